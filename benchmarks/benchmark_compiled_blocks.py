@@ -0,0 +1,120 @@
+"""
+Compiled Constraint Block Benchmark Script for Waffle Production Optimization.
+
+This script measures the compilation layer of matrix-built models. It compares
+the classic PuLP build (expressions built with operator overloading in every
+constraint's apply_to_pulp) with the bulk build that creates the PuLP model from
+compiled constraint blocks, and it measures how long compiling all blocks takes
+without a cache, with a cache holding the blocks from an earlier build, and in
+parallel threads.
+
+Usage:
+    python -m benchmarks.benchmark_compiled_blocks --waffles 100 --pans 10 --weeks 26 --threads 4
+"""
+import time
+import argparse
+import logging
+from typing import Dict, List
+
+import numpy as np
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from src.solvers.block_cache import BlockCache, compile_blocks
+from src.solvers.matrix_model import MatrixModel
+from src.data.optimization_data import OptimizationData, as_optimization_data
+from benchmarks.benchmark_fast_mode import CONSTRAINT_SETS
+from benchmarks.synthetic_data import generate_planning_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def time_pulp_build(data: OptimizationData, constraint_set: str, bulk_build: bool, repeats: int) -> Dict:
+    """
+    Build the PuLP cost model and measure the build time.
+
+    Args:
+        data: Optimization data
+        constraint_set: Name of the constraint set in CONSTRAINT_SETS
+        bulk_build: If True, build from compiled blocks, otherwise with operator overloading
+        repeats: Number of builds
+
+    Returns:
+        Dict: Mean build time and number of constraints
+    """
+    times = []
+    for _ in range(repeats):
+        solver = SolverFactory.create_solver('cbc', constraints=CONSTRAINT_SETS[constraint_set](),
+                                             bulk_build=bulk_build, direct_mps=False)
+        start_time = time.perf_counter()
+        solver.build_minimize_cost_model(data)
+        times.append(time.perf_counter() - start_time)
+    return {'build': float(np.mean(times)), 'constraints': len(solver.model.constraints)}
+
+
+def time_compile(data: OptimizationData, constraint_set: str, cache: bool, threads: int, repeats: int) -> float:
+    """
+    Compile the constraint blocks of a constraint set and measure the time.
+
+    Args:
+        data: Optimization data
+        constraint_set: Name of the constraint set in CONSTRAINT_SETS
+        cache: If True, compile from a cache filled by an earlier compilation
+        threads: Number of compile threads
+        repeats: Number of compilations
+
+    Returns:
+        float: Mean compile time in seconds
+    """
+    constraints = CONSTRAINT_SETS[constraint_set]()
+    block_cache = BlockCache() if cache else None
+    if cache:
+        compile_blocks(MatrixModel(data), constraints, data, block_cache)
+    times = []
+    for _ in range(repeats):
+        matrix = MatrixModel(data)
+        start_time = time.perf_counter()
+        compile_blocks(matrix, constraints, data, block_cache, threads)
+        times.append(time.perf_counter() - start_time)
+    return float(np.mean(times))
+
+
+def run_benchmark(n_waffles: int, n_pans: int, n_weeks: int, threads: int, repeats: int) -> List[List]:
+    """Run the build and compile measurements for each constraint set."""
+    data = as_optimization_data(generate_planning_data(n_waffles, n_pans, n_weeks))
+
+    rows = []
+    for constraint_set in CONSTRAINT_SETS:
+        logger.warning(f"Measuring the {constraint_set} constraints")
+        classic = time_pulp_build(data, constraint_set, False, repeats)
+        bulk = time_pulp_build(data, constraint_set, True, repeats)
+        compile_time = time_compile(data, constraint_set, False, 1, repeats)
+        threaded = time_compile(data, constraint_set, False, threads, repeats)
+        cached = time_compile(data, constraint_set, True, 1, repeats)
+        rows.append([constraint_set, f"{classic['build']:.3f}s", f"{bulk['build']:.3f}s",
+                     f"{classic['build'] / bulk['build']:.1f}x", f"{compile_time * 1000:.1f}ms",
+                     f"{threaded * 1000:.1f}ms", f"{cached * 1000:.2f}ms"])
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Measure PuLP builds from compiled constraint blocks")
+    parser.add_argument("--waffles", type=int, default=100, help="Number of waffle types")
+    parser.add_argument("--pans", type=int, default=10, help="Number of pan types")
+    parser.add_argument("--weeks", type=int, default=26, help="Number of weeks")
+    parser.add_argument("--threads", type=int, default=4, help="Number of threads for the threaded compilation")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of builds to average")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.waffles, args.pans, args.weeks, args.threads, args.repeats)
+    headers = ["Constraints", "PuLP build (classic)", "PuLP build (bulk)", "Speedup", "Compile",
+               f"Compile ({args.threads} threads)", "Compile (cached)"]
+    print(f"\n=== COMPILED BLOCK BENCHMARK ({args.waffles} waffles x {args.pans} pans x {args.weeks} weeks) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
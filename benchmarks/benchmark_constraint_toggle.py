@@ -0,0 +1,159 @@
+"""
+Constraint Toggle Benchmark Script for Waffle Production Optimization.
+
+This script explores constraint combinations by switching one constraint on or
+off per step, twice: once building a new model for every combination, and once
+adding and removing constraint blocks in one long-lived model with
+set_constraints and update_model. It reports the build or update time and the
+solve time per step.
+
+Usage:
+    python -m benchmarks.benchmark_constraint_toggle --solvers highs ortools cpsat --waffles 100 --pans 10 --weeks 26
+"""
+import time
+import argparse
+import logging
+from typing import Dict, List
+
+import numpy as np
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from src.data.optimization_data import OptimizationData, as_optimization_data
+from benchmarks.benchmark_fast_mode import CONSTRAINT_SETS
+from benchmarks.synthetic_data import generate_planning_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Constraints that can be toggled on and off the default constraints
+TOGGLES = ['minimum_batch', 'supply', 'production_rate']
+
+
+def create_constraints(names: List[str]) -> Dict:
+    """
+    Create constraints of the benchmark constraint sets by name.
+
+    Args:
+        names: Constraint names ('demand' or keys of TOGGLES)
+
+    Returns:
+        Dict: Constraints by name
+    """
+    available = dict(CONSTRAINT_SETS['default']())
+    available['minimum_batch'] = CONSTRAINT_SETS['min_batch']()['minimum_batch']
+    available['production_rate'] = CONSTRAINT_SETS['rate']()['production_rate']
+    return {name: available[name] for name in names}
+
+
+def toggle_steps(toggles: List[str], steps: int) -> List[List[str]]:
+    """
+    Create the constraint combinations of a toggle sequence.
+
+    The sequence starts from the default constraints and switches the toggled
+    constraints on or off in turn, one per step.
+
+    Args:
+        toggles: Names of the constraints to toggle
+        steps: Number of toggles
+
+    Returns:
+        List[List[str]]: Constraint names of each step
+    """
+    current = list(CONSTRAINT_SETS['default']())
+    sequence = []
+    for step in range(steps):
+        name = toggles[step % len(toggles)]
+        current = [other for other in current if other != name] if name in current else current + [name]
+        sequence.append(current)
+    return sequence
+
+
+def run_loop(solver_name: str, data: OptimizationData, steps: List[List[str]], time_limit: int, gap: float,
+             update: bool) -> Dict:
+    """
+    Solve the default model and every step of a toggle sequence.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        data: Optimization data
+        steps: Constraint names of each step
+        time_limit: Time limit in seconds
+        gap: Optimality gap
+        update: If True, update one model with update_model, otherwise build a new model per step
+
+    Returns:
+        Dict: Mean build or update time and mean solve time of the steps, the number of
+              in-place updates and the objective value of each step
+    """
+    def new_solver(constraints):
+        return SolverFactory.create_solver(solver_name, constraints=constraints, time_limit=time_limit,
+                                           optimality_gap=gap)
+
+    solver = new_solver(CONSTRAINT_SETS['default']())
+    solver.build_minimize_cost_model(data)
+    solver.solve_model()
+
+    build_times, solve_times, objectives, patched = [], [], [], 0
+    for step in steps:
+        constraints = create_constraints(step)
+        start_time = time.perf_counter()
+        if update:
+            solver.set_constraints(constraints)
+            patched += solver.update_model(data)
+        else:
+            solver = new_solver(constraints)
+            solver.build_minimize_cost_model(data)
+        build_times.append(time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        objectives.append(solver.solve_model()['objective_value'])
+        solve_times.append(time.perf_counter() - start_time)
+    return {'build': float(np.mean(build_times)), 'solve': float(np.mean(solve_times)), 'patched': patched,
+            'objectives': objectives}
+
+
+def run_benchmark(solvers: List[str], n_waffles: int, n_pans: int, n_weeks: int, toggles: List[str],
+                  steps: int, time_limit: int, gap: float) -> List[List]:
+    """Run the toggle sequence with rebuilt and with updated models for each solver."""
+    data = as_optimization_data(generate_planning_data(n_waffles, n_pans, n_weeks))
+    sequence = toggle_steps(toggles, steps)
+
+    rows = []
+    for solver_name in solvers:
+        logger.warning(f"Running {steps} toggles of {', '.join(toggles)} with {solver_name}")
+        rebuilt = run_loop(solver_name, data, sequence, time_limit, gap, update=False)
+        updated = run_loop(solver_name, data, sequence, time_limit, gap, update=True)
+        same = all(a is not None and b is not None and abs(a - b) <= gap * abs(a) + 1e-6
+                   for a, b in zip(rebuilt['objectives'], updated['objectives']))
+        rows.append([solver_name, f"{rebuilt['build']:.3f}s", f"{updated['build']:.3f}s",
+                     f"{updated['patched']}/{steps}", f"{rebuilt['solve']:.3f}s", f"{updated['solve']:.3f}s",
+                     "yes" if same else "no"])
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare rebuilding and updating models when toggling constraints")
+    parser.add_argument("--solvers", type=str, nargs='+', default=['highs', 'ortools', 'cpsat'],
+                        help="Solvers to benchmark")
+    parser.add_argument("--waffles", type=int, default=100, help="Number of waffle types")
+    parser.add_argument("--pans", type=int, default=10, help="Number of pan types")
+    parser.add_argument("--weeks", type=int, default=26, help="Number of weeks")
+    parser.add_argument("--toggles", type=str, nargs='+', choices=TOGGLES,
+                        default=['minimum_batch', 'supply'], help="Constraints to toggle in turn")
+    parser.add_argument("--steps", type=int, default=8, help="Number of toggles")
+    parser.add_argument("--time-limit", type=int, default=300, help="Time limit in seconds")
+    parser.add_argument("--gap", type=float, default=0.005, help="Optimality gap")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.solvers, args.waffles, args.pans, args.weeks, args.toggles, args.steps,
+                         args.time_limit, args.gap)
+    headers = ["Solver", "Build", "Update", "In place", "Solve (built)", "Solve (updated)", "Same objective"]
+    print(f"\n=== CONSTRAINT TOGGLE BENCHMARK ({args.waffles} waffles x {args.pans} pans x {args.weeks} weeks, "
+          f"{args.steps} toggles of {', '.join(args.toggles)}) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+CP-SAT Benchmark Script for Waffle Production Optimization.
+
+This script compares the time OR-Tools SCIP and CP-SAT need to reach a target
+optimality gap on a synthetic instance with minimum batch sizes and production
+rate limits, the two constraints that add binary variables. CP-SAT runs its
+portfolio search with 1, 8 and one worker per core; SCIP is single-threaded.
+
+Usage:
+    python -m benchmarks.benchmark_cpsat --waffles 60 --pans 12 --weeks 16 --gap 0.01
+"""
+import os
+import time
+import argparse
+import logging
+from typing import Dict, List
+
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import (DemandConstraint, SupplyConstraint, ProductionRateConstraint,
+                                     MinimumBatchConstraint)
+from benchmarks.synthetic_data import generate_planning_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def make_constraints() -> Dict:
+    """Create the constraint set of the benchmark."""
+    return {
+        'demand': DemandConstraint(equality=False),
+        'supply': SupplyConstraint(cumulative=True, formulation='inventory'),
+        'minimum_batch': MinimumBatchConstraint(min_batch_size=10),
+        'production_rate': ProductionRateConstraint(max_rate_change=0.2),
+    }
+
+
+def time_solve(solver_name: str, data: Dict, gap: float, time_limit: int, **options) -> Dict:
+    """
+    Build and solve the cost model until the target gap or the time limit is reached.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        data: Optimization data dictionary
+        gap: Target relative optimality gap
+        time_limit: Time limit in seconds
+        **options: Additional solver options
+
+    Returns:
+        Dict: Build time, solve time, status and objective value
+    """
+    solver = SolverFactory.create_solver(solver_name, constraints=make_constraints(), time_limit=time_limit,
+                                         optimality_gap=gap, **options)
+    start_time = time.perf_counter()
+    solver.build_minimize_cost_model(data)
+    build_time = time.perf_counter() - start_time
+    result = solver.solve_model()
+    return {
+        'build_time': build_time,
+        'solve_time': result['solve_time'],
+        'status': result['status'],
+        'objective_value': result['objective_value'],
+    }
+
+
+def run_benchmark(data: Dict, gap: float, time_limit: int, workers: List[int]) -> List[List]:
+    """Solve the instance with SCIP and with CP-SAT for each worker count."""
+    runs = [('OR-Tools SCIP', 'ortools', {})]
+    runs += [(f"CP-SAT ({n or os.cpu_count()} workers)", 'cpsat', {'num_workers': n}) for n in workers]
+
+    rows = []
+    for label, solver_name, options in runs:
+        logger.warning(f"Solving with {label}")
+        result = time_solve(solver_name, data, gap, time_limit, **options)
+        objective = result['objective_value']
+        rows.append([
+            label,
+            result['status'],
+            f"{result['build_time']:.2f}s",
+            f"{result['solve_time']:.2f}s",
+            f"{objective:.2f}" if objective is not None else "-",
+        ])
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare time to target gap of SCIP and CP-SAT")
+    parser.add_argument("--waffles", type=int, default=60, help="Number of waffle types")
+    parser.add_argument("--pans", type=int, default=12, help="Number of pan types")
+    parser.add_argument("--weeks", type=int, default=16, help="Number of weeks")
+    parser.add_argument("--gap", type=float, default=0.01, help="Target relative optimality gap")
+    parser.add_argument("--time-limit", type=int, default=300, help="Time limit per solve in seconds")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 0],
+                        help="CP-SAT worker counts (0: one per core)")
+    args = parser.parse_args()
+
+    data = generate_planning_data(args.waffles, args.pans, args.weeks)
+    rows = run_benchmark(data, args.gap, args.time_limit, args.workers)
+
+    headers = ["Solver", "Status", "Build time", "Time to gap", "Objective"]
+    print(f"\n=== CP-SAT BENCHMARK ({args.waffles} waffles x {args.pans} pans x {args.weeks} weeks, "
+          f"gap {args.gap:.1%}, {os.cpu_count()} cores) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Decomposition Benchmark Script for Waffle Production Optimization.
+
+This script generates an instance whose waffle types fall into product families
+with dedicated pan lines, so that the model splits into one independent block
+per family, and solves it as one model and decomposed into blocks, both one
+block after the other and on a process pool. The time of the largest block
+alone is the time the process pool approaches with one core per block.
+
+Usage:
+    python -m benchmarks.benchmark_decomposition --waffles 400 --pans 40 --weeks 26 --families 8
+"""
+import os
+import time
+import argparse
+import logging
+from typing import Dict, List
+
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import (DemandConstraint, SupplyConstraint, AllowedCombinationsConstraint,
+                                     MinimumBatchConstraint)
+from src.solvers.decomposition import find_blocks
+from benchmarks.synthetic_data import generate_planning_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def make_constraints(min_batch_size: int) -> Dict:
+    """Create the default constraint set of SolverManager plus minimum batch sizes."""
+    return {
+        'demand': DemandConstraint(equality=True),
+        'supply': SupplyConstraint(cumulative=True, formulation='prefix_sum'),
+        'allowed_combinations': AllowedCombinationsConstraint(),
+        'minimum_batch': MinimumBatchConstraint(min_batch_size=min_batch_size),
+    }
+
+
+def time_solve(solver_name: str, data: Dict, min_batch_size: int, time_limit: int, **options) -> Dict:
+    """
+    Build and solve the cost model and measure the total time.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        data: Optimization data dictionary
+        min_batch_size: Minimum batch size of every combination
+        time_limit: Time limit in seconds (per block when decomposed)
+        **options: Additional arguments for SolverFactory.create_solver
+
+    Returns:
+        Dict: Total time, status and objective value
+    """
+    solver = SolverFactory.create_solver(solver_name, constraints=make_constraints(min_batch_size),
+                                         time_limit=time_limit, optimality_gap=0.001, **options)
+    start_time = time.perf_counter()
+    solver.build_minimize_cost_model(data)
+    result = solver.solve_model()
+    total_time = time.perf_counter() - start_time
+    return {'time': total_time, 'status': result['status'], 'objective_value': result['objective_value']}
+
+
+def run_benchmark(solver_name: str, n_waffles: int, n_pans: int, n_weeks: int, n_families: int,
+                  min_batch_size: int, time_limit: int) -> List[List]:
+    """Solve one instance as a whole and decomposed."""
+    data = generate_planning_data(n_waffles, n_pans, n_weeks, allowed_share=0.5, n_families=n_families)
+    blocks = find_blocks(data, make_constraints(min_batch_size))
+    print(f"{len(blocks)} blocks; largest: {len(blocks[0]['waffle_types'])} waffle types, "
+          f"{len(blocks[0]['pan_types'])} pan types; {os.cpu_count()} cores")
+
+    rows = []
+    for label, options in [('One model', {}),
+                           ('Decomposed, sequential', {'decompose': True, 'parallel': None}),
+                           ('Decomposed, process pool', {'decompose': True, 'parallel': 'process'})]:
+        logger.warning(f"Solving: {label}")
+        result = time_solve(solver_name, data, min_batch_size, time_limit, **options)
+        objective = result['objective_value']
+        rows.append([
+            label,
+            result['status'],
+            f"{result['time']:.2f}s",
+            f"{objective:.2f}" if objective is not None else "-",
+        ])
+
+    # Lower bound of the process pool time with one core per block
+    result = time_solve(solver_name, blocks[0], min_batch_size, time_limit)
+    rows.append(['Largest block alone', result['status'], f"{result['time']:.2f}s",
+                 f"{result['objective_value']:.2f}" if result['objective_value'] is not None else "-"])
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare solving one model with solving independent blocks")
+    parser.add_argument("--solver", default="highs", help="Solver for the model and the blocks")
+    parser.add_argument("--waffles", type=int, default=400, help="Number of waffle types")
+    parser.add_argument("--pans", type=int, default=40, help="Number of pan types")
+    parser.add_argument("--weeks", type=int, default=26, help="Number of weeks")
+    parser.add_argument("--families", type=int, default=8, help="Number of product families")
+    parser.add_argument("--min-batch", type=int, default=5, help="Minimum batch size")
+    parser.add_argument("--time-limit", type=int, default=300, help="Time limit in seconds")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.solver, args.waffles, args.pans, args.weeks, args.families, args.min_batch,
+                         args.time_limit)
+    headers = ["Run", "Status", "Build + solve time", "Objective"]
+    print(f"\n=== DECOMPOSITION BENCHMARK ({args.solver}, {args.waffles} waffles x {args.pans} pans x "
+          f"{args.weeks} weeks, {args.families} families) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Direct MPS Benchmark Script for Waffle Production Optimization.
+
+This script compares three ways of solving a model with a PuLP command-line
+solver: the classic PuLP model (expressions built with operator overloading),
+the PuLP model created from compiled constraint blocks, and the direct path that
+writes the compiled model straight to an MPS file and reads the solution back by
+column index. It reports the build time, the time of solve_model (which includes
+writing the model file, running the solver and reading its solution) and the
+objective value.
+
+Usage:
+    python -m benchmarks.benchmark_direct_mps --solver cbc --waffles 100 --pans 10 --weeks 26
+"""
+import time
+import argparse
+import logging
+from typing import Dict, List
+
+import numpy as np
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from src.data.optimization_data import OptimizationData, as_optimization_data
+from benchmarks.benchmark_fast_mode import CONSTRAINT_SETS
+from benchmarks.synthetic_data import generate_planning_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+BUILD_MODES = {
+    'PuLP (classic)': {'bulk_build': False, 'direct_mps': False},
+    'PuLP (bulk)': {'bulk_build': True, 'direct_mps': False},
+    'direct MPS': {'direct_mps': True},
+}
+
+
+def time_solve(solver_name: str, data: OptimizationData, constraint_set: str, options: Dict, time_limit: int,
+               gap: float, repeats: int) -> Dict:
+    """
+    Build and solve the cost model and measure the build and solve times.
+
+    Args:
+        solver_name: Name of the PuLP solver in SolverFactory
+        data: Optimization data
+        constraint_set: Name of the constraint set in CONSTRAINT_SETS
+        options: Keyword arguments for PulpSolver
+        time_limit: Time limit in seconds
+        gap: Optimality gap
+        repeats: Number of runs to average
+
+    Returns:
+        Dict: Mean build and solve time and the objective value of the last run
+    """
+    build_times, solve_times = [], []
+    for _ in range(repeats):
+        solver = SolverFactory.create_solver(solver_name, constraints=CONSTRAINT_SETS[constraint_set](),
+                                             time_limit=time_limit, optimality_gap=gap, **options)
+        start_time = time.perf_counter()
+        solver.build_minimize_cost_model(data)
+        build_times.append(time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        result = solver.solve_model()
+        solve_times.append(time.perf_counter() - start_time)
+    return {'build': float(np.mean(build_times)), 'solve': float(np.mean(solve_times)),
+            'objective': result['objective_value']}
+
+
+def run_benchmark(solver_name: str, n_waffles: int, n_pans: int, n_weeks: int, time_limit: int, gap: float,
+                  repeats: int) -> List[List]:
+    """Solve each constraint set in every build mode."""
+    data = as_optimization_data(generate_planning_data(n_waffles, n_pans, n_weeks))
+
+    rows = []
+    for constraint_set in CONSTRAINT_SETS:
+        for mode, options in BUILD_MODES.items():
+            logger.warning(f"{constraint_set} constraints, {mode}")
+            result = time_solve(solver_name, data, constraint_set, options, time_limit, gap, repeats)
+            objective = f"{result['objective']:.2f}" if result['objective'] is not None else "-"
+            rows.append([constraint_set, mode, f"{result['build']:.3f}s", f"{result['solve']:.3f}s",
+                         f"{result['build'] + result['solve']:.3f}s", objective])
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare PuLP models with the direct MPS path")
+    parser.add_argument("--solver", type=str, default='cbc', choices=['cbc', 'glpk', 'scip'],
+                        help="PuLP command-line solver")
+    parser.add_argument("--waffles", type=int, default=100, help="Number of waffle types")
+    parser.add_argument("--pans", type=int, default=10, help="Number of pan types")
+    parser.add_argument("--weeks", type=int, default=26, help="Number of weeks")
+    parser.add_argument("--time-limit", type=int, default=300, help="Time limit in seconds")
+    parser.add_argument("--gap", type=float, default=0.005, help="Optimality gap")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of runs to average")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.solver, args.waffles, args.pans, args.weeks, args.time_limit, args.gap, args.repeats)
+    headers = ["Constraints", "Mode", "Build", "Solve", "Total", "Objective"]
+    print(f"\n=== DIRECT MPS BENCHMARK ({args.solver}, {args.waffles} waffles x {args.pans} pans x "
+          f"{args.weeks} weeks) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Fast Mode Benchmark Script for Waffle Production Optimization.
+
+This script solves both objectives under several constraint sets with the exact
+MIP solve and with fast mode (LP relaxation, rounding and repair), and reports
+the time, the objective, the gap of the rounded plan to the LP bound, and its
+gap to the exact solve.
+
+Usage:
+    python -m benchmarks.benchmark_fast_mode --solver ortools --waffles 100 --pans 10 --weeks 26
+"""
+import time
+import argparse
+import logging
+from typing import Callable, Dict, List
+
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import (
+    DemandConstraint, SupplyConstraint, ProductionRateConstraint, MinimumBatchConstraint
+)
+from benchmarks.synthetic_data import generate_planning_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Constraint sets by name
+CONSTRAINT_SETS: Dict[str, Callable[[], Dict]] = {
+    'default': lambda: {'demand': DemandConstraint(), 'supply': SupplyConstraint()},
+    'min_batch': lambda: {'demand': DemandConstraint(), 'supply': SupplyConstraint(),
+                          'minimum_batch': MinimumBatchConstraint(min_batch_size=3)},
+    'rate': lambda: {'demand': DemandConstraint(equality=False), 'supply': SupplyConstraint(),
+                     'production_rate': ProductionRateConstraint(max_rate_change=0.5)},
+}
+
+
+def time_solve(solver_name: str, data: Dict, constraint_set: str, maximize: bool, fast: bool,
+               time_limit: int) -> Dict:
+    """
+    Build and solve a model and measure the total time.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        data: Optimization data dictionary
+        constraint_set: Name of the constraint set in CONSTRAINT_SETS
+        maximize: If True, maximize output, otherwise minimize cost
+        fast: If True, round the LP relaxation instead of solving the MIP
+        time_limit: Time limit in seconds
+
+    Returns:
+        Dict: Total time and the solve_model result
+    """
+    solver = SolverFactory.create_solver(solver_name, constraints=CONSTRAINT_SETS[constraint_set](),
+                                         time_limit=time_limit, optimality_gap=0.001, fast=fast)
+    start_time = time.perf_counter()
+    if maximize:
+        solver.build_maximize_output_model(data)
+    else:
+        solver.build_minimize_cost_model(data)
+    result = solver.solve_model()
+    result['time'] = time.perf_counter() - start_time
+    return result
+
+
+def run_benchmark(solver_name: str, n_waffles: int, n_pans: int, n_weeks: int, constraint_sets: List[str],
+                  time_limit: int) -> List[List]:
+    """Solve each constraint set and objective exactly and in fast mode."""
+    data = generate_planning_data(n_waffles, n_pans, n_weeks)
+
+    rows = []
+    for constraint_set in constraint_sets:
+        for maximize in [False, True]:
+            objective = "output" if maximize else "cost"
+            logger.warning(f"Solving {constraint_set}, {objective}")
+            exact = time_solve(solver_name, data, constraint_set, maximize, False, time_limit)
+            fast = time_solve(solver_name, data, constraint_set, maximize, True, time_limit)
+            gap_to_exact = "-"
+            if exact['objective_value'] and fast['objective_value'] is not None:
+                difference = fast['objective_value'] - exact['objective_value']
+                gap_to_exact = f"{100 * difference / abs(exact['objective_value']):+.2f}%"
+            rows.append([
+                constraint_set,
+                objective,
+                f"{exact['time']:.2f}s",
+                f"{fast['time']:.2f}s",
+                fast['status'],
+                f"{100 * fast['gap']:.2f}%" if fast.get('gap') is not None else "-",
+                gap_to_exact,
+            ])
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare fast mode (LP rounding) with exact MIP solves")
+    parser.add_argument("--solver", type=str, default="ortools", help="Solver with a fast mode")
+    parser.add_argument("--waffles", type=int, default=100, help="Number of waffle types")
+    parser.add_argument("--pans", type=int, default=10, help="Number of pan types")
+    parser.add_argument("--weeks", type=int, default=26, help="Number of weeks")
+    parser.add_argument("--constraint-sets", type=str, nargs='+', choices=list(CONSTRAINT_SETS),
+                        default=list(CONSTRAINT_SETS), help="Constraint sets to solve")
+    parser.add_argument("--time-limit", type=int, default=300, help="Time limit in seconds")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.solver, args.waffles, args.pans, args.weeks, args.constraint_sets, args.time_limit)
+    headers = ["Constraints", "Objective", "Exact time", "Fast time", "Fast status", "Gap to LP bound",
+               "Fast vs exact"]
+    print(f"\n=== FAST MODE BENCHMARK ({args.solver}, {args.waffles} waffles x {args.pans} pans x "
+          f"{args.weeks} weeks) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Network Flow Benchmark Script for Waffle Production Optimization.
+
+This script compares the min-cost flow solver with the OR-Tools MIP solver on the
+default constraint set (demand, cumulative supply and allowed combinations) for
+growing numbers of waffle types. The MIP solver is skipped above --mip-max-waffles.
+
+Usage:
+    python -m benchmarks.benchmark_flow --waffles 100 1000 5000 --pans 40 --weeks 52
+"""
+import time
+import argparse
+import logging
+from typing import Dict, List
+
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import DemandConstraint, SupplyConstraint, AllowedCombinationsConstraint
+from benchmarks.synthetic_data import generate_planning_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def make_constraints() -> Dict:
+    """Create the default constraint set of SolverManager."""
+    return {
+        'demand': DemandConstraint(equality=True),
+        'supply': SupplyConstraint(cumulative=True, formulation='prefix_sum'),
+        'allowed_combinations': AllowedCombinationsConstraint(),
+    }
+
+
+def time_solve(solver_name: str, data: Dict, time_limit: int) -> Dict:
+    """
+    Build and solve the cost model and measure build and solve time.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        data: Optimization data dictionary
+        time_limit: Time limit in seconds
+
+    Returns:
+        Dict: Build time, solve time, status and objective value
+    """
+    solver = SolverFactory.create_solver(solver_name, constraints=make_constraints(),
+                                         time_limit=time_limit, optimality_gap=0)
+    start_time = time.perf_counter()
+    solver.build_minimize_cost_model(data)
+    build_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    result = solver.solve_model()
+    solve_time = time.perf_counter() - start_time
+    return {
+        'build_time': build_time,
+        'solve_time': solve_time,
+        'status': result['status'],
+        'objective_value': result['objective_value'],
+    }
+
+
+def run_benchmark(sizes: List[int], n_pans: int, n_weeks: int, mip_max_waffles: int,
+                  time_limit: int) -> List[List]:
+    """Solve instances of every size with the flow solver and, if small enough, OR-Tools."""
+    rows = []
+    for n_waffles in sizes:
+        data = generate_planning_data(n_waffles, n_pans, n_weeks)
+        solvers = ['flow'] + (['ortools'] if n_waffles <= mip_max_waffles else [])
+        for solver_name in solvers:
+            logger.warning(f"{n_waffles} waffles: solving with {solver_name}")
+            result = time_solve(solver_name, data, time_limit)
+            objective = result['objective_value']
+            rows.append([
+                n_waffles,
+                solver_name,
+                result['status'],
+                f"{result['build_time']:.3f}s",
+                f"{result['solve_time']:.3f}s",
+                f"{objective:.2f}" if objective is not None else "-",
+            ])
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare the min-cost flow solver with OR-Tools")
+    parser.add_argument("--waffles", type=int, nargs="+", default=[100, 1000, 5000], help="Numbers of waffle types")
+    parser.add_argument("--pans", type=int, default=40, help="Number of pan types")
+    parser.add_argument("--weeks", type=int, default=52, help="Number of weeks")
+    parser.add_argument("--mip-max-waffles", type=int, default=1000,
+                        help="Largest number of waffle types solved with OR-Tools")
+    parser.add_argument("--time-limit", type=int, default=300, help="OR-Tools time limit in seconds")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.waffles, args.pans, args.weeks, args.mip_max_waffles, args.time_limit)
+    headers = ["Waffles", "Solver", "Status", "Build time", "Solve time", "Objective"]
+    print(f"\n=== NETWORK FLOW BENCHMARK ({args.pans} pans x {args.weeks} weeks) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
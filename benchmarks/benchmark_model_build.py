@@ -0,0 +1,103 @@
+"""
+Model Build Benchmark Script for Waffle Production Optimization.
+
+This script compares the classic OR-Tools model build (one IntVar and one
+SetCoefficient call at a time) with the bulk build that assembles the model as
+NumPy arrays and loads it in one call. It uses the 200 x 40 x 50 instance of
+test_large_optimization.py and reports the build time and model size without
+constraints, with the default constraints and with the inventory supply
+formulation.
+
+Usage:
+    python -m benchmarks.benchmark_model_build
+"""
+import time
+import logging
+from typing import Dict, List
+
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import DemandConstraint, SupplyConstraint, AllowedCombinationsConstraint
+from test_large_optimization import generate_even_more_complex_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+BUILD_MODES = {
+    'classic': {'bulk_build': False},
+    'bulk': {'bulk_build': True},
+    'bulk (named)': {'bulk_build': True, 'variable_names': True},
+}
+
+CONSTRAINT_SETS = {
+    'none': lambda: {},
+    'default': lambda: {
+        'demand': DemandConstraint(equality=True),
+        'supply': SupplyConstraint(cumulative=True, formulation='prefix_sum'),
+        'allowed_combinations': AllowedCombinationsConstraint(),
+    },
+    'inventory supply': lambda: {
+        'demand': DemandConstraint(equality=True),
+        'supply': SupplyConstraint(cumulative=True, formulation='inventory'),
+        'allowed_combinations': AllowedCombinationsConstraint(),
+    },
+}
+
+
+def time_build(data: Dict, constraints: Dict, options: Dict) -> Dict:
+    """
+    Build the cost model once and measure the build time.
+
+    Args:
+        data: Optimization data dictionary
+        constraints: Constraint instances by name
+        options: Keyword arguments for ORToolsSolver
+
+    Returns:
+        Dict: Build time and number of columns and rows
+    """
+    solver = SolverFactory.create_solver('ortools', constraints=constraints, **options)
+    start_time = time.perf_counter()
+    solver.build_minimize_cost_model(data)
+    build_time = time.perf_counter() - start_time
+    return {
+        'build_time': build_time,
+        'columns': solver.solver.NumVariables(),
+        'rows': solver.solver.NumConstraints(),
+    }
+
+
+def run_benchmark(data: Dict) -> List[List]:
+    """Build the model in every mode for every constraint set."""
+    rows = []
+    for constraint_set, make_constraints in CONSTRAINT_SETS.items():
+        classic_time = None
+        for mode, options in BUILD_MODES.items():
+            logger.warning(f"{constraint_set} constraints, {mode} build")
+            result = time_build(data, make_constraints(), options)
+            if classic_time is None:
+                classic_time = result['build_time']
+            rows.append([
+                constraint_set,
+                mode,
+                result['columns'],
+                result['rows'],
+                f"{result['build_time']:.3f}s",
+                f"{classic_time / result['build_time']:.1f}x",
+            ])
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    data = generate_even_more_complex_data()
+    rows = run_benchmark(data)
+    headers = ["Constraints", "Build", "Columns", "Rows", "Build time", "Speedup"]
+    print("\n=== OR-TOOLS MODEL BUILD BENCHMARK (200 waffles x 40 pans x 50 weeks) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Model Update Benchmark Script for Waffle Production Optimization.
+
+This script runs a what-if loop of small data edits (a demand, supply, cost or WPP
+change per step) twice: once building a new model for every step, and once
+patching one long-lived model with update_model. It reports the build or update
+time and the solve time per step.
+
+Usage:
+    python -m benchmarks.benchmark_model_update --solvers highs ortools cpsat cbc --waffles 100 --pans 10 --weeks 26
+"""
+import time
+import argparse
+import logging
+from typing import Dict, List
+
+import numpy as np
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from src.data.optimization_data import OptimizationData, as_optimization_data
+from benchmarks.benchmark_fast_mode import CONSTRAINT_SETS
+from benchmarks.synthetic_data import generate_planning_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Edits of the what-if loop, applied in turn
+EDITS = ['demand', 'supply', 'cost', 'wpp']
+
+
+def edit_steps(data: OptimizationData, steps: int, seed: int = 0) -> List[OptimizationData]:
+    """
+    Create a sequence of edited datasets, each one small edit away from the previous one.
+
+    Demand decreases and supply increases, so that every step stays feasible.
+
+    Args:
+        data: Optimization data of the first build
+        steps: Number of edits
+        seed: Random seed
+
+    Returns:
+        List[OptimizationData]: Data of each step
+    """
+    rng = np.random.default_rng(seed)
+    datasets = []
+    for step in range(steps):
+        edit = EDITS[step % len(EDITS)]
+        if edit == 'demand':
+            keys = list(data['demand'])
+            key = keys[rng.integers(len(keys))]
+            changes = {key: int(data['demand'][key] * 0.95)}
+        elif edit == 'supply':
+            keys = list(data['supply'])
+            key = keys[rng.integers(len(keys))]
+            changes = {key: int(data['supply'][key] * 1.1) + 1}
+        elif edit == 'cost':
+            pan = data.pan_types[rng.integers(len(data.pan_types))]
+            factor = rng.uniform(0.9, 1.1)
+            changes = {key: value * factor for key, value in data['cost'].items() if key[1] == pan}
+        else:
+            waffle = data.waffle_types[rng.integers(len(data.waffle_types))]
+            changes = {waffle: int(data['wpp'][waffle] * rng.uniform(0.9, 1.1))}
+        data = data.with_changes({edit: changes})
+        datasets.append(data)
+    return datasets
+
+
+def run_loop(solver_name: str, data: OptimizationData, steps: List[OptimizationData], constraint_set: str,
+             time_limit: int, gap: float, update: bool) -> Dict:
+    """
+    Solve the first model and every step of a what-if loop.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        data: Optimization data of the first build
+        steps: Data of each step
+        constraint_set: Name of the constraint set in CONSTRAINT_SETS
+        time_limit: Time limit in seconds
+        gap: Optimality gap
+        update: If True, patch one model with update_model, otherwise build a new model per step
+
+    Returns:
+        Dict: Mean build or update time and mean solve time of the steps, the number of
+              in-place updates and the objective value of the last step
+    """
+    def new_solver():
+        return SolverFactory.create_solver(solver_name, constraints=CONSTRAINT_SETS[constraint_set](),
+                                           time_limit=time_limit, optimality_gap=gap)
+
+    solver = new_solver()
+    solver.build_minimize_cost_model(data)
+    solver.solve_model()
+
+    build_times, solve_times, patched = [], [], 0
+    result = None
+    for step_data in steps:
+        start_time = time.perf_counter()
+        if update:
+            patched += solver.update_model(step_data)
+        else:
+            solver = new_solver()
+            solver.build_minimize_cost_model(step_data)
+        build_times.append(time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        result = solver.solve_model()
+        solve_times.append(time.perf_counter() - start_time)
+    return {'build': float(np.mean(build_times)), 'solve': float(np.mean(solve_times)), 'patched': patched,
+            'objective': result['objective_value']}
+
+
+def run_benchmark(solvers: List[str], n_waffles: int, n_pans: int, n_weeks: int, constraint_sets: List[str],
+                  steps: int, time_limit: int, gap: float) -> List[List]:
+    """Run the what-if loop with rebuilt and with updated models for each solver and constraint set."""
+    data = as_optimization_data(generate_planning_data(n_waffles, n_pans, n_weeks))
+    datasets = edit_steps(data, steps)
+
+    rows = []
+    for constraint_set in constraint_sets:
+        for solver_name in solvers:
+            logger.warning(f"Running {steps} steps of {constraint_set} with {solver_name}")
+            rebuilt = run_loop(solver_name, data, datasets, constraint_set, time_limit, gap, update=False)
+            updated = run_loop(solver_name, data, datasets, constraint_set, time_limit, gap, update=True)
+            same = (rebuilt['objective'] is not None and updated['objective'] is not None
+                    and abs(rebuilt['objective'] - updated['objective']) <= gap * abs(rebuilt['objective']) + 1e-6)
+            rows.append([constraint_set, solver_name, f"{rebuilt['build']:.3f}s", f"{updated['build']:.3f}s",
+                         f"{updated['patched']}/{steps}", f"{rebuilt['solve']:.3f}s", f"{updated['solve']:.3f}s",
+                         "yes" if same else "no"])
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare rebuilding and updating models in a what-if loop")
+    parser.add_argument("--solvers", type=str, nargs='+', default=['highs', 'ortools', 'cpsat', 'cbc'],
+                        help="Solvers to benchmark")
+    parser.add_argument("--waffles", type=int, default=100, help="Number of waffle types")
+    parser.add_argument("--pans", type=int, default=10, help="Number of pan types")
+    parser.add_argument("--weeks", type=int, default=26, help="Number of weeks")
+    parser.add_argument("--constraint-sets", type=str, nargs='+', choices=list(CONSTRAINT_SETS),
+                        default=['default', 'min_batch'], help="Constraint sets to solve")
+    parser.add_argument("--steps", type=int, default=8, help="Number of edits in the what-if loop")
+    parser.add_argument("--time-limit", type=int, default=300, help="Time limit in seconds")
+    parser.add_argument("--gap", type=float, default=0.005, help="Optimality gap")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.solvers, args.waffles, args.pans, args.weeks, args.constraint_sets, args.steps,
+                         args.time_limit, args.gap)
+    headers = ["Constraints", "Solver", "Build", "Update", "In place", "Solve (built)", "Solve (updated)",
+               "Same objective"]
+    print(f"\n=== MODEL UPDATE BENCHMARK ({args.waffles} waffles x {args.pans} pans x {args.weeks} weeks, "
+          f"{args.steps} steps) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
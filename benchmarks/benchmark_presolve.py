@@ -0,0 +1,130 @@
+"""
+Presolve Benchmark Script for Waffle Production Optimization.
+
+This script builds and solves the cost model of a sparse-demand instance (each
+waffle type has demand in a fraction of the weeks) with and without presolve,
+and reports the model size, build time and solve time of both runs.
+
+Usage:
+    python -m benchmarks.benchmark_presolve --waffles 200 --pans 20 --weeks 52 --demand-share 0.1
+"""
+import time
+import argparse
+import logging
+from typing import Dict, List
+
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import (DemandConstraint, SupplyConstraint, AllowedCombinationsConstraint,
+                                     MinimumBatchConstraint)
+from src.solvers.presolve import presolve
+from benchmarks.synthetic_data import generate_planning_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def make_constraints(min_batch_size: int) -> Dict:
+    """Create the default constraint set of SolverManager plus minimum batch sizes."""
+    return {
+        'demand': DemandConstraint(equality=True),
+        'supply': SupplyConstraint(cumulative=True, formulation='prefix_sum'),
+        'allowed_combinations': AllowedCombinationsConstraint(),
+        'minimum_batch': MinimumBatchConstraint(min_batch_size=min_batch_size),
+    }
+
+
+def model_size(solver) -> Dict[str, int]:
+    """Get the number of variables and rows of a built model."""
+    if solver.matrix is not None:
+        statistics = solver.matrix.get_statistics()
+        return {'variables': statistics['columns'], 'rows': statistics['rows']}
+    return {'variables': solver.solver.NumVariables(), 'rows': solver.solver.NumConstraints()}
+
+
+def time_solve(solver_name: str, solver_options: Dict, data: Dict, min_batch_size: int,
+               use_presolve: bool, time_limit: int) -> Dict:
+    """
+    Presolve (optionally), build and solve the cost model and measure each step.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        solver_options: Additional arguments for the solver
+        data: Optimization data dictionary
+        min_batch_size: Minimum batch size of every combination
+        use_presolve: Whether to presolve before building the model
+        time_limit: Time limit in seconds
+
+    Returns:
+        Dict: Presolve, build and solve times, model size, status and objective value
+    """
+    solver = SolverFactory.create_solver(solver_name, constraints=make_constraints(min_batch_size),
+                                         time_limit=time_limit, optimality_gap=0, **solver_options)
+    start_time = time.perf_counter()
+    if use_presolve:
+        solver.set_presolve(presolve(data, solver.get_all_constraints()))
+    presolve_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    solver.build_minimize_cost_model(data)
+    build_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    result = solver.solve_model()
+    solve_time = time.perf_counter() - start_time
+    return dict(model_size(solver), presolve_time=presolve_time, build_time=build_time,
+                solve_time=solve_time, status=result['status'], objective_value=result['objective_value'])
+
+
+def run_benchmark(n_waffles: int, n_pans: int, n_weeks: int, demand_share: float, min_batch_size: int,
+                  time_limit: int) -> List[List]:
+    """Solve one instance with every solver, with and without presolve."""
+    data = generate_planning_data(n_waffles, n_pans, n_weeks, demand_share=demand_share)
+    statistics = presolve(data, make_constraints(min_batch_size)).get_statistics()
+    print(f"Presolve: {statistics}")
+
+    rows = []
+    for label, solver_name, options in [('OR-Tools (classic build)', 'ortools', {'bulk_build': False}),
+                                        ('OR-Tools (bulk build)', 'ortools', {}),
+                                        ('HiGHS', 'highs', {})]:
+        for use_presolve in [False, True]:
+            logger.warning(f"Solving with {label}, presolve={use_presolve}")
+            result = time_solve(solver_name, options, data, min_batch_size, use_presolve, time_limit)
+            objective = result['objective_value']
+            rows.append([
+                label,
+                "yes" if use_presolve else "no",
+                f"{result['variables']:,}",
+                f"{result['rows']:,}",
+                f"{result['presolve_time']:.3f}s",
+                f"{result['build_time']:.3f}s",
+                f"{result['solve_time']:.3f}s",
+                result['status'],
+                f"{objective:.2f}" if objective is not None else "-",
+            ])
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare model size and solve time with and without presolve")
+    parser.add_argument("--waffles", type=int, default=200, help="Number of waffle types")
+    parser.add_argument("--pans", type=int, default=20, help="Number of pan types")
+    parser.add_argument("--weeks", type=int, default=52, help="Number of weeks")
+    parser.add_argument("--demand-share", type=float, default=0.1,
+                        help="Share of (waffle, week) combinations with demand")
+    parser.add_argument("--min-batch", type=int, default=5, help="Minimum batch size")
+    parser.add_argument("--time-limit", type=int, default=300, help="Time limit in seconds")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.waffles, args.pans, args.weeks, args.demand_share, args.min_batch,
+                         args.time_limit)
+    headers = ["Solver", "Presolve", "Variables", "Rows", "Presolve time", "Build time", "Solve time",
+               "Status", "Objective"]
+    print(f"\n=== PRESOLVE BENCHMARK ({args.waffles} waffles x {args.pans} pans x {args.weeks} weeks, "
+          f"demand share {args.demand_share}) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
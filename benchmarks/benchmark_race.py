@@ -0,0 +1,94 @@
+"""
+Race Benchmark Script for Waffle Production Optimization.
+
+This script solves the cost model under several constraint sets with each
+backend alone and with a race of all of them, and reports the build and solve
+time of each run and the backend that won the race. Each backend of the race
+runs in its own process, so the race needs one core per backend to keep pace
+with its fastest backend.
+
+Usage:
+    python -m benchmarks.benchmark_race --solvers highs ortools cpsat cbc --waffles 100 --pans 10 --weeks 26
+"""
+import os
+import time
+import argparse
+import logging
+from typing import Dict, List
+
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from benchmarks.benchmark_fast_mode import CONSTRAINT_SETS
+from benchmarks.synthetic_data import generate_planning_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def time_solve(solver_name: str, data: Dict, constraint_set: str, time_limit: int, **solver_options) -> Dict:
+    """
+    Build and solve the cost model and measure the total time.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        data: Optimization data dictionary
+        constraint_set: Name of the constraint set in CONSTRAINT_SETS
+        time_limit: Time limit in seconds
+        **solver_options: Additional arguments for the solver
+
+    Returns:
+        Dict: Total time and the solve_model result
+    """
+    solver = SolverFactory.create_solver(solver_name, constraints=CONSTRAINT_SETS[constraint_set](),
+                                         time_limit=time_limit, optimality_gap=0.001, **solver_options)
+    start_time = time.perf_counter()
+    solver.build_minimize_cost_model(data)
+    result = solver.solve_model()
+    result['time'] = time.perf_counter() - start_time
+    return result
+
+
+def run_benchmark(solvers: List[str], n_waffles: int, n_pans: int, n_weeks: int, constraint_sets: List[str],
+                  time_limit: int) -> List[List]:
+    """Solve each constraint set with each backend alone and with the race."""
+    data = generate_planning_data(n_waffles, n_pans, n_weeks)
+
+    rows = []
+    for constraint_set in constraint_sets:
+        row = [constraint_set]
+        for solver_name in solvers:
+            logger.warning(f"Solving {constraint_set} with {solver_name}")
+            result = time_solve(solver_name, data, constraint_set, time_limit)
+            row.append(f"{result['time']:.2f}s" if result['status'] == 'OPTIMAL' else result['status'])
+        logger.warning(f"Racing {constraint_set}")
+        result = time_solve('race', data, constraint_set, time_limit, solvers=solvers)
+        row.append(f"{result['time']:.2f}s" if result['status'] == 'OPTIMAL' else result['status'])
+        row.append(result['winner'] or "-")
+        rows.append(row)
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare a race of solver backends with each backend alone")
+    parser.add_argument("--solvers", type=str, nargs='+', default=['highs', 'ortools', 'cpsat', 'cbc'],
+                        help="Backends to race")
+    parser.add_argument("--waffles", type=int, default=100, help="Number of waffle types")
+    parser.add_argument("--pans", type=int, default=10, help="Number of pan types")
+    parser.add_argument("--weeks", type=int, default=26, help="Number of weeks")
+    parser.add_argument("--constraint-sets", type=str, nargs='+', choices=list(CONSTRAINT_SETS),
+                        default=list(CONSTRAINT_SETS), help="Constraint sets to solve")
+    parser.add_argument("--time-limit", type=int, default=300, help="Time limit in seconds")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.solvers, args.waffles, args.pans, args.weeks, args.constraint_sets, args.time_limit)
+    headers = ["Constraints"] + args.solvers + ["Race", "Winner"]
+    print(f"\n=== RACE BENCHMARK ({args.waffles} waffles x {args.pans} pans x {args.weeks} weeks, "
+          f"{os.cpu_count()} cores) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Rolling Horizon Benchmark Script for Waffle Production Optimization.
+
+This script solves the cost model with cumulative supply and production rate
+limits over a long horizon as one model and with rolling horizons of several
+window and step sizes, and reports the time and the objective gap to the single
+model. The single model of a short horizon gives the reference time.
+
+Usage:
+    python -m benchmarks.benchmark_rolling_horizon --waffles 100 --pans 10 --weeks 104 --short-weeks 20
+"""
+import time
+import argparse
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import DemandConstraint, SupplyConstraint, ProductionRateConstraint
+from benchmarks.synthetic_data import generate_planning_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def make_constraints(max_rate_change: float) -> Dict:
+    """Create constraints that link the weeks: cumulative supply and production rate limits."""
+    return {
+        'demand': DemandConstraint(equality=False),
+        'supply': SupplyConstraint(cumulative=True, formulation='inventory'),
+        'production_rate': ProductionRateConstraint(max_rate_change=max_rate_change),
+    }
+
+
+def time_solve(solver_name: str, data: Dict, max_rate_change: float, time_limit: int,
+               rolling_horizon: Optional[Tuple[int, int]] = None) -> Dict:
+    """
+    Build and solve the cost model and measure the total time.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        data: Optimization data dictionary
+        max_rate_change: Maximum production rate change between consecutive weeks
+        time_limit: Time limit in seconds (per window with a rolling horizon)
+        rolling_horizon: Optional (window, step) in weeks
+
+    Returns:
+        Dict: Total time, status and objective value
+    """
+    solver = SolverFactory.create_solver(solver_name, constraints=make_constraints(max_rate_change),
+                                         time_limit=time_limit, optimality_gap=0.001,
+                                         rolling_horizon=rolling_horizon)
+    start_time = time.perf_counter()
+    solver.build_minimize_cost_model(data)
+    result = solver.solve_model()
+    return {'time': time.perf_counter() - start_time, 'status': result['status'],
+            'objective_value': result['objective_value']}
+
+
+def run_benchmark(solver_name: str, n_waffles: int, n_pans: int, n_weeks: int, short_weeks: int,
+                  horizons: List[Tuple[int, int]], max_rate_change: float, time_limit: int) -> List[List]:
+    """Solve the long horizon as one model and with each rolling horizon, and the short horizon as one model."""
+    data = generate_planning_data(n_waffles, n_pans, n_weeks)
+    short_data = generate_planning_data(n_waffles, n_pans, short_weeks)
+
+    rows = []
+    reference = None
+    for label, weeks, run_data, rolling_horizon in (
+            [(f"One model, {short_weeks} weeks", short_weeks, short_data, None),
+             (f"One model, {n_weeks} weeks", n_weeks, data, None)]
+            + [(f"Rolling, K={window}, S={step}", n_weeks, data, (window, step)) for window, step in horizons]):
+        logger.warning(f"Solving {label}")
+        result = time_solve(solver_name, run_data, max_rate_change, time_limit, rolling_horizon)
+        objective = result['objective_value']
+        if weeks == n_weeks and rolling_horizon is None:
+            reference = objective
+        gap = "-"
+        if weeks == n_weeks and objective is not None and reference:
+            gap = f"{100 * (objective - reference) / abs(reference):+.2f}%"
+        rows.append([
+            label,
+            f"{result['time']:.2f}s",
+            result['status'],
+            f"{objective:.2f}" if objective is not None else "-",
+            gap,
+        ])
+    return rows
+
+
+def parse_horizon(value: str) -> Tuple[int, int]:
+    """Parse a rolling horizon given as WINDOW:STEP."""
+    window, step = value.split(':')
+    return int(window), int(step)
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare rolling horizon solves with one model of the full horizon")
+    parser.add_argument("--solver", type=str, default="highs", help="Solver for the models and windows")
+    parser.add_argument("--waffles", type=int, default=100, help="Number of waffle types")
+    parser.add_argument("--pans", type=int, default=10, help="Number of pan types")
+    parser.add_argument("--weeks", type=int, default=104, help="Number of weeks of the long horizon")
+    parser.add_argument("--short-weeks", type=int, default=20, help="Number of weeks of the reference horizon")
+    parser.add_argument("--horizons", type=parse_horizon, nargs='+', default=[(13, 4), (8, 4), (20, 10)],
+                        help="Rolling horizons as WINDOW:STEP")
+    parser.add_argument("--max-rate-change", type=float, default=0.5, help="Maximum production rate change")
+    parser.add_argument("--time-limit", type=int, default=600, help="Time limit in seconds")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.solver, args.waffles, args.pans, args.weeks, args.short_weeks, args.horizons,
+                         args.max_rate_change, args.time_limit)
+    headers = ["Run", "Build + solve time", "Status", "Objective", "Gap to one model"]
+    print(f"\n=== ROLLING HORIZON BENCHMARK ({args.solver}, {args.waffles} waffles x {args.pans} pans x "
+          f"{args.weeks} weeks) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
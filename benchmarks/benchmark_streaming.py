@@ -0,0 +1,136 @@
+"""
+Streaming Ingestion Benchmark Script for Waffle Production Optimization.
+
+This script generates a large demand workbook (10k waffle types x 104 weeks by
+default) and compares loading it with pandas and with the streaming read-only
+reader of DataProcessor. Each load runs in a fresh process so that the reported
+peak resident set size (RSS) belongs to that load alone.
+
+Usage:
+    python -m benchmarks.benchmark_streaming [--waffles N] [--weeks N]
+"""
+import os
+import sys
+import time
+import argparse
+import logging
+import resource
+import tempfile
+import multiprocessing
+from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from tabulate import tabulate
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def write_wide_sheet(path: str, row_labels: List[str], column_labels: List[str], values: np.ndarray) -> None:
+    """Write a wide sheet in the layout of the input workbooks using openpyxl's write-only mode."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([None] + column_labels)
+    for label, row in zip(row_labels, values.tolist()):
+        sheet.append([label] + row)
+    workbook.save(path)
+
+
+def generate_dataset(folder: str, n_waffles: int, n_weeks: int, n_pans: int = 20) -> Dict[str, str]:
+    """
+    Generate a synthetic dataset with a large demand sheet.
+
+    Args:
+        folder: Directory for the generated workbooks
+        n_waffles: Number of waffle types (rows of the demand sheet)
+        n_weeks: Number of weeks (columns of the demand and supply sheets)
+        n_pans: Number of pan types
+
+    Returns:
+        Dict[str, str]: Input file paths by role
+    """
+    rng = np.random.default_rng(42)
+    waffles = [f"W{i:05d}" for i in range(n_waffles)]
+    pans = [f"P{i:02d}" for i in range(n_pans)]
+    weeks = [f"Week {i:03d}" for i in range(1, n_weeks + 1)]
+
+    files = {
+        'demand_file': os.path.join(folder, "WaffleDemand.xlsx"),
+        'supply_file': os.path.join(folder, "PanSupply.xlsx"),
+        'cost_file': os.path.join(folder, "WaffleCostPerPan.xlsx"),
+        'wpp_file': os.path.join(folder, "WafflesPerPan.xlsx"),
+        'combinations_file': os.path.join(folder, "WafflePanCombinations.xlsx"),
+    }
+    write_wide_sheet(files['demand_file'], waffles, weeks, rng.integers(0, 500, (n_waffles, n_weeks)))
+    write_wide_sheet(files['supply_file'], pans, weeks, rng.integers(0, 5000, (n_pans, n_weeks)))
+    write_wide_sheet(files['cost_file'], waffles, pans, rng.uniform(0.1, 2.0, (n_waffles, n_pans)).round(2))
+    write_wide_sheet(files['wpp_file'], waffles, ['WPP'], rng.integers(50, 200, (n_waffles, 1)))
+    write_wide_sheet(files['combinations_file'], waffles, pans, rng.integers(0, 2, (n_waffles, n_pans)))
+    return files
+
+
+def peak_rss_mb() -> float:
+    """Get the peak resident set size of the current process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def load_in_process(files: Dict[str, str], streaming: bool) -> Tuple[float, float, float, int, int]:
+    """Load the dataset and report time, peak RSS and data size (runs in a child process)."""
+    from src.data.processor import DataProcessor
+
+    baseline = peak_rss_mb()
+    processor = DataProcessor(streaming=streaming)
+    start_time = time.perf_counter()
+    processor.load_data(**files)
+    load_time = time.perf_counter() - start_time
+    data = processor.get_optimization_data()
+    return load_time, baseline, peak_rss_mb(), data.nbytes(), len(data['demand'])
+
+
+def run_benchmark(files: Dict[str, str]) -> List[List]:
+    """Load the dataset with each ingestion mode in a fresh process."""
+    context = multiprocessing.get_context('spawn')
+    rows = []
+    for name, streaming in [("pandas.read_excel", False), ("streaming", True)]:
+        logger.info(f"Loading with {name}")
+        # A new single-worker pool per reader so that peak RSS is not shared
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            load_time, baseline, peak, data_bytes, n_demand = executor.submit(
+                load_in_process, files, streaming).result()
+        rows.append([
+            name,
+            f"{load_time:.2f}s",
+            f"{baseline:.0f} MB",
+            f"{peak:.0f} MB",
+            f"{peak - baseline:.0f} MB",
+            f"{data_bytes / (1024 * 1024):.1f} MB",
+            n_demand,
+        ])
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare pandas and streaming workbook ingestion")
+    parser.add_argument("--waffles", type=int, default=10000, help="Number of waffle types")
+    parser.add_argument("--weeks", type=int, default=104, help="Number of weeks")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        logger.info(f"Generating {args.waffles} x {args.weeks} demand workbook")
+        files = generate_dataset(folder, args.waffles, args.weeks)
+        rows = run_benchmark(files)
+
+    headers = ["Reader", "Load time", "RSS before", "Peak RSS", "Peak increase", "Data size", "Demand entries"]
+    print(f"\n=== STREAMING INGESTION BENCHMARK ({args.waffles} x {args.weeks}) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
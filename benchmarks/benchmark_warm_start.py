@@ -0,0 +1,136 @@
+"""
+Warm Start Benchmark Script for Waffle Production Optimization.
+
+This script solves the cost model, edits the data slightly (a demand increase in
+one week, or a cost increase for one pan type) and re-solves the edited model
+from scratch and from the first solution. It reports the time to reach the
+optimality gap and, for HiGHS, whose callbacks report improving solutions, the
+time to the first incumbent.
+
+Usage:
+    python -m benchmarks.benchmark_warm_start --solvers highs ortools cbc cpsat --waffles 100 --pans 10 --weeks 26
+"""
+import time
+import argparse
+import logging
+from typing import Dict, List, Optional
+
+from tabulate import tabulate
+
+from src.solvers.base import SolverFactory
+from benchmarks.benchmark_fast_mode import CONSTRAINT_SETS
+from benchmarks.synthetic_data import generate_planning_data
+
+# Set up logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Share by which an edit increases demand or cost
+EDIT_FACTOR = 1.1
+
+
+def edit_data(data: Dict, edit: str) -> Dict:
+    """
+    Apply a small edit to the data.
+
+    Args:
+        data: Optimization data dictionary
+        edit: 'demand' to increase the demand of one week, 'cost' to increase the cost of one pan type
+
+    Returns:
+        Dict: Edited copy of the data
+    """
+    if edit == 'demand':
+        week = data['weeks'][len(data['weeks']) // 4]
+        demand = {key: int(value * EDIT_FACTOR) if key[1] == week else value for key, value in data['demand'].items()}
+        return dict(data, demand=demand)
+    pan = data['pan_types'][0]
+    cost = {key: value * EDIT_FACTOR if key[1] == pan else value for key, value in data['cost'].items()}
+    return dict(data, cost=cost)
+
+
+def time_solve(solver_name: str, data: Dict, constraint_set: str, time_limit: int, gap: float,
+               warm_start: Optional[Dict] = None) -> Dict:
+    """
+    Build and solve the cost model and measure the time to the gap and to the first incumbent.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        data: Optimization data dictionary
+        constraint_set: Name of the constraint set in CONSTRAINT_SETS
+        time_limit: Time limit in seconds
+        gap: Optimality gap
+        warm_start: Optional prior solution to start from
+
+    Returns:
+        Dict: solve_model result with the solve time in 'time', the time to the first
+              incumbent in 'first_incumbent' (None if unknown) and the solution in 'solution'
+    """
+    solver = SolverFactory.create_solver(solver_name, constraints=CONSTRAINT_SETS[constraint_set](),
+                                         time_limit=time_limit, optimality_gap=gap)
+    solver.set_warm_start(warm_start)
+    solver.build_minimize_cost_model(data)
+    incumbents = []
+    if solver_name == 'highs':
+        solver.solver.cbMipImprovingSolution.subscribe(lambda event: incumbents.append(time.perf_counter()))
+    start_time = time.perf_counter()
+    result = solver.solve_model()
+    result['time'] = time.perf_counter() - start_time
+    result['first_incumbent'] = incumbents[0] - start_time if incumbents else None
+    result['solution'] = solver.get_solution()
+    return result
+
+
+def format_time(result: Dict, key: str = 'time') -> str:
+    """Format a time of a result, or its status if it did not reach the gap."""
+    if result['status'] != 'OPTIMAL':
+        return result['status']
+    return f"{result[key]:.2f}s" if result[key] is not None else "-"
+
+
+def run_benchmark(solvers: List[str], n_waffles: int, n_pans: int, n_weeks: int, constraint_sets: List[str],
+                  edits: List[str], time_limit: int, gap: float) -> List[List]:
+    """Re-solve each edit of each constraint set from scratch and from the first solution."""
+    data = generate_planning_data(n_waffles, n_pans, n_weeks)
+
+    rows = []
+    for constraint_set in constraint_sets:
+        for solver_name in solvers:
+            logger.warning(f"Solving {constraint_set} with {solver_name}")
+            prior = time_solve(solver_name, data, constraint_set, time_limit, gap)['solution']
+            for edit in edits:
+                edited = edit_data(data, edit)
+                cold = time_solve(solver_name, edited, constraint_set, time_limit, gap)
+                warm = time_solve(solver_name, edited, constraint_set, time_limit, gap, warm_start=prior)
+                rows.append([constraint_set, edit, solver_name, format_time(cold), format_time(warm),
+                             format_time(cold, 'first_incumbent'), format_time(warm, 'first_incumbent')])
+    return rows
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare re-solves of edited models with and without a warm start")
+    parser.add_argument("--solvers", type=str, nargs='+', default=['highs', 'ortools', 'cbc', 'cpsat'],
+                        help="Solvers to benchmark")
+    parser.add_argument("--waffles", type=int, default=100, help="Number of waffle types")
+    parser.add_argument("--pans", type=int, default=10, help="Number of pan types")
+    parser.add_argument("--weeks", type=int, default=26, help="Number of weeks")
+    parser.add_argument("--constraint-sets", type=str, nargs='+', choices=list(CONSTRAINT_SETS),
+                        default=['default', 'min_batch'], help="Constraint sets to solve")
+    parser.add_argument("--edits", type=str, nargs='+', choices=['demand', 'cost'], default=['demand', 'cost'],
+                        help="Edits between the first solve and the re-solve")
+    parser.add_argument("--time-limit", type=int, default=300, help="Time limit in seconds")
+    parser.add_argument("--gap", type=float, default=0.005, help="Optimality gap")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.solvers, args.waffles, args.pans, args.weeks, args.constraint_sets, args.edits,
+                         args.time_limit, args.gap)
+    headers = ["Constraints", "Edit", "Solver", "Cold to gap", "Warm to gap", "Cold first incumbent",
+               "Warm first incumbent"]
+    print(f"\n=== WARM START BENCHMARK ({args.waffles} waffles x {args.pans} pans x {args.weeks} weeks, "
+          f"gap {args.gap:.2%}) ===")
+    print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+
+
+if __name__ == "__main__":
+    main()
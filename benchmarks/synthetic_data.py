@@ -0,0 +1,79 @@
+"""
+Synthetic Data Generator for the Waffle Production Optimization Benchmarks.
+
+Generates optimization data dictionaries of a given size so that benchmarks can
+scale the number of waffle types, pan types and weeks independently of the
+Excel input files.
+"""
+from typing import Dict
+
+import numpy as np
+
+
+def generate_planning_data(n_waffles: int, n_pans: int, n_weeks: int,
+                           allowed_share: float = 0.3, demand_share: float = 0.5,
+                           seed: int = 42, n_families: int = 1) -> Dict:
+    """
+    Generate a feasible optimization data dictionary.
+
+    Supply is front-loaded and replenished every few weeks, so that unused pans
+    have to be carried over when supply is cumulative.
+
+    Args:
+        n_waffles: Number of waffle types
+        n_pans: Number of pan types
+        n_weeks: Number of weeks
+        allowed_share: Share of pan types each waffle type can be made in
+        demand_share: Share of weeks in which a waffle type has demand
+        seed: Random seed
+        n_families: Number of product families; waffle types of a family are only
+                    made in the pan types of that family (dedicated pan lines)
+
+    Returns:
+        Dict: Optimization data dictionary
+    """
+    rng = np.random.default_rng(seed)
+    waffle_types = [f"Waffle {i:04d}" for i in range(n_waffles)]
+    pan_types = [f"Pan {i:03d}" for i in range(n_pans)]
+    # Zero-padded so that the lexicographic order is the chronological order
+    weeks = [f"Week {i:03d}" for i in range(1, n_weeks + 1)]
+
+    allowed = {}
+    for i, w in enumerate(waffle_types):
+        family = i * n_families // n_waffles
+        family_pans = pan_types[family * n_pans // n_families:(family + 1) * n_pans // n_families]
+        n_allowed = max(1, int(round(allowed_share * len(family_pans))))
+        for p in rng.choice(family_pans, size=n_allowed, replace=False):
+            allowed[(w, str(p))] = True
+
+    demand = {}
+    for w in waffle_types:
+        for t in weeks:
+            if rng.random() < demand_share:
+                demand[(w, t)] = int(rng.integers(10, 100))
+
+    # About three times the average demand per pan type, delivered in the first week
+    # and every fourth week, with the largest share up front
+    total_pans = sum(demand.values())
+    supply = {}
+    deliveries = [t for i, t in enumerate(weeks) if i % 4 == 0]
+    for p in pan_types:
+        per_delivery = int(2 * total_pans / (n_pans * len(deliveries))) + 1
+        for t in deliveries:
+            supply[(p, t)] = per_delivery
+    for p in pan_types:
+        supply[(p, weeks[0])] += total_pans // n_pans
+
+    cost = {(w, p): float(rng.uniform(0.1, 2.0)) for w in waffle_types for p in pan_types}
+    wpp = {w: int(rng.integers(50, 200)) for w in waffle_types}
+
+    return {
+        'waffle_types': waffle_types,
+        'pan_types': pan_types,
+        'weeks': weeks,
+        'demand': demand,
+        'supply': supply,
+        'cost': cost,
+        'wpp': wpp,
+        'allowed': allowed,
+    }
@@ -5,8 +5,11 @@ This is the main entry point for the waffle production optimization application.
 """
 import os
 from src.data.processor import DataProcessor
+from src.data.cache import DEFAULT_CACHE_DIR
 from src.data.validator import DataValidator
 from src.solvers.base import SolverFactory
+from src.solvers.result_cache import SolveCache
+from src.solvers.rounding import FAST_SOLVERS
 from src.utils.results_reporter import ResultsReporter
 
 def print_tabular(headers, data, widths=None):
@@ -49,9 +52,11 @@ def get_user_config():
         'wpp': 'data/input/WafflesPerPan.xlsx',
         'combinations': 'data/input/WafflePanCombinations.xlsx',
         'solver': 'ortools',
+        'speed': 'exact',
         'time_limit': 10,
         'gap': 0.005,
         'limit_to_demand': False,
+        'reuse_incumbents': False,
         'debug': False,
         'output': 'data/output/waffle_solution.xlsx'
     }
@@ -69,9 +74,11 @@ def get_user_config():
         data = [
             ["Objective", defaults['objective']],
             ["Solver", defaults['solver']],
+            ["Speed", defaults['speed']],
             ["Time limit", f"{defaults['time_limit']} seconds"],
             ["Optimality gap", defaults['gap']],
             ["Limit to demand", "No"],
+            ["Reuse cached incumbents", "No"],
             ["Debug mode", "Disabled"],
             ["Output file", defaults['output']],
             ["Demand file", defaults['demand']],
@@ -114,10 +121,23 @@ def get_user_config():
     
     # Solver
     print(f"Solver (default: {defaults['solver']})")
-    print("Available options: ortools, cbc, glpk, scip, coin_cmd")
+    print("Available options: ortools, highs, cpsat, flow, cbc, glpk, scip, coin_cmd, race")
     solver = input("> ").strip().lower() or defaults['solver']
     config['solver'] = solver
     
+    # Speed tier
+    print(f"Speed [exact/fast] (default: {defaults['speed']})")
+    print("fast rounds the LP relaxation (ortools, cbc, glpk, scip, coin_cmd)")
+    while True:
+        speed = input("> ").strip().lower() or defaults['speed']
+        if speed in ['exact', 'fast']:
+            config['speed'] = speed
+            break
+        print("Invalid input. Please enter 'exact' or 'fast'.")
+    if config['speed'] == 'fast' and config['solver'] not in FAST_SOLVERS:
+        print(f"Solver '{config['solver']}' has no fast mode, using 'ortools'")
+        config['solver'] = 'ortools'
+    
     # Time limit
     print(f"Time limit in seconds (default: {defaults['time_limit']})")
     while True:
@@ -143,6 +163,10 @@ def get_user_config():
     limit_to_demand = input("Limit production to demand? [y/N]\n> ").strip().lower()
     config['limit_to_demand'] = limit_to_demand.startswith('y')
     
+    # Cached solutions of an identical run are reused if final; incumbents only on request
+    reuse_incumbents = input("Reuse cached non-optimal solutions of identical runs? [y/N]\n> ").strip().lower()
+    config['reuse_incumbents'] = reuse_incumbents.startswith('y')
+    
     # Debug mode
     debug = input("Enable debug mode? [y/N]\n> ").strip().lower()
     config['debug'] = debug.startswith('y')
@@ -155,9 +179,11 @@ def get_user_config():
     print("\n=== Configuration Summary ===")
     print(f"Objective: {config['objective']}")
     print(f"Solver: {config['solver']}")
+    print(f"Speed: {config['speed']}")
     print(f"Time limit: {config['time_limit']} seconds")
     print(f"Optimality gap: {config['gap']}")
     print(f"Limit to demand: {'Yes' if config['limit_to_demand'] else 'No'}")
+    print(f"Reuse cached incumbents: {'Yes' if config['reuse_incumbents'] else 'No'}")
     print(f"Debug mode: {'Enabled' if config['debug'] else 'Disabled'}")
     print(f"Output file: {config['output']}")
     
@@ -174,7 +200,8 @@ def main():
     config = get_user_config()
     
     # Create data processor
-    data_processor = DataProcessor(debug_mode=config['debug'])
+    data_processor = DataProcessor(debug_mode=config['debug'], cache_dir=DEFAULT_CACHE_DIR,
+                                   parallel_load='process')
     
     # Load data
     print(f"\nLoading data from input files...")
@@ -209,34 +236,48 @@ def main():
             print(f"- {issue}")
         return
     
-    # Create solver
-    print(f"\nCreating {config['solver']} solver...")
-    solver = SolverFactory.create_solver(
-        solver_name=config['solver'],
-        time_limit=config['time_limit'],
-        optimality_gap=config['gap']
-    )
+    # The fast speed tier rounds the LP relaxation instead of solving the MIP
+    solver_options = {'fast': True} if config['speed'] == 'fast' else {}
     
-    # Build model based on objective
-    if config['objective'].lower() == 'cost':
-        print("Building minimize cost model...")
-        solver.build_minimize_cost_model(optimization_data)
-    else:
-        print("Building maximize output model...")
-        solver.build_maximize_output_model(optimization_data, limit_to_demand=config['limit_to_demand'])
+    # An identical earlier run is answered from the solve cache
+    solve_cache = SolveCache()
+    objective = 'minimize_cost' if config['objective'].lower() == 'cost' else 'maximize_output'
+    cache_key = solve_cache.key(optimization_data, {}, objective, config['solver'], config['time_limit'],
+                                config['gap'], dict(solver_options, limit_to_demand=config['limit_to_demand']))
+    cached = solve_cache.get(cache_key, reuse_incumbent=config['reuse_incumbents'])
     
-    # Solve model
-    print("Solving optimization model...")
-    solution_info = solver.solve_model()
+    if cached is not None:
+        print("\nUsing the cached solution of an identical run...")
+        solution_info, solution = cached
+    else:
+        # Create solver
+        print(f"\nCreating {config['solver']} solver...")
+        solver = SolverFactory.create_solver(
+            solver_name=config['solver'],
+            time_limit=config['time_limit'],
+            optimality_gap=config['gap'],
+            **solver_options
+        )
+        
+        # Build model based on objective
+        if objective == 'minimize_cost':
+            print("Building minimize cost model...")
+            solver.build_minimize_cost_model(optimization_data)
+        else:
+            print("Building maximize output model...")
+            solver.build_maximize_output_model(optimization_data, limit_to_demand=config['limit_to_demand'])
+        
+        # Solve model
+        print("Solving optimization model...")
+        solution_info = solver.solve_model()
+        solution = solver.get_solution()
+        solve_cache.put(cache_key, solution_info, solution)
     
     # Check if solved successfully
-    if not solution_info['is_feasible']:
+    if solution_info['status'] not in ('OPTIMAL', 'FEASIBLE'):
         print(f"Failed to find a feasible solution. Status: {solution_info['status']}")
         return
     
-    # Get solution
-    solution = solver.get_solution()
-    
     # Create results reporter
     results_reporter = ResultsReporter(debug_mode=config['debug'])
     
@@ -262,9 +303,9 @@ def main():
     print("\n=== Optimization Results Summary ===")
     headers = ["Metric", "Value"]
     data = [
-        ["Solver", solution_info['solver_name']],
+        ["Solver", config['solver']],
         ["Status", solution_info['status']],
-        ["Solution Time", f"{solution_info['solution_time']:.2f} seconds"],
+        ["Solution Time", f"{solution_info['solve_time']:.2f} seconds"],
     ]
     
     # Add metrics based on objective type
@@ -277,6 +318,10 @@ def main():
         if 'objective_value' in solution:
             data.append(["Total Output", f"{solution['objective_value']:.0f} waffles"])
     
+    # Fast mode measures its gap against the LP bound
+    if solution.get('lp_bound') is not None:
+        data.append(["Gap to LP Bound", f"{solution['gap']:.2%}"])
+    
     # Check for metrics in solution['metrics']
     if 'metrics' in solution:
         metrics = solution['metrics']
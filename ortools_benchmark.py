@@ -5,13 +5,12 @@ This script performs a focused benchmark of the OR-Tools solver
 with different combinations of cumulative and equality parameters.
 """
 import os
-import time
 import logging
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 from tabulate import tabulate
 from src.data.processor import DataProcessor
-from src.solvers.solver_manager import SolverManager
+from src.solvers.scenario_runner import Scenario, ScenarioRunner
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -66,80 +65,31 @@ class ORToolsBenchmark:
             return "N/A"
         return f"{number:,.2f}"
     
-    def run_benchmark(self, data: Dict, time_limit: int = 60) -> None:
-        """Run the benchmark with the given data."""
+    def run_benchmark(self, data: Dict, time_limit: int = 60, core_budget: Optional[int] = None) -> None:
+        """Run the benchmark with the given data, solving the configurations in parallel."""
         logger.info("Starting OR-Tools benchmark...")
         
+        scenarios = []
         for objective in self.objectives:
             for config in self.configs:
-                config_name = self._get_config_name(config, objective)
-                logger.info(f"Testing configuration: {config_name}")
-                
-                try:
-                    result = self._test_configuration(config, data, time_limit, objective)
-                    self.results.append(result)
-                except Exception as e:
-                    logger.error(f"Error testing configuration {config_name}: {str(e)}")
-                    self.results.append({
-                        'config': config_name,
-                        'objective': objective,
-                        'status': 'ERROR',
-                        'error': str(e)
-                    })
-    
-    def _test_configuration(self, config: Dict, data: Dict, time_limit: int, objective: str) -> Dict:
-        """Test a single configuration."""
-        solver_manager = SolverManager()
-        
-        # Configure constraints
-        for constraint_type, constraint_config in config.items():
-            # Set enabled status
-            solver_manager.set_constraint_enabled(
-                constraint_type, 
-                constraint_config.get('enabled', False)
-            )
-            
-            # If enabled, set configuration (excluding the 'enabled' flag)
-            if constraint_config.get('enabled', False):
-                config_copy = constraint_config.copy()
-                config_copy.pop('enabled', None)
-                if config_copy:  # Only set config if there are parameters
-                    solver_manager.set_constraint_configuration(constraint_type, config_copy)
-        
-        # Create solver
-        solver_instance = solver_manager.create_solver(
-            solver_name='ortools',
-            with_constraints=True,
-            time_limit=time_limit
-        )
+                scenarios.append(Scenario('ortools', objective, config, time_limit=time_limit,
+                                          name=self._get_config_name(config, objective)))
         
-        # Build and solve model
-        start_time = time.time()
-        if objective == 'minimize_cost':
-            solver_instance.build_minimize_cost_model(data)
-        else:
-            solver_instance.build_maximize_output_model(data)
-        solution_info = solver_instance.solve_model()
-        end_time = time.time()
-        
-        # Get solution
-        solution = solver_instance.get_solution() or {}
-        
-        # Extract metrics
-        total_waffles = solution.get('total_waffles', 0)
-        total_cost = solution.get('total_cost', 0)
-        objective_value = solution_info.get('objective_value')
-        status = solution_info.get('status', 'UNKNOWN')
-        
-        return {
-            'config': self._get_config_name(config, objective),
-            'objective': objective,
-            'total_waffles': total_waffles,
-            'total_cost': total_cost,
-            'objective_value': objective_value,
-            'solve_time': end_time - start_time,
-            'status': status
-        }
+        runner = ScenarioRunner(data, core_budget=core_budget)
+        for row in runner.run(scenarios):
+            logger.info(f"Tested configuration {row['name']}: {row['status']}")
+            result = {
+                'config': row['name'],
+                'objective': row['objective'],
+                'total_waffles': row['total_waffles'] or 0,
+                'total_cost': row['total_cost'] or 0,
+                'objective_value': row['objective_value'],
+                'solve_time': row['total_time'],
+                'status': row['status']
+            }
+            if row['error'] is not None:
+                result['error'] = row['error']
+            self.results.append(result)
     
     def print_results(self) -> None:
         """Print the benchmark results in a formatted table."""
@@ -5,13 +5,12 @@ This script performs a comprehensive benchmark of all available solvers
 with different constraint configurations and objective functions.
 """
 import os
-import time
 import logging
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from tabulate import tabulate
 from src.data.processor import DataProcessor
-from src.solvers.solver_manager import SolverManager
+from src.solvers.scenario_runner import Scenario, ScenarioRunner
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -95,78 +94,32 @@ class SolverBenchmark:
         """Format time in seconds to a readable string."""
         return f"{seconds:.1f}s"
     
-    def run_benchmark(self, data: Dict, time_limit: int = 60) -> None:
-        """Run the benchmark with the given data."""
+    def run_benchmark(self, data: Dict, time_limit: int = 60, core_budget: Optional[int] = None) -> None:
+        """Run the benchmark with the given data, solving the configurations in parallel."""
         logger.info("Starting solver benchmark...")
         
+        scenarios = []
         for solver in self.solvers:
             for objective in self.objectives:
                 for config in self.constraint_configs:
-                    config_name = self._get_config_name(config)
-                    logger.info(f"Testing {solver} with {objective} and {config_name}")
-                    
-                    try:
-                        result = self._test_configuration(
-                            solver, objective, config, data, time_limit
-                        )
-                        self.results.append(result)
-                    except Exception as e:
-                        logger.error(f"Error testing {solver} with {config_name}: {str(e)}")
-                        self.results.append({
-                            'solver': solver,
-                            'objective': objective,
-                            'config': config_name,
-                            'status': 'ERROR',
-                            'error': str(e)
-                        })
-    
-    def _test_configuration(self, solver: str, objective: str, config: Dict, 
-                          data: Dict, time_limit: int) -> Dict:
-        """Test a single configuration."""
-        solver_manager = SolverManager()
-        
-        # Configure constraints
-        for constraint_type, constraint_config in config.items():
-            if constraint_config is None:
-                solver_manager.set_constraint_enabled(constraint_type, False)
-            else:
-                solver_manager.set_constraint_enabled(constraint_type, True)
-                solver_manager.set_constraint_configuration(constraint_type, constraint_config)
-        
-        # Create solver
-        solver_instance = solver_manager.create_solver(
-            solver_name=solver,
-            with_constraints=True,
-            time_limit=time_limit
-        )
-        
-        # Build and solve model
-        start_time = time.time()
-        if objective == 'minimize_cost':
-            solver_instance.build_minimize_cost_model(data)
-        else:
-            solver_instance.build_maximize_output_model(data)
-        
-        solution_info = solver_instance.solve_model()
-        end_time = time.time()
-        
-        # Get solution
-        solution = solver_instance.get_solution() or {}
-        
-        # Extract metrics
-        total_waffles = solution.get('total_waffles', 0)
-        total_cost = solution.get('total_cost', 0)
-        status = solution_info.get('status', 'UNKNOWN')
-        
-        return {
-            'solver': solver,
-            'objective': objective,
-            'config': self._get_config_name(config),
-            'total_waffles': total_waffles,
-            'total_cost': total_cost,
-            'solve_time': end_time - start_time,
-            'status': status
-        }
+                    scenarios.append(Scenario(solver, objective, config, time_limit=time_limit,
+                                              name=self._get_config_name(config)))
+        
+        runner = ScenarioRunner(data, core_budget=core_budget)
+        for row in runner.run(scenarios):
+            logger.info(f"Tested {row['solver']} with {row['objective']} and {row['name']}: {row['status']}")
+            result = {
+                'solver': row['solver'],
+                'objective': row['objective'],
+                'config': row['name'],
+                'total_waffles': row['total_waffles'] or 0,
+                'total_cost': row['total_cost'] or 0,
+                'solve_time': row['total_time'],
+                'status': row['status']
+            }
+            if row['error'] is not None:
+                result['error'] = row['error']
+            self.results.append(result)
     
     def print_results(self) -> None:
         """Print the benchmark results in a formatted table."""
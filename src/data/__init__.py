@@ -1,11 +1,29 @@
 """
 Data Package for Waffle Production Optimization.
 
-This package contains modules for data processing, validation, and constraint configuration.
+This package contains modules for data processing, validation, and constraint configuration,
+the array-backed optimization data container, and its shared memory form.
+
+The processing, validation and configuration classes are imported on first access,
+so that solvers importing the optimization data container do not load them.
 """
+import importlib
+
+from src.data.optimization_data import OptimizationData, as_optimization_data
+from src.data.shared_data import SharedOptimizationData, attach_shared_data
+
+# Modules of the classes imported on first access
+_LAZY_IMPORTS = {
+    'DataProcessor': 'src.data.processor',
+    'DataValidator': 'src.data.validator',
+    'ConstraintConfigManager': 'src.data.constraint_config',
+}
+
+__all__ = ['DataProcessor', 'DataValidator', 'ConstraintConfigManager',
+           'OptimizationData', 'as_optimization_data', 'SharedOptimizationData', 'attach_shared_data']
 
-from src.data.processor import DataProcessor
-from src.data.validator import DataValidator
-from src.data.constraint_config import ConstraintConfigManager
 
-__all__ = ['DataProcessor', 'DataValidator', 'ConstraintConfigManager']
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
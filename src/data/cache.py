@@ -0,0 +1,395 @@
+"""
+Parse Cache Module for Waffle Production Optimization.
+
+This module provides a persistent on-disk cache for processed input data. Entries
+are stored as .npz files keyed by a fingerprint of the input files (path, size,
+modification time and content hash), so a warm reload skips Excel parsing entirely.
+The normalised table of each input file can also be cached on its own, keyed by the
+fingerprint of that file, so that a reload after one file changed reads only that file.
+The size-bounded entry directory, DiskStore, is shared with the solve cache.
+"""
+import os
+import json
+import pickle
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.optimization_data import OptimizationData
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Default location of the parse cache
+DEFAULT_CACHE_DIR = os.path.join('data', 'cache')
+
+# Increment when the stored layout changes so that stale entries are never read
+CACHE_VERSION = 1
+
+ARRAY_FIELDS = [
+    'demand_array', 'supply_array', 'cost_array', 'wpp_array', 'allowed_array',
+    'demand_mask', 'supply_mask', 'cost_mask', 'wpp_mask', 'allowed_mask',
+]
+
+
+def _json_labels(labels: List) -> List:
+    """Convert NumPy scalar labels (e.g. np.int64 week headers) to the equal Python values."""
+    return [label.item() if isinstance(label, (np.integer, np.floating, np.bool_)) else label
+            for label in labels]
+
+
+class DiskStore:
+    """
+    Size-bounded directory of cache entry files with least-recently-used eviction.
+
+    Each entry is one file named after its key. Entries are written through a
+    temporary file and renamed, so readers never see partial entries, and reading
+    an entry updates its modification time, which orders the eviction.
+    """
+
+    def __init__(self, directory: str, suffix: str, max_size_bytes: int, description: str = 'cache'):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory in which entries are stored
+            suffix: File name suffix of the entries, e.g. '.npz'
+            max_size_bytes: Maximum total size of all entries
+            description: Name of the cache in log messages
+        """
+        self.directory = directory
+        self.suffix = suffix
+        self.max_size_bytes = max_size_bytes
+        self.description = description
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> str:
+        """Get the path of the entry for a key."""
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def read(self, key: str, reader: Callable[[str], Any]) -> Optional[Any]:
+        """
+        Read an entry.
+
+        Args:
+            key: Key of the entry
+            reader: Function that decodes the entry file at the given path
+
+        Returns:
+            Optional[Any]: Result of reader, or None if the entry is missing or unreadable;
+                           unreadable entries are removed
+        """
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            entry = reader(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Discarding unreadable {self.description} entry {path}: {str(e)}")
+            self.remove(path)
+            return None
+
+        # Touch the entry so that eviction is least-recently-used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def write(self, key: str, writer: Callable[[BinaryIO], None]) -> bool:
+        """
+        Write an entry and evict entries until the store fits in max_size_bytes.
+
+        Args:
+            key: Key of the entry
+            writer: Function that writes the entry to a binary file object
+
+        Returns:
+            bool: True if the entry was written
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                writer(f)
+            os.replace(tmp_path, self.path(key))
+        except OSError as e:
+            logger.warning(f"Could not write {self.description} entry: {str(e)}")
+            self.remove(tmp_path)
+            return False
+
+        logger.debug(f"Stored {self.description} entry {key[:12]}")
+        self.evict()
+        return True
+
+    def entries(self) -> List[Tuple[str, float, int]]:
+        """List entries as (path, last access time, size) tuples."""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.suffix):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def evict(self) -> None:
+        """Evict least recently used entries until the store fits in max_size_bytes."""
+        with self._lock:
+            entries = sorted(self.entries(), key=lambda entry: entry[1])
+            total_size = sum(size for _, _, size in entries)
+            while entries and total_size > self.max_size_bytes:
+                path, _, size = entries.pop(0)
+                logger.debug(f"Evicting {self.description} entry {path}")
+                self.remove(path)
+                total_size -= size
+
+    @staticmethod
+    def remove(path: str) -> None:
+        """Remove a file, ignoring files that are already gone."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self) -> int:
+        """
+        Remove all entries.
+
+        Returns:
+            int: Number of removed entries
+        """
+        entries = self.entries()
+        for path, _, _ in entries:
+            self.remove(path)
+        return len(entries)
+
+    def size_bytes(self) -> int:
+        """
+        Get the total size of all entries.
+
+        Returns:
+            int: Size in bytes
+        """
+        return sum(size for _, _, size in self.entries())
+
+
+class ParseCache:
+    """
+    Persistent cache of processed optimization data keyed by input file fingerprints.
+
+    The cache is bounded in size; when the processed data entries or the table
+    entries grow beyond max_size_bytes the least recently used ones are evicted.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_size_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the parse cache.
+
+        Args:
+            cache_dir: Directory in which cache entries are stored
+            max_size_bytes: Maximum total size of the processed data entries, and
+                            separately of the input table entries
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.store = DiskStore(cache_dir, '.npz', max_size_bytes, 'parse cache')
+        # Normalised tables of single input files, bounded separately
+        self.frame_store = DiskStore(cache_dir, '.pkl', max_size_bytes, 'parse cache')
+        # Content hashes by (path, size, mtime) so unchanged files are only hashed once
+        self._hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+    def _file_hash(self, path: str, size: int, mtime_ns: int) -> str:
+        """Get the SHA-256 content hash of a file, memoized by path, size and mtime."""
+        memo_key = (path, size, mtime_ns)
+        if memo_key not in self._hash_memo:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            self._hash_memo[memo_key] = digest.hexdigest()
+        return self._hash_memo[memo_key]
+
+    def fingerprint(self, files: Dict[str, str], options: Optional[Dict] = None) -> str:
+        """
+        Compute the cache key for a set of input files.
+
+        Args:
+            files: Mapping from input role (e.g. 'demand_file') to file path
+            options: JSON-serializable load options that change the processed data
+
+        Returns:
+            str: Hexadecimal cache key
+        """
+        digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+        for role in sorted(files):
+            path = os.path.abspath(files[role])
+            stat = os.stat(path)
+            content_hash = self._file_hash(path, stat.st_size, stat.st_mtime_ns)
+            digest.update(f"|{role}|{path}|{stat.st_size}|{stat.st_mtime_ns}|{content_hash}".encode())
+        if options:
+            digest.update(json.dumps(options, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def get(self, files: Dict[str, str], options: Optional[Dict] = None) -> Optional[OptimizationData]:
+        """
+        Look up processed data for a set of input files.
+
+        Args:
+            files: Mapping from input role to file path
+            options: Load options the data was processed with
+
+        Returns:
+            Optional[OptimizationData]: Cached data, or None on a cache miss
+        """
+        key = self.fingerprint(files, options)
+        entry = self.store.read(key, self._read_entry)
+        if entry is None:
+            logger.debug(f"Parse cache miss for {key[:12]}")
+            return None
+        labels, arrays = entry
+
+        logger.debug(f"Parse cache hit for {key[:12]}")
+        return OptimizationData(
+            labels['waffle_types'], labels['pan_types'], labels['weeks'],
+            arrays['demand_array'], arrays['supply_array'], arrays['cost_array'],
+            arrays['wpp_array'], arrays['allowed_array'],
+            demand_mask=arrays['demand_mask'], supply_mask=arrays['supply_mask'],
+            cost_mask=arrays['cost_mask'], wpp_mask=arrays['wpp_mask'],
+            allowed_mask=arrays['allowed_mask']
+        )
+
+    def put(self, files: Dict[str, str], data: OptimizationData, options: Optional[Dict] = None) -> bool:
+        """
+        Store processed data for a set of input files.
+
+        Args:
+            files: Mapping from input role to file path
+            data: Processed optimization data
+            options: Load options the data was processed with
+
+        Returns:
+            bool: True if the entry was stored, False if the data cannot be cached
+        """
+        try:
+            labels = json.dumps({
+                'waffle_types': _json_labels(data.waffle_types),
+                'pan_types': _json_labels(data.pan_types),
+                'weeks': _json_labels(data.weeks),
+                'files': {role: os.path.abspath(path) for role, path in files.items()},
+            })
+        except TypeError as e:
+            # Labels such as timestamps cannot be restored exactly from JSON
+            logger.warning(f"Not caching data with non-JSON labels: {str(e)}")
+            return False
+
+        key = self.fingerprint(files, options)
+        arrays = {field: getattr(data, field) for field in ARRAY_FIELDS}
+        return self.store.write(key, lambda f: np.savez(f, labels=np.array(labels), **arrays))
+
+    @staticmethod
+    def _read_entry(path: str) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        """Read the labels and arrays of a cache entry."""
+        with np.load(path, allow_pickle=False) as entry:
+            return json.loads(str(entry['labels'])), {field: entry[field] for field in ARRAY_FIELDS}
+
+    def get_frame(self, role: str, path: str, options: Optional[Dict] = None) -> Optional[Any]:
+        """
+        Look up the normalised table of one input file.
+
+        Args:
+            role: Input role of the file (e.g. 'demand_file')
+            path: Path of the file
+            options: Load options the table was read with
+
+        Returns:
+            Optional[Any]: Cached table, or None on a cache miss
+        """
+        entry = self.frame_store.read(self.fingerprint({role: path}, options), self._read_frame_entry)
+        return entry[1] if entry is not None else None
+
+    def put_frame(self, role: str, path: str, frame: Any, options: Optional[Dict] = None) -> bool:
+        """
+        Store the normalised table of one input file.
+
+        Args:
+            role: Input role of the file
+            path: Path of the file
+            frame: Table as returned by the input readers
+            options: Load options the table was read with
+
+        Returns:
+            bool: True if the entry was stored
+        """
+        key = self.fingerprint({role: path}, options)
+        source = os.path.abspath(path)
+        return self.frame_store.write(
+            key, lambda f: pickle.dump((source, frame), f, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def _read_frame_entry(path: str) -> Tuple[str, Any]:
+        """Read the source file path and table of a table entry."""
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            raise ValueError(f"Corrupt table entry: {str(e)}") from e
+
+    def _entry_sources(self, path: str) -> List[str]:
+        """Get the input files an entry was built from."""
+        if path.endswith(self.frame_store.suffix):
+            return [self._read_frame_entry(path)[0]]
+        return list(self._read_entry(path)[0].get('files', {}).values())
+
+    def invalidate(self, file_path: Optional[str] = None) -> int:
+        """
+        Remove cache entries.
+
+        Args:
+            file_path: If given, only entries built from this input file are removed;
+                       otherwise the whole cache is cleared
+
+        Returns:
+            int: Number of removed entries
+        """
+        target = os.path.abspath(file_path) if file_path else None
+        removed = 0
+        for path, _, _ in self.store.entries() + self.frame_store.entries():
+            if target is not None:
+                try:
+                    sources = self._entry_sources(path)
+                except (OSError, ValueError, KeyError):
+                    sources = [target]
+                if target not in sources:
+                    continue
+            DiskStore.remove(path)
+            removed += 1
+        self._hash_memo.clear()
+        logger.debug(f"Invalidated {removed} parse cache entries")
+        return removed
+
+    def clear(self) -> int:
+        """
+        Remove all cache entries.
+
+        Returns:
+            int: Number of removed entries
+        """
+        return self.invalidate()
+
+    def size_bytes(self) -> int:
+        """
+        Get the total size of all cache entries.
+
+        Returns:
+            int: Size in bytes
+        """
+        return self.store.size_bytes() + self.frame_store.size_bytes()
@@ -0,0 +1,422 @@
+"""
+Optimization Data Module for Waffle Production Optimization.
+
+This module provides a compact, array-backed container for optimization data.
+Waffle types, pan types and weeks are interned to integer ids and the data is
+stored as NumPy arrays. Read-only mapping views keep the tuple-keyed dictionary
+interface (e.g. data['demand'][(w, t)]) working for existing callers.
+"""
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _index_of(labels: Sequence) -> Dict[Any, int]:
+    """Build a label -> integer id mapping."""
+    return {label: i for i, label in enumerate(labels)}
+
+
+class ArrayMappingView(Mapping):
+    """
+    Read-only mapping view over a 1D or 2D array.
+
+    Keys are labels (1D) or (row label, column label) tuples (2D). Only entries
+    where the mask is True are part of the mapping.
+    """
+
+    def __init__(self, values: np.ndarray, mask: np.ndarray,
+                 row_labels: Sequence, row_index: Dict[Any, int],
+                 col_labels: Optional[Sequence] = None,
+                 col_index: Optional[Dict[Any, int]] = None):
+        """
+        Initialize the view.
+
+        Args:
+            values: Array holding the values
+            mask: Boolean array of the same shape marking the entries that exist
+            row_labels: Labels of the first axis
+            row_index: Mapping from first-axis labels to integer ids
+            col_labels: Labels of the second axis (2D views only)
+            col_index: Mapping from second-axis labels to integer ids (2D views only)
+        """
+        self.array = values
+        self.mask = mask
+        self._row_labels = row_labels
+        self._row_index = row_index
+        self._col_labels = col_labels
+        self._col_index = col_index
+        self._length = None
+
+    def _position(self, key) -> Optional[Tuple[int, ...]]:
+        """Get the array position of a key, or None if the key is not in the mapping."""
+        try:
+            if self._col_index is None:
+                position = (self._row_index[key],)
+            else:
+                row, col = key
+                position = (self._row_index[row], self._col_index[col])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return position if self.mask[position] else None
+
+    def __getitem__(self, key):
+        position = self._position(key)
+        if position is None:
+            raise KeyError(key)
+        return self.array[position].item()
+
+    def get(self, key, default=None):
+        position = self._position(key)
+        if position is None:
+            return default
+        return self.array[position].item()
+
+    def __contains__(self, key) -> bool:
+        return self._position(key) is not None
+
+    def __iter__(self) -> Iterator:
+        if self._col_index is None:
+            for i in np.flatnonzero(self.mask):
+                yield self._row_labels[i]
+        else:
+            rows, cols = np.nonzero(self.mask)
+            for i, j in zip(rows.tolist(), cols.tolist()):
+                yield (self._row_labels[i], self._col_labels[j])
+
+    def __len__(self) -> int:
+        if self._length is None:
+            self._length = int(np.count_nonzero(self.mask))
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self)} entries)"
+
+    def to_dict(self) -> Dict:
+        """
+        Materialize the view as a plain dictionary.
+
+        Returns:
+            Dict: Dictionary with the same keys and values as the view
+        """
+        if self._col_index is None:
+            indices = np.flatnonzero(self.mask)
+            keys = [self._row_labels[i] for i in indices]
+            return dict(zip(keys, self.array[indices].tolist()))
+        rows, cols = np.nonzero(self.mask)
+        keys = zip([self._row_labels[i] for i in rows], [self._col_labels[j] for j in cols])
+        return dict(zip(keys, self.array[rows, cols].tolist()))
+
+
+class OptimizationData(Mapping):
+    """
+    Array-backed optimization data with integer-interned dimensions.
+
+    Arrays are indexed by the position of a label in waffle_types, pan_types and weeks:
+
+    - demand: W x T, supply: P x T, cost: W x P, wpp: W
+    - allowed: W x P boolean mask
+
+    Each array has a companion boolean mask marking which entries exist, so that the
+    mapping views expose exactly the keys of the original dictionaries. The object
+    itself behaves like the read-only dictionary returned by
+    DataProcessor.get_optimization_data().
+    """
+
+    KEYS = ('waffle_types', 'pan_types', 'weeks', 'demand', 'supply', 'cost', 'wpp', 'allowed')
+
+    def __init__(self,
+                 waffle_types: Sequence,
+                 pan_types: Sequence,
+                 weeks: Sequence,
+                 demand: np.ndarray,
+                 supply: np.ndarray,
+                 cost: np.ndarray,
+                 wpp: np.ndarray,
+                 allowed: np.ndarray,
+                 demand_mask: Optional[np.ndarray] = None,
+                 supply_mask: Optional[np.ndarray] = None,
+                 cost_mask: Optional[np.ndarray] = None,
+                 wpp_mask: Optional[np.ndarray] = None,
+                 allowed_mask: Optional[np.ndarray] = None):
+        """
+        Initialize the optimization data.
+
+        Args:
+            waffle_types: Ordered waffle type labels
+            pan_types: Ordered pan type labels
+            weeks: Ordered week labels
+            demand: Demand array (W x T)
+            supply: Supply array (P x T)
+            cost: Cost per waffle array (W x P), NaN where missing
+            wpp: Waffles per pan array (W)
+            allowed: Allowed combinations boolean array (W x P)
+            demand_mask: Entries of demand that exist (default: demand > 0)
+            supply_mask: Entries of supply that exist (default: supply > 0)
+            cost_mask: Entries of cost that exist (default: cost is not NaN)
+            wpp_mask: Entries of wpp that exist (default: all)
+            allowed_mask: Entries of allowed that exist (default: all)
+        """
+        self.waffle_types = list(waffle_types)
+        self.pan_types = list(pan_types)
+        self.weeks = list(weeks)
+        self.waffle_index = _index_of(self.waffle_types)
+        self.pan_index = _index_of(self.pan_types)
+        self.week_index = _index_of(self.weeks)
+
+        self.demand_array = np.asarray(demand)
+        self.supply_array = np.asarray(supply)
+        self.cost_array = np.asarray(cost, dtype=float)
+        self.wpp_array = np.asarray(wpp)
+        self.allowed_array = np.asarray(allowed, dtype=bool)
+
+        shapes = {
+            'demand': (self.demand_array.shape, (len(self.waffle_types), len(self.weeks))),
+            'supply': (self.supply_array.shape, (len(self.pan_types), len(self.weeks))),
+            'cost': (self.cost_array.shape, (len(self.waffle_types), len(self.pan_types))),
+            'wpp': (self.wpp_array.shape, (len(self.waffle_types),)),
+            'allowed': (self.allowed_array.shape, (len(self.waffle_types), len(self.pan_types))),
+        }
+        for name, (actual, expected) in shapes.items():
+            if actual != expected:
+                raise ValueError(f"{name} array has shape {actual}, expected {expected}.")
+
+        self.demand_mask = self.demand_array > 0 if demand_mask is None else np.asarray(demand_mask, dtype=bool)
+        self.supply_mask = self.supply_array > 0 if supply_mask is None else np.asarray(supply_mask, dtype=bool)
+        self.cost_mask = ~np.isnan(self.cost_array) if cost_mask is None else np.asarray(cost_mask, dtype=bool)
+        self.wpp_mask = (np.ones(self.wpp_array.shape, dtype=bool) if wpp_mask is None
+                         else np.asarray(wpp_mask, dtype=bool))
+        self.allowed_mask = (np.ones(self.allowed_array.shape, dtype=bool) if allowed_mask is None
+                             else np.asarray(allowed_mask, dtype=bool))
+
+        self._views = {
+            'demand': ArrayMappingView(self.demand_array, self.demand_mask,
+                                       self.waffle_types, self.waffle_index,
+                                       self.weeks, self.week_index),
+            'supply': ArrayMappingView(self.supply_array, self.supply_mask,
+                                       self.pan_types, self.pan_index,
+                                       self.weeks, self.week_index),
+            'cost': ArrayMappingView(self.cost_array, self.cost_mask,
+                                     self.waffle_types, self.waffle_index,
+                                     self.pan_types, self.pan_index),
+            'wpp': ArrayMappingView(self.wpp_array, self.wpp_mask,
+                                    self.waffle_types, self.waffle_index),
+            'allowed': ArrayMappingView(self.allowed_array, self.allowed_mask,
+                                        self.waffle_types, self.waffle_index,
+                                        self.pan_types, self.pan_index),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'OptimizationData':
+        """
+        Create optimization data from the tuple-keyed dictionary format.
+
+        Entries whose labels are not part of waffle_types, pan_types or weeks are
+        ignored, since no model variable can refer to them.
+
+        Args:
+            data: Dictionary containing optimization data
+
+        Returns:
+            OptimizationData: Array-backed optimization data
+        """
+        waffle_types = list(data['waffle_types'])
+        pan_types = list(data['pan_types'])
+        weeks = list(data['weeks'])
+        waffle_index = _index_of(waffle_types)
+        pan_index = _index_of(pan_types)
+        week_index = _index_of(weeks)
+
+        def to_array(values: Dict, row_index: Dict, col_index: Optional[Dict], fill, dtype=None):
+            shape = (len(row_index),) if col_index is None else (len(row_index), len(col_index))
+            positions = []
+            items = []
+            for key, value in values.items():
+                try:
+                    if col_index is None:
+                        positions.append((row_index[key],))
+                    else:
+                        positions.append((row_index[key[0]], col_index[key[1]]))
+                except (KeyError, TypeError, IndexError):
+                    continue
+                items.append(value)
+            if dtype is None:
+                dtype = np.asarray(items).dtype if items else np.int64
+            array = np.full(shape, fill, dtype=dtype)
+            mask = np.zeros(shape, dtype=bool)
+            if positions:
+                index = tuple(np.array(positions).T)
+                array[index] = items
+                mask[index] = True
+            return array, mask
+
+        demand, demand_mask = to_array(data.get('demand', {}), waffle_index, week_index, 0)
+        supply, supply_mask = to_array(data.get('supply', {}), pan_index, week_index, 0)
+        cost, cost_mask = to_array(data.get('cost', {}), waffle_index, pan_index, np.nan, dtype=float)
+        wpp, wpp_mask = to_array(data.get('wpp', {}), waffle_index, None, 0)
+        allowed, allowed_mask = to_array(data.get('allowed', {}), waffle_index, pan_index, False, dtype=bool)
+
+        return cls(waffle_types, pan_types, weeks, demand, supply, cost, wpp, allowed,
+                   demand_mask=demand_mask, supply_mask=supply_mask, cost_mask=cost_mask,
+                   wpp_mask=wpp_mask, allowed_mask=allowed_mask)
+
+    def __getitem__(self, key: str):
+        if key == 'waffle_types':
+            return self.waffle_types
+        if key == 'pan_types':
+            return self.pan_types
+        if key == 'weeks':
+            return self.weeks
+        return self._views[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return (f"OptimizationData({len(self.waffle_types)} waffle types, "
+                f"{len(self.pan_types)} pan types, {len(self.weeks)} weeks)")
+
+    def to_dict(self) -> Dict:
+        """
+        Materialize the data in the plain tuple-keyed dictionary format.
+
+        Returns:
+            Dict: Dictionary containing optimization data
+        """
+        return {
+            'waffle_types': list(self.waffle_types),
+            'pan_types': list(self.pan_types),
+            'weeks': list(self.weeks),
+            'demand': self._views['demand'].to_dict(),
+            'supply': self._views['supply'].to_dict(),
+            'cost': self._views['cost'].to_dict(),
+            'wpp': self._views['wpp'].to_dict(),
+            'allowed': self._views['allowed'].to_dict(),
+        }
+
+    def with_changes(self, changes: Mapping[str, Mapping]) -> 'OptimizationData':
+        """
+        Create a copy of the data with some demand, supply, cost or wpp entries replaced.
+
+        Entries that did not exist before are added. Arrays without changes are
+        shared with this instance.
+
+        Args:
+            changes: New values by key for any of 'demand', 'supply', 'cost' and 'wpp',
+                     e.g. {'demand': {('Plain', 1): 12}}
+
+        Returns:
+            OptimizationData: Data with the changes applied
+
+        Raises:
+            ValueError: If changes name another entry, or a key whose labels are not part of the data
+        """
+        indices = {
+            'demand': (self.waffle_index, self.week_index),
+            'supply': (self.pan_index, self.week_index),
+            'cost': (self.waffle_index, self.pan_index),
+            'wpp': (self.waffle_index, None),
+        }
+        arrays = {name: (getattr(self, f'{name}_array'), getattr(self, f'{name}_mask')) for name in indices}
+        for name, values in changes.items():
+            if name not in indices:
+                raise ValueError(f"Cannot change '{name}', only {', '.join(indices)}")
+            if not values:
+                continue
+            row_index, col_index = indices[name]
+            try:
+                if col_index is None:
+                    positions = [(row_index[key],) for key in values]
+                else:
+                    positions = [(row_index[key[0]], col_index[key[1]]) for key in values]
+            except (KeyError, TypeError, IndexError) as e:
+                raise ValueError(f"Unknown {name} key in changes: {str(e)}")
+
+            items = list(values.values())
+            array, mask = arrays[name]
+            array = array.astype(np.result_type(array.dtype, np.asarray(items).dtype))
+            mask = mask.copy()
+            index = tuple(np.array(positions).T)
+            array[index] = items
+            mask[index] = True
+            arrays[name] = (array, mask)
+
+        return OptimizationData(self.waffle_types, self.pan_types, self.weeks,
+                                arrays['demand'][0], arrays['supply'][0], arrays['cost'][0], arrays['wpp'][0],
+                                self.allowed_array,
+                                demand_mask=arrays['demand'][1], supply_mask=arrays['supply'][1],
+                                cost_mask=arrays['cost'][1], wpp_mask=arrays['wpp'][1],
+                                allowed_mask=self.allowed_mask)
+
+    def replace(self, **fields) -> 'OptimizationData':
+        """
+        Create a copy of the data with whole fields replaced.
+
+        Unlike with_changes, this can change the dimensions. Entries of the other
+        fields are kept if their labels are still part of the data.
+
+        Args:
+            **fields: New values for any of KEYS, e.g. weeks=[2, 3] or
+                      demand={('Plain', 2): 12}
+
+        Returns:
+            OptimizationData: Data with the fields replaced
+
+        Raises:
+            ValueError: If fields name a key that is not one of KEYS
+        """
+        unknown = [name for name in fields if name not in self.KEYS]
+        if unknown:
+            raise ValueError(f"Cannot replace {', '.join(unknown)}, only {', '.join(self.KEYS)}")
+        return OptimizationData.from_dict({**{key: self[key] for key in self.KEYS}, **fields})
+
+    def demand_matrix(self) -> np.ndarray:
+        """Get demand as a W x T array with missing entries set to 0."""
+        return np.where(self.demand_mask, self.demand_array, 0)
+
+    def supply_matrix(self) -> np.ndarray:
+        """Get supply as a P x T array with missing entries set to 0."""
+        return np.where(self.supply_mask, self.supply_array, 0)
+
+    def cost_matrix(self) -> np.ndarray:
+        """Get cost per waffle as a W x P float array with missing entries set to 0."""
+        return np.where(self.cost_mask, self.cost_array, 0.0)
+
+    def wpp_vector(self) -> np.ndarray:
+        """Get waffles per pan as a W array with missing entries set to 0."""
+        return np.where(self.wpp_mask, self.wpp_array, 0)
+
+    def allowed_matrix(self) -> np.ndarray:
+        """Get the W x P boolean matrix of allowed combinations (missing entries are not allowed)."""
+        return self.allowed_array & self.allowed_mask
+
+    def nbytes(self) -> int:
+        """
+        Get the memory used by the data arrays and masks.
+
+        Returns:
+            int: Number of bytes
+        """
+        arrays = [self.demand_array, self.supply_array, self.cost_array, self.wpp_array,
+                  self.allowed_array, self.demand_mask, self.supply_mask, self.cost_mask,
+                  self.wpp_mask, self.allowed_mask]
+        return sum(array.nbytes for array in arrays)
+
+
+def as_optimization_data(data: Mapping) -> OptimizationData:
+    """
+    Get array-backed optimization data for a data mapping.
+
+    Args:
+        data: OptimizationData instance or tuple-keyed optimization data dictionary
+
+    Returns:
+        OptimizationData: The same instance if data is already array-backed,
+                          otherwise a converted copy
+    """
+    if isinstance(data, OptimizationData):
+        return data
+    return OptimizationData.from_dict(data)
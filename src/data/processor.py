@@ -1,24 +1,90 @@
 """
 Data Processing Module for Waffle Production Optimization.
 
-This module handles loading and validating input data from Excel files.
+This module handles loading and validating input data from Excel, CSV, Parquet
+and Feather files.
 """
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from typing import Dict, Tuple, List, Set, Optional, Any
 
 from src.data.constraint_config import ConstraintConfigManager
+from src.data.optimization_data import OptimizationData
+from src.data.cache import ParseCache
+from src.data.readers import WideTable, read_input_file, stream_input_file
+
+# String values in the Allowed column that are interpreted as True
+ALLOWED_TRUE_STRINGS = ['yes', 'true', '1', 't', 'y']
+
+# Number of rows converted at a time when building arrays from wide tables
+WIDE_BLOCK_ROWS = 4096
+
+# OptimizationData arrays derived from each input role
+INPUT_ARRAY_FIELDS = {
+    'demand_file': ['demand_array', 'demand_mask'],
+    'supply_file': ['supply_array', 'supply_mask'],
+    'cost_file': ['cost_array', 'cost_mask'],
+    'wpp_file': ['wpp_array', 'wpp_mask'],
+    'combinations_file': ['allowed_array', 'allowed_mask'],
+}
+
+# Supported modes for reading the input files concurrently
+PARALLEL_LOAD_MODES = ['thread', 'process']
+
+# DataProcessor attribute holding the raw frame of each input role
+INPUT_FRAME_ATTRIBUTES = {
+    'demand_file': 'waffle_demand',
+    'supply_file': 'pan_supply',
+    'cost_file': 'waffle_cost',
+    'wpp_file': 'waffles_per_pan',
+    'combinations_file': 'allowed_combinations',
+}
+
+def _file_signature(path: str) -> Tuple[str, int, int]:
+    """Get the (absolute path, size, modification time) signature of a file."""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
 
 class DataProcessor:
-    def __init__(self, debug_mode: bool = False):
+    def __init__(self, debug_mode: bool = False, vectorized: bool = True,
+                 cache_dir: Optional[str] = None, parallel_load: Optional[str] = None,
+                 streaming: bool = False, keep_raw_frames: bool = False):
         """
         Initialize the data processor.
         
         Args:
             debug_mode: If True, enables debug output
+            vectorized: If True, builds the optimization dictionaries with bulk
+                        pandas/NumPy operations instead of row-by-row iteration
+            cache_dir: Directory of the persistent parse cache (None disables caching)
+            parallel_load: Read the input files concurrently with a 'thread' or
+                           'process' pool (None reads them one after another)
+            streaming: If True, demand and supply workbooks are streamed row by row
+                       into compact tables instead of being read with pandas
+            keep_raw_frames: If True, the raw input tables are kept after processing and
+                             reloads only read the input files that have changed
         """
+        if parallel_load is not None and parallel_load not in PARALLEL_LOAD_MODES:
+            raise ValueError(f"Unsupported parallel load mode: {parallel_load}")
+        if streaming and not vectorized:
+            raise ValueError("Streaming ingestion requires the vectorized processing path")
+        
         # Initialize debug mode
         self.debug_mode = debug_mode
+        self.vectorized = vectorized
+        self.parallel_load = parallel_load
+        self.streaming = streaming
+        self.keep_raw_frames = keep_raw_frames
+        
+        # File signatures of the kept raw tables, used to skip unchanged inputs on reload
+        self._input_signatures = {}
+        self._input_weeks = None
+        
+        # Persistent cache of processed input data
+        self.cache = ParseCache(cache_dir) if cache_dir else None
         
         # Initialize data storage
         self.waffle_demand = None
@@ -39,6 +105,9 @@ class DataProcessor:
         self.wpp_dict = {}
         self.allowed_dict = {}
         
+        # Array-backed optimization data built from the dictionaries
+        self.optimization_data = None
+        
         # Initialize constraint configuration manager
         self.constraint_manager = ConstraintConfigManager(debug_mode=debug_mode)
         
@@ -58,95 +127,236 @@ class DataProcessor:
                   cost_file: str, 
                   wpp_file: str, 
                   combinations_file: str,
-                  constraint_config_file: Optional[str] = None) -> None:
+                  constraint_config_file: Optional[str] = None,
+                  weeks: Optional[List[str]] = None) -> None:
         """
-        Load data from Excel files.
+        Load data from input files.
+        
+        Each file may be an Excel, CSV, Parquet or Feather file (detected by extension
+        or content) in the wide layout of the Excel workbooks or in a long layout.
         
         Args:
-            demand_file: Path to waffle demand Excel file
-            supply_file: Path to pan supply Excel file
-            cost_file: Path to waffle cost Excel file
-            wpp_file: Path to waffles per pan Excel file
-            combinations_file: Path to allowed combinations Excel file
+            demand_file: Path to waffle demand file
+            supply_file: Path to pan supply file
+            cost_file: Path to waffle cost file
+            wpp_file: Path to waffles per pan file
+            combinations_file: Path to allowed combinations file
             constraint_config_file: Path to constraint configuration JSON file (optional)
+            weeks: If given, only these weeks of demand and supply are loaded
+                   (Parquet files only read the corresponding columns)
         """
-        # Load raw data from Excel files
-        self.waffle_demand = pd.read_excel(demand_file)
-        self.pan_supply = pd.read_excel(supply_file)
-        self.waffle_cost = pd.read_excel(cost_file)
-        self.waffles_per_pan = pd.read_excel(wpp_file)
-        self.allowed_combinations = pd.read_excel(combinations_file)
+        files = {
+            'demand_file': demand_file,
+            'supply_file': supply_file,
+            'cost_file': cost_file,
+            'wpp_file': wpp_file,
+            'combinations_file': combinations_file,
+        }
         
-        # Rename 'Unnamed: 0' columns to match expected column names
-        if 'Unnamed: 0' in self.waffle_demand.columns:
-            self.waffle_demand = self.waffle_demand.rename(columns={'Unnamed: 0': 'WaffleType'})
-            
-        if 'Unnamed: 0' in self.pan_supply.columns:
-            self.pan_supply = self.pan_supply.rename(columns={'Unnamed: 0': 'PanType'})
-            
-        if 'Unnamed: 0' in self.waffles_per_pan.columns:
-            # Rename to WaffleType since this file has waffles per waffle type, not per pan type
-            self.waffles_per_pan = self.waffles_per_pan.rename(columns={'Unnamed: 0': 'WaffleType'})
-            
-        # Transform waffle_cost from wide to long format
-        if 'Unnamed: 0' in self.waffle_cost.columns:
-            self.waffle_cost = self.waffle_cost.rename(columns={'Unnamed: 0': 'WaffleType'})
-            self.waffle_cost = self.waffle_cost.melt(
-                id_vars=['WaffleType'],
-                var_name='PanType',
-                value_name='Cost'
-            )
-        
-        # Transform allowed_combinations from wide to long format
-        if 'Unnamed: 0' in self.allowed_combinations.columns:
-            self.allowed_combinations = self.allowed_combinations.rename(columns={'Unnamed: 0': 'WaffleType'})
-            self.allowed_combinations = self.allowed_combinations.melt(
-                id_vars=['WaffleType'],
-                var_name='PanType',
-                value_name='Allowed'
-            )
-        
-        # Process and validate data
-        self._extract_dimensions()
-        self._validate_data()
-        self._process_data()
+        # Reuse processed data from the parse cache if the input files are unchanged
+        options = {'weeks': list(weeks)} if weeks is not None else None
+        cached_data = self.cache.get(files, options) if self.cache else None
+        if cached_data is not None:
+            self._debug_print("Using processed data from the parse cache")
+            self._set_optimization_data(cached_data)
+            if self.keep_raw_frames:
+                self._restore_input_frames(files, weeks)
+        else:
+            self._load_input_files(files, weeks)
+            if self.cache:
+                self.cache.put(files, self.optimization_data, options)
         
         # Load constraint configuration if provided
         if constraint_config_file:
             self._debug_print(f"Loading constraint configuration from {constraint_config_file}")
             self.constraint_manager.load_configuration(constraint_config_file)
+    
+    def _load_input_files(self, files: Dict[str, str], weeks: Optional[List[str]] = None) -> None:
+        """
+        Load, validate and process the raw data from the input files.
+        
+        When raw tables are kept, inputs whose file is unchanged since the previous
+        load are not read again, and if the dimensions are unchanged only the arrays
+        of the changed inputs are rebuilt.
+        
+        Args:
+            files: Mapping from input role (e.g. 'demand_file') to file path
+            weeks: If given, only these weeks of demand and supply are loaded
+        """
+        reused = self._unchanged_inputs(files, weeks)
+        # Forget the previous inputs until this load has succeeded
+        self._input_signatures = {}
+        
+        changed = {role: path for role, path in files.items() if role not in reused}
+        if reused:
+            self._debug_print(f"Reusing unchanged inputs, reading {', '.join(changed) or 'nothing'}")
+        frames = self._read_input_files(changed, weeks)
+        for role, frame in frames.items():
+            setattr(self, INPUT_FRAME_ATTRIBUTES[role], frame)
+            if self.cache and self.keep_raw_frames:
+                self.cache.put_frame(role, files[role], frame, self._frame_options(weeks))
+        
+        # Process and validate data once all files have been read
+        previous_dimensions = (self.waffle_types, self.pan_types, self.weeks)
+        self._extract_dimensions()
+        self._validate_data()
+        if reused and previous_dimensions == (self.waffle_types, self.pan_types, self.weeks):
+            self._process_data(changed_roles=set(changed))
+        else:
+            self._process_data()
+        
+        # The optimization data holds everything needed later on
+        if self.keep_raw_frames:
+            self._input_signatures = {role: _file_signature(path) for role, path in files.items()}
+            self._input_weeks = weeks
+        else:
+            for attribute in INPUT_FRAME_ATTRIBUTES.values():
+                setattr(self, attribute, None)
+    
+    def _restore_input_frames(self, files: Dict[str, str], weeks: Optional[List[str]]) -> None:
+        """
+        Restore the raw tables of a parse cache hit from the tables cached per file.
+        
+        If any table is missing from the cache, no tables are restored and the next
+        reload reads all input files.
+        
+        Args:
+            files: Mapping from input role to file path
+            weeks: Weeks selection of the load
+        """
+        options = self._frame_options(weeks)
+        frames = {role: self.cache.get_frame(role, path, options) for role, path in files.items()}
+        if any(frame is None for frame in frames.values()):
+            return
+        for role, frame in frames.items():
+            setattr(self, INPUT_FRAME_ATTRIBUTES[role], frame)
+        self._input_signatures = {role: _file_signature(path) for role, path in files.items()}
+        self._input_weeks = weeks
+    
+    def _frame_options(self, weeks: Optional[List[str]]) -> Dict[str, Any]:
+        """Get the load options that change the raw table read from a file."""
+        return {'weeks': list(weeks) if weeks is not None else None, 'streaming': self.streaming}
+    
+    def _unchanged_inputs(self, files: Dict[str, str], weeks: Optional[List[str]]) -> Set[str]:
+        """
+        Get the input roles whose kept raw table is still up to date.
+        
+        Args:
+            files: Mapping from input role to file path
+            weeks: Weeks selection of the new load
+            
+        Returns:
+            Set[str]: Roles that do not need to be read again
+        """
+        if not self._input_signatures or weeks != self._input_weeks:
+            return set()
+        unchanged = set()
+        for role, path in files.items():
+            try:
+                if self._input_signatures.get(role) == _file_signature(path):
+                    unchanged.add(role)
+            except OSError:
+                continue
+        return unchanged
+    
+    def _read_input_files(self, files: Dict[str, str],
+                          weeks: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Read all input files, concurrently if parallel loading is enabled.
+        
+        Args:
+            files: Mapping from input role to file path
+            weeks: If given, only these weeks of demand and supply are read
+            
+        Returns:
+            Dict[str, pd.DataFrame]: Normalised frames (or compact tables when streaming) by input role
+        """
+        reader = stream_input_file if self.streaming else read_input_file
+        if not self.parallel_load or len(files) < 2:
+            return {role: reader(role, path, weeks) for role, path in files.items()}
+        
+        if self.parallel_load == 'process':
+            executor = ProcessPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1))
+        else:
+            executor = ThreadPoolExecutor(max_workers=len(files))
+        
+        self._debug_print(f"Reading {len(files)} input files with a {self.parallel_load} pool")
+        frames = {}
+        try:
+            futures = {role: executor.submit(reader, role, path, weeks)
+                       for role, path in files.items()}
+            # Collect in input order so the first failing file is reported deterministically
+            for role, future in futures.items():
+                frames[role] = future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return frames
+    
+    def _set_optimization_data(self, data: OptimizationData) -> None:
+        """
+        Use already processed optimization data, e.g. from the parse cache.
+        
+        Args:
+            data: Array-backed optimization data
+        """
+        self.waffle_types = list(data.waffle_types)
+        self.pan_types = list(data.pan_types)
+        self.weeks = list(data.weeks)
+        self.optimization_data = data
+        # Kept raw tables no longer match the optimization data
+        self._input_signatures = {}
+        self._expose_views()
+    
+    def invalidate_cache(self, file_path: Optional[str] = None) -> int:
+        """
+        Remove entries from the parse cache.
+        
+        Args:
+            file_path: If given, only entries built from this input file are removed;
+                       otherwise the whole cache is cleared
+            
+        Returns:
+            int: Number of removed entries
+        """
+        if self.cache is None:
+            return 0
+        return self.cache.invalidate(file_path)
         
     def _extract_dimensions(self) -> None:
         """Extract dimensions (waffle types, pan types, weeks) from input data."""
+        # Start from empty sets so that labels of a previous load do not accumulate
+        waffle_types = set()
+        pan_types = set()
+        
         # Extract waffle types from various files
         if self.waffle_demand is not None:
             if 'WaffleType' in self.waffle_demand.columns:
-                self.waffle_types.update(self.waffle_demand['WaffleType'].unique())
+                waffle_types.update(self.waffle_demand['WaffleType'].unique())
                 
         if self.waffle_cost is not None:
             if 'WaffleType' in self.waffle_cost.columns:
-                self.waffle_types.update(self.waffle_cost['WaffleType'].unique())
+                waffle_types.update(self.waffle_cost['WaffleType'].unique())
                 
         if self.allowed_combinations is not None:
             if 'WaffleType' in self.allowed_combinations.columns:
-                self.waffle_types.update(self.allowed_combinations['WaffleType'].unique())
+                waffle_types.update(self.allowed_combinations['WaffleType'].unique())
                 
         if self.waffles_per_pan is not None:
             if 'WaffleType' in self.waffles_per_pan.columns:
-                self.waffle_types.update(self.waffles_per_pan['WaffleType'].unique())
+                waffle_types.update(self.waffles_per_pan['WaffleType'].unique())
         
         # Extract pan types from various files
         if self.pan_supply is not None:
             if 'PanType' in self.pan_supply.columns:
-                self.pan_types.update(self.pan_supply['PanType'].unique())
+                pan_types.update(self.pan_supply['PanType'].unique())
                 
         if self.waffle_cost is not None:
             if 'PanType' in self.waffle_cost.columns:
-                self.pan_types.update(self.waffle_cost['PanType'].unique())
+                pan_types.update(self.waffle_cost['PanType'].unique())
                 
         if self.allowed_combinations is not None:
             if 'PanType' in self.allowed_combinations.columns:
-                self.pan_types.update(self.allowed_combinations['PanType'].unique())
+                pan_types.update(self.allowed_combinations['PanType'].unique())
         
         # Extract weeks from demand and supply data
         demand_weeks = set()
@@ -158,12 +368,12 @@ class DataProcessor:
             supply_weeks = {col for col in self.pan_supply.columns if col not in ['PanType']}
             
         # Use the union of weeks from both datasets instead of intersection
-        self.weeks = demand_weeks.union(supply_weeks)
+        weeks = demand_weeks.union(supply_weeks)
             
         # Convert to sorted lists for consistent indexing
-        self.waffle_types = sorted(list(self.waffle_types))
-        self.pan_types = sorted(list(self.pan_types))
-        self.weeks = sorted(list(self.weeks))
+        self.waffle_types = sorted(list(waffle_types))
+        self.pan_types = sorted(list(pan_types))
+        self.weeks = sorted(list(weeks))
         
     def _validate_data(self) -> None:
         """Validate the loaded data for consistency and completeness."""
@@ -214,8 +424,37 @@ class DataProcessor:
                 
         # Additional validation could be added here
         
-    def _process_data(self) -> None:
-        """Process the loaded data into dictionaries for optimization."""
+    def _process_data(self, changed_roles: Optional[Set[str]] = None) -> None:
+        """
+        Process the loaded data into dictionaries for optimization.
+        
+        Args:
+            changed_roles: If given, only the data of these input roles is rebuilt
+                           (vectorized path only; see _process_data_vectorized)
+        """
+        if self.vectorized:
+            self._process_data_vectorized(changed_roles)
+        else:
+            # Start from empty dictionaries so that entries of a previous load are dropped
+            self.demand_dict = {}
+            self.supply_dict = {}
+            self.cost_dict = {}
+            self.wpp_dict = {}
+            self.allowed_dict = {}
+            self._process_data_rowwise()
+            self.optimization_data = OptimizationData.from_dict({
+                'waffle_types': self.waffle_types,
+                'pan_types': self.pan_types,
+                'weeks': self.weeks,
+                'demand': self.demand_dict,
+                'supply': self.supply_dict,
+                'cost': self.cost_dict,
+                'wpp': self.wpp_dict,
+                'allowed': self.allowed_dict
+            })
+        
+    def _process_data_rowwise(self) -> None:
+        """Process the loaded data into dictionaries by iterating over every row."""
         # Process demand data
         for _, row in self.waffle_demand.iterrows():
             waffle_type = row['WaffleType']
@@ -262,44 +501,204 @@ class DataProcessor:
                     self.allowed_dict[(waffle_type, pan_type)] = allowed > 0
                 elif isinstance(allowed, str):
                     allowed_lower = allowed.lower()
-                    self.allowed_dict[(waffle_type, pan_type)] = allowed_lower in ['yes', 'true', '1', 't', 'y']
+                    self.allowed_dict[(waffle_type, pan_type)] = allowed_lower in ALLOWED_TRUE_STRINGS
+        
+    def _process_data_vectorized(self, changed_roles: Optional[Set[str]] = None) -> None:
+        """
+        Process the loaded data into arrays using bulk pandas/NumPy operations.
+        
+        Builds the array-backed OptimizationData directly from masked arrays instead of
+        iterating over rows and cells. The dictionaries are exposed as read-only
+        mapping views over these arrays and contain the same entries as the
+        dictionaries built by _process_data_rowwise.
+        
+        Args:
+            changed_roles: If given, only the arrays of these input roles are rebuilt
+                           and the others are reused from the current optimization
+                           data, whose dimensions must be unchanged
+        """
+        waffle_labels = pd.Index(self.waffle_types)
+        pan_labels = pd.Index(self.pan_types)
+        
+        arrays = {}
+        for role in INPUT_FRAME_ATTRIBUTES:
+            if changed_roles is None or role in changed_roles:
+                arrays.update(self._build_arrays(role, waffle_labels, pan_labels))
+            else:
+                arrays.update({field: getattr(self.optimization_data, field)
+                               for field in INPUT_ARRAY_FIELDS[role]})
+        
+        self.optimization_data = OptimizationData(
+            self.waffle_types, self.pan_types, self.weeks,
+            arrays['demand_array'], arrays['supply_array'], arrays['cost_array'],
+            arrays['wpp_array'], arrays['allowed_array'],
+            demand_mask=arrays['demand_mask'], supply_mask=arrays['supply_mask'],
+            cost_mask=arrays['cost_mask'], wpp_mask=arrays['wpp_mask'],
+            allowed_mask=arrays['allowed_mask']
+        )
+        self._expose_views()
+    
+    def _build_arrays(self, role: str, waffle_labels: pd.Index,
+                      pan_labels: pd.Index) -> Dict[str, np.ndarray]:
+        """
+        Build the arrays derived from one input role.
+        
+        Args:
+            role: Input role (e.g. 'cost_file')
+            waffle_labels: Ordered waffle types
+            pan_labels: Ordered pan types
+            
+        Returns:
+            Dict[str, np.ndarray]: Arrays by OptimizationData attribute name
+        """
+        n_waffles, n_pans = len(waffle_labels), len(pan_labels)
+        
+        if role == 'demand_file':
+            demand, demand_mask = self._wide_to_array(self.waffle_demand, 'WaffleType', waffle_labels)
+            return {'demand_array': demand, 'demand_mask': demand_mask}
+        
+        if role == 'supply_file':
+            supply, supply_mask = self._wide_to_array(self.pan_supply, 'PanType', pan_labels)
+            return {'supply_array': supply, 'supply_mask': supply_mask}
+        
+        if role == 'cost_file':
+            costs = self.waffle_cost['Cost'].to_numpy(dtype=float)
+            rows = waffle_labels.get_indexer(self.waffle_cost['WaffleType'])
+            cols = pan_labels.get_indexer(self.waffle_cost['PanType'])
+            keep = ~np.isnan(costs) & (rows >= 0) & (cols >= 0)
+            cost = np.full((n_waffles, n_pans), np.nan)
+            cost[rows[keep], cols[keep]] = costs[keep]
+            return {'cost_array': cost, 'cost_mask': ~np.isnan(cost)}
+        
+        if role == 'wpp_file':
+            wpp_values = self.waffles_per_pan['WPP'].to_numpy(dtype=float)
+            rows = waffle_labels.get_indexer(self.waffles_per_pan['WaffleType'])
+            keep = ~np.isnan(wpp_values) & (rows >= 0)
+            wpp = np.zeros(n_waffles, dtype=np.int64)
+            wpp_mask = np.zeros(n_waffles, dtype=bool)
+            wpp[rows[keep]] = np.trunc(wpp_values[keep]).astype(np.int64)
+            wpp_mask[rows[keep]] = True
+            return {'wpp_array': wpp, 'wpp_mask': wpp_mask}
+        
+        # Allowed combinations
+        allowed_values, has_value = self._normalise_allowed(self.allowed_combinations['Allowed'])
+        rows = waffle_labels.get_indexer(self.allowed_combinations['WaffleType'])
+        cols = pan_labels.get_indexer(self.allowed_combinations['PanType'])
+        keep = has_value & (rows >= 0) & (cols >= 0)
+        allowed = np.zeros((n_waffles, n_pans), dtype=bool)
+        allowed_mask = np.zeros((n_waffles, n_pans), dtype=bool)
+        allowed[rows[keep], cols[keep]] = allowed_values[keep]
+        allowed_mask[rows[keep], cols[keep]] = True
+        return {'allowed_array': allowed, 'allowed_mask': allowed_mask}
+    
+    def _expose_views(self) -> None:
+        """Expose the mapping views of the optimization data as the dictionary attributes."""
+        self.demand_dict = self.optimization_data['demand']
+        self.supply_dict = self.optimization_data['supply']
+        self.cost_dict = self.optimization_data['cost']
+        self.wpp_dict = self.optimization_data['wpp']
+        self.allowed_dict = self.optimization_data['allowed']
+    
+    def _wide_to_array(self, frame: pd.DataFrame, id_column: str,
+                       labels: pd.Index) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert a wide (one column per week) frame into a labels x weeks array.
+        
+        Only positive values are kept, matching the row-wise processing. If an
+        identifier appears in several rows, the last positive value wins.
+        
+        Args:
+            frame: Wide DataFrame or WideTable with an identifier column and one column per week
+            id_column: Name of the identifier column
+            labels: Ordered labels of the first array axis
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (integer values, mask of positive entries)
+        """
+        array = np.zeros((len(labels), len(self.weeks)), dtype=np.int64)
+        week_positions = [i for i, week in enumerate(self.weeks) if week in frame.columns]
+        if not week_positions:
+            return array, array > 0
+        
+        week_columns = [self.weeks[i] for i in week_positions]
+        week_positions = np.asarray(week_positions)
+        if not isinstance(frame, WideTable):
+            frame = frame[[id_column] + week_columns]
+        row_ids = labels.get_indexer(frame[id_column])
+        
+        # Convert blocks of rows so that temporary arrays stay small for large inputs
+        for start in range(0, len(row_ids), WIDE_BLOCK_ROWS):
+            block = slice(start, start + WIDE_BLOCK_ROWS)
+            if isinstance(frame, WideTable):
+                values = np.trunc(frame.week_values(week_columns, block))
+            else:
+                values = np.trunc(frame[week_columns].iloc[block].to_numpy(dtype=float))
+            block_ids = row_ids[block]
+            # NaN compares False, so missing cells are dropped together with non-positive ones
+            rows, cols = np.nonzero((values > 0) & (block_ids >= 0)[:, None])
+            array[block_ids[rows], week_positions[cols]] = values[rows, cols].astype(np.int64)
+        return array, array > 0
+    
+    @staticmethod
+    def _normalise_allowed(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Normalise the Allowed column to booleans.
+        
+        Booleans are kept as they are, numbers are allowed if positive and strings
+        are allowed if they are one of ALLOWED_TRUE_STRINGS (case-insensitive).
+        
+        Args:
+            values: Allowed column of the long-format combinations data
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (allowed flags, mask of entries that have a value)
+        """
+        if pd.api.types.is_bool_dtype(values.dtype):
+            allowed = values.to_numpy(dtype=bool, na_value=False)
+            return allowed, values.notna().to_numpy()
+        
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            numbers = values.to_numpy(dtype=float)
+            return numbers > 0, ~np.isnan(numbers)
+        
+        # Mixed object column: handle strings and numbers/booleans separately
+        if pd.api.types.is_string_dtype(values.dtype):
+            lowered = values.str.lower()
+        else:
+            lowered = pd.Series(np.nan, index=values.index, dtype=object)
+        is_str = lowered.notna().to_numpy()
+        numbers = pd.to_numeric(values.where(~is_str), errors='coerce').to_numpy(dtype=float)
+        
+        allowed = np.where(is_str, lowered.isin(ALLOWED_TRUE_STRINGS).to_numpy(), numbers > 0)
+        mask = is_str | ~np.isnan(numbers)
+        return allowed.astype(bool), mask
         
     def check_data_loaded(self) -> bool:
         """
         Check if data has been loaded.
         
+        Data loaded from the parse cache counts as loaded even though the raw
+        DataFrames are not available in that case.
+        
         Returns:
             bool: True if data is loaded, False otherwise
         """
-        return (self.waffle_demand is not None and
-                self.pan_supply is not None and
-                self.waffle_cost is not None and
-                self.waffles_per_pan is not None and
-                self.allowed_combinations is not None)
+        return self.optimization_data is not None
                 
-    def get_optimization_data(self) -> Dict:
+    def get_optimization_data(self) -> OptimizationData:
         """
         Get the data in a format suitable for optimization.
         
+        The returned object is array-backed but can be used like the read-only
+        dictionary of the previous releases (e.g. data['demand'][(w, t)]).
+        
         Returns:
-            Dict: Dictionary containing optimization data
+            OptimizationData: Array-backed optimization data
         """
         if not self.check_data_loaded():
             raise ValueError("Data has not been loaded. Call load_data first.")
             
-        # Create the optimization data dictionary
-        optimization_data = {
-            'waffle_types': self.waffle_types,
-            'pan_types': self.pan_types,
-            'weeks': self.weeks,
-            'demand': self.demand_dict,
-            'supply': self.supply_dict,
-            'cost': self.cost_dict,
-            'wpp': self.wpp_dict,
-            'allowed': self.allowed_dict
-        }
-        
-        return optimization_data
+        return self.optimization_data
         
     def get_feasibility_data(self) -> Dict:
         """
@@ -0,0 +1,477 @@
+"""
+Input Readers Module for Waffle Production Optimization.
+
+This module reads the five input files (demand, supply, cost, waffles per pan and
+allowed combinations) from Excel, CSV, Parquet or Feather files and normalises
+them to the frame layout expected by DataProcessor. Both the wide layout of the
+Excel workbooks and a long/tidy layout with one row per value are supported.
+
+Large demand and supply workbooks can also be streamed row by row into a compact
+WideTable without building the workbook DOM or a DataFrame.
+"""
+import os
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Supported input formats
+INPUT_FORMATS = ['excel', 'csv', 'parquet', 'feather']
+
+# File extensions of the supported input formats
+FORMAT_EXTENSIONS = {
+    '.xlsx': 'excel',
+    '.xlsm': 'excel',
+    '.xls': 'excel',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+}
+
+# Leading bytes of legacy binary (.xls) workbooks, which openpyxl cannot stream
+LEGACY_EXCEL_MAGIC = b'\xd0\xcf\x11\xe0'
+
+# Leading bytes identifying binary formats when the extension is unknown
+MAGIC_BYTES = [
+    (b'PK\x03\x04', 'excel'),
+    (LEGACY_EXCEL_MAGIC, 'excel'),
+    (b'PAR1', 'parquet'),
+    (b'ARROW1', 'feather'),
+]
+
+# Human readable names of the input roles used in error messages
+INPUT_DESCRIPTIONS = {
+    'demand_file': 'demand',
+    'supply_file': 'supply',
+    'cost_file': 'cost',
+    'wpp_file': 'waffles per pan',
+    'combinations_file': 'allowed combinations',
+}
+
+# Identifier column of each input role
+ID_COLUMNS = {
+    'demand_file': 'WaffleType',
+    'supply_file': 'PanType',
+    'cost_file': 'WaffleType',
+    'wpp_file': 'WaffleType',
+    'combinations_file': 'WaffleType',
+}
+
+# Value column of the cost and combinations inputs in long format
+PAIR_VALUE_COLUMNS = {
+    'cost_file': 'Cost',
+    'combinations_file': 'Allowed',
+}
+
+# Column holding the week in long/tidy demand and supply inputs
+WEEK_COLUMN = 'Week'
+
+# Input roles indexed by week
+WEEK_ROLES = ['demand_file', 'supply_file']
+
+
+def detect_format(path: str) -> str:
+    """
+    Detect the format of an input file by its extension or, failing that, its magic bytes.
+
+    Files that are neither recognised by extension nor by magic bytes are read as CSV.
+
+    Args:
+        path: Path to the input file
+
+    Returns:
+        str: One of INPUT_FORMATS
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in FORMAT_EXTENSIONS:
+        return FORMAT_EXTENSIONS[extension]
+
+    with open(path, 'rb') as f:
+        header = f.read(8)
+    for magic, file_format in MAGIC_BYTES:
+        if header.startswith(magic):
+            return file_format
+    return 'csv'
+
+
+def _read_parquet(path: str, id_column: str, weeks: Optional[List[str]]) -> pd.DataFrame:
+    """
+    Read a Parquet file, reading only the requested weeks if given.
+
+    Wide files are projected to the identifier and week columns; long files are
+    filtered on the week column so that other row groups can be skipped.
+
+    Args:
+        path: Path to the Parquet file
+        id_column: Identifier column of the input role
+        weeks: Weeks to read (None reads all columns)
+
+    Returns:
+        pd.DataFrame: Raw frame
+    """
+    if weeks is None:
+        return pd.read_parquet(path)
+
+    import pyarrow.parquet as pq
+
+    columns = pq.read_schema(path).names
+    if WEEK_COLUMN in columns:
+        return pd.read_parquet(path, filters=[(WEEK_COLUMN, 'in', list(weeks))])
+
+    # Index columns stored by pandas are restored automatically
+    wanted = set(weeks) | {id_column, 'Unnamed: 0', 'index'}
+    return pd.read_parquet(path, columns=[col for col in columns if col in wanted])
+
+
+def read_table(path: str, file_format: Optional[str] = None, id_column: Optional[str] = None,
+               weeks: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a raw table from an input file in any of the supported formats.
+
+    Args:
+        path: Path to the input file
+        file_format: Format of the file (detected if None)
+        id_column: Identifier column used for Parquet column projection
+        weeks: Weeks to read from Parquet files (None reads all columns)
+
+    Returns:
+        pd.DataFrame: Raw frame with a default index
+    """
+    if file_format is None:
+        file_format = detect_format(path)
+
+    if file_format == 'excel':
+        frame = pd.read_excel(path)
+    elif file_format == 'csv':
+        frame = pd.read_csv(path)
+    elif file_format == 'parquet':
+        frame = _read_parquet(path, id_column, weeks)
+    elif file_format == 'feather':
+        frame = pd.read_feather(path)
+    else:
+        raise ValueError(f"Unsupported input format: {file_format}")
+
+    # Columnar files written from pandas may carry the identifiers as the index
+    if not isinstance(frame.index, pd.RangeIndex):
+        frame = frame.reset_index()
+    return frame
+
+
+def _normalise_id_column(frame: pd.DataFrame, id_column: str) -> pd.DataFrame:
+    """Rename the unnamed first column of a wide table to the identifier column."""
+    if id_column in frame.columns:
+        return frame
+    for unnamed in ['Unnamed: 0', 'index']:
+        if unnamed in frame.columns:
+            return frame.rename(columns={unnamed: id_column})
+    return frame
+
+
+def _long_to_wide(frame: pd.DataFrame, id_column: str, role: str) -> pd.DataFrame:
+    """
+    Pivot a long/tidy demand or supply table (id, week, value) to the wide layout.
+
+    Args:
+        frame: Long table with the identifier, week and a single value column
+        id_column: Identifier column of the input role
+        role: Input role, used in error messages
+
+    Returns:
+        pd.DataFrame: Wide table with one column per week
+    """
+    value_columns = [col for col in frame.columns if col not in [id_column, WEEK_COLUMN]]
+    if len(value_columns) != 1:
+        raise ValueError(f"Long {INPUT_DESCRIPTIONS[role]} data must have exactly one value column "
+                         f"besides {id_column} and {WEEK_COLUMN}, found {value_columns}")
+    if frame.duplicated([id_column, WEEK_COLUMN]).any():
+        raise ValueError(f"Long {INPUT_DESCRIPTIONS[role]} data has duplicate {id_column}/{WEEK_COLUMN} rows")
+
+    wide = frame.pivot(index=id_column, columns=WEEK_COLUMN, values=value_columns[0])
+    wide.columns.name = None
+    return wide.reset_index()
+
+
+def normalise_frame(role: str, frame: pd.DataFrame, weeks: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Normalise a raw input table to the layout expected by DataProcessor.
+
+    Demand and supply become wide tables with one column per week, cost and
+    allowed combinations become long tables with one row per waffle/pan pair.
+
+    Args:
+        role: Input role (e.g. 'demand_file')
+        frame: Raw table in wide or long layout
+        weeks: If given, demand and supply are restricted to these weeks
+
+    Returns:
+        pd.DataFrame: Normalised frame
+    """
+    id_column = ID_COLUMNS[role]
+
+    if role in WEEK_ROLES:
+        if WEEK_COLUMN in frame.columns:
+            if weeks is not None:
+                frame = frame[frame[WEEK_COLUMN].isin(weeks)]
+            frame = _long_to_wide(frame, id_column, role)
+        else:
+            frame = _normalise_id_column(frame, id_column)
+            if weeks is not None:
+                wanted = set(weeks)
+                frame = frame[[col for col in frame.columns if col == id_column or col in wanted]]
+        return frame
+
+    if role in PAIR_VALUE_COLUMNS:
+        # Already long when both identifiers are present
+        if 'PanType' in frame.columns:
+            return frame
+        frame = _normalise_id_column(frame, id_column)
+        if id_column not in frame.columns:
+            return frame
+        return frame.melt(id_vars=[id_column], var_name='PanType', value_name=PAIR_VALUE_COLUMNS[role])
+
+    return _normalise_id_column(frame, id_column)
+
+
+def read_input_file(role: str, path: str, weeks: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read one input file and normalise it to the layout expected by DataProcessor.
+
+    This is a module-level function so that it can be run in a worker process.
+    Errors other than a missing file are re-raised as ValueError naming the file.
+
+    Args:
+        role: Input role (e.g. 'demand_file')
+        path: Path to the input file
+        weeks: If given, demand and supply are restricted to these weeks
+
+    Returns:
+        pd.DataFrame: Normalised frame (cost and combinations in long format)
+    """
+    # Only demand and supply are indexed by week
+    if role not in WEEK_ROLES:
+        weeks = None
+
+    try:
+        frame = read_table(path, id_column=ID_COLUMNS[role], weeks=weeks)
+        return normalise_frame(role, frame, weeks)
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Error loading {INPUT_DESCRIPTIONS[role]} file '{path}': {str(e)}") from e
+
+
+class WideTable:
+    """
+    Compact wide table of demand or supply values.
+
+    Holds the identifiers and a single float matrix with one column per week
+    (missing cells are NaN). It provides the parts of the DataFrame interface
+    used by DataProcessor to extract dimensions and validate the data.
+    """
+
+    def __init__(self, id_column: str, ids: List, week_columns: List, values: np.ndarray):
+        """
+        Initialize the table.
+
+        Args:
+            id_column: Name of the identifier column
+            ids: Identifier of each row
+            week_columns: Week label of each value column
+            values: Float matrix of shape (len(ids), len(week_columns))
+        """
+        self.id_column = id_column
+        self.ids = list(ids)
+        self.week_columns = list(week_columns)
+        self.values = values
+        self._positions = {week: i for i, week in enumerate(self.week_columns)}
+
+    @property
+    def columns(self) -> pd.Index:
+        """Column labels, the identifier column followed by the weeks."""
+        return pd.Index([self.id_column] + self.week_columns)
+
+    def __getitem__(self, column) -> pd.Series:
+        """Get the identifier column or a single week column as a Series."""
+        if column == self.id_column:
+            return pd.Series(self.ids, name=column)
+        return pd.Series(self.values[:, self._positions[column]], name=column)
+
+    def week_values(self, weeks: List, rows: slice = slice(None)) -> np.ndarray:
+        """
+        Get the values of the given weeks.
+
+        Args:
+            weeks: Week labels, all of which must be columns of the table
+            rows: Rows to return (all rows by default)
+
+        Returns:
+            np.ndarray: Float matrix with one column per requested week
+        """
+        return self.values[rows, [self._positions[week] for week in weeks]]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Convert the table to the wide DataFrame layout.
+
+        Returns:
+            pd.DataFrame: DataFrame with the identifier column and one column per week
+        """
+        frame = pd.DataFrame(self.values, columns=self.week_columns)
+        frame.insert(0, self.id_column, self.ids)
+        return frame
+
+    def nbytes(self) -> int:
+        """
+        Get the memory used by the value matrix.
+
+        Returns:
+            int: Size in bytes
+        """
+        return self.values.nbytes
+
+
+class _RowBuffer:
+    """Float matrix that rows are appended to while streaming, stored in fixed-size blocks."""
+
+    def __init__(self, n_columns: int, block_rows: int = 1024):
+        self.n_columns = n_columns
+        self.block_rows = block_rows
+        self.blocks = []
+        self.size = 0
+
+    def append(self, row: List) -> None:
+        position = self.size % self.block_rows
+        if position == 0:
+            self.blocks.append(np.empty((self.block_rows, self.n_columns)))
+        # None becomes NaN and numeric strings are parsed like pandas does
+        self.blocks[-1][position] = np.array(row, dtype=float)
+        self.size += 1
+
+    def finish(self) -> np.ndarray:
+        if not self.blocks:
+            return np.empty((0, self.n_columns))
+        array = np.concatenate(self.blocks)[:self.size]
+        self.blocks = []
+        return array
+
+
+def _stream_wide(rows, header: List, id_column: str, weeks: Optional[List]) -> WideTable:
+    """Collect the rows of a wide sheet into a WideTable."""
+    id_position = header.index(id_column) if id_column in header else 0
+    wanted = set(weeks) if weeks is not None else None
+    positions = [i for i, label in enumerate(header)
+                 if i != id_position and label is not None and (wanted is None or label in wanted)]
+    width = len(header)
+
+    ids = []
+    buffer = _RowBuffer(len(positions))
+    for row in rows:
+        if len(row) < width:
+            row = tuple(row) + (None,) * (width - len(row))
+        values = [row[i] for i in positions]
+        identifier = row[id_position]
+        # Skip blank rows, e.g. formatted but empty rows at the end of the sheet
+        if identifier is None and all(value is None for value in values):
+            continue
+        ids.append(identifier)
+        buffer.append(values)
+    return WideTable(id_column, ids, [header[i] for i in positions], buffer.finish())
+
+
+def _stream_long(rows, header: List, id_column: str, weeks: Optional[List], role: str) -> WideTable:
+    """Collect the rows of a long (id, week, value) sheet into a WideTable."""
+    labels = [label for label in header if label is not None]
+    value_columns = [label for label in labels if label not in [id_column, WEEK_COLUMN]]
+    if id_column not in labels or len(value_columns) != 1:
+        raise ValueError(f"Long {INPUT_DESCRIPTIONS[role]} data must have the columns {id_column}, "
+                         f"{WEEK_COLUMN} and exactly one value column, found {labels}")
+    id_position = header.index(id_column)
+    week_position = header.index(WEEK_COLUMN)
+    value_position = header.index(value_columns[0])
+    wanted = set(weeks) if weeks is not None else None
+
+    ids, week_labels, values = [], [], []
+    for row in rows:
+        week = row[week_position]
+        if week is None or (wanted is not None and week not in wanted):
+            continue
+        ids.append(row[id_position])
+        week_labels.append(week)
+        values.append(row[value_position])
+
+    id_codes, id_uniques = pd.factorize(pd.Series(ids, dtype=object))
+    week_codes, week_uniques = pd.factorize(pd.Series(week_labels, dtype=object))
+    cells = id_codes.astype(np.int64) * max(len(week_uniques), 1) + week_codes
+    if len(np.unique(cells)) != len(cells):
+        raise ValueError(f"Long {INPUT_DESCRIPTIONS[role]} data has duplicate {id_column}/{WEEK_COLUMN} rows")
+
+    matrix = np.full((len(id_uniques), len(week_uniques)), np.nan)
+    matrix[id_codes, week_codes] = np.array(values, dtype=float)
+    return WideTable(id_column, list(id_uniques), list(week_uniques), matrix)
+
+
+def stream_workbook(role: str, path: str, weeks: Optional[List[str]] = None) -> WideTable:
+    """
+    Stream the first sheet of a demand or supply workbook into a WideTable.
+
+    Uses openpyxl's read-only mode, so rows are parsed one at a time and
+    neither the workbook DOM nor a DataFrame is built.
+
+    Args:
+        role: Input role ('demand_file' or 'supply_file')
+        path: Path to the Excel file
+        weeks: If given, only these weeks are kept
+
+    Returns:
+        WideTable: Compact table of the sheet
+    """
+    from openpyxl import load_workbook
+
+    id_column = ID_COLUMNS[role]
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("The workbook is empty")
+        header = list(header)
+        if WEEK_COLUMN in header:
+            return _stream_long(rows, header, id_column, weeks, role)
+        return _stream_wide(rows, header, id_column, weeks)
+    finally:
+        workbook.close()
+
+
+def _is_legacy_workbook(path: str) -> bool:
+    """Check whether an Excel file is a legacy binary (.xls) workbook."""
+    with open(path, 'rb') as f:
+        return f.read(len(LEGACY_EXCEL_MAGIC)) == LEGACY_EXCEL_MAGIC
+
+
+def stream_input_file(role: str, path: str,
+                      weeks: Optional[List[str]] = None) -> Union[WideTable, pd.DataFrame]:
+    """
+    Read one input file, streaming demand and supply workbooks into a WideTable.
+
+    Other inputs and formats, including legacy .xls workbooks, are read with
+    read_input_file.
+
+    Args:
+        role: Input role (e.g. 'demand_file')
+        path: Path to the input file
+        weeks: If given, demand and supply are restricted to these weeks
+
+    Returns:
+        Union[WideTable, pd.DataFrame]: Compact table or normalised frame
+    """
+    if role not in WEEK_ROLES or detect_format(path) != 'excel' or _is_legacy_workbook(path):
+        return read_input_file(role, path, weeks)
+
+    try:
+        return stream_workbook(role, path, weeks)
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Error loading {INPUT_DESCRIPTIONS[role]} file '{path}': {str(e)}") from e
@@ -0,0 +1,117 @@
+"""
+Shared Data Module for Waffle Production Optimization.
+
+This module places the arrays of OptimizationData in one block of shared memory,
+so that worker processes can read a dataset without each receiving a pickled
+copy. The owner creates the block with SharedOptimizationData and passes its
+picklable descriptor to the workers, which rebuild a read-only OptimizationData
+over the shared buffer with attach_shared_data.
+"""
+from multiprocessing import shared_memory
+from typing import Any, Dict, Mapping, Tuple
+import logging
+
+import numpy as np
+
+from src.data.optimization_data import OptimizationData, as_optimization_data
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# OptimizationData attributes stored in the shared block, in block order
+SHARED_ARRAYS = ('demand_array', 'supply_array', 'cost_array', 'wpp_array', 'allowed_array',
+                 'demand_mask', 'supply_mask', 'cost_mask', 'wpp_mask', 'allowed_mask')
+
+# Alignment of each array in the shared block, in bytes
+ALIGNMENT = 8
+
+
+class SharedOptimizationData:
+    """
+    Owner of a shared memory block holding the arrays of optimization data.
+
+    The block is released by close(), or on leaving the context manager; workers
+    that are still attached keep their mapping until they close it themselves.
+    """
+
+    def __init__(self, data: Mapping):
+        """
+        Copy optimization data into a new shared memory block.
+
+        Args:
+            data: OptimizationData or dictionary containing optimization data
+        """
+        data = as_optimization_data(data)
+
+        layout = []
+        offset = 0
+        for name in SHARED_ARRAYS:
+            array = getattr(data, name)
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            layout.append((name, offset, array.dtype.str, array.shape))
+            offset += array.nbytes
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (name, start, dtype, shape) in layout:
+            target = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=start)
+            target[...] = getattr(data, name)
+
+        self.descriptor = {
+            'name': self.shm.name,
+            'layout': layout,
+            'waffle_types': list(data.waffle_types),
+            'pan_types': list(data.pan_types),
+            'weeks': list(data.weeks),
+        }
+        logger.debug(f"Shared {offset} bytes of optimization data in block '{self.shm.name}'")
+
+    def close(self) -> None:
+        """Release the shared memory block."""
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self) -> 'SharedOptimizationData':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def attach_shared_data(descriptor: Dict[str, Any]) -> Tuple[OptimizationData, shared_memory.SharedMemory]:
+    """
+    Attach to a shared memory block created by SharedOptimizationData.
+
+    The returned data reads the shared buffer without copying it, and its arrays
+    are read-only. The block stays mapped as long as the returned SharedMemory
+    handle is open; close it once the data is no longer used.
+
+    Args:
+        descriptor: SharedOptimizationData.descriptor of the block
+
+    Returns:
+        Tuple[OptimizationData, SharedMemory]: Optimization data over the shared buffer,
+                                               and the handle of the block
+    """
+    try:
+        # The owner unlinks the block, so attaching processes need not track it
+        shm = shared_memory.SharedMemory(name=descriptor['name'], track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the block again, with the resource tracker
+        # that child processes share with the owner, which is harmless
+        shm = shared_memory.SharedMemory(name=descriptor['name'])
+
+    arrays = {}
+    for name, offset, dtype, shape in descriptor['layout']:
+        array = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        array.flags.writeable = False
+        arrays[name] = array
+
+    data = OptimizationData(descriptor['waffle_types'], descriptor['pan_types'], descriptor['weeks'],
+                            arrays['demand_array'], arrays['supply_array'], arrays['cost_array'],
+                            arrays['wpp_array'], arrays['allowed_array'],
+                            demand_mask=arrays['demand_mask'], supply_mask=arrays['supply_mask'],
+                            cost_mask=arrays['cost_mask'], wpp_mask=arrays['wpp_mask'],
+                            allowed_mask=arrays['allowed_mask'])
+    return data, shm
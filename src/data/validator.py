@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Any
 
+from src.data.optimization_data import as_optimization_data
+
 class DataValidator:
     """
     Class for validating optimization data and feasibility.
@@ -77,81 +79,51 @@ class DataValidator:
         if not allowed:
             critical_issues.append("No allowed combinations data found.")
         
+        # The remaining checks run on the array-backed representation
+        arrays = as_optimization_data(data)
+        allowed_matrix = arrays.allowed_matrix()
+        demand_matrix = arrays.demand_matrix()
+        supply_matrix = arrays.supply_matrix()
+        wpp_vector = arrays.wpp_vector()
+        
         # Check if all waffle types have corresponding wpp values
-        for w in waffle_types:
-            if w not in wpp:
-                critical_issues.append(f"Waffle type '{w}' is missing a waffles per pan value.")
+        for i in np.flatnonzero(~arrays.wpp_mask):
+            critical_issues.append(f"Waffle type '{waffle_types[i]}' is missing a waffles per pan value.")
         
         # Check if all waffle types have at least one allowed pan type
-        for w in waffle_types:
-            has_allowed_pan = False
-            for p in pan_types:
-                if allowed.get((w, p), False):
-                    has_allowed_pan = True
-                    break
-            if not has_allowed_pan:
-                critical_issues.append(f"Waffle type '{w}' has no allowed pan types.")
+        has_allowed_pan = allowed_matrix.any(axis=1)
+        for i in np.flatnonzero(~has_allowed_pan):
+            critical_issues.append(f"Waffle type '{waffle_types[i]}' has no allowed pan types.")
         
         # Check if each pan type is used for at least one waffle type
-        for p in pan_types:
-            has_allowed_waffle = False
-            for w in waffle_types:
-                if allowed.get((w, p), False):
-                    has_allowed_waffle = True
-                    break
-            if not has_allowed_waffle:
-                warnings.append(f"Pan type '{p}' is not used for any waffle type.")
+        for j in np.flatnonzero(~allowed_matrix.any(axis=0)):
+            warnings.append(f"Pan type '{pan_types[j]}' is not used for any waffle type.")
         
         # Check for unsatisfiable demand (no allowed combinations)
         for (w, t), d in demand.items():
-            if w in waffle_types and t in weeks:
-                has_allowed_pan = False
-                for p in pan_types:
-                    if allowed.get((w, p), False):
-                        has_allowed_pan = True
-                        break
-                if not has_allowed_pan:
+            if w in arrays.waffle_index and t in arrays.week_index:
+                if not has_allowed_pan[arrays.waffle_index[w]]:
                     critical_issues.append(f"Demand for waffle type '{w}' in week '{t}' cannot be satisfied (no allowed pan types).")
         
         # Check if there is any supply for each pan type with demand
-        used_pan_types = set()
-        for w in waffle_types:
-            for t in weeks:
-                if (w, t) in demand and demand[(w, t)] > 0:
-                    for p in pan_types:
-                        if allowed.get((w, p), False):
-                            used_pan_types.add(p)
-        
-        for p in used_pan_types:
-            total_supply = sum(supply.get((p, t), 0) for t in weeks)
-            if total_supply <= 0:
-                critical_issues.append(f"Pan type '{p}' is needed but has no supply.")
-        
-        # Calculate total theoretical capacity per waffle type
-        total_capacity = {}
-        for w in waffle_types:
-            total_capacity[w] = 0
-            for p in pan_types:
-                if allowed.get((w, p), False):
-                    for t in weeks:
-                        if (p, t) in supply:
-                            total_capacity[w] += supply[(p, t)] * wpp.get(w, 0)
+        has_demand = (arrays.demand_mask & (demand_matrix > 0)).any(axis=1)
+        used_pan_types = (allowed_matrix & has_demand[:, None]).any(axis=0)
+        total_pan_supply = supply_matrix.sum(axis=1)
+        for j in np.flatnonzero(used_pan_types & (total_pan_supply <= 0)):
+            critical_issues.append(f"Pan type '{pan_types[j]}' is needed but has no supply.")
+        
+        # Calculate total theoretical capacity per waffle type:
+        # sum over allowed pans and weeks of supply * waffles per pan
+        total_capacity = (allowed_matrix.astype(total_pan_supply.dtype) @ total_pan_supply) * wpp_vector
         
         # Compare total capacity to total demand
-        for w in waffle_types:
-            total_demand = sum(demand.get((w, t), 0) for t in weeks)
-            if total_demand > total_capacity.get(w, 0):
-                critical_issues.append(f"Total demand for waffle type '{w}' ({total_demand}) exceeds maximum theoretical capacity ({total_capacity.get(w, 0)}).")
+        total_demand = demand_matrix.sum(axis=1)
+        for i in np.flatnonzero(total_demand > total_capacity):
+            critical_issues.append(f"Total demand for waffle type '{waffle_types[i]}' ({total_demand[i].item()}) exceeds maximum theoretical capacity ({total_capacity[i].item()}).")
                 
         # Check if total theoretical demand exceeds total theoretical capacity
         total_all_demand = sum(demand.values())
-        total_all_capacity = sum(
-            supply.get((p, t), 0) * wpp.get(w, 0)
-            for p in pan_types
-            for t in weeks
-            for w in waffle_types
-            if allowed.get((w, p), False) and (p, t) in supply
-        )
+        total_all_capacity = total_capacity.sum().item()
         if total_all_demand > total_all_capacity:
             critical_issues.append(f"Total demand ({total_all_demand}) exceeds maximum theoretical capacity ({total_all_capacity}).")
                 
@@ -171,44 +143,21 @@ class DataValidator:
         """
         issues = []
         
-        # Extract data
-        waffle_types = data.get('waffle_types', [])
-        pan_types = data.get('pan_types', [])
-        weeks = data.get('weeks', [])
-        demand = data.get('demand', {})
-        supply = data.get('supply', {})
-        wpp = data.get('wpp', {})
-        allowed = data.get('allowed', {})
-        
-        # Check weekly feasibility
-        for t in weeks:
-            # Calculate weekly demand per waffle type
-            weekly_demand = {}
-            for w in waffle_types:
-                if (w, t) in demand:
-                    weekly_demand[w] = demand[(w, t)]
-            
-            # Calculate weekly supply per pan type
-            weekly_supply = {}
-            for p in pan_types:
-                if (p, t) in supply:
-                    weekly_supply[p] = supply[(p, t)]
-            
-            # Check if all pans were used in previous weeks
-            # Assume carry-over is allowed for this basic check
-            
-            # Calculate total weekly capacity per waffle type
-            weekly_capacity = {}
-            for w in waffle_types:
-                weekly_capacity[w] = 0
-                for p in pan_types:
-                    if allowed.get((w, p), False) and p in weekly_supply:
-                        weekly_capacity[w] += weekly_supply[p] * wpp.get(w, 0)
-            
-            # Compare weekly capacity to weekly demand
-            for w in waffle_types:
-                if w in weekly_demand and weekly_demand[w] > weekly_capacity.get(w, 0):
-                    issues.append(f"Week {t}: Demand for waffle type '{w}' ({weekly_demand[w]}) exceeds maximum theoretical capacity ({weekly_capacity.get(w, 0)}).")
+        arrays = as_optimization_data(data)
+        demand_matrix = arrays.demand_matrix()
+        
+        # Calculate total weekly capacity per waffle type (W x T):
+        # sum over allowed pans of weekly supply * waffles per pan
+        supply_matrix = arrays.supply_matrix()
+        weekly_capacity = (arrays.allowed_matrix().astype(supply_matrix.dtype) @ supply_matrix) \
+            * arrays.wpp_vector()[:, None]
+        
+        # Compare weekly capacity to weekly demand (checked week by week)
+        exceeded = arrays.demand_mask & (demand_matrix > weekly_capacity)
+        for t_idx, w_idx in zip(*np.nonzero(exceeded.T)):
+            w = arrays.waffle_types[w_idx]
+            t = arrays.weeks[t_idx]
+            issues.append(f"Week {t}: Demand for waffle type '{w}' ({demand_matrix[w_idx, t_idx].item()}) exceeds maximum theoretical capacity ({weekly_capacity[w_idx, t_idx].item()}).")
         
         # Check the result
         is_feasible = len(issues) == 0
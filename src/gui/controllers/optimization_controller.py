@@ -2,13 +2,18 @@
 Controller for managing optimization processes.
 """
 import os
+import json
 import logging
 import pandas as pd
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
 import time
 
 from src.data.processor import DataProcessor
+from src.data.cache import DEFAULT_CACHE_DIR
 from src.data.validator import DataValidator
+from src.solvers.presolve import presolve
+from src.solvers.rounding import FAST_SOLVERS
+from src.solvers.result_cache import SolveCache
 from src.models.parameter_registry import ParameterRegistry
 
 logger = logging.getLogger(__name__)
@@ -22,16 +27,22 @@ class OptimizationWorker(QObject):
     result = pyqtSignal(dict)
     finished = pyqtSignal()
     
-    def __init__(self, config):
+    def __init__(self, config, solve_cache=None, warm_start=None, model_session=None):
         super().__init__()
         self.config = config
+        self.solve_cache = solve_cache
+        self.warm_start = warm_start
+        # (key, solver) of the previous run, whose model is updated instead of rebuilt
+        self.model_session = model_session
         self.cancelled = False
     
     def run(self):
         """Execute the optimization process."""
         try:
             # Create data processor
-            data_processor = DataProcessor(debug_mode=self.config.get('debug', False))
+            # Threads rather than processes: forking the running Qt application is unsafe
+            data_processor = DataProcessor(debug_mode=self.config.get('debug', False),
+                                           cache_dir=DEFAULT_CACHE_DIR, parallel_load='thread')
             
             # Load data
             self.progress.emit(10, "Loading input data...", 0, 0)
@@ -71,20 +82,82 @@ class OptimizationWorker(QObject):
             # Create solver with constraints
             self.progress.emit(40, "Initializing solver with constraints...", 0, 0)
             
+            # The fast tier rounds the LP relaxation, which only the OR-Tools and PuLP solvers do
+            solver_options = {}
+            solver_name = self.config.get('solver', 'ortools')
+            if self.config.get('speed', 'exact') == 'fast':
+                solver_options['fast'] = True
+                if solver_name not in FAST_SOLVERS:
+                    logger.info(f"Solver '{solver_name}' has no fast mode, using 'ortools'")
+                    solver_name = 'ortools'
+            
+            # Race workers are spawned, since forking the running Qt application is unsafe
+            if solver_name == 'race':
+                solver_options['start_method'] = 'spawn'
+            
+            # Re-running an unchanged optimization returns the cached solution
+            maximize = self.config.get('objective', 'cost') != 'cost'
+            objective = 'maximize_output' if maximize else 'minimize_cost'
+            configuration = data_processor.get_constraint_manager().get_solver_manager().get_serializable_configuration()
+            cache_options = {key: value for key, value in solver_options.items() if key != 'start_method'}
+            cache_options['presolve'] = self.config.get('presolve', False)
+            cache_key = None
+            if self.solve_cache is not None:
+                cache_key = self.solve_cache.key(
+                    optimization_data, configuration, objective, solver_name,
+                    self.config.get('time_limit', 60), self.config.get('gap', 0.01), cache_options)
+                cached = self.solve_cache.get(cache_key, reuse_incumbent=self.config.get('reuse_incumbents', False))
+                if cached is not None:
+                    _, full_solution = cached
+                    full_solution['status'] = full_solution.get('status', 'unknown').upper()
+                    full_solution['cached'] = True
+                    self.progress.emit(100, f"Loaded cached solution - Status: {full_solution['status']}",
+                                       full_solution.get('gap', 0), full_solution.get('iterations', 0))
+                    time.sleep(0.1)  # Small delay to ensure UI thread processes the progress signal
+                    self.result.emit(full_solution)
+                    self.finished.emit()
+                    return
+            
             # Use the constraint manager to create a solver with constraints
             solver = data_processor.create_solver_with_constraints(
-                solver_name=self.config.get('solver', 'ortools'),
+                solver_name=solver_name,
                 time_limit=self.config.get('time_limit', 60),
-                optimality_gap=self.config.get('gap', 0.01)
+                optimality_gap=self.config.get('gap', 0.01),
+                **solver_options
             )
             
+            # The solver of the previous run is reused if only the data or the constraints changed
+            session_key = json.dumps([objective, solver_name, self.config.get('time_limit', 60),
+                                      self.config.get('gap', 0.01), cache_options], sort_keys=True, default=repr)
+            if (self.model_session is not None and self.model_session[0] == session_key
+                    and type(self.model_session[1]) is type(solver)):
+                self.model_session[1].set_constraints(solver.get_all_constraints())
+                solver = self.model_session[1]
+            self.model_session = None
+            
+            # Remove provably zero variables and bound the others before building
+            if self.config.get('presolve', False):
+                presolve_result = presolve(optimization_data, solver.get_all_constraints(), maximize=maximize)
+                solver.set_presolve(presolve_result)
+                statistics = presolve_result.get_statistics()
+                logger.info(f"Presolve removed {statistics['removed_variables']} of {statistics['variables']} "
+                            f"variables and {statistics['removed_rows']} rows")
+            
+            # Start from the solution of the previous run, mapped onto the edited model
+            solver.set_warm_start(self.warm_start)
+            
             # Set up the model
-            self.progress.emit(50, "Building optimization model...", 0, 0)
-            # Choose which model to build based on the objective
-            if self.config.get('objective', 'cost') == 'cost':
-                solver.build_minimize_cost_model(optimization_data)
+            if solver.data is not None:
+                # Patch the model of the previous run for the new data and constraints, or rebuild it
+                self.progress.emit(50, "Updating optimization model...", 0, 0)
+                solver.update_model(optimization_data)
             else:
-                solver.build_maximize_output_model(optimization_data)
+                self.progress.emit(50, "Building optimization model...", 0, 0)
+                # Choose which model to build based on the objective
+                if not maximize:
+                    solver.build_minimize_cost_model(optimization_data)
+                else:
+                    solver.build_maximize_output_model(optimization_data)
             
             # Check if cancelled
             if self.cancelled:
@@ -101,6 +174,9 @@ class OptimizationWorker(QObject):
             
             # Get the full solution
             full_solution = solver.get_solution()
+            self.model_session = (session_key, solver)
+            if cache_key is not None:
+                self.solve_cache.put(cache_key, solution, full_solution)
             
             # Normalize status to uppercase for consistent comparison
             status = full_solution.get('status', 'unknown').upper()
@@ -158,6 +234,16 @@ class OptimizationController(QObject):
         # Initialize data processor
         self.data_processor = DataProcessor()
         
+        # Solutions of earlier runs, reused when an unchanged optimization is run again
+        self.solve_cache = SolveCache()
+        
+        # Last solution of each objective, the starting point of the next run
+        self.warm_starts = {}
+        self.running_objective = None
+        
+        # Solver of the last run, whose model the next run updates for new data
+        self.model_session = None
+        
         # Connect to parameter changes
         self.optimization_params.parameter_changed.connect(self._on_parameter_changed)
         self.data_params.parameter_changed.connect(self._on_data_parameter_changed)
@@ -257,9 +343,12 @@ class OptimizationController(QObject):
                 # Optimization settings
                 "objective": self.optimization_params.get_parameter("objective", "cost"),
                 "solver": self.optimization_params.get_parameter("solver", "ortools"),
+                "speed": self.optimization_params.get_parameter("speed", "exact"),
                 "time_limit": self.optimization_params.get_parameter("time_limit", 60),
                 "gap": self.optimization_params.get_parameter("gap", 0.005),
                 "debug": self.optimization_params.get_parameter("debug_mode", False),
+                "reuse_incumbents": self.optimization_params.get_parameter("reuse_incumbents", False),
+                "presolve": self.optimization_params.get_parameter("presolve", False),
                 
                 # Output settings
                 "output": self.optimization_params.get_parameter("output_path", "")
@@ -277,7 +366,12 @@ class OptimizationController(QObject):
         
         # Create worker and thread
         self.thread = QThread()
-        self.worker = OptimizationWorker(config)
+        self.running_objective = config.get('objective', 'cost')
+        # The worker owns the model session until it returns it with its results
+        self.worker = OptimizationWorker(config, solve_cache=self.solve_cache,
+                                         warm_start=self.warm_starts.get(self.running_objective),
+                                         model_session=self.model_session)
+        self.model_session = None
         self.worker.moveToThread(self.thread)
         
         # Connect signals
@@ -305,6 +399,10 @@ class OptimizationController(QObject):
     def _store_results(self, results):
         """Store the optimization results and emit completion signal."""
         self.results = results
+        if self.worker is not None:
+            self.model_session = self.worker.model_session
+        if results.get('values'):
+            self.warm_starts[self.running_objective] = results['values']
         
         # Store results in parameter model for accessibility
         self.optimization_params.set_parameter("results", results)
@@ -340,7 +438,8 @@ class OptimizationController(QObject):
             logger.debug(f"Loading data with config: {config}")
             
             # Create new data processor
-            self.data_processor = DataProcessor(debug_mode=config.get('debug', False))
+            self.data_processor = DataProcessor(debug_mode=config.get('debug', False),
+                                                cache_dir=DEFAULT_CACHE_DIR, parallel_load='thread')
 
             constraint_config_path = config.get('constraint_config', None)
             constraints_loaded_from_file = False
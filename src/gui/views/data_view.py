@@ -44,7 +44,7 @@ class DataView(ParameterAwareView):
         super().__init__(
             title="Data Configuration",
             description="Configure the input data files for waffle production optimization. "
-                      "All files should be in Excel (.xlsx) format.",
+                      "Files can be Excel (.xlsx), CSV, Parquet or Feather files.",
             main_window=main_window,
             action_button_text="Check Data Completeness",
             model_name="data"
@@ -75,8 +75,9 @@ class DataView(ParameterAwareView):
         # File selectors - save references for getting values later
         self.file_selectors = {}
         
-        # Excel filter
-        excel_filter = "Excel Files (*.xlsx)"
+        # Input file filter
+        excel_filter = ("Input Files (*.xlsx *.csv *.parquet *.feather);;Excel Files (*.xlsx);;"
+                        "CSV Files (*.csv);;Parquet Files (*.parquet);;Feather Files (*.feather)")
         
         file_configs = [
             ("demand", "Demand Data", "Select waffle demand file"),
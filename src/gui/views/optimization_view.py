@@ -73,6 +73,7 @@ class OptimizationView(ParameterAwareView):
         # For combo boxes
         self._bind_combo_box(self.objective_combo, "objective")
         self._bind_combo_box(self.solver_combo, "solver")
+        self._bind_combo_box(self.speed_combo, "speed")
         
         # For spin boxes
         self._bind_spin_box(self.time_limit, "time_limit")
@@ -80,6 +81,8 @@ class OptimizationView(ParameterAwareView):
         
         # For checkboxes
         self._bind_check_box(self.debug_mode, "debug_mode")
+        self._bind_check_box(self.reuse_incumbents, "reuse_incumbents")
+        self._bind_check_box(self.presolve, "presolve")
         
         # For output path (text)
         self._bind_combo_box(self.output_path, "output_path", use_data=False)
@@ -126,16 +129,29 @@ class OptimizationView(ParameterAwareView):
         # Solver selector
         self.solver_combo = QComboBox()
         solvers = [
+            ("Automatic", "auto"),
             ("OR-Tools", "ortools"),
+            ("HiGHS", "highs"),
+            ("OR-Tools CP-SAT", "cpsat"),
+            ("Network Flow", "flow"),
             ("CBC", "cbc"),
             ("GLPK", "glpk"),
             ("SCIP", "scip"),
-            ("COIN-OR", "coin_cmd")
+            ("COIN-OR", "coin_cmd"),
+            ("Race (portfolio)", "race")
         ]
         for label, value in solvers:
             self.solver_combo.addItem(label, value)
         form_layout.addRow("Solver:", self.solver_combo)
         
+        # Speed tier: exact MIP solve, or rounded LP relaxation for either objective
+        self.speed_combo = QComboBox()
+        self.speed_combo.addItem("Exact", "exact")
+        self.speed_combo.addItem("Fast (LP rounding)", "fast")
+        self.speed_combo.setToolTip("Fast solves the LP relaxation and rounds it to a feasible plan; "
+                                    "the gap is measured against the LP bound")
+        form_layout.addRow("Speed:", self.speed_combo)
+        
         # Time limit
         self.time_limit = QSpinBox()
         self.time_limit.setRange(1, 3600)  # 1 second to 1 hour
@@ -156,6 +172,20 @@ class OptimizationView(ParameterAwareView):
         self.debug_mode.setChecked(False)
         form_layout.addRow("Debug:", self.debug_mode)
         
+        # Cached solutions of an unchanged optimization are reused if optimal; incumbents only on request
+        self.reuse_incumbents = QCheckBox("Reuse cached non-optimal solutions")
+        self.reuse_incumbents.setChecked(False)
+        self.reuse_incumbents.setToolTip("Return the cached best solution of an identical run that stopped "
+                                         "before proving optimality, instead of solving again")
+        form_layout.addRow("Cache:", self.reuse_incumbents)
+        
+        # Presolve removes provably zero variables and tightens bounds and big-M values
+        self.presolve = QCheckBox("Remove zero variables and tighten bounds")
+        self.presolve.setChecked(False)
+        self.presolve.setToolTip("Drop production that no feasible plan can use and, when minimizing cost, "
+                                 "production in weeks without demand, before the model is built")
+        form_layout.addRow("Presolve:", self.presolve)
+        
         self.content_layout.addWidget(settings_group)
         
         # Output file setting
@@ -246,6 +276,12 @@ class OptimizationView(ParameterAwareView):
             solver_value = self.solver_combo.itemData(solver_index)
             self.param_model.set_parameter("solver", solver_value, emit_signal=False)
         
+        # Speed tier
+        speed_index = self.settings.value("optimization/speed_index", 0, int)
+        if 0 <= speed_index < self.speed_combo.count():
+            speed_value = self.speed_combo.itemData(speed_index)
+            self.param_model.set_parameter("speed", speed_value, emit_signal=False)
+        
         # Time limit
         time_limit = self.settings.value("optimization/time_limit", 60, int)
         self.param_model.set_parameter("time_limit", time_limit, emit_signal=False)
@@ -258,6 +294,14 @@ class OptimizationView(ParameterAwareView):
         debug_mode = self.settings.value("optimization/debug_mode", False, bool)
         self.param_model.set_parameter("debug_mode", debug_mode, emit_signal=False)
         
+        # Reuse of cached incumbents
+        reuse_incumbents = self.settings.value("optimization/reuse_incumbents", False, bool)
+        self.param_model.set_parameter("reuse_incumbents", reuse_incumbents, emit_signal=False)
+        
+        # Presolve
+        presolve = self.settings.value("optimization/presolve", False, bool)
+        self.param_model.set_parameter("presolve", presolve, emit_signal=False)
+        
         # Output path
         output_path = self.settings.value("optimization/output_path", "")
         if output_path:
@@ -284,9 +328,12 @@ class OptimizationView(ParameterAwareView):
         # Save from widget state, not parameter model, to ensure we have the latest values
         self.settings.setValue("optimization/objective_index", self.objective_combo.currentIndex())
         self.settings.setValue("optimization/solver_index", self.solver_combo.currentIndex())
+        self.settings.setValue("optimization/speed_index", self.speed_combo.currentIndex())
         self.settings.setValue("optimization/time_limit", self.time_limit.value())
         self.settings.setValue("optimization/gap", self.gap.value())
         self.settings.setValue("optimization/debug_mode", self.debug_mode.isChecked())
+        self.settings.setValue("optimization/reuse_incumbents", self.reuse_incumbents.isChecked())
+        self.settings.setValue("optimization/presolve", self.presolve.isChecked())
         self.settings.setValue("optimization/output_path", self.output_path.currentText())
         self.settings.setValue("optimization/export_format", self.export_format.currentIndex())
     
@@ -413,9 +460,14 @@ class OptimizationView(ParameterAwareView):
         self.action_button.setEnabled(True)
         
         # Force the UI to update by directly manipulating the status widget based on optimization status
-        if status.upper() == 'OPTIMAL':
+        # Fast mode returns a FEASIBLE rounded plan with its gap to the LP bound
+        rounded = status.upper() == 'FEASIBLE' and results.get('lp_bound') is not None
+        if status.upper() == 'OPTIMAL' or rounded:
             # For optimal solutions, force 100% progress and success message
-            message = f"Optimization complete - Optimal solution found (Gap: {gap:.2%})"
+            if rounded:
+                message = f"Optimization complete - Rounded LP solution found (Gap to LP bound: {gap:.2%})"
+            else:
+                message = f"Optimization complete - Optimal solution found (Gap: {gap:.2%})"
             
             # Direct widget manipulation to ensure consistent state
             logger.debug("Setting optimization to complete state with 100% progress")
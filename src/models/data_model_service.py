@@ -7,6 +7,7 @@ import logging
 import os
 from PyQt6.QtCore import QObject, pyqtSignal
 from src.data.processor import DataProcessor
+from src.data.cache import DEFAULT_CACHE_DIR
 from .parameter_registry import ParameterRegistry
 
 logger = logging.getLogger(__name__)
@@ -27,7 +28,9 @@ class DataModelService(QObject):
         """
         super().__init__()
         self.debug_mode = debug_mode
-        self.data_processor = DataProcessor(debug_mode=debug_mode)
+        # Keep the raw tables so that a changed input file only re-reads that file
+        self.data_processor = DataProcessor(debug_mode=debug_mode, cache_dir=DEFAULT_CACHE_DIR,
+                                            parallel_load='thread', keep_raw_frames=True)
         self.param_registry = ParameterRegistry.get_instance()
         self.data_params = self.param_registry.get_model("data")
         self.optimization_params = self.param_registry.get_model("optimization")
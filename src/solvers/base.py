@@ -4,10 +4,12 @@ Solver Interface Module for Waffle Production Optimization.
 This module defines the abstract base class for solver implementations.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Mapping, Optional, List, Tuple
 import logging
 
+from src.solvers.block_cache import BlockCache
 from src.solvers.constraints import Constraint, ConstraintRegistry
+from src.solvers.presolve import PresolveResult
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -22,8 +24,74 @@ class SolverInterface(ABC):
         self.constraint_registry = ConstraintRegistry()
         self.data = None
         self.model_type = None
+        self.presolve_result = None
+        self.warm_start = None
         logger.debug(f"Initialized {self.__class__.__name__}")
     
+    def set_block_compilation(self, cache: Optional[BlockCache] = None, threads: int = 1) -> None:
+        """
+        Configure how the constraint blocks of matrix-built models are compiled.
+        
+        Each solver caches the blocks it compiled, so that rebuilding or updating
+        a model only compiles constraints whose data or configuration changed. A
+        cache passed here can be shared between solvers, e.g. by the runs of a
+        scenario sweep over the same data.
+        
+        Args:
+            cache: Cache of compiled blocks (None disables caching)
+            threads: Number of threads to compile the blocks of different constraints in
+        """
+        if threads < 1:
+            raise ValueError(f"Invalid number of compile threads: {threads}")
+        self.constraint_registry.block_cache = cache
+        self.constraint_registry.compile_threads = threads
+    
+    def set_presolve(self, presolve_result: Optional[PresolveResult]) -> None:
+        """
+        Use the variable bounds of a presolve run for the models built next.
+        
+        Args:
+            presolve_result: PresolveResult of the data the next model is built from,
+                             or None to build models without presolve
+        """
+        self.presolve_result = presolve_result
+        if presolve_result is not None:
+            logger.debug(f"Using presolve bounds in {self.__class__.__name__}: {presolve_result.get_statistics()}")
+    
+    def set_warm_start(self, solution: Optional[Mapping]) -> None:
+        """
+        Use a prior solution as the starting point of the next solves.
+        
+        The prior solution is mapped onto the variables of the model being solved
+        by (waffle, pan, week), so it may come from a model of edited data: variables
+        it does not cover start at 0 and values of variables that no longer exist are
+        dropped. Solvers pass it on as a hint or MIP start where their backend
+        supports one, and ignore it otherwise.
+        
+        Args:
+            solution: Solution of get_solution, or its values by (waffle, pan, week),
+                      or None to solve without a starting point
+        """
+        if solution is not None and 'values' in solution:
+            solution = solution['values']
+        self.warm_start = dict(solution) if solution else None
+        if self.warm_start is not None:
+            logger.debug(f"Using a warm start with {len(self.warm_start)} non-zero values "
+                         f"in {self.__class__.__name__}")
+    
+    def warm_start_values(self, keys: Iterable[Tuple]) -> List[float]:
+        """
+        Get the warm start values of variables, in the order of their keys.
+        
+        Args:
+            keys: (waffle, pan, week) keys of the model's variables
+            
+        Returns:
+            List[float]: Rounded, non-negative value of each variable in the prior solution
+        """
+        warm_start = self.warm_start or {}
+        return [float(max(round(warm_start.get(key, 0)), 0)) for key in keys]
+    
     def add_constraint(self, name: str, constraint: Constraint) -> None:
         """
         Add a constraint to the solver.
@@ -45,6 +113,23 @@ class SolverInterface(ABC):
         logger.debug(f"Removing constraint '{name}' from {self.__class__.__name__}")
         self.constraint_registry.unregister_constraint(name)
     
+    def set_constraints(self, constraints: Mapping[str, Constraint]) -> None:
+        """
+        Replace the registered constraints.
+        
+        Constraints that are not in the new set are removed and the others are
+        added or replaced. A built model picks the new constraints up with
+        update_model, without a rebuild where the solver supports it.
+        
+        Args:
+            constraints: Constraints by name, e.g. get_all_constraints of another solver
+        """
+        for name in self.constraint_registry.get_all_constraints():
+            if name not in constraints:
+                self.remove_constraint(name)
+        for name, constraint in constraints.items():
+            self.add_constraint(name, constraint)
+    
     def get_constraint(self, name: str) -> Optional[Constraint]:
         """
         Get a constraint by name.
@@ -125,6 +210,56 @@ class SolverInterface(ABC):
         """
         logger.info(f"Solving {self.model_type} model")
     
+    def update_model(self, data: Mapping) -> bool:
+        """
+        Update the built model for new data and the registered constraints, keeping its objective.
+        
+        When the new data only changes demand, supply, cost or WPP values, solvers
+        that keep a matrix model patch the bounds and coefficients of the loaded model
+        in place, so that the next solve_model skips the build. Constraints added or
+        removed since the build (see set_constraints) are added to or deleted from the
+        loaded model as blocks of rows and auxiliary columns by the HiGHS solver and
+        the bulk build of the OR-Tools solver, and so are constraints whose rows
+        changed, e.g. through new demand entries or presolve bounds that remove
+        variables. Other solvers rebuild the model for such changes.
+        
+        Args:
+            data: New optimization data, e.g. OptimizationData.with_changes of the current data
+        
+        Returns:
+            bool: True if the model was patched in place, False if it was rebuilt
+        
+        Raises:
+            ValueError: If no model has been built
+        """
+        if self.data is None or self.model_type is None:
+            raise ValueError("Model has not been built. Call build_minimize_cost_model or build_maximize_output_model first.")
+        
+        if self._patch_model(data):
+            self.data = data
+            logger.info(f"Updated {self.model_type} model of {self.__class__.__name__} in place")
+            return True
+        
+        logger.info(f"Rebuilding {self.model_type} model of {self.__class__.__name__} for the new data")
+        if self.model_type == 'maximize_output':
+            self.build_maximize_output_model(data)
+        else:
+            self.build_minimize_cost_model(data)
+        return False
+    
+    def _patch_model(self, data: Mapping) -> bool:
+        """
+        Patch the built model for new data in place.
+        
+        Args:
+            data: New optimization data
+        
+        Returns:
+            bool: True if the model was patched, False if it has to be rebuilt
+                  (the default for solvers without in-place updates)
+        """
+        return False
+    
     @abstractmethod
     def get_solution(self) -> Dict:
         """
@@ -136,19 +271,108 @@ class SolverInterface(ABC):
         logger.debug("Retrieving solution")
 
 
+
+class MetaSolver(SolverInterface):
+    """
+    Base class for solvers that solve the model with other solvers of SolverFactory.
+    
+    Building a model only validates and stores the data and the objective; the
+    models of the underlying solvers are built when solve_model runs them.
+    Subclasses implement solve_model and store the merged solution in self.solution.
+    """
+    
+    # Name of the solve mode in log messages, e.g. 'decomposed'
+    mode = 'meta'
+    
+    def __init__(self):
+        """Initialize the meta solver without data or solution."""
+        super().__init__()  # Initialize constraint registry
+        self.maximize = False
+        self.solution = None
+    
+    def apply_constraints(self) -> None:
+        """
+        Validate the data for all registered constraints.
+        
+        The constraints are applied to the models of the underlying solvers.
+        
+        Raises:
+            ValueError: If the data is invalid for a constraint
+        """
+        for name, constraint in self.get_all_constraints().items():
+            if not constraint.validate_data(self.data):
+                raise ValueError(f"Invalid data for constraint '{name}'")
+    
+    def _build(self, data: Dict, maximize: bool) -> None:
+        """
+        Store the data and objective of the model.
+        
+        Args:
+            data: Dictionary containing optimization data
+            maximize: If True, maximize waffle output, otherwise minimize cost
+        """
+        self.data = data
+        self.maximize = maximize
+        self.solution = None
+        self.apply_constraints()
+    
+    def build_minimize_cost_model(self, data: Dict) -> None:
+        """
+        Build an optimization model to minimize production cost.
+        
+        Args:
+            data: Dictionary containing optimization data
+        """
+        logger.info(f"Building {self.mode} cost minimization model")
+        self.model_type = 'minimize_cost'
+        self._build(data, maximize=False)
+    
+    def build_maximize_output_model(self, data: Dict) -> None:
+        """
+        Build an optimization model to maximize waffle output.
+        
+        Args:
+            data: Dictionary containing optimization data
+        """
+        logger.info(f"Building {self.mode} output maximization model")
+        self.model_type = 'maximize_output'
+        self._build(data, maximize=True)
+    
+    def get_solution(self) -> Dict:
+        """
+        Get the solution merged by solve_model.
+        
+        Returns:
+            Dict: Dictionary containing the solution variables and objective value
+        """
+        if self.solution is None:
+            logger.warning("Cannot retrieve solution: no solution available")
+            return {
+                "status": "NOT_SOLVED",
+                "values": {},
+                "objective_value": None,
+                "model_type": self.model_type
+            }
+        return self.solution
+
 class SolverFactory:
     """
     Factory class for creating solver instances.
     """
     
     @staticmethod
-    def create_solver(solver_name: str, constraints: Dict[str, Constraint] = None, **kwargs) -> SolverInterface:
+    def create_solver(solver_name: str, constraints: Dict[str, Constraint] = None, decompose: bool = False,
+                      rolling_horizon: Optional[Tuple[int, int]] = None, **kwargs) -> SolverInterface:
         """
         Create a solver instance based on the solver name.
         
         Args:
             solver_name: Name of the solver
             constraints: Dictionary mapping constraint names to constraint instances
+            decompose: If True, split the model into independent blocks and solve each
+                       with the named solver (see DecomposedSolver)
+            rolling_horizon: Optional (window, step) in weeks; if given, solve windows of
+                             window weeks and fix step weeks at a time (see RollingHorizonSolver)
             **kwargs: Additional arguments for the solver
             
         Returns:
@@ -159,20 +383,37 @@ class SolverFactory:
         """
         from src.solvers.ortools_solver import ORToolsSolver
         from src.solvers.pulp_solver import PulpSolver
+        from src.solvers.highs_solver import HighsSolver
+        from src.solvers.cpsat_solver import CpSatSolver
+        from src.solvers.flow_solver import NetworkFlowSolver
+        from src.solvers.race import RacingSolver
         
         solvers = {
             'ortools': ORToolsSolver,
+            'highs': HighsSolver,
+            'cpsat': CpSatSolver,
+            'flow': NetworkFlowSolver,
             'cbc': lambda **kwargs: PulpSolver(solver_name='CBC', **kwargs),
             'glpk': lambda **kwargs: PulpSolver(solver_name='GLPK', **kwargs),
             'scip': lambda **kwargs: PulpSolver(solver_name='SCIP', **kwargs),
             'coin_cmd': lambda **kwargs: PulpSolver(solver_name='COIN_CMD', **kwargs),
+            'race': RacingSolver,
             # Additional solvers can be added here
         }
         
         if solver_name.lower() not in solvers:
             raise ValueError(f"Solver '{solver_name}' is not supported.")
             
-        solver = solvers[solver_name.lower()](**kwargs)
+        if rolling_horizon is not None:
+            from src.solvers.rolling_horizon import RollingHorizonSolver
+            window, step = rolling_horizon
+            solver = RollingHorizonSolver(solver_name=solver_name.lower(), window=window, step=step,
+                                          decompose=decompose, **kwargs)
+        elif decompose:
+            from src.solvers.decomposition import DecomposedSolver
+            solver = DecomposedSolver(solver_name=solver_name.lower(), **kwargs)
+        else:
+            solver = solvers[solver_name.lower()](**kwargs)
         
         # Add constraints if provided
         if constraints:
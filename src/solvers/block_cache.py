@@ -0,0 +1,172 @@
+"""
+Compiled Constraint Block Module for Waffle Production Optimization.
+
+Constraints with matrix support are compiled into CompiledBlock instances: the
+rows and auxiliary columns of one constraint as NumPy arrays, independent of any
+solver backend. This module caches compiled blocks, keyed by the data, the
+decision variable bounds and the constraint configuration, and compiles the
+blocks of several constraints in parallel threads. The HiGHS, OR-Tools, CP-SAT
+and PuLP solvers load the blocks into their backends.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from src.solvers.matrix_model import CompiledBlock, MatrixModel
+from src.solvers.result_cache import data_fingerprint
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def constraint_key(constraint: Any) -> str:
+    """
+    Describe a constraint by its class and configuration.
+
+    Constraint instances only hold their configuration, so two constraints with
+    the same key compile to the same block.
+
+    Args:
+        constraint: Constraint instance
+
+    Returns:
+        str: Key of the constraint
+    """
+    cls = type(constraint)
+    return f"{cls.__module__}.{cls.__qualname__}{sorted(vars(constraint).items())!r}"
+
+
+def matrix_key(matrix: MatrixModel) -> str:
+    """
+    Compute the part of the block key shared by all constraints of a matrix model.
+
+    Args:
+        matrix: MatrixModel the blocks are compiled for
+
+    Returns:
+        str: Hexadecimal key of the data, decision variable bounds and naming
+    """
+    digest = hashlib.sha256(data_fingerprint(matrix.data).encode())
+    digest.update(matrix.variable_upper.tobytes())
+    digest.update(b'names' if matrix.with_names else b'')
+    return digest.hexdigest()
+
+
+class BlockCache:
+    """
+    In-memory cache of compiled constraint blocks.
+
+    The cache holds the max_entries most recently used blocks and can be shared
+    between solvers and threads.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        """
+        Initialize the block cache.
+
+        Args:
+            max_entries: Maximum number of blocks in the cache
+        """
+        self.max_entries = max_entries
+        self._blocks: 'OrderedDict[Tuple[str, str], CompiledBlock]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[CompiledBlock]:
+        """
+        Look up a compiled block.
+
+        Args:
+            key: Matrix key and constraint key
+
+        Returns:
+            Optional[CompiledBlock]: The block, or None on a cache miss
+        """
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._blocks.move_to_end(key)
+        return block
+
+    def put(self, key: Tuple[str, str], block: CompiledBlock) -> None:
+        """
+        Store a compiled block, evicting the least recently used ones.
+
+        Args:
+            key: Matrix key and constraint key
+            block: Compiled block
+        """
+        with self._lock:
+            self._blocks[key] = block
+            self._blocks.move_to_end(key)
+            while len(self._blocks) > self.max_entries:
+                self._blocks.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all blocks and reset the statistics."""
+        with self._lock:
+            self._blocks.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Get statistics about the cache.
+
+        Returns:
+            Dict[str, int]: Number of blocks, hits and misses
+        """
+        with self._lock:
+            return {'blocks': len(self._blocks), 'hits': self.hits, 'misses': self.misses}
+
+
+def compile_blocks(matrix: MatrixModel, constraints: Mapping[str, Any], data: Mapping,
+                   cache: Optional[BlockCache] = None, threads: int = 1) -> List[Tuple[str, CompiledBlock]]:
+    """
+    Compile the blocks of constraints for the decision variables of a matrix model.
+
+    Blocks found in the cache are reused. The others are compiled, in parallel
+    threads if threads is above 1, and stored in the cache.
+
+    Args:
+        matrix: MatrixModel the blocks are compiled for (not modified)
+        constraints: Constraints with matrix support by name, in block order
+        data: Dictionary containing optimization data
+        cache: Cache of compiled blocks (default: no caching)
+        threads: Number of threads to compile blocks in
+
+    Returns:
+        List[Tuple[str, CompiledBlock]]: Name and block of each constraint, in the given order
+    """
+    shared_key = matrix_key(matrix) if cache is not None else None
+    blocks: Dict[str, CompiledBlock] = {}
+    missing = []
+    for name, constraint in constraints.items():
+        block = cache.get((shared_key, constraint_key(constraint))) if cache is not None else None
+        if block is None:
+            missing.append(name)
+        else:
+            blocks[name] = block
+
+    def compile_one(name):
+        return matrix.compile_block(constraints[name], data)
+
+    if threads > 1 and len(missing) > 1:
+        with ThreadPoolExecutor(max_workers=min(threads, len(missing))) as executor:
+            compiled = list(executor.map(compile_one, missing))
+    else:
+        compiled = [compile_one(name) for name in missing]
+    for name, block in zip(missing, compiled):
+        blocks[name] = block
+        if cache is not None:
+            cache.put((shared_key, constraint_key(constraints[name])), block)
+    if missing:
+        logger.debug(f"Compiled constraint blocks: {', '.join(missing)}")
+    return [(name, blocks[name]) for name in constraints]
@@ -16,6 +16,8 @@ class AllowedCombinationsConstraint(Constraint):
     are used in the optimization model.
     """
     
+    matrix_support = True
+    
     def __init__(self):
         """Initialize the allowed combinations constraint."""
         pass
@@ -52,6 +54,19 @@ class AllowedCombinationsConstraint(Constraint):
         # No explicit constraint needed - already enforced by variable creation
         pass
     
+    def apply_to_matrix(self, matrix: Any, data: Dict) -> None:
+        """
+        Append allowed combinations constraint to a matrix model.
+        
+        Note: Matrix models only have columns for allowed combinations, so this
+        method is a no-op as well.
+        
+        Args:
+            matrix: MatrixModel instance
+            data: Dictionary containing optimization data
+        """
+        pass
+    
     def validate_data(self, data: Dict) -> bool:
         """
         Validate that required data for this constraint is present.
@@ -7,6 +7,9 @@ to manage constraints across different solver implementations.
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 
+from src.solvers.block_cache import BlockCache, compile_blocks
+from src.solvers.model_index import ModelIndex
+
 
 class Constraint(ABC):
     """
@@ -16,6 +19,10 @@ class Constraint(ABC):
     to ensure compatibility across solver implementations.
     """
     
+    # Whether the constraint implements apply_to_matrix and apply_to_cpsat
+    matrix_support = False
+    cpsat_support = False
+    
     @abstractmethod
     def apply_to_ortools(self, solver: Any, variables: Dict, data: Dict) -> None:
         """
@@ -23,7 +30,8 @@ class Constraint(ABC):
         
         Args:
             solver: OR-Tools solver instance
-            variables: Dictionary of decision variables
+            variables: Decision variables keyed by (waffle, pan, week); a ModelIndex
+                       when applied through the ConstraintRegistry
             data: Dictionary containing optimization data
         """
         pass
@@ -35,6 +43,35 @@ class Constraint(ABC):
         
         Args:
             problem: PuLP problem instance
+            variables: Decision variables keyed by (waffle, pan, week); a ModelIndex
+                       when applied through the ConstraintRegistry
+            data: Dictionary containing optimization data
+        """
+        pass
+    
+    def apply_to_matrix(self, matrix: Any, data: Dict) -> None:
+        """
+        Append this constraint to a matrix model as NumPy row blocks.
+        
+        Only called for constraints with matrix_support. The others are applied
+        to the solver with their per-backend method after the matrix model has
+        been loaded.
+        
+        Args:
+            matrix: MatrixModel instance
+            data: Dictionary containing optimization data
+        """
+        pass
+    
+    def apply_to_cpsat(self, model: Any, variables: Dict, data: Dict) -> None:
+        """
+        Apply this constraint to a CP-SAT model with native CP-SAT constructs.
+        
+        Only called for constraints with cpsat_support. The others are
+        translated to CP-SAT from their matrix rows.
+        
+        Args:
+            model: CP-SAT CpModel instance
             variables: Dictionary of decision variables
             data: Dictionary containing optimization data
         """
@@ -87,6 +124,10 @@ class ConstraintRegistry:
     def __init__(self):
         """Initialize an empty constraint registry."""
         self._constraints = {}
+        # Compiled matrix blocks are reused from block_cache (None disables caching)
+        # and compiled in compile_threads threads
+        self.block_cache = BlockCache()
+        self.compile_threads = 1
     
     def register_constraint(self, name: str, constraint: Constraint) -> None:
         """
@@ -129,16 +170,22 @@ class ConstraintRegistry:
         """
         return self._constraints.copy()
     
-    def apply_constraints(self, solver_type: str, solver: Any, variables: Dict, data: Dict) -> None:
+    def apply_constraints(self, solver_type: str, solver: Any, variables: Dict, data: Dict,
+                          index: Optional[ModelIndex] = None) -> None:
         """
         Apply all registered constraints to the solver model.
         
+        Every constraint receives the same ModelIndex as its variables argument,
+        so the variables are grouped only once per model.
+        
         Args:
-            solver_type: Type of solver ('ortools' or 'pulp')
+            solver_type: Type of solver ('ortools', 'pulp' or 'cpsat')
             solver: Solver instance
             variables: Dictionary of decision variables
             data: Dictionary containing optimization data
+            index: ModelIndex of the variables, built here if not given
         """
+        variables = index if index is not None else ModelIndex.of(variables, data)
         for name, constraint in self._constraints.items():
             if not constraint.validate_data(data):
                 raise ValueError(f"Invalid data for constraint '{name}'")
@@ -147,9 +194,50 @@ class ConstraintRegistry:
                 constraint.apply_to_ortools(solver, variables, data)
             elif solver_type.lower() == 'pulp':
                 constraint.apply_to_pulp(solver, variables, data)
+            elif solver_type.lower() == 'cpsat':
+                constraint.apply_to_cpsat(solver, variables, data)
             else:
                 raise ValueError(f"Unsupported solver type: {solver_type}")
     
+    def apply_matrix_constraints(self, matrix: Any, data: Dict,
+                                 native_solver_type: Optional[str] = None,
+                                 order: Optional[List[str]] = None) -> Dict[str, Constraint]:
+        """
+        Append all registered constraints that support it to a matrix model.
+        
+        Each constraint is compiled into a block (see src/solvers/block_cache.py),
+        reused from block_cache if it was compiled before, and appended as a named
+        block of the matrix model.
+        
+        Args:
+            matrix: MatrixModel instance
+            data: Dictionary containing optimization data
+            native_solver_type: If 'cpsat', constraints with a native CP-SAT formulation
+                                are deferred instead of appended to the matrix model
+            order: Names of all registered constraints in the order to append them
+                   (default: registration order)
+            
+        Returns:
+            Dict[str, Constraint]: Deferred constraints, to be applied to the solver
+                                   after the matrix model is loaded
+        """
+        deferred = {}
+        compiled = {}
+        for name in (order if order is not None else list(self._constraints)):
+            constraint = self._constraints[name]
+            if not constraint.validate_data(data):
+                raise ValueError(f"Invalid data for constraint '{name}'")
+            
+            if native_solver_type == 'cpsat' and constraint.cpsat_support:
+                deferred[name] = constraint
+            elif constraint.matrix_support:
+                compiled[name] = constraint
+            else:
+                deferred[name] = constraint
+        for name, block in compile_blocks(matrix, compiled, data, self.block_cache, self.compile_threads):
+            matrix.add_compiled_block(name, block)
+        return deferred
+    
     def validate_all_data(self, data: Dict) -> Dict[str, bool]:
         """
         Validate data for all registered constraints.
@@ -5,7 +5,10 @@ This module implements the demand satisfaction constraint for the optimization m
 """
 from typing import Dict, Any
 
+import numpy as np
+
 from src.solvers.constraints.base import Constraint
+from src.solvers.model_index import ModelIndex
 
 
 class DemandConstraint(Constraint):
@@ -16,6 +19,8 @@ class DemandConstraint(Constraint):
     exactly meets the demand specified in the input data.
     """
     
+    matrix_support = True
+    
     def __init__(self, equality: bool = True):
         """
         Initialize the demand constraint.
@@ -35,8 +40,9 @@ class DemandConstraint(Constraint):
             variables: Dictionary of decision variables
             data: Dictionary containing optimization data
         """
+        index = ModelIndex.of(variables, data)
         waffle_types = data['waffle_types']
-        weeks = sorted(data['weeks'])  # Sort weeks to ensure chronological order
+        weeks = index.weeks  # Sorted to ensure chronological order
         demand = data['demand']
         
         for w in waffle_types:
@@ -49,9 +55,8 @@ class DemandConstraint(Constraint):
                         # Inequality constraint (meet or exceed demand)
                         constraint = solver.Constraint(demand[(w, t)], solver.infinity())
                         
-                    for p in data['pan_types']:
-                        if (w, p, t) in variables:
-                            constraint.SetCoefficient(variables[(w, p, t)], 1)
+                    for var in index.by_waffle_week.get((w, t), []):
+                        constraint.SetCoefficient(var, 1)
     
     def apply_to_pulp(self, problem: Any, variables: Dict, data: Dict) -> None:
         """
@@ -64,16 +69,16 @@ class DemandConstraint(Constraint):
         """
         import pulp
         
+        index = ModelIndex.of(variables, data)
         waffle_types = data['waffle_types']
-        weeks = sorted(data['weeks'])
+        weeks = index.weeks
         demand = data['demand']
         
         for w in waffle_types:
             for t in weeks:
                 if (w, t) in demand:
                     # Create expression for sum of production for this waffle type and week
-                    prod_sum = pulp.lpSum(variables[(w, p, t)] for p in data['pan_types'] 
-                                      if (w, p, t) in variables)
+                    prod_sum = pulp.lpSum(index.by_waffle_week.get((w, t), []))
                     
                     if self.equality:
                         # Equality constraint (exactly meet demand)
@@ -82,6 +87,23 @@ class DemandConstraint(Constraint):
                         # Inequality constraint (meet or exceed demand)
                         problem += prod_sum >= demand[(w, t)], f"Demand_{w}_{t}"
     
+    def apply_to_matrix(self, matrix: Any, data: Dict) -> None:
+        """
+        Append demand rows to a matrix model.
+        
+        Args:
+            matrix: MatrixModel instance
+            data: Dictionary containing optimization data
+        """
+        demand, mask = matrix.demand_matrix()
+        waffles, weeks = np.nonzero(mask)
+        values = demand[waffles, weeks]
+        
+        # One row per (w, t) with demand, summing x over the allowed pans of w
+        rows, columns = matrix.sum_rows('waffle', waffles, weeks, weeks)
+        upper = values if self.equality else np.inf
+        matrix.add_rows(rows, columns, 1.0, values, upper)
+    
     def validate_data(self, data: Dict) -> bool:
         """
         Validate that required data for this constraint is present.
@@ -4,8 +4,12 @@ Minimum Batch Constraint Module for Waffle Production Optimization.
 This module implements the minimum batch size constraint for the optimization model.
 """
 from typing import Dict, Any, Union
+import math
+
+import numpy as np
 
 from src.solvers.constraints.base import Constraint
+from src.solvers.model_index import ModelIndex
 
 
 class MinimumBatchConstraint(Constraint):
@@ -17,6 +21,9 @@ class MinimumBatchConstraint(Constraint):
     This prevents impractical small production batches.
     """
     
+    matrix_support = True
+    cpsat_support = True
+    
     def __init__(self, min_batch_size: Union[int, Dict] = 10):
         """
         Initialize the minimum batch constraint.
@@ -53,30 +60,26 @@ class MinimumBatchConstraint(Constraint):
             variables: Dictionary of decision variables
             data: Dictionary containing optimization data
         """
-        waffle_types = data['waffle_types']
-        pan_types = data['pan_types']
-        weeks = sorted(data['weeks'])
-        
-        for w in waffle_types:
-            for p in pan_types:
-                for t in weeks:
-                    if (w, p, t) in variables:
-                        # Get minimum batch size for this combination
-                        min_batch = self.get_min_batch_size(w, p)
-                        
-                        # Create a binary variable to indicate if this combination is used
-                        is_used = solver.IntVar(0, 1, f"is_used_{w}_{p}_{t}")
-                        
-                        # Get a large upper bound (big-M) for this variable
-                        # We use the supply for this pan type in this week if available,
-                        # otherwise use a sufficiently large number
-                        big_m = data.get('supply', {}).get((p, t), 1000)
-                        
-                        # If x > 0 then is_used = 1
-                        solver.Add(variables[(w, p, t)] <= big_m * is_used)
-                        
-                        # If is_used = 1 then x >= min_batch
-                        solver.Add(variables[(w, p, t)] >= min_batch * is_used)
+        index = ModelIndex.of(variables, data)
+        supply = data.get('supply', {})
+        
+        for (w, p, t), var in index.items():
+            # Get minimum batch size for this combination
+            min_batch = self.get_min_batch_size(w, p)
+            
+            # Create a binary variable to indicate if this combination is used
+            is_used = solver.IntVar(0, 1, f"is_used_{w}_{p}_{t}")
+            
+            # Get a large upper bound (big-M) for this variable
+            # We use the presolve bound of the variable if there is one, otherwise the
+            # supply for this pan type in this week if available, otherwise a sufficiently large number
+            big_m = index.upper_bound((w, p, t), supply.get((p, t), 1000))
+            
+            # If x > 0 then is_used = 1
+            solver.Add(var <= big_m * is_used)
+            
+            # If is_used = 1 then x >= min_batch
+            solver.Add(var >= min_batch * is_used)
     
     def apply_to_pulp(self, problem: Any, variables: Dict, data: Dict) -> None:
         """
@@ -89,30 +92,91 @@ class MinimumBatchConstraint(Constraint):
         """
         import pulp
         
-        waffle_types = data['waffle_types']
-        pan_types = data['pan_types']
-        weeks = sorted(data['weeks'])
-        
-        for w in waffle_types:
-            for p in pan_types:
-                for t in weeks:
-                    if (w, p, t) in variables:
-                        # Get minimum batch size for this combination
-                        min_batch = self.get_min_batch_size(w, p)
-                        
-                        # Create a binary variable to indicate if this combination is used
-                        is_used = pulp.LpVariable(f"is_used_{w}_{p}_{t}", cat=pulp.LpBinary)
-                        
-                        # Get a large upper bound (big-M) for this variable
-                        big_m = data.get('supply', {}).get((p, t), 1000)
-                        
-                        # If x > 0 then is_used = 1
-                        problem += variables[(w, p, t)] <= big_m * is_used, \
-                                f"MinBatch_IsUsed1_{w}_{p}_{t}"
-                        
-                        # If is_used = 1 then x >= min_batch
-                        problem += variables[(w, p, t)] >= min_batch * is_used, \
-                                f"MinBatch_IsUsed2_{w}_{p}_{t}"
+        index = ModelIndex.of(variables, data)
+        supply = data.get('supply', {})
+        
+        for (w, p, t), var in index.items():
+            # Get minimum batch size for this combination
+            min_batch = self.get_min_batch_size(w, p)
+            
+            # Create a binary variable to indicate if this combination is used
+            is_used = pulp.LpVariable(f"is_used_{w}_{p}_{t}", cat=pulp.LpBinary)
+            
+            # Get a large upper bound (big-M) for this variable
+            big_m = index.upper_bound((w, p, t), supply.get((p, t), 1000))
+            
+            # If x > 0 then is_used = 1
+            problem += var <= big_m * is_used, \
+                    f"MinBatch_IsUsed1_{w}_{p}_{t}"
+            
+            # If is_used = 1 then x >= min_batch
+            problem += var >= min_batch * is_used, \
+                    f"MinBatch_IsUsed2_{w}_{p}_{t}"
+    
+    def apply_to_matrix(self, matrix: Any, data: Dict) -> None:
+        """
+        Append minimum batch rows to a matrix model.
+        
+        Args:
+            matrix: MatrixModel instance
+            data: Dictionary containing optimization data
+        """
+        # One binary is_used column per decision variable not removed by presolve
+        x = np.flatnonzero(matrix.variable_upper > 0)
+        n = len(x)
+        if n == 0:
+            return
+        waffle_types = matrix.data.waffle_types
+        pan_types = matrix.data.pan_types
+        pairs = list(zip(matrix.pair_waffle.tolist(), matrix.pair_pan.tolist()))
+        
+        names = None
+        if matrix.with_names:
+            keys = matrix.variable_keys()
+            names = [f"is_used_{keys[i][0]}_{keys[i][1]}_{keys[i][2]}" for i in x.tolist()]
+        is_used = matrix.add_columns(n, 0, 1, True, names)
+        
+        # Big-M is the bound of the variable if it has one, otherwise the supply of
+        # the pan in the week if available, otherwise 1000
+        supply, mask = matrix.supply_matrix()
+        big_m = np.where(mask, supply, 1000)[matrix.pair_pan].ravel()[x]
+        upper = matrix.variable_upper[x]
+        big_m = np.where(np.isfinite(upper), upper, big_m)
+        min_batch = np.repeat([self.get_min_batch_size(waffle_types[w], pan_types[p]) for w, p in pairs],
+                              matrix.num_weeks)[x]
+        
+        # Rows 2i: x - big_m * is_used <= 0 (if x > 0 then is_used = 1)
+        # Rows 2i + 1: x - min_batch * is_used >= 0 (if is_used = 1 then x >= min_batch)
+        rows = np.repeat(np.arange(2 * n), 2)
+        columns = np.column_stack([x, is_used, x, is_used]).ravel()
+        coefficients = np.column_stack([np.ones(n), -big_m, np.ones(n), -min_batch]).ravel()
+        lower = np.column_stack([np.full(n, -np.inf), np.zeros(n)]).ravel()
+        upper = np.column_stack([np.zeros(n), np.full(n, np.inf)]).ravel()
+        matrix.add_rows(rows, columns, coefficients, lower, upper)
+    
+    def apply_to_cpsat(self, model: Any, variables: Dict, data: Dict) -> None:
+        """
+        Apply minimum batch constraint to a CP-SAT model.
+        
+        Instead of big-M rows, a Boolean is_used literal enforces either
+        min_batch <= x <= big_m or x == 0.
+        
+        Args:
+            model: CP-SAT CpModel instance
+            variables: Dictionary of decision variables
+            data: Dictionary containing optimization data
+        """
+        index = ModelIndex.of(variables, data)
+        supply = data.get('supply', {})
+        
+        for (w, p, t), var in index.items():
+            min_batch = self.get_min_batch_size(w, p)
+            # Same cap on used combinations as the big-M of the linear formulation
+            big_m = index.upper_bound((w, p, t), supply.get((p, t), 1000))
+            
+            is_used = model.NewBoolVar(f"is_used_{w}_{p}_{t}")
+            model.AddLinearConstraint(var, int(math.ceil(min_batch)), int(math.floor(big_m))).OnlyEnforceIf(is_used)
+            model.Add(var == 0).OnlyEnforceIf(is_used.Not())
     
     def validate_data(self, data: Dict) -> bool:
         """
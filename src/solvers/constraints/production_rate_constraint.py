@@ -3,9 +3,13 @@ Production Rate Constraint Module for Waffle Production Optimization.
 
 This module implements the production rate change constraint for the optimization model.
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import math
+
+import numpy as np
 
 from src.solvers.constraints.base import Constraint
+from src.solvers.model_index import ModelIndex
 
 
 class ProductionRateConstraint(Constraint):
@@ -16,15 +20,39 @@ class ProductionRateConstraint(Constraint):
     too drastically between consecutive weeks, providing production stability.
     """
     
-    def __init__(self, max_rate_change: float = 0.2):
+    matrix_support = True
+    cpsat_support = True
+    
+    def __init__(self, max_rate_change: float = 0.2, initial_production: Optional[Dict[str, float]] = None):
         """
         Initialize the production rate constraint.
         
         Args:
             max_rate_change: Maximum allowed proportional change in production rate
                             between consecutive weeks (default: 0.2 = 20%)
+            initial_production: Production of each waffle type in the week before the first
+                                week of the model, e.g. the last fixed week of a rolling
+                                horizon (default: none)
         """
         self.max_rate_change = max_rate_change
+        self.initial_production = initial_production or {}
+    
+    def initial_minimums(self, waffle_types) -> Dict[str, float]:
+        """
+        Get the minimum production in the first week implied by the initial production.
+        
+        The increase limit of the other weeks does not bind, since prev_prod_dummy has
+        no upper bound, so only the maximum decrease is carried into the first week.
+        
+        Args:
+            waffle_types: Waffle types of the model
+            
+        Returns:
+            Dict[str, float]: Minimum first-week production of each waffle type with
+                              positive initial production
+        """
+        return {w: self.initial_production[w] * (1 - self.max_rate_change)
+                for w in waffle_types if self.initial_production.get(w, 0) > 0}
     
     def apply_to_ortools(self, solver: Any, variables: Dict, data: Dict) -> None:
         """
@@ -35,31 +63,41 @@ class ProductionRateConstraint(Constraint):
             variables: Dictionary of decision variables
             data: Dictionary containing optimization data
         """
-        waffle_types = data['waffle_types']
-        pan_types = data['pan_types']
-        weeks = sorted(data['weeks'])
+        index = ModelIndex.of(variables, data)
+        weeks = index.weeks
+        
+        # Maximum decrease from the production before the first week
+        for w, minimum in self.initial_minimums(data['waffle_types'] if weeks else []).items():
+            constraint = solver.Constraint(minimum, solver.infinity(), f"InitialRate_{w}")
+            for var in index.by_waffle_week.get((w, weeks[0]), []):
+                constraint.SetCoefficient(var, 1)
         
         # Skip if only one week
         if len(weeks) < 2:
             return
         
-        for w in waffle_types:
+        # Big-M for the conditional decrease constraint: total supply, or the largest
+        # production of the waffle type in the previous week allowed by presolve bounds
+        total_supply = sum(data.get('supply', {}).get((p, t), 0) for p in data['pan_types'] for t in weeks)
+        
+        for w in index.waffles:
             for i in range(1, len(weeks)):
                 prev_week = weeks[i-1]
                 curr_week = weeks[i]
                 
-                # Calculate total production for each week
-                # We need to check which variables exist first
-                prev_vars = [(w, p, prev_week) for p in pan_types if (w, p, prev_week) in variables]
-                curr_vars = [(w, p, curr_week) for p in pan_types if (w, p, curr_week) in variables]
+                # Production variables of each week
+                prev_vars = index.by_waffle_week.get((w, prev_week), [])
+                curr_vars = index.by_waffle_week.get((w, curr_week), [])
                 
-                # Skip if no variables for this waffle type in either week
-                if not prev_vars or not curr_vars:
+                # Skip if no variables for this waffle type in both weeks; a week
+                # whose variables were all removed by presolve has zero production
+                if not prev_vars and not curr_vars:
                     continue
                 
                 # Create linear expressions for total production in each week
-                prev_prod = solver.Sum([variables[var] for var in prev_vars])
-                curr_prod = solver.Sum([variables[var] for var in curr_vars])
+                prev_prod = solver.Sum(prev_vars)
+                curr_prod = solver.Sum(curr_vars)
+                big_m = min(total_supply, index.bounds_by_waffle_week.get((w, prev_week), total_supply))
                 
                 # Create dummy variable for previous week production to handle case where it's zero
                 # This avoids division by zero in the constraint
@@ -73,8 +111,6 @@ class ProductionRateConstraint(Constraint):
                 
                 # Enforce maximum decrease: curr_prod >= prev_prod * (1 - max_rate_change)
                 # Only apply if prev_prod is positive (to avoid infeasibility)
-                # We create a conditional constraint using a big-M approach
-                big_m = sum(data.get('supply', {}).get((p, t), 0) for p in pan_types for t in weeks)
                 has_prev_prod = solver.IntVar(0, 1, f"has_prev_prod_{w}_{prev_week}")
                 
                 # has_prev_prod = 1 if prev_prod > 0, else 0
@@ -96,33 +132,39 @@ class ProductionRateConstraint(Constraint):
         """
         import pulp
         
-        waffle_types = data['waffle_types']
-        pan_types = data['pan_types']
-        weeks = sorted(data['weeks'])
+        index = ModelIndex.of(variables, data)
+        weeks = index.weeks
+        
+        # Maximum decrease from the production before the first week
+        for w, minimum in self.initial_minimums(data['waffle_types'] if weeks else []).items():
+            problem += pulp.lpSum(index.by_waffle_week.get((w, weeks[0]), [])) >= minimum, f"InitialRate_{w}"
         
         # Skip if only one week
         if len(weeks) < 2:
             return
         
-        for w in waffle_types:
+        # Big-M for the conditional decrease constraint: total supply, or the largest
+        # production of the waffle type in the previous week allowed by presolve bounds
+        total_supply = sum(data.get('supply', {}).get((p, t), 0) for p in data['pan_types'] for t in weeks)
+        
+        for w in index.waffles:
             for i in range(1, len(weeks)):
                 prev_week = weeks[i-1]
                 curr_week = weeks[i]
                 
-                # Calculate total production for each week
-                # We need to check which variables exist first
-                prev_vars = [variables[(w, p, prev_week)] for p in pan_types 
-                           if (w, p, prev_week) in variables]
-                curr_vars = [variables[(w, p, curr_week)] for p in pan_types 
-                           if (w, p, curr_week) in variables]
+                # Production variables of each week
+                prev_vars = index.by_waffle_week.get((w, prev_week), [])
+                curr_vars = index.by_waffle_week.get((w, curr_week), [])
                 
-                # Skip if no variables for this waffle type in either week
-                if not prev_vars or not curr_vars:
+                # Skip if no variables for this waffle type in both weeks; a week
+                # whose variables were all removed by presolve has zero production
+                if not prev_vars and not curr_vars:
                     continue
                 
                 # Create expressions for total production in each week
                 prev_prod = pulp.lpSum(prev_vars)
                 curr_prod = pulp.lpSum(curr_vars)
+                big_m = min(total_supply, index.bounds_by_waffle_week.get((w, prev_week), total_supply))
                 
                 # Create dummy variable for previous week production
                 prev_prod_dummy = pulp.LpVariable(f"prev_prod_dummy_{w}_{prev_week}", 
@@ -137,7 +179,6 @@ class ProductionRateConstraint(Constraint):
                 
                 # Enforce maximum decrease: curr_prod >= prev_prod * (1 - max_rate_change)
                 # Only apply if prev_prod is positive (to avoid infeasibility)
-                big_m = sum(data.get('supply', {}).get((p, t), 0) for p in pan_types for t in weeks)
                 has_prev_prod = pulp.LpVariable(f"has_prev_prod_{w}_{prev_week}", 
                                              cat=pulp.LpBinary)
                 
@@ -152,6 +193,142 @@ class ProductionRateConstraint(Constraint):
                          big_m * (1 - has_prev_prod), \
                          f"MaxDecrease_{w}_{prev_week}_to_{curr_week}"
     
+    def apply_to_matrix(self, matrix: Any, data: Dict) -> None:
+        """
+        Append production rate rows to a matrix model.
+        
+        Args:
+            matrix: MatrixModel instance
+            data: Dictionary containing optimization data
+        """
+        n_weeks = matrix.num_weeks
+        
+        # Maximum decrease from the production before the first week
+        minimums = self.initial_minimums(matrix.data.waffle_types)
+        if minimums and n_weeks > 0:
+            waffle_position = {w: i for i, w in enumerate(matrix.data.waffle_types)}
+            initial_waffles = np.array([waffle_position[w] for w in minimums], dtype=np.int64)
+            rows, columns = matrix.sum_rows('waffle', initial_waffles, 0, 0)
+            matrix.add_rows(rows, columns, 1.0, np.array(list(minimums.values()), dtype=float), np.inf)
+        
+        # Skip if only one week
+        if n_weeks < 2:
+            return
+        
+        # One block per waffle type with variables and pair of consecutive weeks,
+        # unless presolve removed the variables of both weeks
+        offsets, _ = matrix.pair_groups('waffle')
+        waffles = np.flatnonzero(np.diff(offsets) > 0)
+        block_waffles = np.repeat(waffles, n_weeks - 1)
+        block_weeks = np.tile(np.arange(1, n_weeks), len(waffles))
+        bounds = matrix.waffle_week_upper_bounds()
+        prev_bounds = bounds[block_waffles, block_weeks - 1]
+        used = (prev_bounds > 0) | (bounds[block_waffles, block_weeks] > 0)
+        block_waffles, block_weeks, prev_bounds = block_waffles[used], block_weeks[used], prev_bounds[used]
+        n = len(block_waffles)
+        if n == 0:
+            return
+        
+        dummy_names = has_prev_names = None
+        if matrix.with_names:
+            waffle_types = matrix.data.waffle_types
+            labels = [f"{waffle_types[w]}_{matrix.weeks[i - 1]}"
+                      for w, i in zip(block_waffles.tolist(), block_weeks.tolist())]
+            dummy_names = [f"prev_prod_dummy_{label}" for label in labels]
+            has_prev_names = [f"has_prev_prod_{label}" for label in labels]
+        prev_prod_dummy = matrix.add_columns(n, 1, np.inf, True, dummy_names)
+        has_prev_prod = matrix.add_columns(n, 0, 1, True, has_prev_names)
+        
+        # Big-M: total supply, or the largest production in the previous week allowed by the bounds
+        supply, _ = matrix.supply_matrix()
+        big_m = np.minimum(float(supply.sum()), prev_bounds)
+        prev_rows, prev_columns = matrix.sum_rows('waffle', block_waffles, block_weeks - 1, block_weeks - 1)
+        curr_rows, curr_columns = matrix.sum_rows('waffle', block_waffles, block_weeks, block_weeks)
+        blocks = np.arange(n)
+        
+        # Five rows per block, numbered 5 * block + k:
+        # 0: prev_prod_dummy - prev_prod >= 0
+        # 1: curr_prod - (1 + max_rate_change) * prev_prod_dummy <= 0
+        # 2: prev_prod - big_m * has_prev_prod <= 0
+        # 3: prev_prod - has_prev_prod >= 0
+        # 4: curr_prod - (1 - max_rate_change) * prev_prod - big_m * has_prev_prod >= -big_m
+        terms = [
+            (5 * blocks, prev_prod_dummy, 1.0),
+            (5 * prev_rows, prev_columns, -1.0),
+            (5 * curr_rows + 1, curr_columns, 1.0),
+            (5 * blocks + 1, prev_prod_dummy, -(1 + self.max_rate_change)),
+            (5 * prev_rows + 2, prev_columns, 1.0),
+            (5 * blocks + 2, has_prev_prod, -big_m),
+            (5 * prev_rows + 3, prev_columns, 1.0),
+            (5 * blocks + 3, has_prev_prod, -1.0),
+            (5 * curr_rows + 4, curr_columns, 1.0),
+            (5 * prev_rows + 4, prev_columns, -(1 - self.max_rate_change)),
+            (5 * blocks + 4, has_prev_prod, -big_m),
+        ]
+        rows = np.concatenate([term[0] for term in terms])
+        columns = np.concatenate([term[1] for term in terms])
+        coefficients = np.concatenate([np.broadcast_to(term[2], len(term[0])) for term in terms])
+        lower = np.column_stack([np.zeros(n), np.full(n, -np.inf), np.full(n, -np.inf), np.zeros(n), -big_m]).ravel()
+        upper = np.tile([np.inf, 0, 0, np.inf, np.inf], n)
+        matrix.add_rows(rows, columns, coefficients, lower, upper)
+    
+    def apply_to_cpsat(self, model: Any, variables: Dict, data: Dict) -> None:
+        """
+        Apply production rate constraint to a CP-SAT model.
+        
+        The rate change is written as num / den with a power-of-ten den, scaled
+        like the matrix rows, so that all coefficients are integral and the limit
+        is the one the other solvers enforce. The maximum decrease is enforced
+        only if has_prev_prod is true instead of through big-M.
+        
+        Args:
+            model: CP-SAT CpModel instance
+            variables: Dictionary of decision variables
+            data: Dictionary containing optimization data
+        """
+        from ortools.sat.python import cp_model
+        from src.solvers.cpsat_solver import decimal_ratio
+        
+        index = ModelIndex.of(variables, data)
+        weeks = index.weeks
+        num, den = decimal_ratio(self.max_rate_change)
+        
+        # Maximum decrease from the production before the first week
+        for w in self.initial_minimums(data['waffle_types'] if weeks else []):
+            first_prod = cp_model.LinearExpr.Sum(index.by_waffle_week.get((w, weeks[0]), []))
+            model.Add(den * first_prod >= math.ceil((den - num) * self.initial_production[w] - 1e-6))
+        
+        # Skip if only one week
+        if len(weeks) < 2:
+            return
+        
+        for w in index.waffles:
+            for i in range(1, len(weeks)):
+                prev_week = weeks[i-1]
+                curr_week = weeks[i]
+                
+                prev_vars = index.by_waffle_week.get((w, prev_week), [])
+                curr_vars = index.by_waffle_week.get((w, curr_week), [])
+                
+                # Skip if no variables for this waffle type in both weeks; a week
+                # whose variables were all removed by presolve has zero production
+                if not prev_vars and not curr_vars:
+                    continue
+                
+                prev_prod = cp_model.LinearExpr.Sum(prev_vars)
+                curr_prod = cp_model.LinearExpr.Sum(curr_vars)
+                
+                # Maximum increase: den * curr_prod <= (den + num) * max(prev_prod, 1)
+                prev_prod_dummy = model.NewIntVar(1, 2**31 - 1, f"prev_prod_dummy_{w}_{prev_week}")
+                model.Add(prev_prod_dummy >= prev_prod)
+                model.Add(den * curr_prod <= (den + num) * prev_prod_dummy)
+                
+                # Maximum decrease, only if there was production in the previous week
+                has_prev_prod = model.NewBoolVar(f"has_prev_prod_{w}_{prev_week}")
+                model.Add(prev_prod >= 1).OnlyEnforceIf(has_prev_prod)
+                model.Add(prev_prod == 0).OnlyEnforceIf(has_prev_prod.Not())
+                model.Add(den * curr_prod >= (den - num) * prev_prod).OnlyEnforceIf(has_prev_prod)
+    
     def validate_data(self, data: Dict) -> bool:
         """
         Validate that required data for this constraint is present.
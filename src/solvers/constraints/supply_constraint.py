@@ -3,14 +3,20 @@ Supply Constraint Module for Waffle Production Optimization.
 
 This module implements the supply limitation constraint for the optimization model.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any
 import logging
 
+import numpy as np
+
 from src.solvers.constraints.base import Constraint
+from src.solvers.model_index import ModelIndex
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Formulations of the cumulative supply constraint
+SUPPLY_FORMULATIONS = ['prefix_sum', 'inventory']
+
 class SupplyConstraint(Constraint):
     """
     Constraint to enforce pan supply limitations.
@@ -18,18 +24,30 @@ class SupplyConstraint(Constraint):
     This constraint ensures that the total usage of each pan type across all waffle types
     does not exceed the available supply in each week. It can optionally implement
     cumulative constraints where unused pans from earlier weeks can be used in later weeks.
+    
+    Cumulative supply can be formulated in two equivalent ways:
+    - 'prefix_sum': for each week, usage up to that week <= supply up to that week
+    - 'inventory': an inventory variable per pan and week carries unused pans over,
+      with one balance row per pan and week linking consecutive weeks
+    The inventory formulation has O(P*W*T) instead of O(P*W*T^2) nonzeros.
     """
     
-    def __init__(self, cumulative: bool = True):
+    matrix_support = True
+    
+    def __init__(self, cumulative: bool = True, formulation: str = 'prefix_sum'):
         """
         Initialize the supply constraint.
         
         Args:
             cumulative: If True, unused pans from earlier weeks can be used in later weeks
                         If False, unused pans from earlier weeks cannot be used
+            formulation: Formulation of cumulative supply ('prefix_sum' or 'inventory')
         """
-        logger.info(f"Initializing SupplyConstraint with cumulative={cumulative}")
+        if formulation not in SUPPLY_FORMULATIONS:
+            raise ValueError(f"Unsupported supply formulation: {formulation}")
+        logger.info(f"Initializing SupplyConstraint with cumulative={cumulative}, formulation={formulation}")
         self.cumulative = cumulative
+        self.formulation = formulation
     
     def apply_to_ortools(self, solver: Any, variables: Dict, data: Dict) -> None:
         """
@@ -40,28 +58,46 @@ class SupplyConstraint(Constraint):
             variables: Dictionary of decision variables
             data: Dictionary containing optimization data
         """
+        index = ModelIndex.of(variables, data)
         pan_types = data['pan_types']
-        weeks = sorted(data['weeks'])
+        weeks = index.weeks
         supply = data['supply']
+        usage = index.by_pan_week
         
         logger.info(f"Applying supply constraint to OR-Tools model with cumulative={self.cumulative}")
         
-        if self.cumulative:
+        if self.cumulative and self.formulation == 'inventory':
+            # Balance rows: usage + inventory(t) - inventory(t-1) = supply(t)
+            for p in pan_types:
+                if not any((p, t) in usage for t in weeks):
+                    continue
+                previous_inventory = None
+                for t in weeks:
+                    weekly_supply = supply.get((p, t), 0)
+                    inventory = solver.NumVar(0, solver.infinity(), f'inventory_{p}_{t}')
+                    constraint = solver.Constraint(weekly_supply, weekly_supply)
+                    for var in usage.get((p, t), []):
+                        constraint.SetCoefficient(var, 1)
+                    constraint.SetCoefficient(inventory, 1)
+                    if previous_inventory is not None:
+                        constraint.SetCoefficient(previous_inventory, -1)
+                    previous_inventory = inventory
+                    
+                logger.debug(f"Added supply balance constraints for pan {p}")
+        elif self.cumulative:
             # Cumulative supply constraints - allow unused pans to carry over
             for p in pan_types:
                 # Track cumulative supply and usage for each week
+                cumulative_supply = 0
+                cumulative_usage = []
                 for t in weeks:
-                    # Calculate cumulative supply up to week t
-                    cumulative_supply = sum(supply.get((p, week), 0) for week in weeks if week <= t)
+                    cumulative_supply += supply.get((p, t), 0)
+                    cumulative_usage.extend(usage.get((p, t), []))
                     
                     # Create constraint: cumulative usage up to week t <= cumulative supply up to week t
                     constraint = solver.Constraint(-solver.infinity(), cumulative_supply)
-                    
-                    # Sum up all usage variables up to week t
-                    for w in data['waffle_types']:
-                        for week in weeks:
-                            if week <= t and (w, p, week) in variables:
-                                constraint.SetCoefficient(variables[(w, p, week)], 1)
+                    for var in cumulative_usage:
+                        constraint.SetCoefficient(var, 1)
                     
                     logger.debug(f"Added cumulative supply constraint for pan {p}, week {t}: limit = {cumulative_supply}")
         else:
@@ -76,13 +112,10 @@ class SupplyConstraint(Constraint):
                     constraint = solver.Constraint(-solver.infinity(), weekly_supply)
                     
                     # Add all usage variables for this week
-                    added = False
-                    for w in data['waffle_types']:
-                        if (w, p, t) in variables:
-                            constraint.SetCoefficient(variables[(w, p, t)], 1)
-                            added = True
+                    for var in usage.get((p, t), []):
+                        constraint.SetCoefficient(var, 1)
                     
-                    if added:
+                    if (p, t) in usage:
                         logger.debug(f"Added weekly supply constraint for pan {p}, week {t}: limit = {weekly_supply}")
     
     def apply_to_pulp(self, problem: Any, variables: Dict, data: Dict) -> None:
@@ -96,44 +129,99 @@ class SupplyConstraint(Constraint):
         """
         import pulp
         
+        index = ModelIndex.of(variables, data)
         pan_types = data['pan_types']
-        weeks = sorted(data['weeks'])
+        weeks = index.weeks
         supply = data['supply']
+        usage = index.by_pan_week
         
-        #logger.info(f"Applying supply constraint to PuLP model with cumulative={self.cumulative}")
-        
-        if self.cumulative:
+        if self.cumulative and self.formulation == 'inventory':
+            # Balance rows: usage + inventory(t) - inventory(t-1) = supply(t)
+            for p in pan_types:
+                if not any((p, t) in usage for t in weeks):
+                    continue
+                previous_inventory = None
+                for t in weeks:
+                    inventory = pulp.LpVariable(f'inventory_{p}_{t}', lowBound=0)
+                    terms = usage.get((p, t), []) + [inventory]
+                    balance = pulp.lpSum(terms)
+                    if previous_inventory is not None:
+                        balance = balance - previous_inventory
+                    problem += balance == supply.get((p, t), 0), f"SupplyBalance_{p}_{t}"
+                    previous_inventory = inventory
+        elif self.cumulative:
             # Cumulative supply constraints - allow unused pans to carry over
             for p in pan_types:
+                cumulative_supply = 0
+                cumulative_usage = []
                 for t in weeks:
-                    # Calculate cumulative supply up to week t
-                    cumulative_supply = sum(supply.get((p, week), 0) for week in weeks if week <= t)
-                    
-                    # Create variables for all waffle types and weeks up to current week
-                    usage_vars = [variables[(w, p, week)] 
-                                for w in data['waffle_types'] 
-                                for week in weeks if week <= t
-                                if (w, p, week) in variables]
+                    # Cumulative supply and usage variables up to week t
+                    cumulative_supply += supply.get((p, t), 0)
+                    cumulative_usage.extend(usage.get((p, t), []))
                     
                     # Create constraint: cumulative usage up to week t <= cumulative supply up to week t
-                    problem += pulp.lpSum(usage_vars) <= cumulative_supply, f"CumulativeSupply_{p}_{t}"
+                    problem += pulp.lpSum(cumulative_usage) <= cumulative_supply, f"CumulativeSupply_{p}_{t}"
         else:
             # Weekly supply constraints - no carry over
             for p in pan_types:
                 for t in weeks:
-                    # We need to create a constraint for each week, even if supply is 0
                     # Get the supply for this week (default to 0 if not specified)
                     weekly_supply = supply.get((p, t), 0)
-                    
-                    # Create variables for all waffle types in this week
-                    usage_vars = [variables[(w, p, t)] 
-                                for w in data['waffle_types'] 
-                                if (w, p, t) in variables]
+                    usage_vars = usage.get((p, t), [])
                     
                     if usage_vars:
                         # Create constraint: usage <= supply for this week
                         problem += pulp.lpSum(usage_vars) <= weekly_supply, f"Supply_{p}_{t}"
     
+    def apply_to_matrix(self, matrix: Any, data: Dict) -> None:
+        """
+        Append supply rows to a matrix model.
+        
+        Args:
+            matrix: MatrixModel instance
+            data: Dictionary containing optimization data
+        """
+        supply, _ = matrix.supply_matrix()
+        n_pans, n_weeks = supply.shape
+        
+        if self.cumulative and self.formulation == 'inventory':
+            # Inventory columns and balance rows only for pans that have usage variables
+            offsets, _ = matrix.pair_groups('pan')
+            pans = np.flatnonzero(np.diff(offsets) > 0)
+            if len(pans) == 0:
+                return
+            names = None
+            if matrix.with_names:
+                pan_types = matrix.data.pan_types
+                names = [f'inventory_{pan_types[p]}_{t}' for p in pans.tolist() for t in matrix.weeks]
+            inventory = matrix.add_columns(len(pans) * n_weeks, 0, np.inf, False, names).reshape(len(pans), n_weeks)
+            
+            # Balance rows: usage + inventory(t) - inventory(t-1) = supply(t)
+            row_pans = np.repeat(pans, n_weeks)
+            row_weeks = np.tile(np.arange(n_weeks), len(pans))
+            usage_rows, usage_columns = matrix.sum_rows('pan', row_pans, row_weeks, row_weeks)
+            all_rows = np.arange(len(row_pans))
+            carried_rows = all_rows[row_weeks > 0]
+            rows = np.concatenate([usage_rows, all_rows, carried_rows])
+            columns = np.concatenate([usage_columns, inventory.ravel(), inventory[:, :-1].ravel()])
+            coefficients = np.concatenate([np.ones(len(usage_rows) + len(all_rows)),
+                                           -np.ones(len(carried_rows))])
+            limits = supply[pans].ravel()
+            matrix.add_rows(rows, columns, coefficients, limits, limits)
+            return
+        
+        # One row per (p, t), even if the pan has no usage variables
+        row_pans = np.repeat(np.arange(n_pans), n_weeks)
+        row_weeks = np.tile(np.arange(n_weeks), n_pans)
+        if self.cumulative:
+            # Cumulative usage up to week t <= cumulative supply up to week t
+            rows, columns = matrix.sum_rows('pan', row_pans, 0, row_weeks)
+            limits = np.cumsum(supply, axis=1).ravel()
+        else:
+            rows, columns = matrix.sum_rows('pan', row_pans, row_weeks, row_weeks)
+            limits = supply.ravel()
+        matrix.add_rows(rows, columns, 1.0, np.full(len(limits), -np.inf), limits)
+    
     def validate_data(self, data: Dict) -> bool:
         """
         Validate that required data for this constraint is present.
@@ -160,6 +248,12 @@ class SupplyConstraint(Constraint):
                 "cumulative": {
                     "type": "boolean",
                     "description": "If True, unused pans from earlier weeks can be used in later weeks."
+                },
+                "formulation": {
+                    "type": "string",
+                    "enum": SUPPLY_FORMULATIONS,
+                    "description": "How cumulative supply is modelled: 'prefix_sum' rows over all "
+                                   "earlier weeks, or 'inventory' carry-over variables (sparser)."
                 }
             },
             "required": []
@@ -0,0 +1,463 @@
+"""
+CP-SAT Implementation for Waffle Production Optimization.
+
+This module provides the implementation of SolverInterface using the OR-Tools
+CP-SAT solver. Pan counts are integers, so the model maps directly onto CP-SAT
+once costs are scaled to integers; CP-SAT's portfolio search runs one strategy
+per worker thread.
+"""
+from typing import Dict, Tuple
+import time
+import logging
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from src.solvers.base import SolverInterface
+from src.solvers.matrix_model import ColumnIndex, MatrixModel, assemble_aligned
+from src.solvers.model_index import ModelIndex
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Largest number of decimal digits removed from row coefficients by scaling
+MAX_ROW_DECIMALS = 6
+
+
+def decimal_ratio(value: float) -> Tuple[int, int]:
+    """
+    Write a coefficient as an integer over a power of ten, as _integer_rows scales rows.
+
+    Args:
+        value: Coefficient
+
+    Returns:
+        Tuple[int, int]: Numerator and power-of-ten denominator
+
+    Raises:
+        ValueError: If the coefficient needs more than MAX_ROW_DECIMALS decimals
+    """
+    for digits in range(MAX_ROW_DECIMALS + 1):
+        scaled = value * 10 ** digits
+        if abs(scaled - round(scaled)) <= 1e-9 * 10 ** digits:
+            return int(round(scaled)), 10 ** digits
+    raise ValueError(f"Coefficient {value} needs more than {MAX_ROW_DECIMALS} decimals for CP-SAT")
+
+
+def _integer_rows(indptr: np.ndarray, coefficients: np.ndarray, lower: np.ndarray,
+                  upper: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Scale each row by a power of ten so that its coefficients become integers.
+
+    Since the row activity is then an integer, the bounds are rounded inwards.
+
+    Args:
+        indptr: CSR row start offsets
+        coefficients: CSR coefficients
+        lower: Row lower bounds
+        upper: Row upper bounds
+
+    Returns:
+        Tuple: Integer coefficients, lower bounds and upper bounds
+
+    Raises:
+        ValueError: If a row needs more than MAX_ROW_DECIMALS decimals
+    """
+    n_rows = len(lower)
+    rows = np.repeat(np.arange(n_rows), np.diff(indptr))
+    decimals = np.zeros(len(coefficients), dtype=np.int64)
+    remaining = np.abs(coefficients - np.round(coefficients)) > 1e-9
+    for digits in range(1, MAX_ROW_DECIMALS + 1):
+        if not remaining.any():
+            break
+        decimals[remaining] = digits
+        scaled = coefficients * 10 ** digits
+        remaining &= np.abs(scaled - np.round(scaled)) > 1e-9 * 10 ** digits
+    if remaining.any():
+        raise ValueError(f"Row coefficients need more than {MAX_ROW_DECIMALS} decimals for CP-SAT")
+
+    row_decimals = np.zeros(n_rows, dtype=np.int64)
+    np.maximum.at(row_decimals, rows, decimals)
+    scale = 10.0 ** row_decimals
+    integer_coefficients = np.round(coefficients * scale[rows]).astype(np.int64)
+    integer_lower = np.full(n_rows, cp_model.INT_MIN, dtype=np.int64)
+    integer_upper = np.full(n_rows, cp_model.INT_MAX, dtype=np.int64)
+    finite = np.isfinite(lower)
+    integer_lower[finite] = np.ceil(lower[finite] * scale[finite] - 1e-9)
+    finite = np.isfinite(upper)
+    integer_upper[finite] = np.floor(upper[finite] * scale[finite] + 1e-9)
+    return integer_coefficients, integer_lower, integer_upper
+
+
+class CpSatSolver(SolverInterface):
+    """
+    Implementation of the SolverInterface using OR-Tools CP-SAT.
+    """
+
+    def __init__(self, time_limit: int = 60, optimality_gap: float = 0.005,
+                 num_workers: int = 0, objective_scale: int = 1000, log_search: bool = False):
+        """
+        Initialize the CP-SAT solver.
+
+        Args:
+            time_limit: Time limit for solving the model in seconds
+            optimality_gap: Maximum allowed optimality gap (default: 0.5%)
+            num_workers: Number of parallel search workers (0: one per core)
+            objective_scale: Objective coefficients are multiplied by this factor and
+                             rounded to integers (1000 keeps costs to 1/1000 of a unit)
+            log_search: Whether CP-SAT prints its search log
+        """
+        super().__init__()  # Initialize constraint registry
+        if objective_scale <= 0:
+            raise ValueError(f"objective_scale must be positive, got {objective_scale}")
+        self.time_limit = time_limit
+        self.optimality_gap = optimality_gap
+        self.num_workers = num_workers
+        self.objective_scale = objective_scale
+        self.log_search = log_search
+        self.model = None
+        self.matrix = None
+        self.column_upper = None
+        self.integer_arrays = None
+        self.variables = {}
+        self.data = None
+        self.model_type = None
+        self.solution_status = None
+        self.objective_value = None
+        self.column_values = None
+        self.start_time = None
+        logger.debug(f"Initialized CP-SAT solver with time_limit={time_limit}, optimality_gap={optimality_gap}, "
+                     f"num_workers={num_workers}, objective_scale={objective_scale}")
+
+    def apply_constraints(self) -> None:
+        """
+        Apply all registered constraints to the model.
+
+        Constraints with a native CP-SAT formulation are applied with apply_to_cpsat;
+        all others are translated from their matrix rows.
+
+        Raises:
+            ValueError: If the model has not been built or a constraint supports neither
+        """
+        if self.matrix is None or self.data is None:
+            logger.error("Cannot apply constraints: model not built")
+            raise ValueError("Model has not been built. Call build_minimize_cost_model or build_maximize_output_model first.")
+
+        logger.info("Applying constraints to CP-SAT model")
+        native = self.constraint_registry.apply_matrix_constraints(self.matrix, self.data, native_solver_type='cpsat')
+        unsupported = [name for name, constraint in native.items() if not constraint.cpsat_support]
+        if unsupported:
+            raise ValueError(f"Constraints without CP-SAT or matrix support: {', '.join(unsupported)}")
+
+        self._load_matrix()
+        bounds = self.presolve_result.variable_bounds() if self.presolve_result is not None else None
+        index = ModelIndex(self.variables, self.data, upper_bounds=bounds) if native else None
+        for name, constraint in native.items():
+            logger.debug(f"Applying native CP-SAT formulation of constraint '{name}'")
+            constraint.apply_to_cpsat(self.model, index, self.data)
+        logger.debug("Constraints applied successfully")
+
+    def _integer_arrays(self, matrix: MatrixModel) -> Dict[str, np.ndarray]:
+        """
+        Convert the columns, rows and objective of a matrix model to the integers of CP-SAT.
+
+        CP-SAT needs finite integer domains: unbounded columns get the upper bound
+        implied by the rows, or the sum of all finite row bounds if no row bounds them.
+        Continuous columns (such as inventory carry-over) are integral for integral
+        supply and demand, and become integer columns.
+
+        Args:
+            matrix: MatrixModel to convert
+
+        Returns:
+            Dict[str, np.ndarray]: Column bounds ('lower', 'upper'), CSR rows ('indptr', 'columns',
+                                   'coefficients', 'row_lower', 'row_upper') and the scaled
+                                   objective coefficients ('objective')
+        """
+        lower, _, _, objective = matrix.column_arrays()
+        upper = matrix.implied_upper_bounds()
+        row_lower, row_upper = matrix.row_arrays()
+        finite_bounds = np.abs(np.concatenate([row_lower[np.isfinite(row_lower)], row_upper[np.isfinite(row_upper)]]))
+        fallback = int(finite_bounds.sum()) + 1
+        upper = np.where(np.isfinite(upper), upper, fallback)
+        lower = np.where(np.isfinite(lower), np.ceil(lower), -fallback)
+
+        indptr, columns, coefficients = matrix.to_csr()
+        coefficients, row_lower, row_upper = _integer_rows(indptr, coefficients, row_lower, row_upper)
+        return {
+            'lower': lower.astype(np.int64),
+            'upper': upper.astype(np.int64),
+            'indptr': indptr,
+            'columns': columns,
+            'coefficients': coefficients,
+            'row_lower': row_lower,
+            'row_upper': row_upper,
+            'objective': np.round(objective * self.objective_scale).astype(np.int64),
+        }
+
+    def _load_matrix(self) -> None:
+        """
+        Write the columns, rows and scaled objective of the matrix model into the CP-SAT model.
+        """
+        matrix = self.matrix
+        proto = self.model.Proto()
+        arrays = self._integer_arrays(matrix)
+        self.integer_arrays = arrays
+        self.column_upper = arrays['upper']
+
+        add_variable = proto.variables.add
+        for lb, ub in zip(arrays['lower'].tolist(), arrays['upper'].tolist()):
+            add_variable().domain.extend((lb, ub))
+
+        indptr = arrays['indptr'].tolist()
+        columns = arrays['columns'].tolist()
+        coefficients = arrays['coefficients'].tolist()
+        add_constraint = proto.constraints.add
+        for r, (lb, ub) in enumerate(zip(arrays['row_lower'].tolist(), arrays['row_upper'].tolist())):
+            linear = add_constraint().linear
+            begin, end = indptr[r], indptr[r + 1]
+            linear.vars.extend(columns[begin:end])
+            linear.coeffs.extend(coefficients[begin:end])
+            linear.domain.extend((lb, ub))
+
+        # CP-SAT minimizes; a maximization objective is negated with a negative scaling factor
+        sign = -1 if matrix.maximize else 1
+        scaled = arrays['objective']
+        nonzero = np.flatnonzero(scaled)
+        proto.objective.vars.extend(nonzero.tolist())
+        proto.objective.coeffs.extend((sign * scaled[nonzero]).tolist())
+        proto.objective.scaling_factor = sign / self.objective_scale
+
+        self.variables = _CpSatVariables(self.model, matrix)
+        logger.debug(f"Loaded matrix model into CP-SAT: {matrix.get_statistics()}")
+
+    def _patch_model(self, data: Dict) -> bool:
+        """
+        Patch the domains, rows and objective of the CP-SAT model for new data.
+
+        Models with native CP-SAT constraints are always rebuilt, and so are models
+        whose constraint blocks were added, removed or restructured, since rows and
+        variables cannot be deleted from a CP-SAT model.
+
+        Args:
+            data: New optimization data
+
+        Returns:
+            bool: True if the model was patched, False if it has to be rebuilt
+        """
+        if self.matrix is None or self.model is None:
+            return False
+        # Native constraints of the loaded model add rows or variables beyond the matrix model
+        proto = self.model.Proto()
+        if len(proto.constraints) != self.matrix.num_rows or len(proto.variables) != self.matrix.num_columns:
+            return False
+        constraints = self.constraint_registry.get_all_constraints()
+        if any(constraint.cpsat_support or not constraint.matrix_support
+               for constraint in constraints.values()):
+            return False
+        upper_bounds = self.presolve_result.upper_bounds if self.presolve_result is not None else None
+
+        def assemble(order):
+            matrix = MatrixModel(data, upper_bounds=upper_bounds)
+            matrix.set_production_objective(self.matrix.maximize)
+            self.constraint_registry.apply_matrix_constraints(matrix, data, native_solver_type='cpsat', order=order)
+            return matrix
+
+        matrix = assemble_aligned(self.matrix, constraints, assemble)
+        changes = matrix.changes_from(self.matrix)
+        if changes is None or changes['blocks_changed']:
+            return False
+
+        previous = self.integer_arrays
+        arrays = self._integer_arrays(matrix)
+        # The objective only lists nonzero coefficients
+        nonzero = np.flatnonzero(arrays['objective'])
+        if not np.array_equal(nonzero, np.flatnonzero(previous['objective'])):
+            return False
+
+        columns = np.flatnonzero((arrays['lower'] != previous['lower']) | (arrays['upper'] != previous['upper']))
+        for j in columns.tolist():
+            domain = proto.variables[j].domain
+            domain[0], domain[1] = int(arrays['lower'][j]), int(arrays['upper'][j])
+
+        # Rows are scaled to integers one by one, so a changed coefficient may rescale its whole row
+        indptr = arrays['indptr']
+        nonzeros = np.flatnonzero(arrays['coefficients'] != previous['coefficients'])
+        nonzero_rows = np.searchsorted(indptr, nonzeros, side='right') - 1
+        for k, r in zip(nonzeros.tolist(), nonzero_rows.tolist()):
+            proto.constraints[r].linear.coeffs[k - int(indptr[r])] = int(arrays['coefficients'][k])
+        rows = np.flatnonzero((arrays['row_lower'] != previous['row_lower'])
+                              | (arrays['row_upper'] != previous['row_upper']))
+        for r in rows.tolist():
+            domain = proto.constraints[r].linear.domain
+            domain[0], domain[1] = int(arrays['row_lower'][r]), int(arrays['row_upper'][r])
+
+        objective = np.flatnonzero(arrays['objective'] != previous['objective'])
+        if len(objective):
+            sign = -1 if matrix.maximize else 1
+            positions = np.searchsorted(nonzero, objective)
+            for position, j in zip(positions.tolist(), objective.tolist()):
+                proto.objective.coeffs[position] = int(sign * arrays['objective'][j])
+
+        self.matrix = matrix
+        self.integer_arrays = arrays
+        self.column_upper = arrays['upper']
+        self.variables = _CpSatVariables(self.model, matrix)
+        self.solution_status = None
+        self.objective_value = None
+        self.column_values = None
+        logger.debug(f"Patched CP-SAT model: {len(columns)} domains, {len(nonzeros)} coefficients, "
+                     f"{len(rows)} row domains, {len(objective)} objective coefficients")
+        return True
+
+    def _build(self, data: Dict, maximize: bool) -> None:
+        """
+        Build the CP-SAT model.
+
+        Args:
+            data: Dictionary containing optimization data
+            maximize: If True, maximize waffle output, otherwise minimize cost
+        """
+        self.data = data
+        self.solution_status = None
+        self.objective_value = None
+        self.column_values = None
+        self.model = cp_model.CpModel()
+        upper_bounds = self.presolve_result.upper_bounds if self.presolve_result is not None else None
+        self.matrix = MatrixModel(data, upper_bounds=upper_bounds)
+        self.matrix.set_production_objective(maximize)
+
+        # Apply constraints from constraint registry
+        self.apply_constraints()
+
+    def build_minimize_cost_model(self, data: Dict) -> None:
+        """
+        Build an optimization model to minimize production cost.
+
+        Args:
+            data: Dictionary containing optimization data
+        """
+        logger.info("Building cost minimization model")
+        self.model_type = 'minimize_cost'
+        self._build(data, maximize=False)
+        logger.info("Cost minimization model built successfully")
+
+    def build_maximize_output_model(self, data: Dict) -> None:
+        """
+        Build an optimization model to maximize waffle output.
+
+        Args:
+            data: Dictionary containing optimization data
+        """
+        logger.info("Building output maximization model")
+        self.model_type = 'maximize_output'
+        self._build(data, maximize=True)
+        logger.info("Output maximization model built successfully")
+
+    def solve_model(self) -> Dict:
+        """
+        Solve the current optimization model.
+
+        Returns:
+            Dict: Dictionary containing solution information
+        """
+        if self.model is None:
+            logger.error("Cannot solve model: model not built")
+            raise ValueError("Model has not been built. Call build_minimize_cost_model or build_maximize_output_model first.")
+
+        logger.info(f"Solving {self.model_type} model")
+        logger.debug(f"Time limit: {self.time_limit}s, Optimality gap: {self.optimality_gap}, "
+                     f"Workers: {self.num_workers or 'all cores'}")
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = float(self.time_limit)
+        solver.parameters.relative_gap_limit = float(self.optimality_gap)
+        solver.parameters.num_workers = int(self.num_workers)
+        solver.parameters.log_search_progress = self.log_search
+
+        # Start from the prior solution
+        self.model.ClearHints()
+        if self.warm_start is not None:
+            hint = self.model.Proto().solution_hint
+            hints = np.minimum(self.matrix.hint_values(self.warm_start), self.column_upper[:self.matrix.num_variables])
+            hint.vars.extend(range(len(hints)))
+            hint.values.extend(hints.astype(np.int64).tolist())
+
+        self.start_time = time.time()
+        status = solver.Solve(self.model)
+        solve_time = time.time() - self.start_time
+
+        status_map = {
+            cp_model.OPTIMAL: "OPTIMAL",
+            cp_model.FEASIBLE: "FEASIBLE",
+            cp_model.INFEASIBLE: "INFEASIBLE",
+            cp_model.MODEL_INVALID: "MODEL_INVALID",
+            cp_model.UNKNOWN: "NOT_SOLVED",
+        }
+        self.solution_status = status_map.get(status, "UNKNOWN")
+
+        self.objective_value = None
+        self.column_values = None
+        if self.solution_status in ["OPTIMAL", "FEASIBLE"]:
+            self.column_values = np.asarray(solver.ResponseProto().solution, dtype=float)
+            # Exact objective of the solution, without the rounding of the scaled costs
+            n = self.matrix.num_variables
+            self.objective_value = float(self.matrix.objective @ self.column_values[:n])
+
+        logger.info(f"Solver finished with status: {self.solution_status}")
+        logger.debug(f"Solve time: {solve_time:.2f}s, {solver.ResponseStats()}")
+
+        return {
+            "status": self.solution_status,
+            "solve_time": solve_time,
+            "objective_value": self.objective_value,
+            "model_type": self.model_type
+        }
+
+    def get_solution(self) -> Dict:
+        """
+        Get the solution of the optimization model.
+
+        Returns:
+            Dict: Dictionary containing the solution variables and objective value
+        """
+        logger.debug("Retrieving solution")
+
+        if self.column_values is None:
+            logger.warning(f"Cannot retrieve solution: status is {self.solution_status}")
+            return {
+                "status": self.solution_status if self.solution_status else "NOT_SOLVED",
+                "values": {},
+                "objective_value": None,
+                "model_type": self.model_type
+            }
+
+        solution_values = self.matrix.positive_values(self.column_values)
+        logger.debug(f"Found {len(solution_values)} non-zero variables")
+        return {
+            "status": self.solution_status,
+            "values": solution_values,
+            "objective_value": self.objective_value,
+            "model_type": self.model_type
+        }
+
+
+class _CpSatVariables(ColumnIndex):
+    """
+    Read-only mapping from (waffle, pan, week) to the CP-SAT variables of the
+    decision variable columns.
+    """
+
+    def __init__(self, model: cp_model.CpModel, matrix: MatrixModel):
+        """
+        Initialize the mapping.
+
+        Args:
+            model: CP-SAT model the matrix model was loaded into
+            matrix: MatrixModel the model was loaded from
+        """
+        super().__init__(matrix)
+        self.model = model
+
+    def __getitem__(self, key: Tuple):
+        return self.model.GetIntVarFromProtoIndex(super().__getitem__(key))
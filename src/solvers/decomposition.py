@@ -0,0 +1,307 @@
+"""
+Decomposition Module for Waffle Production Optimization.
+
+When the allowed (waffle, pan) graph splits into connected components, e.g.
+because product families use dedicated pan lines, no constraint links the
+variables of different components and each component is an independent model.
+With weekly (non-cumulative) supply and no production rate limits, the weeks
+are independent as well. DecomposedSolver detects these blocks, solves them with
+any solver of SolverFactory on a process or thread pool and merges the results.
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Mapping, Optional, Tuple
+import os
+import time
+import logging
+
+from src.solvers.base import MetaSolver, SolverFactory
+from src.solvers.constraints import (
+    Constraint,
+    DemandConstraint,
+    SupplyConstraint,
+    AllowedCombinationsConstraint,
+    ProductionRateConstraint,
+    MinimumBatchConstraint,
+)
+from src.solvers.presolve import presolve
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Constraint classes whose rows only link variables of the same waffle or pan type
+COMPONENT_CONSTRAINTS = (DemandConstraint, SupplyConstraint, AllowedCombinationsConstraint,
+                         ProductionRateConstraint, MinimumBatchConstraint)
+
+# Pools the blocks can be solved on
+PARALLEL_MODES = ['process', 'thread']
+
+# Aggregated status of a decomposed solve: the first status in this list that any block has
+STATUS_PRIORITY = ['INFEASIBLE', 'UNBOUNDED', 'MODEL_INVALID', 'ABNORMAL', 'UNKNOWN', 'NOT_SOLVED', 'FEASIBLE']
+
+
+def splits_weeks(constraints: Mapping[str, Constraint]) -> bool:
+    """
+    Check whether the weeks of a model are independent.
+
+    Args:
+        constraints: Dictionary mapping constraint names to constraint instances
+
+    Returns:
+        bool: True if no constraint links different weeks, i.e. supply is weekly and
+              there are no production rate limits
+    """
+    return all(type(constraint) in COMPONENT_CONSTRAINTS and not isinstance(constraint, ProductionRateConstraint)
+               and not (isinstance(constraint, SupplyConstraint) and constraint.cumulative)
+               for constraint in constraints.values())
+
+
+def _components(waffle_types: List, pan_types: List, allowed: Mapping) -> Tuple[Dict, Dict]:
+    """
+    Find the connected components of the allowed (waffle, pan) graph.
+
+    Waffle and pan types without any allowed combination have no variables; they
+    are put into the first component so that their rows are still checked.
+
+    Args:
+        waffle_types: Waffle types
+        pan_types: Pan types
+        allowed: Allowed flag by (waffle, pan)
+
+    Returns:
+        Tuple[Dict, Dict]: Component number of each waffle type and of each pan type,
+                           numbered in order of first appearance
+    """
+    parent = {('w', w): ('w', w) for w in waffle_types}
+    parent.update({('p', p): ('p', p) for p in pan_types})
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    connected = set()
+    for (w, p), is_allowed in allowed.items():
+        if is_allowed and ('w', w) in parent and ('p', p) in parent:
+            parent[find(('w', w))] = find(('p', p))
+            connected.update((('w', w), ('p', p)))
+
+    numbers = {}
+    for node in list(parent):
+        if node in connected:
+            numbers.setdefault(find(node), len(numbers))
+    waffle_components = {w: numbers.get(find(('w', w)), 0) for w in waffle_types}
+    pan_components = {p: numbers.get(find(('p', p)), 0) for p in pan_types}
+    return waffle_components, pan_components
+
+
+def find_blocks(data: Mapping, constraints: Mapping[str, Constraint]) -> List[Dict]:
+    """
+    Split optimization data into independent blocks.
+
+    Blocks are the connected components of the allowed (waffle, pan) graph and, if
+    splits_weeks holds, each week of a component. Constraints other than the
+    built-in ones may link any variables, so their presence prevents decomposition.
+
+    Args:
+        data: Dictionary containing optimization data
+        constraints: Dictionary mapping constraint names to constraint instances
+
+    Returns:
+        List[Dict]: Optimization data dictionary of each block, largest first
+    """
+    if not all(type(constraint) in COMPONENT_CONSTRAINTS for constraint in constraints.values()):
+        return [data]
+
+    waffle_types = list(data['waffle_types'])
+    pan_types = list(data['pan_types'])
+    weeks = sorted(data['weeks'])
+    allowed = data['allowed']
+    waffle_components, pan_components = _components(waffle_types, pan_types, allowed)
+    n_components = max(list(waffle_components.values()) + list(pan_components.values()) + [0]) + 1
+    week_groups = [[t] for t in weeks] if splits_weeks(constraints) else [weeks]
+    if n_components * len(week_groups) == 1:
+        return [data]
+
+    # Data shared by all week groups of a component
+    components = [{'waffle_types': [], 'pan_types': [], 'cost': {}, 'wpp': {}, 'allowed': {}}
+                  for _ in range(n_components)]
+    for w in waffle_types:
+        components[waffle_components[w]]['waffle_types'].append(w)
+    for p in pan_types:
+        components[pan_components[p]]['pan_types'].append(p)
+    for (w, p), is_allowed in allowed.items():
+        if w in waffle_components and p in pan_components and waffle_components[w] == pan_components[p]:
+            components[waffle_components[w]]['allowed'][(w, p)] = is_allowed
+    for (w, p), value in data['cost'].items():
+        if w in waffle_components and p in pan_components and waffle_components[w] == pan_components[p]:
+            components[waffle_components[w]]['cost'][(w, p)] = value
+    for w, value in data['wpp'].items():
+        if w in waffle_components:
+            components[waffle_components[w]]['wpp'][w] = value
+
+    group_of_week = {t: g for g, group in enumerate(week_groups) for t in group}
+    blocks = [dict(component, weeks=group, demand={}, supply={})
+              for component in components for group in week_groups]
+    for (w, t), value in data['demand'].items():
+        if w in waffle_components and t in group_of_week:
+            blocks[waffle_components[w] * len(week_groups) + group_of_week[t]]['demand'][(w, t)] = value
+    for (p, t), value in data['supply'].items():
+        if p in pan_components and t in group_of_week:
+            blocks[pan_components[p] * len(week_groups) + group_of_week[t]]['supply'][(p, t)] = value
+
+    # Largest blocks first, so that they start first on the pool
+    blocks.sort(key=lambda block: len(block['allowed']) * len(block['weeks']), reverse=True)
+    logger.info(f"Decomposed the model into {len(blocks)} blocks ({n_components} components, "
+                f"{len(week_groups)} week groups)")
+    return blocks
+
+
+def solve_block(solver_name: str, solver_options: Dict, constraints: Dict[str, Constraint], data: Mapping,
+                maximize: bool, use_presolve: bool, warm_start: Optional[Mapping] = None) -> Tuple[Dict, Dict]:
+    """
+    Build and solve the model of one block.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        solver_options: Additional arguments for the solver
+        constraints: Dictionary mapping constraint names to constraint instances
+        data: Optimization data of the block
+        maximize: If True, maximize waffle output, otherwise minimize cost
+        use_presolve: Whether to presolve the block before building its model
+        warm_start: Optional prior solution values by (waffle, pan, week) to start from
+
+    Returns:
+        Tuple[Dict, Dict]: Solution information of solve_model and solution of get_solution
+    """
+    solver = SolverFactory.create_solver(solver_name, constraints=constraints, **solver_options)
+    if use_presolve:
+        solver.set_presolve(presolve(data, constraints, maximize))
+    solver.set_warm_start(warm_start)
+    if maximize:
+        solver.build_maximize_output_model(data)
+    else:
+        solver.build_minimize_cost_model(data)
+    return solver.solve_model(), solver.get_solution()
+
+
+class DecomposedSolver(MetaSolver):
+    """
+    Solver that splits the model into independent blocks and solves each with another solver.
+    """
+
+    mode = 'decomposed'
+
+    def __init__(self, solver_name: str = 'ortools', parallel: Optional[str] = 'process',
+                 max_workers: Optional[int] = None, **solver_options):
+        """
+        Initialize the decomposed solver.
+
+        Args:
+            solver_name: Name of the solver in SolverFactory that solves each block
+            parallel: Solve the blocks on a 'process' or 'thread' pool, or one after
+                      the other if None
+            max_workers: Maximum number of concurrent blocks (default: number of cores)
+            **solver_options: Arguments for the block solver, e.g. time_limit and optimality_gap;
+                              each block gets the full time limit
+        """
+        super().__init__()
+        if parallel is not None and parallel not in PARALLEL_MODES:
+            raise ValueError(f"Unsupported parallel mode: {parallel}")
+        self.solver_name = solver_name
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.solver_options = solver_options
+        self.blocks = None
+        logger.debug(f"Initialized decomposed solver with solver_name={solver_name}, parallel={parallel}")
+
+    def _build(self, data: Dict, maximize: bool) -> None:
+        """
+        Store the data and split it into blocks.
+
+        Args:
+            data: Dictionary containing optimization data
+            maximize: If True, maximize waffle output, otherwise minimize cost
+        """
+        super()._build(data, maximize)
+        self.blocks = find_blocks(data, self.get_all_constraints())
+
+    def _block_warm_start(self, block: Mapping) -> Optional[Dict[Tuple, float]]:
+        """Get the part of the warm start that belongs to the waffle types of a block."""
+        if self.warm_start is None:
+            return None
+        waffle_types = set(block['waffle_types'])
+        return {key: value for key, value in self.warm_start.items() if key[0] in waffle_types}
+
+    def _solve_blocks(self) -> List[Tuple[Dict, Dict]]:
+        """
+        Solve all blocks, on a pool if there is more than one.
+
+        Returns:
+            List[Tuple[Dict, Dict]]: Solution information and solution of each block
+        """
+        arguments = (self.solver_name, self.solver_options, self.get_all_constraints())
+        use_presolve = self.presolve_result is not None
+        warm_starts = [self._block_warm_start(block) for block in self.blocks]
+        if self.parallel is None or len(self.blocks) == 1:
+            return [solve_block(*arguments, block, self.maximize, use_presolve, warm_start)
+                    for block, warm_start in zip(self.blocks, warm_starts)]
+
+        max_workers = min(len(self.blocks), self.max_workers or os.cpu_count() or 1)
+        if self.parallel == 'process':
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        logger.debug(f"Solving {len(self.blocks)} blocks with a {self.parallel} pool of {max_workers} workers")
+        try:
+            futures = [executor.submit(solve_block, *arguments, block, self.maximize, use_presolve, warm_start)
+                       for block, warm_start in zip(self.blocks, warm_starts)]
+            return [future.result() for future in futures]
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def solve_model(self) -> Dict:
+        """
+        Solve all blocks and merge their results.
+
+        The status is OPTIMAL if every block is optimal, otherwise the worst block
+        status; the objective is the sum of the block objectives.
+
+        Returns:
+            Dict: Dictionary containing solution information
+        """
+        if self.blocks is None:
+            logger.error("Cannot solve model: model not built")
+            raise ValueError("Model has not been built. Call build_minimize_cost_model or build_maximize_output_model first.")
+
+        logger.info(f"Solving {self.model_type} model in {len(self.blocks)} blocks with {self.solver_name}")
+        start_time = time.time()
+        results = self._solve_blocks()
+        solve_time = time.time() - start_time
+
+        statuses = [result['status'] for result, _ in results]
+        status = next((status for status in STATUS_PRIORITY if status in statuses), 'OPTIMAL')
+        if status == 'OPTIMAL' and any(s != 'OPTIMAL' for s in statuses):
+            status = 'UNKNOWN'
+        objectives = [result['objective_value'] for result, _ in results]
+        objective_value = sum(objectives) if all(value is not None for value in objectives) else None
+
+        values = {}
+        for _, solution in results:
+            values.update(solution.get('values', {}))
+        self.solution = {
+            "status": status,
+            "values": values if objective_value is not None else {},
+            "objective_value": objective_value,
+            "model_type": self.model_type
+        }
+        logger.info(f"Decomposed solve finished with status: {status}")
+        logger.debug(f"Solve time: {solve_time:.2f}s, block statuses: {statuses}")
+
+        return {
+            "status": status,
+            "solve_time": solve_time,
+            "objective_value": objective_value,
+            "model_type": self.model_type,
+            "num_blocks": len(self.blocks)
+        }
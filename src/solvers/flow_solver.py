@@ -0,0 +1,326 @@
+"""
+Network Flow Implementation for Waffle Production Optimization.
+
+With only the demand, supply and allowed combinations constraints, the
+production model is a transportation problem: pans flow from (pan, week) supply
+nodes, along carry-over arcs when supply is cumulative, to (waffle, week) demand
+nodes over the allowed (waffle, pan) arcs. Its constraint matrix is totally
+unimodular, so the network simplex of OR-Tools SimpleMinCostFlow returns the
+integer optimum directly, without branch and bound.
+"""
+from typing import Dict
+import time
+import logging
+
+import numpy as np
+from ortools.graph.python import min_cost_flow
+
+from src.solvers.base import SolverInterface
+from src.solvers.constraints import (Constraint, DemandConstraint, SupplyConstraint,
+                                     AllowedCombinationsConstraint)
+from src.solvers.matrix_model import ColumnIndex, MatrixModel
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Constraint classes that the network represents exactly
+FLOW_CONSTRAINTS = (DemandConstraint, SupplyConstraint, AllowedCombinationsConstraint)
+
+# Node indices of the super source and the sink of unused supply and surplus production
+SOURCE = 0
+SINK = 1
+
+
+def is_flow_representable(constraints: Dict[str, Constraint]) -> bool:
+    """
+    Check whether a constraint set can be solved as a min-cost flow.
+
+    Subclasses are not accepted, since they may add rows to the model. A supply
+    constraint is required, since it provides the capacities of the network.
+
+    Args:
+        constraints: Dictionary mapping constraint names to constraint instances
+
+    Returns:
+        bool: True if the constraints are a supply constraint plus demand and allowed
+              combinations constraints
+    """
+    return (all(type(constraint) in FLOW_CONSTRAINTS for constraint in constraints.values())
+            and any(type(constraint) is SupplyConstraint for constraint in constraints.values()))
+
+
+class NetworkFlowSolver(SolverInterface):
+    """
+    Implementation of the SolverInterface using OR-Tools SimpleMinCostFlow.
+    """
+
+    def __init__(self, time_limit: int = 60, optimality_gap: float = 0.005, cost_scale: int = 1000):
+        """
+        Initialize the network flow solver.
+
+        Args:
+            time_limit: Accepted for compatibility with the MIP solvers; the network
+                        simplex always runs to optimality
+            optimality_gap: Accepted for compatibility with the MIP solvers
+            cost_scale: Arc costs are multiplied by this factor and rounded to integers
+                        (1000 keeps costs to 1/1000 of a unit)
+        """
+        super().__init__()  # Initialize constraint registry
+        if cost_scale <= 0:
+            raise ValueError(f"cost_scale must be positive, got {cost_scale}")
+        self.time_limit = time_limit
+        self.optimality_gap = optimality_gap
+        self.cost_scale = cost_scale
+        self.flow = None
+        self.matrix = None
+        self.variables = {}
+        self.data = None
+        self.model_type = None
+        self.production_arcs = None
+        self.production_columns = None
+        self.feasible_data = True
+        self.solution_status = None
+        self.objective_value = None
+        self.column_values = None
+        self.start_time = None
+        logger.debug(f"Initialized network flow solver with cost_scale={cost_scale}")
+
+    def apply_constraints(self) -> None:
+        """
+        Check that the registered constraints can be represented by the network.
+
+        Raises:
+            ValueError: If the model has not been built, the data is invalid or a
+                        constraint is not flow-representable
+        """
+        if self.matrix is None or self.data is None:
+            logger.error("Cannot apply constraints: model not built")
+            raise ValueError("Model has not been built. Call build_minimize_cost_model or build_maximize_output_model first.")
+
+        constraints = self.constraint_registry.get_all_constraints()
+        unsupported = [name for name, constraint in constraints.items()
+                       if type(constraint) not in FLOW_CONSTRAINTS]
+        if unsupported:
+            raise ValueError(f"Constraints that cannot be solved as a network flow: {', '.join(unsupported)}")
+        if not is_flow_representable(constraints):
+            raise ValueError("The network flow solver requires a supply constraint")
+        for name, constraint in constraints.items():
+            if not constraint.validate_data(self.data):
+                raise ValueError(f"Invalid data for constraint '{name}'")
+
+    def _build(self, data: Dict, maximize: bool) -> None:
+        """
+        Build the min-cost flow network.
+
+        Nodes are the source, the sink, P x T supply nodes and W x T demand nodes.
+        The source sends all supply either to a supply node (up to its supply) or
+        straight to the sink. Demand nodes consume their demand; production above
+        demand, or in weeks without a demand row, flows on to the sink.
+
+        Args:
+            data: Dictionary containing optimization data
+            maximize: If True, maximize waffle output, otherwise minimize cost
+        """
+        self.data = data
+        self.solution_status = None
+        self.objective_value = None
+        self.column_values = None
+        self.matrix = MatrixModel(data)
+        self.matrix.set_production_objective(maximize)
+        self.variables = ColumnIndex(self.matrix)
+        self.apply_constraints()
+
+        constraints = self.constraint_registry.get_all_constraints().values()
+        demand_constraint = next((c for c in constraints if type(c) is DemandConstraint), None)
+        supply_constraint = next((c for c in constraints if type(c) is SupplyConstraint), None)
+
+        matrix = self.matrix
+        n_weeks = matrix.num_weeks
+        n_pans = len(data['pan_types'])
+        n_waffles = len(data['waffle_types'])
+        supply_offset = 2
+        demand_offset = supply_offset + n_pans * n_weeks
+
+        # Integral supply per (p, t): x is integer, so usage is bounded by the floor of
+        # the (cumulative) supply
+        supply, _ = matrix.supply_matrix()
+        if supply_constraint.cumulative:
+            supply = np.diff(np.floor(np.cumsum(supply, axis=1) + 1e-9), axis=1, prepend=0)
+        else:
+            supply = np.floor(supply + 1e-9)
+
+        # Integral demand per (w, t)
+        demand, demand_mask = matrix.demand_matrix()
+        if demand_constraint is None:
+            demand_mask = np.zeros_like(demand_mask)
+        demand = np.where(demand_mask, demand, 0)
+        integral = np.abs(demand - np.round(demand)) <= 1e-9
+        equality = demand_constraint is not None and demand_constraint.equality
+        # An equality row with fractional demand has no integer solution
+        self.feasible_data = not (equality and not integral.all())
+        demand = np.ceil(demand - 1e-9)
+
+        # No arc can carry more than the total supply
+        capacity = int(supply.sum())
+        total_demand = int(demand.sum())
+
+        pan_weeks = np.arange(n_pans * n_weeks)
+        tails = [np.full(n_pans * n_weeks + 1, SOURCE)]
+        heads = [np.append(supply_offset + pan_weeks, SINK)]
+        capacities = [np.append(supply.ravel(), capacity)]
+        costs = [np.zeros(n_pans * n_weeks + 1, dtype=np.int64)]
+
+        if supply_constraint.cumulative and n_weeks > 1:
+            # Carry-over arcs (p, t) -> (p, t + 1)
+            carry = (supply_offset + pan_weeks).reshape(n_pans, n_weeks)
+            tails.append(carry[:, :-1].ravel())
+            heads.append(carry[:, 1:].ravel())
+            capacities.append(np.full(n_pans * (n_weeks - 1), capacity))
+            costs.append(np.zeros(n_pans * (n_weeks - 1), dtype=np.int64))
+
+        # Production arcs (p, t) -> (w, t), one per decision variable column
+        pairs = np.arange(matrix.num_variables) // n_weeks
+        weeks = np.arange(matrix.num_variables) % n_weeks
+        sign = -1 if maximize else 1
+        scaled_costs = np.round(sign * matrix.objective[:matrix.num_variables] * self.cost_scale).astype(np.int64)
+        heads_demand = demand[matrix.pair_waffle[pairs], weeks]
+
+        # Surplus arcs (w, t) -> sink where production may exceed demand. With
+        # nonnegative costs surplus never pays off, and production into a node without
+        # demand stays zero, so those arcs are left out and the remaining production
+        # arcs are bounded by the demand of their head node
+        surplus = np.ones((n_waffles, n_weeks), dtype=bool) if not equality else ~demand_mask
+        production_capacity = np.full(matrix.num_variables, capacity)
+        if scaled_costs.min(initial=0) >= 0:
+            surplus[:] = False
+            production_capacity = heads_demand
+        self.production_columns = np.flatnonzero(production_capacity > 0)
+
+        first_production_arc = sum(len(t) for t in tails)
+        columns = self.production_columns
+        tails.append(supply_offset + matrix.pair_pan[pairs[columns]] * n_weeks + weeks[columns])
+        heads.append(demand_offset + matrix.pair_waffle[pairs[columns]] * n_weeks + weeks[columns])
+        capacities.append(production_capacity[columns])
+        costs.append(scaled_costs[columns])
+
+        waffles, surplus_weeks = np.nonzero(surplus)
+        tails.append(demand_offset + waffles * n_weeks + surplus_weeks)
+        heads.append(np.full(len(waffles), SINK))
+        capacities.append(np.full(len(waffles), capacity))
+        costs.append(np.zeros(len(waffles), dtype=np.int64))
+
+        self.flow = min_cost_flow.SimpleMinCostFlow()
+        self.flow.add_arcs_with_capacity_and_unit_cost(
+            np.concatenate(tails).astype(np.int32), np.concatenate(heads).astype(np.int32),
+            np.concatenate(capacities).astype(np.int64), np.concatenate(costs))
+        self.production_arcs = np.arange(first_production_arc, first_production_arc + len(columns))
+
+        demand_nodes = demand_offset + np.arange(n_waffles * n_weeks)
+        nodes = np.concatenate([[SOURCE, SINK], demand_nodes]).astype(np.int32)
+        supplies = np.concatenate([[capacity, total_demand - capacity], -demand.ravel()]).astype(np.int64)
+        self.flow.set_nodes_supplies(nodes, supplies)
+        logger.debug(f"Built flow network with {self.flow.num_nodes()} nodes and {self.flow.num_arcs()} arcs")
+
+    def build_minimize_cost_model(self, data: Dict) -> None:
+        """
+        Build an optimization model to minimize production cost.
+
+        Args:
+            data: Dictionary containing optimization data
+        """
+        logger.info("Building cost minimization flow network")
+        self.model_type = 'minimize_cost'
+        self._build(data, maximize=False)
+        logger.info("Cost minimization flow network built successfully")
+
+    def build_maximize_output_model(self, data: Dict) -> None:
+        """
+        Build an optimization model to maximize waffle output.
+
+        Args:
+            data: Dictionary containing optimization data
+        """
+        logger.info("Building output maximization flow network")
+        self.model_type = 'maximize_output'
+        self._build(data, maximize=True)
+        logger.info("Output maximization flow network built successfully")
+
+    def solve_model(self) -> Dict:
+        """
+        Solve the current optimization model.
+
+        Returns:
+            Dict: Dictionary containing solution information
+
+        Raises:
+            ValueError: If the scaled costs or capacities are out of range
+        """
+        if self.flow is None:
+            logger.error("Cannot solve model: model not built")
+            raise ValueError("Model has not been built. Call build_minimize_cost_model or build_maximize_output_model first.")
+
+        logger.info(f"Solving {self.model_type} flow network")
+        self.start_time = time.time()
+        status = self.flow.solve() if self.feasible_data else min_cost_flow.SimpleMinCostFlow.INFEASIBLE
+        solve_time = time.time() - self.start_time
+
+        if status in [min_cost_flow.SimpleMinCostFlow.BAD_COST_RANGE,
+                      min_cost_flow.SimpleMinCostFlow.BAD_CAPACITY_RANGE]:
+            raise ValueError(f"Network flow costs or capacities out of range ({status.name}); "
+                             f"try a smaller cost_scale")
+
+        status_map = {
+            min_cost_flow.SimpleMinCostFlow.OPTIMAL: "OPTIMAL",
+            min_cost_flow.SimpleMinCostFlow.FEASIBLE: "FEASIBLE",
+            # Supply and demand of the network are balanced, so an unbalanced result
+            # means the demand nodes cannot be served
+            min_cost_flow.SimpleMinCostFlow.INFEASIBLE: "INFEASIBLE",
+            min_cost_flow.SimpleMinCostFlow.UNBALANCED: "INFEASIBLE",
+            min_cost_flow.SimpleMinCostFlow.NOT_SOLVED: "NOT_SOLVED",
+        }
+        self.solution_status = status_map.get(status, "ABNORMAL")
+
+        self.objective_value = None
+        self.column_values = None
+        if self.solution_status in ["OPTIMAL", "FEASIBLE"]:
+            self.column_values = np.zeros(self.matrix.num_variables)
+            self.column_values[self.production_columns] = self.flow.flows(self.production_arcs)
+            # Exact objective of the solution, without the rounding of the scaled costs
+            self.objective_value = float(self.matrix.objective @ self.column_values)
+
+        logger.info(f"Solver finished with status: {self.solution_status}")
+        logger.debug(f"Solve time: {solve_time:.4f}s")
+
+        return {
+            "status": self.solution_status,
+            "solve_time": solve_time,
+            "objective_value": self.objective_value,
+            "model_type": self.model_type
+        }
+
+    def get_solution(self) -> Dict:
+        """
+        Get the solution of the optimization model.
+
+        Returns:
+            Dict: Dictionary containing the solution variables and objective value
+        """
+        logger.debug("Retrieving solution")
+
+        if self.column_values is None:
+            logger.warning(f"Cannot retrieve solution: status is {self.solution_status}")
+            return {
+                "status": self.solution_status if self.solution_status else "NOT_SOLVED",
+                "values": {},
+                "objective_value": None,
+                "model_type": self.model_type
+            }
+
+        solution_values = self.matrix.positive_values(self.column_values)
+        logger.debug(f"Found {len(solution_values)} non-zero variables")
+        return {
+            "status": self.solution_status,
+            "values": solution_values,
+            "objective_value": self.objective_value,
+            "model_type": self.model_type
+        }
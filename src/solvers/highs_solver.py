@@ -0,0 +1,347 @@
+"""
+HiGHS Implementation for Waffle Production Optimization.
+
+This module provides the implementation of SolverInterface using the HiGHS
+solver in-process through highspy. The model is assembled as a MatrixModel and
+passed to HiGHS column-wise in a single passModel call; solution values are read
+back as arrays, without writing model or solution files.
+"""
+from typing import Dict, Optional
+import time
+import logging
+
+import numpy as np
+
+from src.solvers.base import SolverInterface
+from src.solvers.matrix_model import ColumnIndex, MatrixModel, assemble_aligned
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Values of the HiGHS 'parallel' option
+PARALLEL_MODES = ['choose', 'on', 'off']
+
+
+def _import_highspy():
+    """Import highspy, with an installation hint if it is missing."""
+    try:
+        import highspy
+    except ImportError as e:
+        raise ValueError("The HiGHS solver requires the highspy package (pip install highspy).") from e
+    return highspy
+
+
+class HighsSolver(SolverInterface):
+    """
+    Implementation of the SolverInterface using HiGHS through highspy.
+    """
+
+    def __init__(self, time_limit: int = 60, optimality_gap: float = 0.005,
+                 threads: int = 0, parallel: str = 'choose', verbose: bool = False):
+        """
+        Initialize the HiGHS solver.
+
+        Args:
+            time_limit: Time limit for solving the model in seconds
+            optimality_gap: Maximum allowed optimality gap (default: 0.5%)
+            threads: Number of HiGHS worker threads (0: let HiGHS decide). HiGHS shares
+                     one thread pool per process, which is reset when this value changes
+            parallel: Whether HiGHS uses parallel algorithms ('choose', 'on' or 'off')
+            verbose: Whether HiGHS prints its log to the console
+        """
+        super().__init__()  # Initialize constraint registry
+        if parallel not in PARALLEL_MODES:
+            raise ValueError(f"Unsupported parallel mode: {parallel}")
+        self.time_limit = time_limit
+        self.optimality_gap = optimality_gap
+        self.threads = threads
+        self.parallel = parallel
+        self.verbose = verbose
+        self.solver = None
+        self.matrix = None
+        self.variables = {}
+        self.data = None
+        self.model_type = None
+        self.solution_status = None
+        self.objective_value = None
+        self.start_time = None
+        logger.debug(f"Initialized HiGHS solver with time_limit={time_limit}, optimality_gap={optimality_gap}, "
+                     f"threads={threads}, parallel={parallel}")
+
+    def apply_constraints(self) -> None:
+        """
+        Apply all registered constraints to the model.
+
+        Raises:
+            ValueError: If the model has not been built or a constraint does not
+                        support matrix construction
+        """
+        if self.matrix is None or self.data is None:
+            logger.error("Cannot apply constraints: model not built")
+            raise ValueError("Model has not been built. Call build_minimize_cost_model or build_maximize_output_model first.")
+
+        logger.info("Applying constraints to HiGHS model")
+        deferred = self.constraint_registry.apply_matrix_constraints(self.matrix, self.data)
+        if deferred:
+            raise ValueError(f"Constraints without matrix support cannot be used with HiGHS: {', '.join(deferred)}")
+        logger.debug("Constraints applied successfully")
+
+    def _create_solver(self):
+        """
+        Create a HiGHS instance with the solver options.
+
+        Returns:
+            highspy.Highs: New HiGHS instance
+        """
+        highspy = _import_highspy()
+        solver = highspy.Highs()
+        solver.setOptionValue('output_flag', self.verbose)
+        solver.setOptionValue('time_limit', float(self.time_limit))
+        solver.setOptionValue('mip_rel_gap', float(self.optimality_gap))
+        solver.setOptionValue('parallel', self.parallel)
+        if self.threads:
+            # The thread pool is global and only picks up a new size after a reset
+            highspy.Highs.resetGlobalScheduler(True)
+            solver.setOptionValue('threads', int(self.threads))
+        return solver
+
+    def _build(self, data: Dict, maximize: bool) -> None:
+        """
+        Assemble the model as a MatrixModel and pass it to HiGHS.
+
+        Args:
+            data: Dictionary containing optimization data
+            maximize: If True, maximize waffle output, otherwise minimize cost
+        """
+        highspy = _import_highspy()
+        self.data = data
+        self.solution_status = None
+        self.objective_value = None
+        upper_bounds = self.presolve_result.upper_bounds if self.presolve_result is not None else None
+        self.matrix = MatrixModel(data, upper_bounds=upper_bounds)
+        self.matrix.set_production_objective(maximize)
+        self.variables = ColumnIndex(self.matrix)
+
+        # Apply constraints from constraint registry
+        self.apply_constraints()
+
+        lower, upper, integer, objective = self.matrix.column_arrays()
+        row_lower, row_upper = self.matrix.row_arrays()
+        starts, rows, coefficients = self.matrix.to_csc()
+        integrality = np.where(integer, int(highspy.HighsVarType.kInteger),
+                               int(highspy.HighsVarType.kContinuous)).astype(np.int32)
+        sense = highspy.ObjSense.kMaximize if maximize else highspy.ObjSense.kMinimize
+
+        self.solver = self._create_solver()
+        status = self.solver.passModel(
+            self.matrix.num_columns, self.matrix.num_rows, self.matrix.num_nonzeros,
+            int(highspy.MatrixFormat.kColwise), int(sense), 0.0,
+            objective, lower, upper, row_lower, row_upper,
+            starts.astype(np.int32), rows.astype(np.int32), coefficients, integrality)
+        if status == highspy.HighsStatus.kError:
+            raise ValueError("Failed to pass model to HiGHS")
+        logger.debug(f"Passed model to HiGHS: {self.matrix.get_statistics()}")
+
+    def _patch_model(self, data: Dict) -> bool:
+        """
+        Patch the HiGHS model for new data or constraints.
+
+        Bounds and coefficients of unchanged constraint blocks are changed in place,
+        the rows and auxiliary columns of removed or restructured constraints are
+        deleted and those of new or restructured constraints are appended.
+
+        Args:
+            data: New optimization data
+
+        Returns:
+            bool: True if the model was patched, False if it has to be rebuilt
+        """
+        if self.matrix is None or self.solver is None:
+            return False
+        constraints = self.constraint_registry.get_all_constraints()
+        if not all(constraint.matrix_support for constraint in constraints.values()):
+            return False
+        upper_bounds = self.presolve_result.upper_bounds if self.presolve_result is not None else None
+
+        def assemble(order):
+            matrix = MatrixModel(data, upper_bounds=upper_bounds)
+            matrix.set_production_objective(self.matrix.maximize)
+            self.constraint_registry.apply_matrix_constraints(matrix, data, order=order)
+            return matrix
+
+        matrix = assemble_aligned(self.matrix, constraints, assemble)
+        changes = matrix.changes_from(self.matrix)
+        if changes is None:
+            return False
+
+        highspy = _import_highspy()
+        if len(changes['deleted_rows']):
+            self.solver.deleteRows(len(changes['deleted_rows']), changes['deleted_rows'].astype(np.int32))
+        if len(changes['deleted_columns']):
+            self.solver.deleteCols(len(changes['deleted_columns']), changes['deleted_columns'].astype(np.int32))
+
+        lower, upper, integer, objective = matrix.column_arrays()
+        columns = changes['columns'].astype(np.int32)
+        if len(columns):
+            self.solver.changeColsBounds(len(columns), columns, lower[columns], upper[columns])
+        columns = changes['objective'].astype(np.int32)
+        if len(columns):
+            self.solver.changeColsCost(len(columns), columns, objective[columns])
+        row_lower, row_upper = matrix.row_arrays()
+        for r in changes['rows'].tolist():
+            self.solver.changeRowBounds(r, float(row_lower[r]), float(row_upper[r]))
+        for r, j, value in zip(changes['coefficient_rows'].tolist(), changes['coefficient_columns'].tolist(),
+                               changes['coefficients'].tolist()):
+            self.solver.changeCoeff(r, j, value)
+
+        first_column = changes['first_new_column']
+        if first_column < matrix.num_columns:
+            count = matrix.num_columns - first_column
+            self.solver.addCols(count, objective[first_column:], lower[first_column:], upper[first_column:], 0,
+                                np.zeros(count, dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros(0))
+            integrality = np.where(integer[first_column:], int(highspy.HighsVarType.kInteger),
+                                   int(highspy.HighsVarType.kContinuous)).astype(np.uint8)
+            self.solver.changeColsIntegrality(count, np.arange(first_column, matrix.num_columns, dtype=np.int32),
+                                              integrality)
+        first_row = changes['first_new_row']
+        if first_row < matrix.num_rows:
+            indptr, row_columns, coefficients = matrix.to_csr()
+            begin = indptr[first_row]
+            self.solver.addRows(matrix.num_rows - first_row, row_lower[first_row:], row_upper[first_row:],
+                                int(indptr[-1] - begin), (indptr[first_row:-1] - begin).astype(np.int32),
+                                row_columns[begin:].astype(np.int32), coefficients[begin:])
+
+        self.matrix = matrix
+        self.variables = ColumnIndex(matrix)
+        self.solution_status = None
+        self.objective_value = None
+        logger.debug(f"Patched HiGHS model: {len(changes['columns'])} column bounds, {len(changes['objective'])} "
+                     f"costs, {len(changes['rows'])} row bounds, {len(changes['coefficients'])} coefficients, "
+                     f"{len(changes['deleted_rows'])} rows deleted and {matrix.num_rows - first_row} rows added")
+        return True
+
+    def build_minimize_cost_model(self, data: Dict) -> None:
+        """
+        Build an optimization model to minimize production cost.
+
+        Args:
+            data: Dictionary containing optimization data
+        """
+        logger.info("Building cost minimization model")
+        self.model_type = 'minimize_cost'
+        self._build(data, maximize=False)
+        logger.info("Cost minimization model built successfully")
+
+    def build_maximize_output_model(self, data: Dict) -> None:
+        """
+        Build an optimization model to maximize waffle output.
+
+        Args:
+            data: Dictionary containing optimization data
+        """
+        logger.info("Building output maximization model")
+        self.model_type = 'maximize_output'
+        self._build(data, maximize=True)
+        logger.info("Output maximization model built successfully")
+
+    def _has_solution(self) -> bool:
+        """Check whether HiGHS holds a feasible primal solution."""
+        highspy = _import_highspy()
+        return self.solver.getInfo().primal_solution_status == int(highspy.SolutionStatus.kSolutionStatusFeasible)
+
+    def solve_model(self) -> Dict:
+        """
+        Solve the current optimization model.
+
+        Returns:
+            Dict: Dictionary containing solution information
+        """
+        if self.solver is None:
+            logger.error("Cannot solve model: model not built")
+            raise ValueError("Model has not been built. Call build_minimize_cost_model or build_maximize_output_model first.")
+
+        highspy = _import_highspy()
+        logger.info(f"Solving {self.model_type} model")
+        logger.debug(f"Time limit: {self.time_limit}s, Optimality gap: {self.optimality_gap}")
+
+        # Start from the prior solution; HiGHS completes the auxiliary columns itself
+        if self.warm_start is not None:
+            hints = self.matrix.hint_values(self.warm_start)
+            self.solver.setSolution(len(hints), np.arange(len(hints), dtype=np.int32), hints)
+
+        self.start_time = time.time()
+        self.solver.run()
+        solve_time = time.time() - self.start_time
+
+        model_status = self.solver.getModelStatus()
+        status_map = {
+            highspy.HighsModelStatus.kOptimal: "OPTIMAL",
+            highspy.HighsModelStatus.kModelEmpty: "OPTIMAL",
+            highspy.HighsModelStatus.kInfeasible: "INFEASIBLE",
+            highspy.HighsModelStatus.kUnbounded: "UNBOUNDED",
+            highspy.HighsModelStatus.kUnboundedOrInfeasible: "UNBOUNDED_OR_INFEASIBLE",
+            highspy.HighsModelStatus.kNotset: "NOT_SOLVED",
+        }
+        if model_status in status_map:
+            self.solution_status = status_map[model_status]
+        elif self._has_solution():
+            # Stopped by a limit with an incumbent solution
+            self.solution_status = "FEASIBLE"
+        elif model_status in [highspy.HighsModelStatus.kTimeLimit, highspy.HighsModelStatus.kIterationLimit,
+                              highspy.HighsModelStatus.kSolutionLimit, highspy.HighsModelStatus.kInterrupt]:
+            self.solution_status = "NOT_SOLVED"
+        else:
+            self.solution_status = "ABNORMAL"
+
+        self.objective_value = None
+        if self.solution_status in ["OPTIMAL", "FEASIBLE"]:
+            self.objective_value = self.solver.getInfo().objective_function_value
+
+        logger.info(f"Solver finished with status: {self.solution_status}")
+        logger.debug(f"Solve time: {solve_time:.2f}s, HiGHS status: {self.solver.modelStatusToString(model_status)}")
+
+        return {
+            "status": self.solution_status,
+            "solve_time": solve_time,
+            "objective_value": self.objective_value,
+            "model_type": self.model_type
+        }
+
+    def get_column_values(self) -> Optional[np.ndarray]:
+        """
+        Get the values of all model columns.
+
+        Returns:
+            Optional[np.ndarray]: Column values in MatrixModel order, or None without a solution
+        """
+        if self.solver is None or self.solution_status not in ["OPTIMAL", "FEASIBLE"]:
+            return None
+        return np.asarray(self.solver.getSolution().col_value, dtype=float)
+
+    def get_solution(self) -> Dict:
+        """
+        Get the solution of the optimization model.
+
+        Returns:
+            Dict: Dictionary containing the solution variables and objective value
+        """
+        logger.debug("Retrieving solution")
+
+        values = self.get_column_values()
+        if values is None:
+            logger.warning(f"Cannot retrieve solution: status is {self.solution_status}")
+            return {
+                "status": self.solution_status if self.solution_status else "NOT_SOLVED",
+                "values": {},
+                "objective_value": None,
+                "model_type": self.model_type
+            }
+
+        solution_values = self.matrix.positive_values(values)
+        logger.debug(f"Found {len(solution_values)} non-zero variables")
+        return {
+            "status": self.solution_status,
+            "values": solution_values,
+            "objective_value": self.objective_value,
+            "model_type": self.model_type
+        }
@@ -0,0 +1,837 @@
+"""
+Matrix Model Module for Waffle Production Optimization.
+
+This module assembles an optimization model as NumPy arrays (column bounds,
+objective vector and a CSR constraint matrix) so that it can be loaded into a
+solver in one call instead of one variable and one coefficient at a time.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+import copy
+import logging
+
+import numpy as np
+
+from src.data.optimization_data import as_optimization_data
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def ragged_arange(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Concatenate the ranges start, start + 1, ..., start + count - 1 without a Python loop.
+
+    Args:
+        starts: First value of each range
+        counts: Length of each range
+
+    Returns:
+        np.ndarray: The concatenated ranges
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(np.asarray(starts, dtype=np.int64), counts) + np.arange(total, dtype=np.int64) - offsets
+
+
+def _same_structure(structure: Optional[Tuple], other: Optional[Tuple]) -> bool:
+    """Check whether two block structures of MatrixModel._block_structure are equal."""
+    if structure is None or other is None:
+        return False
+    return all(np.array_equal(a, b) for a, b in zip(structure, other))
+
+
+class CompiledBlock:
+    """
+    Rows and auxiliary columns of one constraint, compiled for the decision
+    variables of a MatrixModel but not appended to it.
+
+    Auxiliary columns are numbered from num_variables, as if the block were the
+    first one after the decision variables. The arrays are never modified, so a
+    block can be appended to any number of models of the same decision variables.
+    """
+
+    def __init__(self, column_blocks: List[Tuple], row_blocks: List[Tuple]):
+        """
+        Initialize the block.
+
+        Args:
+            column_blocks: Auxiliary column blocks in the layout of MatrixModel.add_columns
+            row_blocks: CSR row blocks in the layout of MatrixModel.add_rows
+        """
+        self.column_blocks = column_blocks
+        self.row_blocks = row_blocks
+        self.num_columns = sum(len(block[0]) for block in column_blocks)
+        self.num_rows = sum(len(block[3]) for block in row_blocks)
+        self.num_nonzeros = sum(len(block[1]) for block in row_blocks)
+
+
+class MatrixModel:
+    """
+    Linear model held as NumPy arrays.
+
+    The first columns are the decision variables x[w, p, t] for every allowed
+    (waffle, pan) pair and every week, in the same order as the variables of the
+    classic build: by waffle type, then pan type, then week. Column j belongs to
+    pair j // num_weeks and sorted week j % num_weeks. Constraints append rows
+    and auxiliary columns with add_rows and add_columns.
+
+    Decision variables with an upper bound of 0 (removed by presolve) keep their
+    column, but add_rows leaves them out of all rows.
+
+    Constraints appended with add_block are recorded as named blocks of rows and
+    auxiliary columns, so that changes_from can match the blocks of models whose
+    constraints were added or removed.
+    """
+
+    def __init__(self, data: Mapping, with_names: bool = False, upper_bounds: Optional[np.ndarray] = None):
+        """
+        Initialize the model with the decision variables of the given data.
+
+        Args:
+            data: OptimizationData instance or tuple-keyed optimization data dictionary
+            with_names: Whether to give columns names (slower, but needed for readable exports)
+            upper_bounds: Upper bound of each decision variable column, e.g. from presolve
+                          (default: unbounded)
+        """
+        self.data = as_optimization_data(data)
+        self.with_names = with_names
+
+        # Weeks are sorted to ensure chronological order, like the classic build
+        weeks = self.data.weeks
+        self.week_order = np.array(sorted(range(len(weeks)), key=weeks.__getitem__), dtype=np.int64)
+        self.weeks = [weeks[i] for i in self.week_order]
+        self.week_position = {week: i for i, week in enumerate(self.weeks)}
+        self.num_weeks = len(self.weeks)
+
+        self.pair_waffle, self.pair_pan = np.nonzero(self.data.allowed_matrix())
+        self.num_pairs = len(self.pair_waffle)
+        self.pair_lookup = np.full((len(self.data.waffle_types), len(self.data.pan_types)), -1, dtype=np.int64)
+        self.pair_lookup[self.pair_waffle, self.pair_pan] = np.arange(self.num_pairs)
+        self.num_variables = self.num_pairs * self.num_weeks
+        if upper_bounds is None:
+            self.variable_upper = np.full(self.num_variables, np.inf)
+        else:
+            self.variable_upper = np.asarray(upper_bounds, dtype=float)
+            if self.variable_upper.shape != (self.num_variables,):
+                raise ValueError(f"Expected {self.num_variables} upper bounds, got {self.variable_upper.shape}")
+        removed = self.variable_upper <= 0
+        self.removed_variables = removed if removed.any() else None
+
+        self.maximize = False
+        self._keys = None
+        self._column_blocks: List[Tuple] = []
+        self._row_blocks: List[Tuple] = []
+        self.blocks: Dict[str, Tuple[int, int, int, int]] = {}
+        self._layout_cache = None
+        self.num_columns = 0
+        self.num_rows = 0
+        self.num_nonzeros = 0
+        self.objective = np.zeros(self.num_variables)
+
+        names = self._variable_names() if with_names else None
+        self.add_columns(self.num_variables, 0, self.variable_upper, True, names)
+        logger.debug(f"Created {self.num_variables} decision variable columns")
+
+    def _variable_names(self) -> List[str]:
+        """Get the names of the decision variables in column order."""
+        waffle_types = self.data.waffle_types
+        pan_types = self.data.pan_types
+        return [f'x_{waffle_types[w]}_{pan_types[p]}_{t}'
+                for w, p in zip(self.pair_waffle.tolist(), self.pair_pan.tolist())
+                for t in self.weeks]
+
+    def variable_keys(self) -> List[Tuple]:
+        """
+        Get the (waffle, pan, week) key of each decision variable column.
+
+        Returns:
+            List[Tuple]: Keys in column order
+        """
+        if self._keys is None:
+            waffle_types = self.data.waffle_types
+            pan_types = self.data.pan_types
+            self._keys = [(waffle_types[w], pan_types[p], t)
+                          for w, p in zip(self.pair_waffle.tolist(), self.pair_pan.tolist())
+                          for t in self.weeks]
+        return self._keys
+
+    def positive_values(self, values: np.ndarray) -> Dict[Tuple, float]:
+        """
+        Get the positive values of the decision variables from a column value array.
+
+        Args:
+            values: Value of each column (auxiliary columns are ignored)
+
+        Returns:
+            Dict[Tuple, float]: Values by (waffle, pan, week)
+        """
+        values = np.asarray(values, dtype=float)[:self.num_variables]
+        keys = self.variable_keys()
+        return {keys[i]: float(values[i]) for i in np.flatnonzero(values > 0).tolist()}
+
+    def hint_values(self, values: Mapping[Tuple, float]) -> np.ndarray:
+        """
+        Map the values of a prior solution onto the decision variable columns.
+
+        Variables missing from the prior solution are hinted at 0 and keys without
+        a column are dropped. Values are rounded and clipped to the column bounds.
+
+        Args:
+            values: Values by (waffle, pan, week), e.g. the 'values' of a solution
+
+        Returns:
+            np.ndarray: Hint value of each decision variable column
+        """
+        hints = np.zeros(self.num_variables)
+        for key, value in values.items():
+            column = self.variable_column(key)
+            if column is not None:
+                hints[column] = value
+        return np.clip(np.round(hints), 0, self.variable_upper)
+
+    def variable_column(self, key: Tuple) -> Optional[int]:
+        """
+        Get the column of the decision variable with the given key.
+
+        Args:
+            key: (waffle, pan, week) tuple
+
+        Returns:
+            Optional[int]: Column index, or None if the variable does not exist
+        """
+        try:
+            w, p, t = key
+            pair = self.pair_lookup[self.data.waffle_index[w], self.data.pan_index[p]]
+            position = self.week_position[t]
+        except (KeyError, TypeError, ValueError):
+            return None
+        if pair < 0:
+            return None
+        return int(pair) * self.num_weeks + position
+
+    def demand_matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get demand and its mask of existing entries as W x T arrays in sorted week order.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Demand values and mask
+        """
+        return (self.data.demand_matrix()[:, self.week_order],
+                self.data.demand_mask[:, self.week_order])
+
+    def supply_matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get supply and its mask of existing entries as P x T arrays in sorted week order.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Supply values and mask
+        """
+        return (self.data.supply_matrix()[:, self.week_order],
+                self.data.supply_mask[:, self.week_order])
+
+    def pair_groups(self, by: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Group the allowed (waffle, pan) pairs by waffle type or by pan type.
+
+        Args:
+            by: 'waffle' or 'pan'
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Group offsets (length groups + 1) and pair ids,
+                                           so that the pairs of group g are pairs[offsets[g]:offsets[g + 1]]
+        """
+        if by == 'waffle':
+            keys, size, pairs = self.pair_waffle, len(self.data.waffle_types), np.arange(self.num_pairs)
+        elif by == 'pan':
+            keys, size = self.pair_pan, len(self.data.pan_types)
+            pairs = np.argsort(keys, kind='stable')
+        else:
+            raise ValueError(f"Unsupported pair grouping: {by}")
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=size), out=offsets[1:])
+        return offsets, pairs
+
+    def sum_rows(self, by: str, groups: np.ndarray, first_week: ArrayLike,
+                 last_week: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the coefficients of rows that sum decision variables over pairs and a range of weeks.
+
+        Row r sums x[pair, t] over the pairs of group groups[r] and the sorted week
+        positions first_week[r] to last_week[r] (inclusive), pair by pair.
+
+        Args:
+            by: Pair grouping ('waffle' or 'pan')
+            groups: Waffle or pan index of each row
+            first_week: First week position of each row
+            last_week: Last week position of each row
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Row number and column of each nonzero, ordered by row
+        """
+        offsets, pairs = self.pair_groups(by)
+        groups = np.asarray(groups, dtype=np.int64)
+        first_week = np.broadcast_to(np.asarray(first_week, dtype=np.int64), groups.shape)
+        span = np.broadcast_to(np.asarray(last_week, dtype=np.int64), groups.shape) - first_week + 1
+
+        # One entry per (row, pair), then one per (row, pair, week)
+        pair_counts = offsets[groups + 1] - offsets[groups]
+        row_pairs = pairs[ragged_arange(offsets[groups], pair_counts)]
+        row_first = np.repeat(first_week, pair_counts)
+        row_span = np.repeat(span, pair_counts)
+
+        rows = np.repeat(np.arange(len(groups)), pair_counts * span)
+        columns = ragged_arange(row_pairs * self.num_weeks + row_first, row_span)
+        return rows, columns
+
+    def waffle_week_upper_bounds(self) -> np.ndarray:
+        """
+        Get the largest total production of each waffle type in each week allowed
+        by the decision variable bounds.
+
+        Returns:
+            np.ndarray: W x T array in sorted week order (0 if no variable is left, inf if unbounded)
+        """
+        bounds = np.zeros((len(self.data.waffle_types), self.num_weeks))
+        np.add.at(bounds, self.pair_waffle, self.variable_upper.reshape(self.num_pairs, self.num_weeks))
+        return bounds
+
+    def set_objective(self, coefficients: np.ndarray, maximize: bool) -> None:
+        """
+        Set the objective coefficients of the decision variables.
+
+        Args:
+            coefficients: Coefficient of each decision variable column
+            maximize: Whether the objective is maximized
+        """
+        self.objective = np.asarray(coefficients, dtype=float)
+        self.maximize = maximize
+
+    def set_production_objective(self, maximize: bool) -> None:
+        """
+        Set the objective of the production models.
+
+        Minimizing cost uses cost * wpp per pan, maximizing output uses wpp per pan.
+
+        Args:
+            maximize: If True, maximize waffle output, otherwise minimize cost
+        """
+        wpp = self.data.wpp_vector()[self.pair_waffle].astype(float)
+        if maximize:
+            pair_coefficients = wpp
+        else:
+            pair_coefficients = self.data.cost_matrix()[self.pair_waffle, self.pair_pan] * wpp
+        self.set_objective(np.repeat(pair_coefficients, self.num_weeks), maximize)
+
+    def add_columns(self, count: int, lower: ArrayLike, upper: ArrayLike, integer: bool,
+                    names: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Append columns to the model.
+
+        Args:
+            count: Number of columns
+            lower: Lower bound (scalar or one per column)
+            upper: Upper bound (scalar or one per column)
+            integer: Whether the columns are integer
+            names: Column names, only used if the model was created with names
+
+        Returns:
+            np.ndarray: Indices of the new columns
+        """
+        lower = np.broadcast_to(np.asarray(lower, dtype=float), (count,))
+        upper = np.broadcast_to(np.asarray(upper, dtype=float), (count,))
+        self._column_blocks.append((lower, upper, integer, names if self.with_names else None))
+        columns = np.arange(self.num_columns, self.num_columns + count)
+        self.num_columns += count
+        return columns
+
+    def add_rows(self, rows: np.ndarray, columns: np.ndarray, coefficients: ArrayLike,
+                 lower: ArrayLike, upper: ArrayLike) -> None:
+        """
+        Append rows given as coordinate (row, column, coefficient) triplets.
+
+        Nonzeros on removed decision variables are dropped.
+
+        Args:
+            rows: Row number of each nonzero, from 0 to the number of new rows - 1
+            columns: Column of each nonzero
+            coefficients: Coefficient of each nonzero (scalar or one per nonzero)
+            lower: Lower bound of each row (the number of rows is taken from here)
+            upper: Upper bound of each row
+        """
+        lower = np.asarray(lower, dtype=float)
+        count = len(lower)
+        upper = np.broadcast_to(np.asarray(upper, dtype=float), (count,))
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = np.asarray(columns, dtype=np.int64)
+        coefficients = np.broadcast_to(np.asarray(coefficients, dtype=float), columns.shape)
+        if self.removed_variables is not None:
+            removed = np.zeros(len(columns), dtype=bool)
+            decision = columns < self.num_variables
+            removed[decision] = self.removed_variables[columns[decision]]
+            if removed.any():
+                rows, columns, coefficients = rows[~removed], columns[~removed], coefficients[~removed]
+
+        # Convert to CSR; emitters usually produce rows in order already
+        if len(rows) > 1 and np.any(rows[1:] < rows[:-1]):
+            order = np.argsort(rows, kind='stable')
+            rows, columns, coefficients = rows[order], columns[order], coefficients[order]
+        indptr = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=count), out=indptr[1:])
+
+        self._row_blocks.append((indptr, columns, coefficients, lower, upper))
+        self.num_rows += count
+        self.num_nonzeros += len(columns)
+
+    def compile_block(self, constraint: Any, data: Mapping) -> CompiledBlock:
+        """
+        Compile the rows and auxiliary columns of a constraint without appending them.
+
+        Args:
+            constraint: Constraint with matrix support
+            data: Dictionary containing optimization data
+
+        Returns:
+            CompiledBlock: The compiled block
+        """
+        # The constraint is applied to a copy holding only the decision variables
+        scratch = copy.copy(self)
+        scratch._column_blocks = self._column_blocks[:1]
+        scratch._row_blocks = []
+        scratch.blocks = {}
+        scratch._layout_cache = None
+        scratch.num_columns, scratch.num_rows, scratch.num_nonzeros = self.num_variables, 0, 0
+        constraint.apply_to_matrix(scratch, data)
+        return CompiledBlock(scratch._column_blocks[1:], scratch._row_blocks)
+
+    def add_compiled_block(self, name: str, block: CompiledBlock) -> None:
+        """
+        Append a compiled block as a named block.
+
+        Args:
+            name: Name of the constraint
+            block: Block compiled for the decision variables of this model
+        """
+        first_row, first_column = self.num_rows, self.num_columns
+        offset = first_column - self.num_variables
+        self._column_blocks.extend(block.column_blocks)
+        for indptr, columns, coefficients, lower, upper in block.row_blocks:
+            if offset:
+                columns = np.where(columns >= self.num_variables, columns + offset, columns)
+            self._row_blocks.append((indptr, columns, coefficients, lower, upper))
+        self.num_columns += block.num_columns
+        self.num_rows += block.num_rows
+        self.num_nonzeros += block.num_nonzeros
+        self.blocks[name] = (first_row, self.num_rows, first_column, self.num_columns)
+
+    def add_block(self, name: str, constraint: Any, data: Mapping) -> None:
+        """
+        Append the rows and auxiliary columns of a constraint as a named block.
+
+        Args:
+            name: Name of the constraint
+            constraint: Constraint with matrix support
+            data: Dictionary containing optimization data
+        """
+        self.add_compiled_block(name, self.compile_block(constraint, data))
+
+    def block_order(self, names: Iterable[str], changed: Iterable[str] = ()) -> List[str]:
+        """
+        Order constraint names so that a model assembled in this order lines up with this model.
+
+        Blocks of this model keep their relative order and come first, followed by
+        the blocks in changed and new constraints, which are appended to a loaded model.
+
+        Args:
+            names: Names of the registered constraints
+            changed: Names of blocks whose structure changed
+
+        Returns:
+            List[str]: Constraint names in assembly order
+        """
+        names = list(names)
+        changed = set(changed)
+        kept = [name for name in self.blocks if name in names and name not in changed]
+        return kept + [name for name in names if name not in kept]
+
+    def changed_blocks(self, previous: 'MatrixModel') -> List[str]:
+        """
+        Get the blocks of this model whose structure differs from the block of the same name in a previous model.
+
+        Args:
+            previous: Model to compare with
+
+        Returns:
+            List[str]: Names of the changed blocks, in the order of this model
+        """
+        previous_structures = {name: structure for name, _, structure in previous._layout()}
+        return [name for name, _, structure in self._layout()
+                if name in previous_structures and not _same_structure(structure, previous_structures[name])]
+
+    def _block_structure(self, span: Tuple[int, int, int, int], csr: Tuple,
+                         integer: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Get the structure of a block with its auxiliary columns numbered from num_variables.
+
+        Args:
+            span: First row, end row, first column and end column of the block
+            csr: to_csr of the model
+            integer: Integer flag of each column
+
+        Returns:
+            Optional[Tuple]: Row offsets, columns and auxiliary column integer flags of the
+                             block, or None if its rows use auxiliary columns of other blocks
+        """
+        first_row, end_row, first_column, end_column = span
+        indptr, columns, _ = csr
+        begin, end = indptr[first_row], indptr[end_row]
+        local = columns[begin:end] - first_column + self.num_variables
+        auxiliary = columns[begin:end] >= self.num_variables
+        if np.any(auxiliary & ((local < self.num_variables) | (local >= self.num_variables + end_column - first_column))):
+            return None
+        local[~auxiliary] = columns[begin:end][~auxiliary]
+        return indptr[first_row:end_row + 1] - begin, local, integer[first_column:end_column]
+
+    def _layout(self) -> List[Tuple]:
+        """
+        Split the rows and auxiliary columns into blocks.
+
+        If the named blocks do not cover the whole model, e.g. because rows were added
+        without add_block, the model is one unnamed block (name None). The layout is
+        kept until rows or columns are added.
+
+        Returns:
+            List[Tuple]: Name, span and structure of each block in model order
+        """
+        key = (self.num_rows, self.num_columns, self.num_nonzeros, len(self.blocks))
+        if self._layout_cache is not None and self._layout_cache[0] == key:
+            return self._layout_cache[1]
+        csr, integer = self.to_csr(), self.column_arrays()[2]
+        layout = [(name, span, self._block_structure(span, csr, integer)) for name, span in self.blocks.items()]
+        rows = sum(span[1] - span[0] for _, span, _ in layout)
+        columns = sum(span[3] - span[2] for _, span, _ in layout)
+        if (rows != self.num_rows or columns != self.num_columns - self.num_variables
+                or any(structure is None for _, _, structure in layout)):
+            span = (0, self.num_rows, self.num_variables, self.num_columns)
+            layout = [(None, span, self._block_structure(span, csr, integer))]
+        self._layout_cache = (key, layout)
+        return layout
+
+    def column_names(self) -> Optional[List[str]]:
+        """
+        Get the names of all columns.
+
+        Returns:
+            Optional[List[str]]: Names in column order, or None if the model was created without names
+        """
+        if not self.with_names:
+            return None
+        names = []
+        for lower, _, _, block_names in self._column_blocks:
+            names.extend(block_names if block_names is not None
+                         else [f'c_{j}' for j in range(len(names), len(names) + len(lower))])
+        return names
+
+    def column_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the bounds, integrality and objective coefficients of all columns.
+
+        Returns:
+            Tuple: Lower bounds, upper bounds, integer flags (bool) and objective coefficients
+        """
+        lower = np.concatenate([block[0] for block in self._column_blocks])
+        upper = np.concatenate([block[1] for block in self._column_blocks])
+        integer = np.concatenate([np.full(len(block[0]), block[2], dtype=bool) for block in self._column_blocks])
+        objective = np.zeros(self.num_columns)
+        objective[:len(self.objective)] = self.objective
+        return lower, upper, integer, objective
+
+    def row_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the bounds of all rows.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Lower and upper bounds
+        """
+        if not self._row_blocks:
+            return np.zeros(0), np.zeros(0)
+        return (np.concatenate([block[3] for block in self._row_blocks]),
+                np.concatenate([block[4] for block in self._row_blocks]))
+
+    def to_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the constraint matrix in compressed sparse row format.
+
+        Returns:
+            Tuple: Row start offsets (num_rows + 1), column indices and coefficients
+        """
+        if not self._row_blocks:
+            return np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        starts = [np.zeros(1, dtype=np.int64)]
+        offset = 0
+        for indptr, columns, _, _, _ in self._row_blocks:
+            starts.append(indptr[1:] + offset)
+            offset += len(columns)
+        return (np.concatenate(starts),
+                np.concatenate([block[1] for block in self._row_blocks]),
+                np.concatenate([block[2] for block in self._row_blocks]))
+
+    def to_csc(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the constraint matrix in compressed sparse column format.
+
+        Returns:
+            Tuple: Column start offsets (num_columns + 1), row indices and coefficients
+        """
+        indptr, columns, coefficients = self.to_csr()
+        rows = np.repeat(np.arange(self.num_rows), np.diff(indptr))
+        order = np.argsort(columns, kind='stable')
+        starts = np.zeros(self.num_columns + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=self.num_columns), out=starts[1:])
+        return starts, rows[order], coefficients[order]
+
+    def changes_from(self, previous: 'MatrixModel') -> Optional[Dict[str, Any]]:
+        """
+        Compare this model with a model of the same decision variables built from
+        other data or other constraints.
+
+        Blocks of the same name and structure (rows, nonzero pattern and auxiliary
+        columns) are matched, as long as they come first in this model and in the
+        same order as in the previous one. The previous model can then be turned into
+        this one by deleting its other blocks, changing bounds and coefficients of the
+        matched blocks in place and appending the remaining blocks of this model.
+        Models without named blocks must have the same structure.
+
+        Args:
+            previous: Model to compare with
+
+        Returns:
+            Optional[Dict[str, Any]]: None if the models cannot be matched, otherwise the changes:
+                'deleted_rows' and 'deleted_columns' (rows and columns of the previous model to
+                delete), 'first_new_row' and 'first_new_column' (rows and columns of this model
+                from which on to append), 'blocks_changed' (whether any rows or columns are
+                deleted or appended), 'previous_columns' (previous column of each matched column),
+                then 'columns' (matched columns whose bounds changed), 'objective' (matched
+                columns whose objective coefficient changed), 'rows' (matched rows whose bounds
+                changed), and the position in to_csr, row, column and new value of each changed
+                coefficient in 'nonzeros', 'coefficient_rows', 'coefficient_columns' and 'coefficients'
+        """
+        if self.num_variables != previous.num_variables or self.maximize != previous.maximize:
+            return None
+        lower, upper, _, objective = self.column_arrays()
+        previous_lower, previous_upper, _, previous_objective = previous.column_arrays()
+        indptr, columns, coefficients = self.to_csr()
+        previous_indptr, _, previous_coefficients = previous.to_csr()
+        layout = self._layout()
+        previous_layout = previous._layout()
+
+        # Match blocks in order until the first block that has to be appended
+        positions = {name: position for position, (name, _, _) in enumerate(previous_layout)}
+        matched = []
+        last = -1
+        for name, span, structure in layout:
+            position = positions.get(name)
+            if (position is None or position < last
+                    or not _same_structure(structure, previous_layout[position][2])):
+                break
+            matched.append(previous_layout[position][1])
+            last = position
+        if len(matched) < len(layout) and layout[len(matched)][0] is None:
+            return None
+        if any(name is None for name, _, _ in previous_layout) and not matched:
+            return None
+
+        variables = np.arange(self.num_variables)
+        row_map = np.concatenate([np.zeros(0, dtype=np.int64)]
+                                 + [np.arange(span[0], span[1]) for span in matched])
+        column_map = np.concatenate([variables] + [np.arange(span[2], span[3]) for span in matched])
+        first_new_row, first_new_column = len(row_map), len(column_map)
+        kept_rows = np.zeros(previous.num_rows, dtype=bool)
+        kept_rows[row_map] = True
+        kept_columns = np.zeros(previous.num_columns, dtype=bool)
+        kept_columns[column_map] = True
+        deleted_rows = np.flatnonzero(~kept_rows)
+        deleted_columns = np.flatnonzero(~kept_columns)
+
+        # Matched blocks have the same row lengths in both models
+        row_lengths = np.diff(previous_indptr)[row_map]
+        nonzero_map = ragged_arange(previous_indptr[row_map], row_lengths)
+        num_matched = int(indptr[first_new_row])
+        nonzeros = np.flatnonzero(coefficients[:num_matched] != previous_coefficients[nonzero_map])
+        row_lower, row_upper = self.row_arrays()
+        previous_row_lower, previous_row_upper = previous.row_arrays()
+        return {
+            'deleted_rows': deleted_rows,
+            'deleted_columns': deleted_columns,
+            'first_new_row': first_new_row,
+            'first_new_column': first_new_column,
+            'blocks_changed': bool(len(deleted_rows) or len(deleted_columns) or first_new_row < self.num_rows
+                                   or first_new_column < self.num_columns),
+            'previous_columns': column_map,
+            'columns': np.flatnonzero((lower[:first_new_column] != previous_lower[column_map])
+                                      | (upper[:first_new_column] != previous_upper[column_map])),
+            'objective': np.flatnonzero(objective[:first_new_column] != previous_objective[column_map]),
+            'rows': np.flatnonzero((row_lower[:first_new_row] != previous_row_lower[row_map])
+                                   | (row_upper[:first_new_row] != previous_row_upper[row_map])),
+            'nonzeros': nonzeros,
+            'coefficient_rows': np.searchsorted(indptr, nonzeros, side='right') - 1,
+            'coefficient_columns': columns[nonzeros],
+            'coefficients': coefficients[nonzeros],
+        }
+
+    def implied_upper_bounds(self) -> np.ndarray:
+        """
+        Get column upper bounds tightened by the rows.
+
+        A row with a finite upper bound whose coefficients are all positive and whose
+        columns are all nonnegative bounds each of its columns by upper / coefficient.
+        Integer columns are rounded down.
+
+        Returns:
+            np.ndarray: Upper bound of each column (inf where no row bounds it)
+        """
+        lower, upper, integer, _ = self.column_arrays()
+        bounds = upper.copy()
+        row_upper = self.row_arrays()[1]
+        indptr, columns, coefficients = self.to_csr()
+        if len(columns) == 0:
+            return bounds
+
+        rows = np.repeat(np.arange(self.num_rows), np.diff(indptr))
+        unsuitable = (coefficients <= 0) | (lower[columns] < 0)
+        suitable_rows = (np.bincount(rows, weights=unsuitable, minlength=self.num_rows) == 0) & np.isfinite(row_upper)
+        entries = suitable_rows[rows]
+        np.minimum.at(bounds, columns[entries], row_upper[rows[entries]] / coefficients[entries])
+        bounds[integer] = np.floor(bounds[integer] + 1e-9)
+        return bounds
+
+    def to_proto(self):
+        """
+        Convert the model to an OR-Tools MPModelProto.
+
+        Returns:
+            MPModelProto: Model with all columns, rows and the objective
+        """
+        from ortools.linear_solver import linear_solver_pb2
+
+        proto = linear_solver_pb2.MPModelProto(maximize=self.maximize)
+        self.append_to_proto(proto)
+        logger.debug(f"Matrix model: {self.num_columns} columns, {self.num_rows} rows, "
+                     f"{self.num_nonzeros} nonzeros")
+        return proto
+
+    def append_to_proto(self, proto: Any, first_column: int = 0, first_row: int = 0) -> None:
+        """
+        Add the columns and rows of the model to an OR-Tools MPModelProto.
+
+        Args:
+            proto: MPModelProto holding the columns and rows before the first ones to add
+            first_column: First column to add
+            first_row: First row to add
+        """
+        objective = self.column_arrays()[3].tolist()
+        add_variable = proto.variable.add
+        start = 0
+        for lower, upper, integer, names in self._column_blocks:
+            end = start + len(lower)
+            if end > first_column:
+                skip = max(first_column - start, 0)
+                if names is None:
+                    for lb, ub, obj in zip(lower[skip:].tolist(), upper[skip:].tolist(),
+                                           objective[start + skip:end]):
+                        add_variable(lower_bound=lb, upper_bound=ub, objective_coefficient=obj, is_integer=integer)
+                else:
+                    for lb, ub, obj, name in zip(lower[skip:].tolist(), upper[skip:].tolist(),
+                                                 objective[start + skip:end], names[skip:]):
+                        add_variable(lower_bound=lb, upper_bound=ub, objective_coefficient=obj,
+                                     is_integer=integer, name=name)
+            start = end
+
+        add_constraint = proto.constraint.add
+        start = 0
+        for indptr, columns, coefficients, lower, upper in self._row_blocks:
+            end = start + len(lower)
+            if end > first_row:
+                skip = max(first_row - start, 0)
+                indptr = indptr.tolist()
+                columns = columns.tolist()
+                coefficients = coefficients.tolist()
+                for r, (lb, ub) in enumerate(zip(lower[skip:].tolist(), upper[skip:].tolist()), skip):
+                    begin, stop = indptr[r], indptr[r + 1]
+                    add_constraint(lower_bound=lb, upper_bound=ub,
+                                   var_index=columns[begin:stop], coefficient=coefficients[begin:stop])
+            start = end
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Get the size of the model.
+
+        Returns:
+            Dict[str, int]: Number of columns, rows and nonzeros
+        """
+        return {'columns': self.num_columns, 'rows': self.num_rows, 'nonzeros': self.num_nonzeros}
+
+
+def assemble_aligned(previous: MatrixModel, names: Iterable[str],
+                     assemble: Callable[[List[str]], MatrixModel]) -> MatrixModel:
+    """
+    Assemble a model whose blocks line up with those of a loaded model.
+
+    Blocks of constraints that are still registered keep their order, and new
+    blocks and blocks whose structure changed come last, so that changes_from
+    matches all unchanged blocks. The model is assembled a second time if a
+    block changed its structure.
+
+    Args:
+        previous: Model loaded in the solver
+        names: Names of the registered constraints
+        assemble: Function assembling the model of the constraints in the given order
+
+    Returns:
+        MatrixModel: The assembled model
+    """
+    names = list(names)
+    order = previous.block_order(names)
+    matrix = assemble(order)
+    changed = matrix.changed_blocks(previous)
+    if changed:
+        aligned_order = previous.block_order(names, changed)
+        if aligned_order != order:
+            logger.debug(f"Moving changed blocks to the end: {', '.join(changed)}")
+            matrix = assemble(aligned_order)
+    return matrix
+
+
+class ColumnIndex(Mapping):
+    """
+    Read-only mapping from (waffle, pan, week) to the column of a decision variable
+    in a MatrixModel.
+    """
+
+    def __init__(self, matrix: MatrixModel):
+        """
+        Initialize the mapping.
+
+        Args:
+            matrix: MatrixModel holding the decision variables
+        """
+        self.matrix = matrix
+
+    def __getitem__(self, key: Tuple) -> int:
+        column = self.matrix.variable_column(key)
+        if column is None:
+            raise KeyError(key)
+        return column
+
+    def __contains__(self, key) -> bool:
+        return self.matrix.variable_column(key) is not None
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return iter(self.matrix.variable_keys())
+
+    def __len__(self) -> int:
+        return self.matrix.num_variables
@@ -0,0 +1,111 @@
+"""
+Model Index Module for Waffle Production Optimization.
+
+This module provides ModelIndex, which groups the decision variables of a model
+by (waffle, week), (pan, week), (waffle, pan) and week. It is built once from the
+variables of a model, so that constraints look up the variables they touch
+instead of testing every (waffle, pan, week) combination of the data.
+"""
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import math
+
+
+class ModelIndex(Mapping):
+    """
+    Read-only mapping from (waffle, pan, week) to decision variables, with the
+    variables grouped along each dimension.
+
+    Groups only contain existing variables and keep the order in which the
+    variables were created; each group of pans or waffles is in week order if
+    the variables were created in week order.
+
+    Attributes:
+        weeks: Weeks of the data in chronological (sorted) order
+        waffles: Waffle types that have variables, in creation order
+        pans: Pan types that have variables, in creation order
+        by_waffle_week: Variables by (waffle, week)
+        by_pan_week: Variables by (pan, week)
+        by_pair: Variables by (waffle, pan), as (week, variable) tuples
+        by_week: Variables by week
+        upper_bounds: Presolve upper bounds by (waffle, pan, week)
+        bounds_by_waffle_week: Sum of the upper bounds of the variables of each
+                               (waffle, week), if upper bounds were given
+    """
+
+    def __init__(self, variables: Mapping, data: Mapping, upper_bounds: Optional[Mapping] = None):
+        """
+        Group the variables of a model.
+
+        Args:
+            variables: Decision variables keyed by (waffle, pan, week)
+            data: Dictionary containing optimization data
+            upper_bounds: Upper bounds of the variables kept by presolve; if given,
+                          variables without a bound are left out of the index
+        """
+        if upper_bounds is not None:
+            variables = {key: variables[key] for key in upper_bounds if key in variables}
+        self.variables = variables
+        self.upper_bounds = upper_bounds if upper_bounds is not None else {}
+        self.bounds_by_waffle_week: Dict[Tuple, float] = {}
+        self.weeks = sorted(data['weeks'])
+        self.by_waffle_week: Dict[Tuple, List] = {}
+        self.by_pan_week: Dict[Tuple, List] = {}
+        self.by_pair: Dict[Tuple, List[Tuple[Any, Any]]] = {}
+        self.by_week: Dict[Any, List] = {}
+        waffles = {}
+        pans = {}
+        for key, var in variables.items():
+            w, p, t = key
+            self.by_waffle_week.setdefault((w, t), []).append(var)
+            self.by_pan_week.setdefault((p, t), []).append(var)
+            self.by_pair.setdefault((w, p), []).append((t, var))
+            self.by_week.setdefault(t, []).append(var)
+            if upper_bounds is not None:
+                self.bounds_by_waffle_week[(w, t)] = self.bounds_by_waffle_week.get((w, t), 0) + upper_bounds[key]
+            waffles[w] = None
+            pans[p] = None
+        self.waffles = list(waffles)
+        self.pans = list(pans)
+
+    @classmethod
+    def of(cls, variables: Mapping, data: Mapping) -> 'ModelIndex':
+        """
+        Get the index of a model's variables, building it only if necessary.
+
+        Args:
+            variables: ModelIndex or decision variables keyed by (waffle, pan, week)
+            data: Dictionary containing optimization data
+
+        Returns:
+            ModelIndex: The given index, or a new index of the variables
+        """
+        if isinstance(variables, cls):
+            return variables
+        return cls(variables, data)
+
+    def upper_bound(self, key: Tuple, default: float) -> float:
+        """
+        Get the presolve upper bound of a variable.
+
+        Args:
+            key: (waffle, pan, week) tuple
+            default: Value returned if the variable has no finite bound
+
+        Returns:
+            float: Upper bound of the variable, or default
+        """
+        bound = self.upper_bounds.get(key, math.inf)
+        return bound if math.isfinite(bound) else default
+
+    def __getitem__(self, key: Tuple) -> Any:
+        return self.variables[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self.variables
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return iter(self.variables)
+
+    def __len__(self) -> int:
+        return len(self.variables)
@@ -0,0 +1,316 @@
+"""
+MPS Writer Module for Waffle Production Optimization.
+
+This module writes a MatrixModel straight to a free-format MPS file, runs a
+command-line solver on it and reads the solution back. Columns are named C{j}
+and rows R{i} after their index in the matrix model, so solution files map back
+to columns by index, without creating PuLP variables, expressions or
+constraints. The command-line solvers are configured through the PuLP solver
+objects (executable path, time limit, gap and other options), so the fast path
+solves with the same settings as the PuLP model it replaces.
+"""
+import os
+import logging
+import subprocess
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pulp
+
+from src.solvers.matrix_model import MatrixModel
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Solution file formats of the supported solvers, by PulpSolver solver name
+MPS_SOLVERS = {'cbc': 'cbc', 'coin_cmd': 'cbc', 'glpk': 'glpk', 'highs': 'highs', 'scip': 'scip'}
+
+
+def _format_values(values: np.ndarray) -> List[str]:
+    """Format numbers like PuLP's MPS writer, formatting each distinct value once."""
+    unique, inverse = np.unique(values, return_inverse=True)
+    formatted = ['% .12e' % value for value in unique.tolist()]
+    return [formatted[i] for i in inverse.tolist()]
+
+
+def write_mps(matrix: MatrixModel, path: str, relax: bool = False) -> None:
+    """
+    Write a matrix model as an MPS file.
+
+    Lines use the field positions of PuLP's MPS writer, which CBC, GLPK (free
+    format), HiGHS and SCIP all read. The objective is always minimized:
+    maximization objectives are written negated, since not every solver reads
+    the OBJSENSE section. Rows without finite bounds are left out.
+
+    Args:
+        matrix: MatrixModel to write
+        path: Path of the MPS file
+        relax: If True, write all columns as continuous (the LP relaxation)
+    """
+    lower, upper, integer, objective = matrix.column_arrays()
+    row_lower, row_upper = matrix.row_arrays()
+    starts, rows, coefficients = matrix.to_csc()
+    if matrix.maximize:
+        objective = -objective
+    if relax:
+        integer = np.zeros(matrix.num_columns, dtype=bool)
+
+    equal = row_lower == row_upper
+    has_lower = np.isfinite(row_lower)
+    has_upper = np.isfinite(row_upper)
+    kept = has_lower | has_upper
+    row_type = np.where(equal, 'E', np.where(has_lower, 'G', 'L'))
+    column_names = ['%-8s  ' % f'C{j}' for j in range(matrix.num_columns)]
+    row_names = ['%-8s  ' % f'R{i}' for i in range(matrix.num_rows)] + ['OBJ       ']
+
+    lines = ['NAME          WAFFLES', 'ROWS', ' N  OBJ']
+    lines.extend(f' {kind}  R{i}' for i, kind in zip(np.flatnonzero(kept).tolist(), row_type[kept].tolist()))
+
+    # Objective entries (row -1, so that they name 'OBJ') come first in each column; columns
+    # without any entry get a zero objective entry so that every column is declared
+    counts = np.diff(starts)
+    entry_columns = np.repeat(np.arange(matrix.num_columns), counts)
+    keep_entry = kept[rows]
+    objective_columns = np.flatnonzero((objective != 0) | (np.bincount(entry_columns[keep_entry],
+                                                                       minlength=matrix.num_columns) == 0))
+    columns = np.concatenate([objective_columns, entry_columns[keep_entry]])
+    order = np.argsort(columns, kind='stable')
+    columns = columns[order]
+    entry_rows = np.concatenate([np.full(len(objective_columns), -1), rows[keep_entry]])[order]
+    values = _format_values(np.concatenate([objective[objective_columns], coefficients[keep_entry]])[order])
+    entries = [f'    {column_names[j]}{row_names[i]}{value}'
+               for j, i, value in zip(columns.tolist(), entry_rows.tolist(), values)]
+
+    # Integer columns are enclosed in MARKER lines, one pair per run of integer columns
+    boundaries = np.flatnonzero(np.diff(np.concatenate([[False], integer, [False]]).astype(np.int8)))
+    positions = np.searchsorted(columns, boundaries).tolist()
+    lines.append('COLUMNS')
+    previous = 0
+    for first, end in zip(positions[::2], positions[1::2]):
+        lines.extend(entries[previous:first])
+        lines.append("    MARK      'MARKER'                 'INTORG'")
+        lines.extend(entries[first:end])
+        lines.append("    MARK      'MARKER'                 'INTEND'")
+        previous = end
+    lines.extend(entries[previous:])
+
+    rhs = np.where(equal | has_lower, row_lower, row_upper)
+    with_rhs = np.flatnonzero(kept & (rhs != 0))
+    lines.append('RHS')
+    lines.extend(f'    RHS       {row_names[i]}{value}'
+                 for i, value in zip(with_rhs.tolist(), _format_values(rhs[with_rhs])))
+    ranged = np.flatnonzero(has_lower & has_upper & ~equal)
+    if len(ranged):
+        lines.append('RANGES')
+        lines.extend(f'    RNG       {row_names[i]}{value}'
+                     for i, value in zip(ranged.tolist(), _format_values((row_upper - row_lower)[ranged])))
+
+    # Like PuLP, integer columns without an upper bound get an explicit lower bound,
+    # since some readers assume unbounded integer columns to be binary
+    lines.append('BOUNDS')
+    fixed = lower == upper
+    explicit_lower = (lower != 0) | (integer & np.isposinf(upper))
+    for kind, mask, bounds in [('FX', fixed, lower), ('MI', ~fixed & np.isneginf(lower), None),
+                               ('LO', ~fixed & np.isfinite(lower) & explicit_lower, lower),
+                               ('UP', ~fixed & np.isfinite(upper), upper)]:
+        bounded = np.flatnonzero(mask)
+        if bounds is None:
+            lines.extend(f' {kind} BND       C{j}' for j in bounded.tolist())
+        else:
+            lines.extend(f' {kind} BND       {column_names[j]}{value}'
+                         for j, value in zip(bounded.tolist(), _format_values(bounds[bounded])))
+    lines.append('ENDATA')
+
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+        f.write('\n')
+    logger.debug(f"Wrote MPS file {path}: {matrix.get_statistics()}")
+
+
+def column_values(values: dict, num_columns: int) -> np.ndarray:
+    """
+    Map solution values by column name back to the columns.
+
+    Args:
+        values: Values by name; names other than C{j} (rows, the objective) are ignored
+        num_columns: Number of columns of the model
+
+    Returns:
+        np.ndarray: Value of each column (0 for columns missing from the solution)
+    """
+    result = np.zeros(num_columns)
+    for name, value in values.items():
+        if name.startswith('C') and name[1:].isdigit():
+            result[int(name[1:])] = float(value)
+    return result
+
+
+def _write_start(path: str, solution_format: str, start: np.ndarray) -> None:
+    """Write a MIP start in the solution file format of CBC or HiGHS."""
+    if solution_format == 'cbc':
+        lines = ["Stopped on time - objective value 0"]
+        lines.extend(f"{j:>7} C{j} {value:>15} {0:>23}" for j, value in enumerate(start.tolist()))
+    else:
+        lines = ["Model status", "None", "", "# Primal solution values", "Feasible", "",
+                 f"# Columns {len(start)}"]
+        lines.extend(f"C{j} {value}" for j, value in enumerate(start.tolist()))
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+        f.write('\n')
+
+
+def _run(command: Any, args: List[str]) -> None:
+    """Run a solver executable with the output handling of its PuLP solver object."""
+    pipe = command.get_pipe()
+    try:
+        returncode = subprocess.call(args, stdout=pipe, stderr=pipe, stdin=subprocess.DEVNULL)
+    finally:
+        if pipe is not None:
+            pipe.close()
+    # HiGHS returns 1 for warnings
+    if returncode not in (0, 1):
+        raise pulp.PulpSolverError(f"Error while executing {command.path} (exit code {returncode})")
+
+
+def _solve_cbc(command: Any, mps_path: str, solution_path: str, start_path: Optional[str]) -> Tuple[int, dict]:
+    """Solve an MPS file with CBC and read the status and values by name."""
+    args = [command.path, mps_path]
+    if start_path is not None:
+        args.extend(['-mips', start_path])
+    if command.timeLimit is not None:
+        args.extend(['-sec', str(command.timeLimit)])
+    for option in command.options + command.getOptions():
+        args.extend(f'-{option}'.split())
+    args.extend(['-solve', '-printingOptions', 'all', '-solution', solution_path])
+    _run(command, args)
+
+    status, _ = command.get_status(solution_path)
+    values = {}
+    with open(solution_path) as f:
+        f.readline()
+        for line in f:
+            parts = line.split()
+            if parts and parts[0] == '**':
+                parts = parts[1:]
+            if len(parts) >= 3:
+                values[parts[1]] = parts[2]
+    return status, values
+
+
+def _solve_glpk(command: Any, mps_path: str, solution_path: str, start_path: Optional[str]) -> Tuple[int, dict]:
+    """Solve an MPS file with GLPK and read the status and values by name."""
+    output_path = f'{solution_path}.out'
+    args = [command.path, '--freemps', mps_path, '-o', output_path, '-w', solution_path]
+    if command.timeLimit:
+        args.extend(['--tmlim', str(command.timeLimit)])
+    args.extend(command.options)
+    try:
+        _run(command, args)
+        return command.readsol(output_path, solution_path)
+    finally:
+        command.delete_tmp_files(output_path)
+
+
+def _solve_highs(command: Any, mps_path: str, solution_path: str, start_path: Optional[str]) -> Tuple[int, dict]:
+    """Solve an MPS file with HiGHS and read the status and values by name."""
+    options_path = f'{solution_path}.options'
+    file_options = [f'solution_file={solution_path}', 'write_solution_to_file=true', 'write_solution_style=0']
+    if not command.msg:
+        file_options.append('log_to_console=false')
+    args = [command.path, mps_path, f'--options_file={options_path}']
+    if command.timeLimit is not None:
+        args.append(f'--time_limit={command.timeLimit}')
+    if start_path is not None:
+        args.append(f'--read_solution_file={start_path}')
+    options = iter(command.options)
+    for option in options:
+        if '=' not in option:
+            option += f'={next(options)}'
+        if option.startswith('-'):
+            args.append(option)
+        else:
+            file_options.append(option)
+    with open(options_path, 'w') as f:
+        f.write('\n'.join(file_options))
+    try:
+        _run(command, args)
+    finally:
+        command.delete_tmp_files(options_path)
+
+    if not os.path.exists(solution_path) or os.stat(solution_path).st_size == 0:
+        return pulp.LpStatusNotSolved, {}
+    with open(solution_path) as f:
+        lines = [line.strip() for line in f.readlines()[:5]]
+    model_status = lines[1].lower() if len(lines) > 1 else ''
+    primal_status = lines[4].lower() if len(lines) > 4 else ''
+    # Following the PuLP convention, a feasible solution counts as optimal
+    if model_status == 'optimal' or primal_status == 'feasible':
+        return pulp.LpStatusOptimal, command.readsol(solution_path)
+    if model_status == 'infeasible':
+        return pulp.LpStatusInfeasible, {}
+    if model_status == 'unbounded':
+        return pulp.LpStatusUnbounded, {}
+    return pulp.LpStatusNotSolved, {}
+
+
+def _solve_scip(command: Any, mps_path: str, solution_path: str, start_path: Optional[str]) -> Tuple[int, dict]:
+    """Solve an MPS file with SCIP and read the status and values by name."""
+    settings_path = f'{solution_path}.set'
+    file_options = [f'limits/time={command.timeLimit}'] if command.timeLimit is not None else []
+    args = [command.path, '-s', settings_path]
+    if not command.msg:
+        args.append('-q')
+    options = iter(command.options)
+    for option in options:
+        if option.startswith('-'):
+            args.extend([option, next(options)])
+        else:
+            if '=' not in option:
+                option += f'={next(options)}'
+            file_options.append(option)
+    args.extend(['-c', f'read "{mps_path}"', '-c', 'optimize', '-c', f'write solution "{solution_path}"',
+                 '-c', 'quit'])
+    with open(settings_path, 'w') as f:
+        f.write('\n'.join(file_options))
+    try:
+        _run(command, args)
+    finally:
+        command.delete_tmp_files(settings_path)
+    if not os.path.exists(solution_path):
+        raise pulp.PulpSolverError(f"Error while executing {command.path}")
+    return command.readsol(solution_path)
+
+
+SOLUTION_READERS = {'cbc': _solve_cbc, 'glpk': _solve_glpk, 'highs': _solve_highs, 'scip': _solve_scip}
+
+
+def solve_mps(solver_name: str, command: Any, matrix: MatrixModel, relax: bool = False,
+              start: Optional[np.ndarray] = None) -> Tuple[int, Optional[np.ndarray]]:
+    """
+    Solve a matrix model with a command-line solver through an MPS file.
+
+    Args:
+        solver_name: Name of the solver in MPS_SOLVERS
+        command: PuLP solver object of the solver, for its path and options
+        matrix: MatrixModel to solve
+        relax: If True, solve the LP relaxation
+        start: MIP start value of each column, passed to CBC and HiGHS
+
+    Returns:
+        Tuple[int, Optional[np.ndarray]]: PuLP status and the value of each column,
+                                          or None if no solution was found
+    """
+    solution_format = MPS_SOLVERS[solver_name.lower()]
+    mps_path, solution_path, start_path = command.create_tmp_files('WaffleOptimizer', 'mps', 'sol', 'mst')
+    if start is None or relax or solution_format not in ('cbc', 'highs'):
+        start_path = None
+    try:
+        write_mps(matrix, mps_path, relax)
+        if start_path is not None:
+            _write_start(start_path, solution_format, start)
+        status, values = SOLUTION_READERS[solution_format](command, mps_path, solution_path, start_path)
+    finally:
+        command.delete_tmp_files(mps_path, solution_path, *([start_path] if start_path else []))
+    if status != pulp.LpStatusOptimal:
+        return status, None
+    return status, column_values(values, matrix.num_columns)
@@ -3,39 +3,232 @@ OR-Tools Implementation for Waffle Production Optimization.
 
 This module provides the implementation of SolverInterface using Google OR-Tools.
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import time
 import logging
+
+import numpy as np
 from ortools.linear_solver import pywraplp
 from src.solvers.base import SolverInterface
+from src.solvers.matrix_model import ColumnIndex, MatrixModel, assemble_aligned
+from src.solvers.model_index import ModelIndex
+from src.solvers.rounding import check_repairable, production_objective, round_and_repair, rounding_gap
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+
+def _ranges(indices: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Split sorted indices into ranges of consecutive indices.
+    
+    Args:
+        indices: Sorted indices
+        
+    Returns:
+        List[Tuple[int, int]]: First index and end (exclusive) of each range
+    """
+    if len(indices) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    firsts = np.concatenate([[indices[0]], indices[breaks]]).tolist()
+    ends = (np.concatenate([indices[breaks - 1], [indices[-1]]]) + 1).tolist()
+    return list(zip(firsts, ends))
+
+
+class MatrixVariables(ColumnIndex):
+    """
+    Read-only mapping from (waffle, pan, week) to the OR-Tools variables of a model
+    loaded from a MatrixModel.
+    
+    Variables are looked up by column on access, so that no Python object is
+    created per variable unless a constraint or caller asks for it.
+    """
+    
+    def __init__(self, solver: Any, matrix: MatrixModel):
+        """
+        Initialize the mapping.
+        
+        Args:
+            solver: OR-Tools solver the matrix model was loaded into
+            matrix: MatrixModel the solver was loaded from
+        """
+        super().__init__(matrix)
+        self.solver = solver
+    
+    def __getitem__(self, key: Tuple):
+        return self.solver.variable(super().__getitem__(key))
+    
+    def solution_values(self) -> Dict[Tuple, float]:
+        """
+        Get the positive solution values of all variables in one call.
+        
+        Returns:
+            Dict[Tuple, float]: Solution values by (waffle, pan, week)
+        """
+        from ortools.linear_solver import linear_solver_pb2
+        
+        response = linear_solver_pb2.MPSolutionResponse()
+        self.solver.FillSolutionResponseProto(response)
+        return self.matrix.positive_values(response.variable_value)
+
+
 class ORToolsSolver(SolverInterface):
     """
     Implementation of the SolverInterface using Google OR-Tools.
     """
     
-    def __init__(self, time_limit: int = 60, optimality_gap: float = 0.005):
+    def __init__(self, time_limit: int = 60, optimality_gap: float = 0.005,
+                 bulk_build: bool = True, variable_names: bool = False, fast: bool = False):
         """
         Initialize the OR-Tools solver.
         
         Args:
             time_limit: Time limit for solving the model in seconds
             optimality_gap: Maximum allowed optimality gap (default: 0.5%)
+            bulk_build: If True, assemble the model as NumPy arrays and load it in one call;
+                        if False, create variables and coefficients one at a time
+            variable_names: Whether the bulk build names its variables (slower, but gives
+                            readable model exports); the classic build always names them
+            fast: If True, solve the LP relaxation with GLOP and round and repair its
+                  solution instead of solving the MIP (see src/solvers/rounding.py)
         """
         super().__init__()  # Initialize constraint registry
         self.time_limit = time_limit
         self.optimality_gap = optimality_gap
+        self.bulk_build = bulk_build
+        self.variable_names = variable_names
+        self.fast = fast
+        self.matrix = None
+        self.model_proto = None
         self.solver = None
         self.variables = {}
+        self.model_index = None
         self.objective = None
         self.data = None
         self.model_type = None
         self.solution_status = None
         self.start_time = None
-        logger.debug(f"Initialized OR-Tools solver with time_limit={time_limit}, optimality_gap={optimality_gap}")
+        self.fast_solution = None
+        logger.debug(f"Initialized OR-Tools solver with time_limit={time_limit}, optimality_gap={optimality_gap}, "
+                     f"bulk_build={bulk_build}, fast={fast}")
+    
+    def _create_solver(self) -> Any:
+        """
+        Create the underlying OR-Tools solver (SCIP if available, otherwise CBC, or
+        GLOP in fast mode, which ignores integrality).
+        
+        Returns:
+            pywraplp.Solver: New solver instance
+        """
+        if self.fast:
+            return pywraplp.Solver.CreateSolver('GLOP')
+        try:
+            solver = pywraplp.Solver.CreateSolver('SCIP')
+            if solver is None:
+                logger.debug("SCIP solver not available, falling back to CBC")
+                solver = pywraplp.Solver.CreateSolver('CBC')
+        except Exception as e:
+            logger.warning(f"Error creating SCIP solver: {str(e)}, falling back to CBC")
+            solver = pywraplp.Solver.CreateSolver('CBC')
+        return solver
+    
+    def _create_variables(self, data: Dict) -> None:
+        """
+        Create the decision variables x[waffle_type, pan_type, week] of the classic build.
+        
+        With a presolve result, only the variables kept by presolve are created,
+        with the presolve upper bounds.
+        
+        Args:
+            data: Dictionary containing optimization data
+        """
+        logger.debug("Creating decision variables")
+        waffle_types = data['waffle_types']
+        pan_types = data['pan_types']
+        weeks = sorted(data['weeks'])  # Sort weeks to ensure chronological order
+        allowed = data['allowed']
+        bounds = self.presolve_result.variable_bounds() if self.presolve_result is not None else None
+        
+        self.variables = {}
+        for w in waffle_types:
+            for p in pan_types:
+                for t in weeks:
+                    if allowed.get((w, p), False):
+                        upper = self.solver.infinity()
+                        if bounds is not None:
+                            if (w, p, t) not in bounds:
+                                continue
+                            upper = min(bounds[(w, p, t)], upper)
+                        var_name = f'x_{w}_{p}_{t}'
+                        self.variables[(w, p, t)] = self.solver.IntVar(0, upper, var_name)
+        logger.debug(f"Created {len(self.variables)} decision variables")
+        self.model_index = ModelIndex(self.variables, data, upper_bounds=bounds)
+    
+    def _assemble_matrix(self, data: Dict, maximize: bool,
+                         order: Optional[List[str]] = None) -> Tuple[MatrixModel, Dict]:
+        """
+        Assemble the model as a MatrixModel.
+        
+        Args:
+            data: Dictionary containing optimization data
+            maximize: If True, maximize waffle output, otherwise minimize cost
+            order: Names of all registered constraints in the order to append them
+                   (default: registration order)
+            
+        Returns:
+            Tuple[MatrixModel, Dict]: The matrix model and the constraints without matrix support
+        """
+        upper_bounds = self.presolve_result.upper_bounds if self.presolve_result is not None else None
+        matrix = MatrixModel(data, with_names=self.variable_names, upper_bounds=upper_bounds)
+        matrix.set_production_objective(maximize)
+        deferred = self.constraint_registry.apply_matrix_constraints(matrix, data, order=order)
+        return matrix, deferred
+    
+    def _load_proto(self, proto: Any, matrix: MatrixModel) -> None:
+        """
+        Load a model proto into a new OR-Tools solver.
+        
+        Args:
+            proto: MPModelProto of the matrix model
+            matrix: MatrixModel the proto was created from
+        """
+        self.solver = self._create_solver()
+        logger.debug(f"Using solver: {self.solver.SolverVersion()}")
+        if self.variable_names:
+            error = self.solver.LoadModelFromProtoKeepNames(proto)
+        else:
+            error = self.solver.LoadModelFromProto(proto)
+        if error:
+            raise ValueError(f"Failed to load model into OR-Tools: {error}")
+        
+        self.matrix = matrix
+        self.variables = MatrixVariables(self.solver, matrix)
+        self.objective = self.solver.Objective()
+    
+    def _build_from_matrix(self, data: Dict, maximize: bool) -> None:
+        """
+        Build the model as a MatrixModel and load it into OR-Tools in one call.
+        
+        Constraints without matrix support are applied to the loaded model with
+        apply_to_ortools.
+        
+        Args:
+            data: Dictionary containing optimization data
+            maximize: If True, maximize waffle output, otherwise minimize cost
+        """
+        matrix, deferred = self._assemble_matrix(data, maximize)
+        proto = matrix.to_proto()
+        self._load_proto(proto, matrix)
+        # Models of matrix rows only can be patched for new data and loaded again
+        self.model_proto = None if deferred else proto
+        logger.debug(f"Loaded matrix model: {matrix.get_statistics()}")
+        
+        bounds = self.presolve_result.variable_bounds() if self.presolve_result is not None else None
+        index = ModelIndex(self.variables, data, upper_bounds=bounds) if deferred else None
+        for name, constraint in deferred.items():
+            logger.debug(f"Applying constraint '{name}' without matrix support")
+            constraint.apply_to_ortools(self.solver, index, data)
     
     def apply_constraints(self) -> None:
         """
@@ -47,7 +240,8 @@ class ORToolsSolver(SolverInterface):
         
         logger.info("Applying constraints to OR-Tools model")
         # Apply constraints using the constraint registry
-        self.constraint_registry.apply_constraints('ortools', self.solver, self.variables, self.data)
+        self.constraint_registry.apply_constraints('ortools', self.solver, self.variables, self.data,
+                                                   index=self.model_index)
         logger.debug("Constraints applied successfully")
     
     def build_minimize_cost_model(self, data: Dict) -> None:
@@ -60,41 +254,31 @@ class ORToolsSolver(SolverInterface):
         logger.info("Building cost minimization model")
         self.data = data
         self.model_type = 'minimize_cost'
+        self.matrix = None
+        self.model_proto = None
+        self.model_index = None
+        
+        if self.bulk_build:
+            self._build_from_matrix(data, maximize=False)
+            logger.info("Cost minimization model built successfully")
+            return
         
         # Extract data
         waffle_types = data['waffle_types']
         pan_types = data['pan_types']
         weeks = sorted(data['weeks'])  # Sort weeks to ensure chronological order
-        allowed = data['allowed']
         cost = data['cost']
         wpp = data['wpp']  # Waffles per waffle type
         
         logger.debug(f"Model dimensions: {len(waffle_types)} waffle types, {len(pan_types)} pan types, {len(weeks)} weeks")
         
         # Create solver (use CBC by default, but use SCIP if available)
-        try:
-            self.solver = pywraplp.Solver.CreateSolver('SCIP')
-            if self.solver is None:
-                logger.debug("SCIP solver not available, falling back to CBC")
-                self.solver = pywraplp.Solver.CreateSolver('CBC')
-        except Exception as e:
-            logger.warning(f"Error creating SCIP solver: {str(e)}, falling back to CBC")
-            self.solver = pywraplp.Solver.CreateSolver('CBC')
+        self.solver = self._create_solver()
         
         logger.debug(f"Using solver: {self.solver.SolverVersion()}")
         
         # Create decision variables: x[waffle_type, pan_type, week]
-        logger.debug("Creating decision variables")
-        self.variables = {}
-        var_count = 0
-        for w in waffle_types:
-            for p in pan_types:
-                for t in weeks:
-                    if allowed.get((w, p), False):
-                        var_name = f'x_{w}_{p}_{t}'
-                        self.variables[(w, p, t)] = self.solver.IntVar(0, self.solver.infinity(), var_name)
-                        var_count += 1
-        logger.debug(f"Created {var_count} decision variables")
+        self._create_variables(data)
         
         # Objective function: minimize total cost
         logger.debug("Setting up objective function")
@@ -121,40 +305,30 @@ class ORToolsSolver(SolverInterface):
         
         self.data = data
         self.model_type = 'maximize_output'
+        self.matrix = None
+        self.model_proto = None
+        self.model_index = None
+        
+        if self.bulk_build:
+            self._build_from_matrix(data, maximize=True)
+            logger.info("Output maximization model built successfully")
+            return
         
         # Extract data
         waffle_types = data['waffle_types']
         pan_types = data['pan_types']
         weeks = sorted(data['weeks'])  # Sort weeks to ensure chronological order
-        allowed = data['allowed']
         wpp = data['wpp']  # Waffles per waffle type
         
         logger.debug(f"Model dimensions: {len(waffle_types)} waffle types, {len(pan_types)} pan types, {len(weeks)} weeks")
         
         # Create solver (use CBC by default, but use SCIP if available)
-        try:
-            self.solver = pywraplp.Solver.CreateSolver('SCIP')
-            if self.solver is None:
-                logger.debug("SCIP solver not available, falling back to CBC")
-                self.solver = pywraplp.Solver.CreateSolver('CBC')
-        except Exception as e:
-            logger.warning(f"Error creating SCIP solver: {str(e)}, falling back to CBC")
-            self.solver = pywraplp.Solver.CreateSolver('CBC')
+        self.solver = self._create_solver()
         
         logger.debug(f"Using solver: {self.solver.SolverVersion()}")
         
         # Create decision variables: x[waffle_type, pan_type, week]
-        logger.debug("Creating decision variables")
-        self.variables = {}
-        var_count = 0
-        for w in waffle_types:
-            for p in pan_types:
-                for t in weeks:
-                    if allowed.get((w, p), False):
-                        var_name = f'x_{w}_{p}_{t}'
-                        self.variables[(w, p, t)] = self.solver.IntVar(0, self.solver.infinity(), var_name)
-                        var_count += 1
-        logger.debug(f"Created {var_count} decision variables")
+        self._create_variables(data)
         
         # Objective function: maximize total waffle output
         logger.debug("Setting up objective function")
@@ -169,6 +343,77 @@ class ORToolsSolver(SolverInterface):
         self.apply_constraints()
         logger.info("Output maximization model built successfully")
     
+    def _patch_model(self, data: Dict) -> bool:
+        """
+        Patch the matrix model proto for new data or constraints and reload it.
+        
+        The proto is patched rather than the loaded solver: SCIP re-solves models
+        changed through the solver slower than freshly loaded ones. Bounds and
+        coefficients of unchanged constraint blocks are changed in place, the rows
+        and auxiliary columns of removed or restructured constraints are deleted and
+        those of new or restructured constraints are appended. Only models of the
+        bulk build whose constraints all have matrix support can be patched.
+        
+        Args:
+            data: New optimization data
+            
+        Returns:
+            bool: True if the model was patched, False if it has to be rebuilt
+        """
+        if self.model_proto is None:
+            return False
+        constraints = self.constraint_registry.get_all_constraints()
+        if not all(constraint.matrix_support for constraint in constraints.values()):
+            return False
+        maximize = self.matrix.maximize
+        matrix = assemble_aligned(self.matrix, constraints,
+                                  lambda order: self._assemble_matrix(data, maximize, order)[0])
+        changes = matrix.changes_from(self.matrix)
+        if changes is None:
+            return False
+        
+        proto = self.model_proto
+        for first, end in reversed(_ranges(changes['deleted_rows'])):
+            del proto.constraint[first:end]
+        for first, end in reversed(_ranges(changes['deleted_columns'])):
+            del proto.variable[first:end]
+        
+        # Rows list their nonzeros in CSR order
+        indptr, columns, _ = matrix.to_csr()
+        first_row, first_column = changes['first_new_row'], changes['first_new_column']
+        moved = changes['previous_columns'] != np.arange(first_column)
+        if moved.any():
+            # Auxiliary columns of kept blocks moved down with the deleted columns
+            nonzeros = np.flatnonzero(moved[columns[:indptr[first_row]]])
+            for r in np.unique(np.searchsorted(indptr, nonzeros, side='right') - 1).tolist():
+                var_index = proto.constraint[r].var_index
+                del var_index[:]
+                var_index.extend(columns[indptr[r]:indptr[r + 1]].tolist())
+        
+        lower, upper, _, objective = matrix.column_arrays()
+        for j in changes['columns'].tolist():
+            proto.variable[j].lower_bound = lower[j]
+            proto.variable[j].upper_bound = upper[j]
+        for j in changes['objective'].tolist():
+            proto.variable[j].objective_coefficient = objective[j]
+        row_lower, row_upper = matrix.row_arrays()
+        for r in changes['rows'].tolist():
+            proto.constraint[r].lower_bound = row_lower[r]
+            proto.constraint[r].upper_bound = row_upper[r]
+        for k, r, value in zip(changes['nonzeros'].tolist(), changes['coefficient_rows'].tolist(),
+                               changes['coefficients'].tolist()):
+            proto.constraint[r].coefficient[k - int(indptr[r])] = value
+        matrix.append_to_proto(proto, first_column, first_row)
+        
+        self._load_proto(proto, matrix)
+        self.solution_status = None
+        self.fast_solution = None
+        logger.debug(f"Patched {len(changes['columns'])} column bounds, {len(changes['objective'])} objective "
+                     f"coefficients, {len(changes['rows'])} row bounds and {len(changes['coefficients'])} "
+                     f"coefficients, deleted {len(changes['deleted_rows'])} rows and added "
+                     f"{matrix.num_rows - first_row} rows")
+        return True
+    
     def solve_model(self) -> Dict:
         """
         Solve the current optimization model.
@@ -191,12 +436,19 @@ class ORToolsSolver(SolverInterface):
             logger.debug(f"Setting SCIP optimality gap to {self.optimality_gap}")
             self.solver.SetSolverSpecificParametersAsString(f"limits/gap = {self.optimality_gap}")
         
+        if self.fast:
+            check_repairable(self.get_all_constraints())
+        elif self.warm_start is not None:
+            self._set_hint()
+        
         # Record start time
         self.start_time = time.time()
         
         # Solve the model
         logger.debug("Starting solver")
         status = self.solver.Solve()
+        if self.fast:
+            return self._round_relaxation(status)
         solve_time = time.time() - self.start_time
         
         # Map the status to a human-readable string
@@ -225,6 +477,85 @@ class ORToolsSolver(SolverInterface):
             "model_type": self.model_type
         }
     
+    def _set_hint(self) -> None:
+        """Pass the warm start to the solver as a hint (used by SCIP; CBC ignores it)."""
+        if isinstance(self.variables, MatrixVariables):
+            hints = self.matrix.hint_values(self.warm_start).tolist()
+            variables = [self.solver.variable(column) for column in range(len(hints))]
+        else:
+            variables = list(self.variables.values())
+            hints = [min(value, var.ub()) for value, var in
+                     zip(self.warm_start_values(self.variables.keys()), variables)]
+        self.solver.SetHint(variables, hints)
+        logger.debug(f"Set hint for {len(variables)} variables")
+    
+    def _lp_values(self) -> Dict[Tuple, float]:
+        """
+        Get the positive solution values of the decision variables.
+        
+        Returns:
+            Dict[Tuple, float]: Solution values by (waffle, pan, week)
+        """
+        if isinstance(self.variables, MatrixVariables):
+            return self.variables.solution_values()
+        solution_values = {}
+        for key, var in self.variables.items():
+            if var.solution_value() > 0:
+                solution_values[key] = var.solution_value()
+        return solution_values
+    
+    def _round_relaxation(self, status: int) -> Dict:
+        """
+        Round and repair the solution of the LP relaxation (fast mode).
+        
+        The status is FEASIBLE if the repaired plan satisfies all constraints and
+        UNKNOWN otherwise; gap is the rounding gap against the LP bound.
+        
+        Args:
+            status: OR-Tools status of the LP solve
+            
+        Returns:
+            Dict: Dictionary containing solution information
+        """
+        self.fast_solution = None
+        if status != pywraplp.Solver.OPTIMAL:
+            self.solution_status = "INFEASIBLE" if status == pywraplp.Solver.INFEASIBLE else "UNKNOWN"
+            logger.info(f"LP relaxation finished with status: {self.solution_status}")
+            return {
+                "status": self.solution_status,
+                "solve_time": time.time() - self.start_time,
+                "objective_value": None,
+                "model_type": self.model_type
+            }
+        
+        maximize = self.model_type == 'maximize_output'
+        lp_bound = self.objective.Value()
+        values, repaired = round_and_repair(self.data, self.get_all_constraints(), self._lp_values(), maximize)
+        self.solution_status = "FEASIBLE" if repaired else "UNKNOWN"
+        objective_value = production_objective(self.data, values, maximize) if repaired else None
+        gap = rounding_gap(objective_value, lp_bound) if repaired else None
+        solve_time = time.time() - self.start_time
+        if repaired:
+            self.fast_solution = {
+                "status": self.solution_status,
+                "values": values,
+                "objective_value": objective_value,
+                "model_type": self.model_type,
+                "lp_bound": lp_bound,
+                "gap": gap
+            }
+        logger.info(f"Rounded LP relaxation with status: {self.solution_status}")
+        logger.debug(f"Solve time: {solve_time:.2f}s, LP bound: {lp_bound}, objective: {objective_value}")
+        
+        return {
+            "status": self.solution_status,
+            "solve_time": solve_time,
+            "objective_value": objective_value,
+            "model_type": self.model_type,
+            "lp_bound": lp_bound,
+            "gap": gap
+        }
+    
     def get_solution(self) -> Dict:
         """
         Get the solution of the optimization model.
@@ -234,6 +565,9 @@ class ORToolsSolver(SolverInterface):
         """
         logger.debug("Retrieving solution")
         
+        if self.fast and self.fast_solution is not None:
+            return self.fast_solution
+        
         if self.solver is None or self.solution_status not in ["OPTIMAL", "FEASIBLE"]:
             logger.warning(f"Cannot retrieve solution: status is {self.solution_status}")
             return {
@@ -245,12 +579,8 @@ class ORToolsSolver(SolverInterface):
         
         # Extract solution values
         logger.debug("Extracting non-zero variable values")
-        solution_values = {}
-        non_zero_count = 0
-        for key, var in self.variables.items():
-            if var.solution_value() > 0:
-                solution_values[key] = var.solution_value()
-                non_zero_count += 1
+        solution_values = self._lp_values()
+        non_zero_count = len(solution_values)
         
         logger.debug(f"Found {non_zero_count} non-zero variables")
         return {
@@ -0,0 +1,174 @@
+"""
+Presolve Module for Waffle Production Optimization.
+
+This module shrinks the production models before they are built. From the data
+and the constraints of a solver it removes decision variables x[w, p, t] that
+are zero in every feasible solution (or, when minimizing cost, in an optimal
+solution) and derives finite upper bounds for the others from the pan supply
+and the demand. Solvers create only the kept variables, with these bounds, and
+the big-M constraints use the bounds as their big-M values.
+"""
+from typing import Dict, Mapping, Tuple
+import logging
+
+import numpy as np
+
+from src.solvers.constraints import (
+    Constraint,
+    DemandConstraint,
+    SupplyConstraint,
+    AllowedCombinationsConstraint,
+    ProductionRateConstraint,
+    MinimumBatchConstraint,
+)
+from src.solvers.matrix_model import MatrixModel
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Constraint classes under which a cheapest solution never produces in a week without demand
+DOMINANCE_CONSTRAINTS = (DemandConstraint, SupplyConstraint, AllowedCombinationsConstraint, MinimumBatchConstraint)
+
+
+class PresolveResult:
+    """
+    Upper bounds of the decision variables found by presolve.
+
+    Bounds are held in the column layout of MatrixModel: one entry per allowed
+    (waffle, pan) pair and sorted week. A bound of 0 means the variable is removed,
+    inf means that no finite bound was found.
+
+    Attributes:
+        upper_bounds: Upper bound of each decision variable column
+        removed_rows: Number of constraint rows the removed variables no longer generate
+        removed_columns: Number of auxiliary columns the removed variables no longer generate
+    """
+
+    def __init__(self, matrix: MatrixModel, upper_bounds: np.ndarray, removed_rows: int, removed_columns: int):
+        """
+        Initialize the result.
+
+        Args:
+            matrix: MatrixModel of the presolved data, giving the column layout
+            upper_bounds: Upper bound of each decision variable column
+            removed_rows: Number of constraint rows no longer generated
+            removed_columns: Number of auxiliary columns no longer generated
+        """
+        self.matrix = matrix
+        self.upper_bounds = upper_bounds
+        self.removed_rows = removed_rows
+        self.removed_columns = removed_columns
+
+    @property
+    def keep(self) -> np.ndarray:
+        """Mask of the decision variable columns that are kept."""
+        return self.upper_bounds > 0
+
+    def variable_bounds(self) -> Dict[Tuple, float]:
+        """
+        Get the upper bounds of the kept variables.
+
+        Returns:
+            Dict[Tuple, float]: Upper bound by (waffle, pan, week), in column order
+        """
+        keys = self.matrix.variable_keys()
+        bounds = self.upper_bounds.tolist()
+        return {keys[i]: bounds[i] for i in np.flatnonzero(self.keep).tolist()}
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Get the number of variables and rows presolve removed.
+
+        Returns:
+            Dict[str, int]: Number of variables before presolve, removed variables,
+                            kept variables with a finite bound, removed rows and
+                            removed auxiliary columns
+        """
+        keep = self.keep
+        return {
+            'variables': len(self.upper_bounds),
+            'removed_variables': int((~keep).sum()),
+            'bounded_variables': int((keep & np.isfinite(self.upper_bounds)).sum()),
+            'removed_rows': self.removed_rows,
+            'removed_columns': self.removed_columns,
+        }
+
+
+def presolve(data: Mapping, constraints: Mapping[str, Constraint], maximize: bool = False) -> PresolveResult:
+    """
+    Remove provably zero variables and bound the others.
+
+    The bounds are derived as follows:
+    - a supply constraint bounds x[w, p, t] by the supply of p in week t, or by the
+      supply of p up to week t if supply is cumulative
+    - an equality demand constraint bounds x[w, p, t] by the demand of w in week t
+    - a minimum batch larger than the bound of a variable removes it
+    - when minimizing a nonnegative cost and all constraints are demand, supply,
+      allowed combinations or minimum batch constraints, lowering a variable never
+      breaks a constraint or raises the cost, so variables of weeks without demand
+      are removed as well
+
+    Pan counts are integers, so all bounds are rounded down.
+
+    Args:
+        data: OptimizationData instance or tuple-keyed optimization data dictionary
+        constraints: Dictionary mapping constraint names to the constraints of the model
+        maximize: Whether the model maximizes output instead of minimizing cost
+
+    Returns:
+        PresolveResult: Upper bounds of the decision variables and removal counts
+    """
+    matrix = MatrixModel(data)
+    matrix.set_production_objective(maximize)
+    n_pairs, n_weeks = matrix.num_pairs, matrix.num_weeks
+    upper = np.full((n_pairs, n_weeks), np.inf)
+    constraints = list(constraints.values())
+
+    supply, _ = matrix.supply_matrix()
+    for constraint in constraints:
+        if isinstance(constraint, SupplyConstraint):
+            pan_supply = np.cumsum(supply, axis=1) if constraint.cumulative else supply
+            np.minimum(upper, np.floor(pan_supply[matrix.pair_pan] + 1e-9), out=upper)
+
+    demand, demand_mask = matrix.demand_matrix()
+    if any(isinstance(constraint, DemandConstraint) and constraint.equality for constraint in constraints):
+        pair_demand = np.where(demand_mask, np.floor(demand + 1e-9), np.inf)[matrix.pair_waffle]
+        np.minimum(upper, pair_demand, out=upper)
+
+    if (not maximize and np.all(matrix.objective >= 0)
+            and all(type(constraint) in DOMINANCE_CONSTRAINTS for constraint in constraints)):
+        has_demand = np.zeros_like(demand_mask)
+        for constraint in constraints:
+            if isinstance(constraint, DemandConstraint):
+                has_demand |= demand_mask
+        upper[~has_demand[matrix.pair_waffle]] = 0
+
+    waffle_types = matrix.data.waffle_types
+    pan_types = matrix.data.pan_types
+    batch_constraints = [constraint for constraint in constraints if isinstance(constraint, MinimumBatchConstraint)]
+    for constraint in batch_constraints:
+        min_batch = np.array([constraint.get_min_batch_size(waffle_types[w], pan_types[p])
+                              for w, p in zip(matrix.pair_waffle.tolist(), matrix.pair_pan.tolist())], dtype=float)
+        upper[upper < min_batch[:, None]] = 0
+
+    keep = upper > 0
+    removed = int(n_pairs * n_weeks - keep.sum())
+
+    # Minimum batch: one is_used column and two rows per variable
+    removed_columns = removed * len(batch_constraints)
+    removed_rows = 2 * removed * len(batch_constraints)
+
+    # Production rate: two columns and five rows per waffle and pair of consecutive
+    # weeks, unless neither week has variables left
+    rate_constraints = sum(isinstance(constraint, ProductionRateConstraint) for constraint in constraints)
+    if rate_constraints and n_weeks > 1:
+        waffle_weeks = np.zeros((len(waffle_types), n_weeks), dtype=np.int64)
+        np.add.at(waffle_weeks, matrix.pair_waffle, keep)
+        has_pairs = np.bincount(matrix.pair_waffle, minlength=len(waffle_types)) > 0
+        empty = (waffle_weeks[:, 1:] == 0) & (waffle_weeks[:, :-1] == 0) & has_pairs[:, None]
+        removed_columns += 2 * int(empty.sum()) * rate_constraints
+        removed_rows += 5 * int(empty.sum()) * rate_constraints
+
+    result = PresolveResult(matrix, upper.ravel(), removed_rows, removed_columns)
+    logger.info(f"Presolve: {result.get_statistics()}")
+    return result
@@ -12,16 +12,23 @@ This module provides the implementation for PuLP-based solvers including:
 - SCIP
 """
 from typing import Dict, List, Any
+import math
 import time
+import numpy as np
 import pulp
 from src.solvers.base import SolverInterface
+from src.solvers.matrix_model import ColumnIndex, MatrixModel
+from src.solvers.model_index import ModelIndex
+from src.solvers.mps_writer import MPS_SOLVERS, solve_mps
+from src.solvers.rounding import check_repairable, production_objective, round_and_repair, rounding_gap
 
 class PulpSolver(SolverInterface):
     """
     Implementation of the SolverInterface using PuLP.
     """
     
-    def __init__(self, time_limit: int = 60, optimality_gap: float = 0.005, solver_name: str = 'HiGHS'):
+    def __init__(self, time_limit: int = 60, optimality_gap: float = 0.005, solver_name: str = 'HiGHS',
+                 fast: bool = False, bulk_build: bool = True, direct_mps: bool = True):
         """
         Initialize the PuLP solver.
         
@@ -29,21 +36,45 @@ class PulpSolver(SolverInterface):
             time_limit: Time limit for solving the model in seconds
             optimality_gap: Maximum allowed optimality gap (default: 0.5%)
             solver_name: Name of the underlying solver (CBC, GLPK, HiGHS, etc.)
+            fast: If True, solve the LP relaxation and round and repair its solution
+                  instead of solving the MIP (see src/solvers/rounding.py)
+            bulk_build: If True, compile the model as NumPy arrays and create the PuLP
+                        expressions from them, instead of building them with PuLP
+                        operator overloading
+            direct_mps: If True, write the compiled model straight to an MPS file for
+                        CBC, GLPK, HiGHS and SCIP and read their solution back by
+                        column index, without creating a PuLP model. Other solvers,
+                        missing executables and constraints without matrix support
+                        fall back to the PuLP model.
         """
         super().__init__()  # Initialize constraint registry
         self.time_limit = time_limit
         self.optimality_gap = optimality_gap
         self.solver_name = solver_name
+        self.fast = fast
+        self.bulk_build = bulk_build
+        self.direct_mps = direct_mps
         self.model = None
+        self.matrix = None
+        self.column_values = None
         self.variables = {}
+        self.model_index = None
         self.objective = None
         self.data = None
         self.model_type = None
         self.solution_status = None
         self.start_time = None
+        self.fast_solution = None
         
     def _create_solver(self):
-        """Create the appropriate PuLP solver based on solver_name."""
+        """Create the appropriate PuLP solver based on solver_name, for the LP relaxation in fast mode."""
+        solver = self._create_mip_solver()
+        # PuLP solvers relax integrality when mip is off
+        solver.mip = not self.fast
+        return solver
+        
+    def _create_mip_solver(self):
+        """Create the PuLP solver for solver_name."""
         if self.solver_name.lower() == 'cbc':
             return pulp.PULP_CBC_CMD(timeLimit=self.time_limit, gapRel=self.optimality_gap)
         elif self.solver_name.lower() == 'glpk':
@@ -68,6 +99,122 @@ class PulpSolver(SolverInterface):
             # Default to CBC if unknown solver name
             return pulp.PULP_CBC_CMD(timeLimit=self.time_limit, gapRel=self.optimality_gap)
         
+    def _create_variables(self, data: Dict) -> None:
+        """
+        Create the decision variables x[waffle_type, pan_type, week].
+        
+        x[w, p, t] represents the number of pans of type p used to cook waffle type w
+        in week t. With a presolve result, only the variables kept by presolve are
+        created, with the presolve upper bounds.
+        
+        Args:
+            data: Dictionary containing optimization data
+        """
+        waffle_types = data['waffle_types']
+        pan_types = data['pan_types']
+        weeks = sorted(data['weeks'])  # Sort weeks to ensure chronological order
+        allowed = data['allowed']
+        bounds = self.presolve_result.variable_bounds() if self.presolve_result is not None else None
+        
+        self.variables = {}
+        for w in waffle_types:
+            for p in pan_types:
+                for t in weeks:
+                    if allowed.get((w, p), False):
+                        upper = None
+                        if bounds is not None:
+                            if (w, p, t) not in bounds:
+                                continue
+                            upper = bounds[(w, p, t)] if math.isfinite(bounds[(w, p, t)]) else None
+                        var_name = f'x_{w}_{p}_{t}'
+                        self.variables[(w, p, t)] = pulp.LpVariable(var_name, lowBound=0, upBound=upper,
+                                                                    cat=pulp.LpInteger)
+        self.model_index = ModelIndex(self.variables, data, upper_bounds=bounds)
+        
+    def _use_direct_mps(self) -> bool:
+        """Check whether the model can be solved by writing it to an MPS file directly."""
+        if not self.direct_mps or self.solver_name.lower() not in MPS_SOLVERS:
+            return False
+        constraints = self.constraint_registry.get_all_constraints()
+        if not all(constraint.matrix_support for constraint in constraints.values()):
+            return False
+        return self._create_mip_solver().available()
+    
+    def _build_direct_mps(self, maximize: bool) -> None:
+        """
+        Compile the model as a MatrixModel, to be written to an MPS file when solved.
+        
+        Args:
+            maximize: If True, maximize waffle output, otherwise minimize cost
+        """
+        upper_bounds = self.presolve_result.upper_bounds if self.presolve_result is not None else None
+        self.matrix = MatrixModel(self.data, upper_bounds=upper_bounds)
+        self.matrix.set_production_objective(maximize)
+        self.constraint_registry.apply_matrix_constraints(self.matrix, self.data)
+        self.variables = ColumnIndex(self.matrix)
+        self.model_index = None
+    
+    def _build_from_matrix(self, maximize: bool) -> None:
+        """
+        Compile the model as a MatrixModel and create the PuLP model from its arrays.
+        
+        Each matrix row becomes one named constraint ({constraint}_{row}); rows with
+        two different finite bounds become two. Expressions are created from
+        (variable, coefficient) pairs without operator overloading. Constraints
+        without matrix support are applied with apply_to_pulp.
+        
+        Args:
+            maximize: If True, maximize waffle output, otherwise minimize cost
+        """
+        upper_bounds = self.presolve_result.upper_bounds if self.presolve_result is not None else None
+        matrix = MatrixModel(self.data, with_names=True, upper_bounds=upper_bounds)
+        matrix.set_production_objective(maximize)
+        deferred = self.constraint_registry.apply_matrix_constraints(matrix, self.data)
+        
+        lower, upper, integer, objective = matrix.column_arrays()
+        removed = matrix.removed_variables
+        columns = []
+        for j, (name, low, up, is_integer) in enumerate(zip(matrix.column_names(), lower.tolist(), upper.tolist(),
+                                                           integer.tolist())):
+            if j < matrix.num_variables and removed is not None and removed[j]:
+                columns.append(None)
+                continue
+            columns.append(pulp.LpVariable(name, lowBound=low if math.isfinite(low) else None,
+                                           upBound=up if math.isfinite(up) else None,
+                                           cat=pulp.LpInteger if is_integer else pulp.LpContinuous))
+        self.variables = {key: var for key, var in zip(matrix.variable_keys(), columns) if var is not None}
+        bounds = self.presolve_result.variable_bounds() if self.presolve_result is not None else None
+        self.model_index = ModelIndex(self.variables, self.data, upper_bounds=bounds)
+        
+        self.model.setObjective(pulp.LpAffineExpression(
+            [(var, coefficient) for var, coefficient in zip(columns, objective.tolist()) if var is not None]))
+        
+        indptr, row_columns, coefficients = matrix.to_csr()
+        indptr, row_columns, coefficients = indptr.tolist(), row_columns.tolist(), coefficients.tolist()
+        row_lower, row_upper = matrix.row_arrays()
+        row_lower, row_upper = row_lower.tolist(), row_upper.tolist()
+        for block_name, (first_row, end_row, _, _) in matrix.blocks.items():
+            for r in range(first_row, end_row):
+                terms = [(columns[j], coefficient) for j, coefficient
+                         in zip(row_columns[indptr[r]:indptr[r + 1]], coefficients[indptr[r]:indptr[r + 1]])
+                         if columns[j] is not None]
+                name = f'{block_name}_{r - first_row}'
+                low, up = row_lower[r], row_upper[r]
+                if low == up:
+                    self.model.addConstraint(pulp.LpConstraint(pulp.LpAffineExpression(terms), pulp.LpConstraintEQ,
+                                                               name, low))
+                    continue
+                if math.isfinite(low):
+                    self.model.addConstraint(pulp.LpConstraint(pulp.LpAffineExpression(terms), pulp.LpConstraintGE,
+                                                               name, low))
+                if math.isfinite(up):
+                    upper_name = f'{name}_upper' if math.isfinite(low) else name
+                    self.model.addConstraint(pulp.LpConstraint(pulp.LpAffineExpression(terms), pulp.LpConstraintLE,
+                                                               upper_name, up))
+        
+        for constraint in deferred.values():
+            constraint.apply_to_pulp(self.model, self.model_index, self.data)
+        
     def apply_constraints(self) -> None:
         """
         Apply all registered constraints to the model.
@@ -76,7 +223,8 @@ class PulpSolver(SolverInterface):
             raise ValueError("Model has not been built. Call build_minimize_cost_model or build_maximize_output_model first.")
         
         # Apply constraints using the constraint registry
-        self.constraint_registry.apply_constraints('pulp', self.model, self.variables, self.data)
+        self.constraint_registry.apply_constraints('pulp', self.model, self.variables, self.data,
+                                                   index=self.model_index)
         
     def build_minimize_cost_model(self, data: Dict) -> None:
         """
@@ -88,26 +236,26 @@ class PulpSolver(SolverInterface):
         self.data = data
         self.model_type = 'minimize_cost'
         
+        self.matrix = None
+        self.column_values = None
+        # Write the compiled model straight to an MPS file if the solver reads one
+        if self._use_direct_mps():
+            self.model = None
+            self._build_direct_mps(maximize=False)
+            return
+        
         # Create PuLP model
         self.model = pulp.LpProblem("WaffleOptimizer_MinCost", pulp.LpMinimize)
+        if self.bulk_build:
+            self._build_from_matrix(maximize=False)
+            return
         
         # Extract data
-        waffle_types = data['waffle_types']
-        pan_types = data['pan_types']
-        weeks = sorted(data['weeks'])  # Sort weeks to ensure chronological order
-        allowed = data['allowed']
         cost = data['cost']
         wpp = data['wpp']  # Waffles per waffle type
         
         # Create decision variables: x[waffle_type, pan_type, week]
-        # Represents the number of pans of type pan_type used to cook waffle_type in week
-        self.variables = {}
-        for w in waffle_types:
-            for p in pan_types:
-                for t in weeks:
-                    if allowed.get((w, p), False):
-                        var_name = f'x_{w}_{p}_{t}'
-                        self.variables[(w, p, t)] = pulp.LpVariable(var_name, lowBound=0, cat=pulp.LpInteger)
+        self._create_variables(data)
         
         # Objective function: minimize total cost
         # Cost is calculated as: (number of pans) * (waffles per pan) * (cost per waffle)
@@ -130,25 +278,25 @@ class PulpSolver(SolverInterface):
         self.data = data
         self.model_type = 'maximize_output'
         
+        self.matrix = None
+        self.column_values = None
+        # Write the compiled model straight to an MPS file if the solver reads one
+        if self._use_direct_mps():
+            self.model = None
+            self._build_direct_mps(maximize=True)
+            return
+        
         # Create PuLP model
         self.model = pulp.LpProblem("WaffleOptimizer_MaxOutput", pulp.LpMaximize)
+        if self.bulk_build:
+            self._build_from_matrix(maximize=True)
+            return
         
         # Extract data
-        waffle_types = data['waffle_types']
-        pan_types = data['pan_types']
-        weeks = sorted(data['weeks'])  # Sort weeks to ensure chronological order
-        allowed = data['allowed']
         wpp = data['wpp']  # Waffles per waffle type
         
         # Create decision variables: x[waffle_type, pan_type, week]
-        # Represents the number of pans of type pan_type used to cook waffle_type in week
-        self.variables = {}
-        for w in waffle_types:
-            for p in pan_types:
-                for t in weeks:
-                    if allowed.get((w, p), False):
-                        var_name = f'x_{w}_{p}_{t}'
-                        self.variables[(w, p, t)] = pulp.LpVariable(var_name, lowBound=0, cat=pulp.LpInteger)
+        self._create_variables(data)
         
         # Objective function: maximize total waffle output
         objective_expr = pulp.lpSum(
@@ -167,18 +315,58 @@ class PulpSolver(SolverInterface):
         Returns:
             Dict: Dictionary containing solution information
         """
-        if self.model is None:
+        if self.model is None and self.matrix is None:
             raise ValueError("Model has not been built. Call build_minimize_cost_model or build_maximize_output_model first.")
         
+        if self.fast:
+            check_repairable(self.get_all_constraints())
+        
+        if self.matrix is not None:
+            return self._solve_direct_mps()
+        
         # Create solver instance
         solver = self._create_solver()
         
+        # Start from the prior solution as a MIP start, for backends that read one (CBC, HiGHS, SCIP)
+        if self.warm_start is not None and not self.fast:
+            for var, value in zip(self.variables.values(), self.warm_start_values(self.variables.keys())):
+                var.setInitialValue(min(value, var.upBound) if var.upBound is not None else value)
+            solver.optionsDict['warmStart'] = True
+        
         # Record start time
         self.start_time = time.time()
         
         # Solve the model
         status = self.model.solve(solver)
+        return self._solution_info(status)
+    
+    def _solve_direct_mps(self) -> Dict:
+        """
+        Solve the compiled model through an MPS file written from its arrays.
+        
+        Returns:
+            Dict: Dictionary containing solution information
+        """
+        start = None
+        if self.warm_start is not None and not self.fast:
+            start = np.zeros(self.matrix.num_columns)
+            start[:self.matrix.num_variables] = self.matrix.hint_values(self.warm_start)
+        
+        self.start_time = time.time()
+        status, self.column_values = solve_mps(self.solver_name, self._create_mip_solver(), self.matrix,
+                                               relax=self.fast, start=start)
+        return self._solution_info(status)
+    
+    def _solution_info(self, status: int) -> Dict:
+        """
+        Record the status of a solve and get the solution information.
         
+        Args:
+            status: PuLP status of the solve
+            
+        Returns:
+            Dict: Dictionary containing solution information
+        """
         # Map PuLP status to a human-readable string
         status_map = {
             pulp.LpStatusOptimal: "OPTIMAL",
@@ -189,15 +377,75 @@ class PulpSolver(SolverInterface):
         }
         
         self.solution_status = status_map.get(status, "UNKNOWN")
+        if self.fast:
+            return self._round_relaxation()
         
         # Return solution information
         return {
             "status": self.solution_status,
             "solve_time": time.time() - self.start_time,
-            "objective_value": pulp.value(self.model.objective) if self.solution_status == "OPTIMAL" else None,
+            "objective_value": self._objective_value() if self.solution_status == "OPTIMAL" else None,
             "model_type": self.model_type
         }
     
+    def _objective_value(self) -> float:
+        """Get the objective value of the solved model."""
+        if self.matrix is not None:
+            return float(self.matrix.objective @ self.column_values[:self.matrix.num_variables])
+        return pulp.value(self.model.objective)
+    
+    def _positive_values(self) -> Dict:
+        """Get the positive decision variable values of the solved model by (waffle, pan, week)."""
+        if self.matrix is not None:
+            return self.matrix.positive_values(self.column_values)
+        return {key: var.varValue for key, var in self.variables.items() if (var.varValue or 0) > 0}
+    
+    def _round_relaxation(self) -> Dict:
+        """
+        Round and repair the solution of the LP relaxation (fast mode).
+        
+        The status is FEASIBLE if the repaired plan satisfies all constraints and
+        UNKNOWN otherwise; gap is the rounding gap against the LP bound.
+        
+        Returns:
+            Dict: Dictionary containing solution information
+        """
+        self.fast_solution = None
+        if self.solution_status != "OPTIMAL":
+            return {
+                "status": self.solution_status,
+                "solve_time": time.time() - self.start_time,
+                "objective_value": None,
+                "model_type": self.model_type
+            }
+        
+        maximize = self.model_type == 'maximize_output'
+        lp_bound = self._objective_value()
+        lp_values = self._positive_values()
+        values, repaired = round_and_repair(self.data, self.get_all_constraints(), lp_values, maximize)
+        self.solution_status = "FEASIBLE" if repaired else "UNKNOWN"
+        objective_value = production_objective(self.data, values, maximize) if repaired else None
+        gap = rounding_gap(objective_value, lp_bound) if repaired else None
+        if repaired:
+            self.fast_solution = {
+                "status": self.solution_status,
+                "values": values,
+                "objective_value": objective_value,
+                "model_type": self.model_type,
+                "lp_bound": lp_bound,
+                "gap": gap,
+                "solve_time": time.time() - self.start_time
+            }
+        
+        return {
+            "status": self.solution_status,
+            "solve_time": time.time() - self.start_time,
+            "objective_value": objective_value,
+            "model_type": self.model_type,
+            "lp_bound": lp_bound,
+            "gap": gap
+        }
+    
     def get_solution(self) -> Dict:
         """
         Get the solution of the optimization model.
@@ -205,7 +453,10 @@ class PulpSolver(SolverInterface):
         Returns:
             Dict: Dictionary containing the solution variables and objective value
         """
-        if self.model is None or self.solution_status != "OPTIMAL":
+        if self.fast and self.fast_solution is not None:
+            return self.fast_solution
+        
+        if (self.model is None and self.matrix is None) or self.solution_status != "OPTIMAL":
             return {
                 "status": self.solution_status if self.solution_status else "NOT_SOLVED",
                 "values": {},
@@ -213,16 +464,10 @@ class PulpSolver(SolverInterface):
                 "model_type": self.model_type
             }
         
-        # Extract solution values
-        solution_values = {}
-        for key, var in self.variables.items():
-            if pulp.value(var) > 0:
-                solution_values[key] = pulp.value(var)
-        
         return {
             "status": self.solution_status,
-            "values": solution_values,
-            "objective_value": pulp.value(self.model.objective),
+            "values": self._positive_values(),
+            "objective_value": self._objective_value(),
             "model_type": self.model_type,
             "solve_time": time.time() - self.start_time if self.start_time else None
         } 
\ No newline at end of file
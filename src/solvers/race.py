@@ -0,0 +1,235 @@
+"""
+Race Module for Waffle Production Optimization.
+
+No backend of SolverFactory is fastest on every instance. RacingSolver solves
+the same model with a portfolio of backends, each in its own worker process,
+and returns the first conclusive result (an optimum, or a proof that the model
+is infeasible or unbounded). Without one, it returns the best solution found
+by the deadline. The remaining workers are terminated and the result names the
+backend that won.
+"""
+import multiprocessing
+import os
+import queue
+import signal
+import time
+import logging
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+from src.solvers.base import MetaSolver
+from src.solvers.decomposition import solve_block
+from src.solvers.rounding import FAST_SOLVERS
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Backends raced when none are given
+DEFAULT_BACKENDS = ['highs', 'ortools', 'cpsat', 'cbc']
+
+# Statuses that end the race: no other backend can do better
+CONCLUSIVE_STATUSES = ['OPTIMAL', 'INFEASIBLE', 'UNBOUNDED']
+
+
+def backend_label(name: str, options: Mapping[str, Any]) -> str:
+    """
+    Get the label of a backend in race results.
+
+    Args:
+        name: Name of the solver in SolverFactory
+        options: Arguments for the solver given in the race's solver list
+
+    Returns:
+        str: Solver name, followed by its options if there are any
+    """
+    if not options:
+        return name
+    return f"{name}({', '.join(f'{key}={value}' for key, value in sorted(options.items()))})"
+
+
+def _race_worker(results: Any, index: int, solver_name: str, solver_options: Dict, constraints: Dict,
+                 data: Mapping, maximize: bool, use_presolve: bool, warm_start: Optional[Dict]) -> None:
+    """Solve the model with one backend and put (index, result, solution, error) on the results queue."""
+    if hasattr(os, 'setpgrp'):
+        # Own process group, so that terminating the worker also stops solver subprocesses (e.g. PuLP's CBC)
+        os.setpgrp()
+    try:
+        result, solution = solve_block(solver_name, solver_options, constraints, data, maximize, use_presolve,
+                                       warm_start)
+        results.put((index, result, solution, None))
+    except Exception as e:
+        results.put((index, None, None, f"{type(e).__name__}: {e}"))
+
+
+def _terminate(process: Any) -> None:
+    """Terminate a worker process and its process group, if it is still running."""
+    if not process.is_alive():
+        return
+    if hasattr(os, 'killpg'):
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except OSError:
+            # The worker has not created its process group yet
+            pass
+    process.terminate()
+
+
+class RacingSolver(MetaSolver):
+    """
+    Solver that races several backends on the same model and keeps the best result.
+    """
+
+    mode = 'raced'
+
+    def __init__(self, solvers: Optional[Sequence[Union[str, Tuple[str, Dict]]]] = None, time_limit: int = 60,
+                 optimality_gap: float = 0.005, grace_period: float = 10.0, start_method: Optional[str] = None,
+                 **solver_options):
+        """
+        Initialize the racing solver.
+
+        Args:
+            solvers: Backends to race, as SolverFactory names or (name, options) tuples
+                     (default: DEFAULT_BACKENDS)
+            time_limit: Time limit of each backend in seconds
+            optimality_gap: Optimality gap of each backend
+            grace_period: Time in seconds after the time limit that the race waits for
+                          backends to build their models and report their solutions
+            start_method: multiprocessing start method of the workers, e.g. 'spawn' where
+                          forking the parent process is unsafe (default: the platform default)
+            **solver_options: Arguments for all backends; a backend's own options take precedence.
+                              A shared fast=True only goes to backends in FAST_SOLVERS
+        """
+        super().__init__()
+        backends = []
+        labels = []
+        for backend in solvers or DEFAULT_BACKENDS:
+            name, options = (backend, {}) if isinstance(backend, str) else backend
+            labels.append(backend_label(name.lower(), options))
+            shared_options = dict(solver_options)
+            if name.lower() not in FAST_SOLVERS and shared_options.pop('fast', False):
+                logger.info(f"Solver '{name}' has no fast mode, racing it exactly")
+            options = dict(shared_options, time_limit=time_limit, optimality_gap=optimality_gap, **options)
+            backends.append((name.lower(), options))
+        if not backends:
+            raise ValueError("A race needs at least one solver")
+        if len(set(labels)) != len(labels):
+            raise ValueError(f"Duplicate solvers in race: {labels}")
+        self.backends = backends
+        self.labels = labels
+        self.time_limit = time_limit
+        self.grace_period = grace_period
+        self.start_method = start_method
+        logger.debug(f"Initialized racing solver with solvers={labels}, time_limit={time_limit}")
+
+    def _better(self, result: Dict, best: Optional[Dict]) -> bool:
+        """Check whether a backend result has a better solution than the best one so far."""
+        if result['status'] not in ('OPTIMAL', 'FEASIBLE') or result.get('objective_value') is None:
+            return False
+        if best is None:
+            return True
+        if self.maximize:
+            return result['objective_value'] > best['objective_value']
+        return result['objective_value'] < best['objective_value']
+
+    def _race(self) -> Tuple[Optional[int], Dict[int, Tuple[Optional[Dict], Optional[Dict], Optional[str]]]]:
+        """
+        Run all backends until one is conclusive, all are done or the deadline passes.
+
+        Returns:
+            Tuple: Index of the winning backend (None if no backend found a solution or
+                   proof), and the (result, solution, error) of each backend that finished
+        """
+        context = multiprocessing.get_context(self.start_method)
+        results = context.Queue()
+        use_presolve = self.presolve_result is not None
+        processes = []
+        for index, (name, options) in enumerate(self.backends):
+            process = context.Process(target=_race_worker, daemon=True,
+                                      args=(results, index, name, options, self.get_all_constraints(), self.data,
+                                            self.maximize, use_presolve, self.warm_start))
+            process.start()
+            processes.append(process)
+
+        deadline = time.time() + self.time_limit + self.grace_period
+        finished = {}
+        winner = None
+        try:
+            while len(finished) < len(processes):
+                try:
+                    index, result, solution, error = results.get(timeout=max(0.0, min(0.1, deadline - time.time())))
+                except queue.Empty:
+                    if time.time() >= deadline:
+                        logger.warning(f"Race deadline passed with {len(processes) - len(finished)} backends running")
+                        break
+                    # A worker that died without reporting, e.g. in native solver code, has lost
+                    for position, process in enumerate(processes):
+                        if position not in finished and not process.is_alive() and process.exitcode != 0:
+                            finished[position] = (None, None, f"Worker exited with code {process.exitcode}")
+                    continue
+                finished[index] = (result, solution, error)
+                if error is not None:
+                    logger.warning(f"Backend '{self.labels[index]}' failed: {error}")
+                    continue
+                logger.debug(f"Backend '{self.labels[index]}' finished with status {result['status']}")
+                if result['status'] in CONCLUSIVE_STATUSES:
+                    winner = index
+                    break
+                if self._better(result, finished[winner][0] if winner is not None else None):
+                    winner = index
+        finally:
+            for process in processes:
+                _terminate(process)
+            for process in processes:
+                process.join()
+            results.close()
+        return winner, finished
+
+    def solve_model(self) -> Dict:
+        """
+        Race all backends on the model.
+
+        The result is that of the winning backend, with its label in 'winner' and the
+        status of each backend in 'backends' (TERMINATED for losers stopped by the race,
+        ERROR for backends that failed).
+
+        Returns:
+            Dict: Dictionary containing solution information
+        """
+        if self.data is None:
+            logger.error("Cannot solve model: model not built")
+            raise ValueError("Model has not been built. Call build_minimize_cost_model or build_maximize_output_model first.")
+
+        logger.info(f"Racing {len(self.backends)} solvers on {self.model_type} model: {self.labels}")
+        start_time = time.time()
+        winner, finished = self._race()
+        solve_time = time.time() - start_time
+
+        backends = {}
+        for index, label in enumerate(self.labels):
+            if index not in finished:
+                backends[label] = "TERMINATED"
+            else:
+                result, _, error = finished[index]
+                backends[label] = "ERROR" if error is not None else result['status']
+
+        if winner is not None:
+            result, solution, _ = finished[winner]
+            status = result['status']
+            objective_value = result.get('objective_value')
+            self.solution = dict(solution, winner=self.labels[winner])
+        else:
+            statuses = [status for status in backends.values() if status not in ("TERMINATED", "ERROR")]
+            status = statuses[0] if statuses else "NOT_SOLVED"
+            objective_value = None
+            self.solution = None
+        winner_label = self.labels[winner] if winner is not None else None
+        logger.info(f"Race finished with status {status}, winner: {winner_label}")
+        logger.debug(f"Solve time: {solve_time:.2f}s, backends: {backends}")
+
+        return {
+            "status": status,
+            "solve_time": solve_time,
+            "objective_value": objective_value,
+            "model_type": self.model_type,
+            "winner": winner_label,
+            "backends": backends
+        }
@@ -0,0 +1,230 @@
+"""
+Solve Cache Module for Waffle Production Optimization.
+
+This module caches solve results so that re-running an unchanged optimization
+returns the stored solution instead of solving again. Entries are keyed by a
+hash of the normalized optimization data, the constraint configuration, the
+objective, the solver and its parameters. Recent entries are kept in memory,
+and entries are also written as JSON files to a size-bounded on-disk cache so
+that they survive restarts.
+"""
+import os
+import copy
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from src.data.cache import DEFAULT_CACHE_DIR, DiskStore
+from src.data.optimization_data import as_optimization_data
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Default location of the on-disk solve cache
+DEFAULT_SOLVE_CACHE_DIR = os.path.join(DEFAULT_CACHE_DIR, 'solutions')
+
+# Increment when the stored layout changes so that stale entries are never read
+SOLVE_CACHE_VERSION = 1
+
+# Statuses whose results are final and always reused; others are incumbents
+FINAL_STATUSES = ['OPTIMAL', 'INFEASIBLE', 'UNBOUNDED']
+
+# Arrays of OptimizationData that the data fingerprint covers
+FINGERPRINT_ARRAYS = ['demand_array', 'supply_array', 'cost_array', 'wpp_array', 'allowed_array',
+                      'demand_mask', 'supply_mask', 'cost_mask', 'wpp_mask', 'allowed_mask']
+
+
+def data_fingerprint(data: Mapping) -> str:
+    """
+    Compute a hash of optimization data.
+
+    Data is normalized to OptimizationData first, so dictionaries and arrays with
+    the same contents have the same fingerprint.
+
+    Args:
+        data: OptimizationData or dictionary containing optimization data
+
+    Returns:
+        str: Hexadecimal fingerprint
+    """
+    data = as_optimization_data(data)
+    digest = hashlib.sha256()
+    labels = [list(data.waffle_types), list(data.pan_types), list(data.weeks)]
+    digest.update(json.dumps(labels, default=repr).encode())
+    for name in FINGERPRINT_ARRAYS:
+        array = getattr(data, name)
+        digest.update(f"|{name}|{array.dtype.str}|{array.shape}|".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _encode(value: Any) -> Any:
+    """Convert a solution to JSON values, storing dictionaries with non-string keys as item lists."""
+    if isinstance(value, Mapping):
+        if any(not isinstance(key, str) for key in value):
+            return {'__items__': [[list(key) if isinstance(key, tuple) else key, _encode(item)]
+                                  for key, item in value.items()]}
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if hasattr(value, 'item'):
+        # numpy scalar
+        return value.item()
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Restore a solution converted by _encode."""
+    if isinstance(value, dict):
+        if set(value) == {'__items__'}:
+            return {tuple(key) if isinstance(key, list) else key: _decode(item) for key, item in value['__items__']}
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+class SolveCache:
+    """
+    Two-tier cache of solve results keyed by data, configuration and solver parameters.
+
+    The memory tier holds the max_entries most recently used entries. The on-disk
+    tier is bounded by max_size_bytes; when it grows beyond that the least recently
+    used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_SOLVE_CACHE_DIR, max_entries: int = 32,
+                 max_size_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the solve cache.
+
+        Args:
+            cache_dir: Directory in which cache entries are stored (None keeps entries in memory only)
+            max_entries: Maximum number of entries in memory
+            max_size_bytes: Maximum total size of all entries on disk
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_bytes
+        self._memory: 'OrderedDict[str, Tuple[Dict, Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.store = DiskStore(cache_dir, '.json', max_size_bytes, 'solve cache') if cache_dir is not None else None
+
+    @staticmethod
+    def key(data: Mapping, configuration: Mapping, objective: str, solver_name: str, time_limit: float,
+            gap: float, options: Optional[Mapping] = None) -> str:
+        """
+        Compute the cache key of a solve.
+
+        Args:
+            data: Optimization data
+            configuration: Constraint configuration, e.g. SolverManager.get_serializable_configuration()
+            objective: Objective of the model, e.g. 'minimize_cost'
+            solver_name: Name of the solver
+            time_limit: Time limit in seconds
+            gap: Optimality gap
+            options: Other solver and model options that change the result
+
+        Returns:
+            str: Hexadecimal cache key
+        """
+        parameters = {
+            'version': SOLVE_CACHE_VERSION,
+            'configuration': configuration,
+            'objective': objective,
+            'solver': solver_name.lower(),
+            'time_limit': time_limit,
+            'gap': gap,
+            'options': options or {},
+        }
+        digest = hashlib.sha256(data_fingerprint(data).encode())
+        digest.update(json.dumps(parameters, sort_keys=True, default=repr).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str, reuse_incumbent: bool = False) -> Optional[Tuple[Dict, Dict]]:
+        """
+        Look up a solve.
+
+        Args:
+            key: Cache key from key()
+            reuse_incumbent: If True, also return results that are not final, e.g. the
+                             best solution found before a time limit
+
+        Returns:
+            Optional[Tuple[Dict, Dict]]: Copies of the solve_model result and the solution,
+                                         or None on a cache miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is None:
+            entry = self.store.read(key, self._read_entry) if self.store is not None else None
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None:
+            logger.debug(f"Solve cache miss for {key[:12]}")
+            return None
+
+        result, solution = entry
+        if result.get('status') not in FINAL_STATUSES and not reuse_incumbent:
+            logger.debug(f"Not reusing cached {result.get('status')} result for {key[:12]}")
+            return None
+        logger.info(f"Solve cache hit for {key[:12]} ({result.get('status')})")
+        return copy.deepcopy(result), copy.deepcopy(solution)
+
+    def put(self, key: str, result: Dict, solution: Dict) -> bool:
+        """
+        Store a solve.
+
+        Args:
+            key: Cache key from key()
+            result: Result of solve_model
+            solution: Result of get_solution
+
+        Returns:
+            bool: True if the entry was stored on disk, False if it is kept in memory only
+        """
+        entry = (copy.deepcopy(result), copy.deepcopy(solution))
+        self._remember(key, entry)
+        if self.store is None:
+            return False
+
+        try:
+            content = json.dumps({'result': _encode(result), 'solution': _encode(solution)})
+        except (TypeError, ValueError) as e:
+            # Labels such as timestamps cannot be restored exactly from JSON
+            logger.debug(f"Not writing solve cache entry with non-JSON values: {str(e)}")
+            return False
+        return self.store.write(key, lambda f: f.write(content.encode()))
+
+    def _remember(self, key: str, entry: Tuple[Dict, Dict]) -> None:
+        """Add an entry to the memory tier, evicting the least recently used ones."""
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    @staticmethod
+    def _read_entry(path: str) -> Tuple[Dict, Dict]:
+        """Read the result and solution of an on-disk entry."""
+        with open(path) as f:
+            content = json.load(f)
+        return _decode(content['result']), _decode(content['solution'])
+
+    def clear(self) -> int:
+        """
+        Remove all entries from both tiers.
+
+        Returns:
+            int: Number of removed on-disk entries
+        """
+        with self._lock:
+            self._memory.clear()
+        removed = self.store.clear() if self.store is not None else 0
+        logger.debug(f"Cleared {removed} solve cache entries")
+        return removed
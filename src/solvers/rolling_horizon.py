@@ -0,0 +1,238 @@
+"""
+Rolling Horizon Module for Waffle Production Optimization.
+
+Model size and solve time grow faster than linearly with the number of weeks,
+since cumulative supply and production rate limits link the weeks. A rolling
+horizon solve optimizes a window of the first K weeks, fixes the production of
+its first S weeks, and moves the window S weeks ahead. Pans left unused in the
+fixed weeks are carried into the next window as supply of its first week (if
+supply is cumulative), and the production of the last fixed week limits the
+decrease in the first week of the next window (if production rates are limited).
+The plan is not necessarily optimal. Weeks fixed by earlier windows can also leave
+a later window infeasible, e.g. by using up cumulative supply that later demand
+needs; the solve then starts over with windows and steps twice as long, at the
+latest with a single window of all weeks, which is the full model.
+"""
+from typing import Dict, List, Mapping, Optional, Tuple
+import copy
+import time
+import logging
+
+from src.solvers.base import MetaSolver
+from src.solvers.constraints import Constraint, SupplyConstraint, ProductionRateConstraint
+from src.solvers.decomposition import solve_block
+from src.solvers.rounding import production_objective
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def window_data(data: Mapping, weeks: List, inventory: Optional[Mapping] = None) -> Dict:
+    """
+    Restrict optimization data to a window of weeks.
+
+    Args:
+        data: Dictionary containing optimization data
+        weeks: Sorted weeks of the window
+        inventory: Unused pans carried into the first week of the window, by pan type
+
+    Returns:
+        Dict: Optimization data of the window, sharing cost, wpp and allowed with data
+    """
+    window = set(weeks)
+    supply = {(p, t): value for (p, t), value in data['supply'].items() if t in window}
+    for p, value in (inventory or {}).items():
+        if value > 0:
+            supply[(p, weeks[0])] = supply.get((p, weeks[0]), 0) + value
+    return {
+        'waffle_types': data['waffle_types'],
+        'pan_types': data['pan_types'],
+        'weeks': list(weeks),
+        'demand': {(w, t): value for (w, t), value in data['demand'].items() if t in window},
+        'supply': supply,
+        'cost': data['cost'],
+        'wpp': data['wpp'],
+        'allowed': data['allowed'],
+    }
+
+
+class RollingHorizonSolver(MetaSolver):
+    """
+    Solver that plans long horizons window by window with another solver.
+    """
+
+    mode = 'rolling horizon'
+
+    def __init__(self, solver_name: str = 'ortools', window: int = 13, step: int = 4, **solver_options):
+        """
+        Initialize the rolling horizon solver.
+
+        Args:
+            solver_name: Name of the solver in SolverFactory that solves each window
+            window: Number of weeks optimized at once (K)
+            step: Number of weeks fixed after each window and moved ahead (S), at most window
+            **solver_options: Arguments for the window solver, e.g. time_limit and optimality_gap;
+                              each window gets the full time limit
+
+        Raises:
+            ValueError: If window or step is out of range
+        """
+        super().__init__()
+        if window < 1 or not 1 <= step <= window:
+            raise ValueError(f"Invalid rolling horizon: window={window}, step={step}")
+        self.solver_name = solver_name
+        self.window = window
+        self.step = step
+        self.solver_options = solver_options
+        logger.debug(f"Initialized rolling horizon solver with solver_name={solver_name}, "
+                     f"window={window}, step={step}")
+
+    def windows(self, window: Optional[int] = None, step: Optional[int] = None) -> List[Tuple[List, List]]:
+        """
+        Get the weeks of each window and the weeks fixed after solving it.
+
+        The last window ends with the last week and all of its weeks are fixed.
+
+        Args:
+            window: Number of weeks of each window (default: self.window)
+            step: Number of weeks fixed after each window (default: self.step)
+
+        Returns:
+            List[Tuple[List, List]]: Weeks and fixed weeks of each window
+        """
+        window = window if window is not None else self.window
+        step = step if step is not None else self.step
+        weeks = sorted(self.data['weeks'])
+        windows = []
+        start = 0
+        while start < len(weeks):
+            window_weeks = weeks[start:start + window]
+            if start + window >= len(weeks):
+                windows.append((window_weeks, window_weeks))
+                break
+            windows.append((window_weeks, window_weeks[:step]))
+            start += step
+        return windows
+
+    def _window_constraints(self, production: Optional[Dict]) -> Dict[str, Constraint]:
+        """
+        Get the constraints of a window.
+
+        Args:
+            production: Production of each waffle type in the week before the window,
+                        or None for the first window
+
+        Returns:
+            Dict[str, Constraint]: Registered constraints, with production rate constraints
+                                   limited by the production before the window
+        """
+        constraints = dict(self.get_all_constraints())
+        if production is not None:
+            for name, constraint in constraints.items():
+                if isinstance(constraint, ProductionRateConstraint):
+                    constraint = copy.copy(constraint)
+                    constraint.initial_production = production
+                    constraints[name] = constraint
+        return constraints
+
+    def _solve_windows(self, windows: List[Tuple[List, List]]) -> Tuple[str, Dict, int]:
+        """
+        Solve the windows one after another, fixing the production of their fixed weeks.
+
+        Args:
+            windows: Weeks and fixed weeks of each window, from windows()
+
+        Returns:
+            Tuple[str, Dict, int]: Status, production values of the fixed weeks and
+                                   the index of the window that ended the solve
+        """
+        constraints = self.get_all_constraints().values()
+        carry_inventory = any(isinstance(constraint, SupplyConstraint) and constraint.cumulative
+                              for constraint in constraints)
+        supply = self.data['supply']
+        use_presolve = self.presolve_result is not None
+
+        values = {}
+        inventory = {}
+        production = None
+        for index, (window_weeks, fixed_weeks) in enumerate(windows):
+            result, solution = solve_block(self.solver_name, self.solver_options, self._window_constraints(production),
+                                           window_data(self.data, window_weeks, inventory),
+                                           self.maximize, use_presolve, self.warm_start)
+            if result['status'] not in ('OPTIMAL', 'FEASIBLE'):
+                logger.warning(f"Window starting {window_weeks[0]} ended with status {result['status']}")
+                return result['status'], {}, index
+
+            fixed = set(fixed_weeks)
+            usage = {}
+            production = {}
+            for (w, p, t), value in solution['values'].items():
+                if t in fixed:
+                    values[(w, p, t)] = value
+                    usage[p] = usage.get(p, 0) + value
+                    if t == fixed_weeks[-1]:
+                        production[w] = production.get(w, 0) + value
+
+            # Pans not used in the fixed weeks carry over under cumulative supply
+            if carry_inventory:
+                inventory = {p: inventory.get(p, 0) + sum(supply.get((p, t), 0) for t in fixed_weeks)
+                             - usage.get(p, 0) for p in self.data['pan_types']}
+        status = result['status'] if len(windows) == 1 else 'FEASIBLE'
+        return status, values, len(windows) - 1
+
+    def solve_model(self) -> Dict:
+        """
+        Solve the model window by window.
+
+        If a window after the first is infeasible because of the weeks fixed before
+        it, the solve starts over with windows and steps twice as long. The first
+        window only has the constraints of the full model on its weeks, so when it
+        is infeasible, so is the full model.
+
+        The status is that of the single window if one window covers all weeks, the
+        status of the window without a solution that ended the solve, or FEASIBLE otherwise.
+
+        Returns:
+            Dict: Dictionary containing solution information
+        """
+        if self.data is None or self.model_type is None:
+            logger.error("Cannot solve model: model not built")
+            raise ValueError("Model has not been built. Call build_minimize_cost_model or build_maximize_output_model first.")
+
+        num_weeks = len(self.data['weeks'])
+        window, step = self.window, self.step
+        start_time = time.time()
+        while True:
+            windows = self.windows(window, step)
+            logger.info(f"Solving {self.model_type} model in {len(windows)} windows of {window} weeks "
+                        f"with {self.solver_name}")
+            status, values, index = self._solve_windows(windows)
+            if status != 'INFEASIBLE' or index == 0:
+                break
+            window, step = min(2 * window, num_weeks), min(2 * step, num_weeks)
+            logger.warning(f"Weeks fixed by earlier windows made a window infeasible; "
+                           f"starting over with window={window}, step={step}")
+        solve_time = time.time() - start_time
+
+        if status in ('OPTIMAL', 'FEASIBLE'):
+            objective_value = production_objective(self.data, values, self.maximize)
+        else:
+            objective_value = None
+        self.solution = {
+            "status": status,
+            "values": values,
+            "objective_value": objective_value,
+            "model_type": self.model_type
+        }
+        logger.info(f"Rolling horizon solve finished with status: {status}")
+        logger.debug(f"Solve time: {solve_time:.2f}s")
+
+        return {
+            "status": status,
+            "solve_time": solve_time,
+            "objective_value": objective_value,
+            "model_type": self.model_type,
+            "num_windows": len(windows),
+            "window": window,
+            "step": step
+        }
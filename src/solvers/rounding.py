@@ -0,0 +1,276 @@
+"""
+Rounding Module for Waffle Production Optimization.
+
+The fast mode of ORToolsSolver and PulpSolver solves the LP relaxation of the
+model instead of the MIP and turns its fractional pan counts into an integer
+plan here: the LP values are rounded down, which never breaks a supply limit,
+and a repair step then adds pans until every demand is met again, on the
+cheapest pans with unused supply. The LP objective bounds the optimum, so the
+gap between it and the repaired plan bounds how far the plan is from optimal.
+"""
+from typing import Dict, List, Mapping, Tuple
+import math
+import logging
+
+import numpy as np
+
+from src.solvers.constraints import (
+    Constraint,
+    DemandConstraint,
+    SupplyConstraint,
+    AllowedCombinationsConstraint,
+    ProductionRateConstraint,
+    MinimumBatchConstraint,
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Constraint classes whose rows the repair step restores or checks
+REPAIR_CONSTRAINTS = (DemandConstraint, SupplyConstraint, AllowedCombinationsConstraint,
+                      ProductionRateConstraint, MinimumBatchConstraint)
+
+# SolverFactory names of the solvers that have a fast mode
+FAST_SOLVERS = ('ortools', 'cbc', 'glpk', 'scip', 'coin_cmd')
+
+
+def check_repairable(constraints: Mapping[str, Constraint]) -> None:
+    """
+    Check that the repair step knows all constraints of a model.
+
+    Args:
+        constraints: Dictionary mapping constraint names to constraint instances
+
+    Raises:
+        ValueError: If a constraint is not one of the built-in types
+    """
+    unsupported = [name for name, constraint in constraints.items() if type(constraint) not in REPAIR_CONSTRAINTS]
+    if unsupported:
+        raise ValueError(f"Constraints that fast mode cannot repair: {', '.join(unsupported)}")
+
+
+def production_objective(data: Mapping, values: Mapping[Tuple, float], maximize: bool) -> float:
+    """
+    Get the objective value of a production plan.
+
+    Args:
+        data: Dictionary containing optimization data
+        values: Pan counts by (waffle, pan, week)
+        maximize: If True, total waffle output, otherwise total cost
+
+    Returns:
+        float: Objective value
+    """
+    wpp = data['wpp']
+    cost = data['cost']
+    if maximize:
+        return float(sum(value * wpp.get(w, 0) for (w, p, t), value in values.items()))
+    return float(sum(value * cost.get((w, p), 0) * wpp.get(w, 0) for (w, p, t), value in values.items()))
+
+
+def rounding_gap(objective_value: float, lp_bound: float) -> float:
+    """
+    Get the relative gap between a rounded plan and the LP bound.
+
+    Args:
+        objective_value: Objective value of the rounded plan
+        lp_bound: Objective value of the LP relaxation
+
+    Returns:
+        float: |objective_value - lp_bound| / |objective_value|, 0 if both are 0
+    """
+    difference = abs(objective_value - lp_bound)
+    if difference <= 1e-9:
+        return 0.0
+    return difference / abs(objective_value) if objective_value != 0 else math.inf
+
+
+def _rate_violations(constraints: List[ProductionRateConstraint], values: Mapping[Tuple, float],
+                     waffle_types: List, weeks: List) -> int:
+    """Count the week pairs, and first weeks after an initial production, that decrease too fast."""
+    production = {}
+    for (w, p, t), value in values.items():
+        production[(w, t)] = production.get((w, t), 0) + value
+    violations = 0
+    for constraint in constraints:
+        for w in waffle_types:
+            previous = constraint.initial_production.get(w, 0)
+            for t in weeks:
+                current = production.get((w, t), 0)
+                if previous > 0 and current < previous * (1 - constraint.max_rate_change) - 1e-6:
+                    violations += 1
+                previous = current
+    return violations
+
+
+def round_and_repair(data: Mapping, constraints: Mapping[str, Constraint], lp_values: Mapping[Tuple, float],
+                     maximize: bool) -> Tuple[Dict[Tuple, float], bool]:
+    """
+    Round an LP solution to integer pan counts and restore demand and supply feasibility.
+
+    The steps are:
+    - round every value down and drop values below their minimum batch size, which
+      keeps all supply rows satisfied
+    - when maximizing output under production rate limits, cut the production
+      back to the demand, so that its supply is free for the repair
+    - for each week in order, meet the missing demand of each waffle type, and
+      the least production that production rate limits allow after the previous
+      week, by first raising its pan counts already in use and then starting new
+      batches, on the cheapest allowed pans with unused supply (under cumulative
+      supply, a pan count in week t uses the smallest unused supply of the weeks
+      from t on)
+    - when maximizing output without equality demand, spend the remaining supply
+      on the waffle types with the most waffles per pan, from the last week back,
+      without exceeding what production rate limits allow before the next week
+    - check the production rate limits, which equality demand may not let the
+      repair restore
+
+    Args:
+        data: Dictionary containing optimization data
+        constraints: Dictionary mapping constraint names to constraint instances
+        lp_values: LP solution values by (waffle, pan, week)
+        maximize: If True, the model maximizes output, otherwise it minimizes cost
+
+    Returns:
+        Tuple[Dict[Tuple, float], bool]: Integer pan counts by (waffle, pan, week), and
+                                         whether they satisfy all constraints
+
+    Raises:
+        ValueError: If a constraint is not one of the built-in types
+    """
+    check_repairable(constraints)
+    constraints = list(constraints.values())
+    waffle_types = list(data['waffle_types'])
+    weeks = sorted(data['weeks'])
+    week_position = {t: i for i, t in enumerate(weeks)}
+    supply = data['supply']
+    demand = data['demand']
+    cost = data['cost']
+    wpp = data['wpp']
+    allowed = data['allowed']
+
+    demand_constraints = [c for c in constraints if isinstance(c, DemandConstraint)]
+    equality = any(c.equality for c in demand_constraints)
+    supply_constraints = [c for c in constraints if isinstance(c, SupplyConstraint)]
+    cumulative = bool(supply_constraints) and all(c.cumulative for c in supply_constraints)
+    batch_constraints = [c for c in constraints if isinstance(c, MinimumBatchConstraint)]
+    rate_constraints = [c for c in constraints if isinstance(c, ProductionRateConstraint)]
+
+    pans_of = {w: [] for w in waffle_types}
+    for (w, p), is_allowed in allowed.items():
+        if is_allowed and w in pans_of:
+            pans_of[w].append(p)
+    min_batch = {(w, p): max([c.get_min_batch_size(w, p) for c in batch_constraints], default=1)
+                 for w in waffle_types for p in pans_of[w]}
+
+    values = {}
+    for (w, p, t), value in lp_values.items():
+        rounded = math.floor(value + 1e-6)
+        if rounded > 0 and rounded >= min_batch.get((w, p), 1):
+            values[(w, p, t)] = rounded
+
+    # Unused supply of each pan type: per week, or per prefix of weeks under cumulative supply
+    headroom = {}
+    if supply_constraints:
+        for p in data['pan_types']:
+            headroom[p] = np.array([supply.get((p, t), 0) for t in weeks], dtype=float)
+        for (w, p, t), value in values.items():
+            headroom[p][week_position[t]] -= value
+        if cumulative:
+            for p in headroom:
+                np.cumsum(headroom[p], out=headroom[p])
+
+    def available(p, i) -> float:
+        if not supply_constraints:
+            return math.inf
+        unused = headroom[p][i:].min() if cumulative else headroom[p][i]
+        return math.floor(unused + 1e-6)
+
+    def add(w, p, i, amount) -> None:
+        key = (w, p, weeks[i])
+        values[key] = values.get(key, 0) + amount
+        if supply_constraints:
+            if cumulative:
+                headroom[p][i:] -= amount
+            else:
+                headroom[p][i] -= amount
+
+    def produced(w, i) -> float:
+        return sum(values.get((w, p, weeks[i]), 0) for p in pans_of[w])
+
+    def remove(w, p, i, amount) -> None:
+        add(w, p, i, -amount)
+        if values[(w, p, weeks[i])] <= 0:
+            del values[(w, p, weeks[i])]
+
+    fill = maximize and bool(supply_constraints) and not equality
+    if fill and rate_constraints:
+        # Production above demand would use the supply that rate limits need after a
+        # demand peak; keep only the demand here and spend the rest in the fill below
+        for i, t in enumerate(weeks):
+            for w in waffle_types:
+                excess = produced(w, i) - (demand.get((w, t), 0) if demand_constraints else 0)
+                for p in sorted(pans_of[w], key=lambda p: cost.get((w, p), 0), reverse=True):
+                    current = values.get((w, p, t), 0)
+                    if excess <= 0 or current == 0:
+                        continue
+                    amount = current if current <= excess else min(excess, current - min_batch[(w, p)])
+                    if amount > 0:
+                        remove(w, p, i, amount)
+                        excess -= amount
+
+    repaired = True
+    if demand_constraints or rate_constraints:
+        for i, t in enumerate(weeks):
+            for w in waffle_types:
+                has_demand = bool(demand_constraints) and (w, t) in demand
+                target = demand[(w, t)] if has_demand else 0
+                exact = has_demand and equality
+                if not exact:
+                    # Production may decrease by at most max_rate_change from the previous week
+                    for constraint in rate_constraints:
+                        previous = produced(w, i - 1) if i > 0 else constraint.initial_production.get(w, 0)
+                        if previous > 0:
+                            target = max(target, math.ceil(previous * (1 - constraint.max_rate_change) - 1e-6))
+                shortfall = target - produced(w, i)
+                if shortfall <= 0:
+                    continue
+                pans = sorted(pans_of[w], key=lambda p: cost.get((w, p), 0))
+                # Raise batches already in use, then start new ones
+                for p in pans:
+                    if shortfall > 0 and values.get((w, p, t), 0) > 0:
+                        amount = min(shortfall, available(p, i))
+                        if amount > 0:
+                            add(w, p, i, amount)
+                            shortfall -= amount
+                for p in pans:
+                    if shortfall > 0 and values.get((w, p, t), 0) == 0:
+                        batch = min_batch[(w, p)]
+                        amount = min(shortfall if exact else max(shortfall, batch), available(p, i))
+                        if amount >= batch:
+                            add(w, p, i, amount)
+                            shortfall -= amount
+                if shortfall > 0:
+                    repaired = False
+
+    if fill:
+        # Spend the remaining supply on the waffle types with the most waffles per pan, last
+        # week first, so that a week never gets more than the next week's production allows
+        max_rate_change = min([c.max_rate_change for c in rate_constraints], default=1)
+        for i in range(len(weeks) - 1, -1, -1):
+            for w in sorted(waffle_types, key=lambda w: wpp.get(w, 0), reverse=True):
+                if wpp.get(w, 0) <= 0:
+                    break
+                limit = math.inf
+                if i < len(weeks) - 1 and max_rate_change < 1:
+                    limit = math.floor(produced(w, i + 1) / (1 - max_rate_change) + 1e-6) - produced(w, i)
+                for p in pans_of[w]:
+                    amount = min(available(p, i), limit)
+                    if amount > 0 and (values.get((w, p, weeks[i]), 0) > 0 or amount >= min_batch[(w, p)]):
+                        add(w, p, i, amount)
+                        limit -= amount
+    violations = _rate_violations(rate_constraints, values, waffle_types, weeks)
+    if violations:
+        repaired = False
+    logger.debug(f"Rounded {len(lp_values)} LP values to {len(values)} pan counts, repaired={repaired}")
+    return values, repaired
@@ -0,0 +1,362 @@
+"""
+Scenario Runner Module for Waffle Production Optimization.
+
+Benchmarks and sweeps solve one dataset under many scenarios: combinations of
+solver, objective, constraint configuration, time limit and optimality gap.
+ScenarioRunner places the dataset in shared memory once, runs the scenarios on
+a process pool within a budget of cores, and yields a result row as each
+scenario finishes. Rows can be appended to a CSV store as they arrive or
+collected in a pandas DataFrame.
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+import csv
+import multiprocessing
+import os
+import time
+import logging
+
+import pandas as pd
+
+from src.data.shared_data import SharedOptimizationData, attach_shared_data
+from src.solvers.rounding import production_objective
+from src.solvers.solver_manager import SolverManager
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Objectives a scenario can solve
+OBJECTIVES = ['minimize_cost', 'maximize_output']
+
+# Columns of a result row, in store order
+RESULT_COLUMNS = ['name', 'solver', 'objective', 'constraints', 'time_limit', 'gap', 'cores', 'warm_start',
+                  'status', 'objective_value', 'total_waffles', 'total_cost', 'build_time', 'solve_time',
+                  'total_time', 'error']
+
+# Optimization data of a worker process, attached once by the pool initializer
+_worker_data = None
+_worker_shm = None
+
+
+def constraint_label(constraints: Mapping[str, Optional[Dict]]) -> str:
+    """
+    Get a readable label of a constraint configuration.
+
+    Args:
+        constraints: Constraint configuration of a scenario
+
+    Returns:
+        str: Enabled constraint types with their parameters, e.g. "demand(equality=True), supply()"
+    """
+    parts = []
+    for constraint_type, config in constraints.items():
+        if config is None or not config.get('enabled', True):
+            continue
+        parameters = ', '.join(f"{key}={value}" for key, value in config.items() if key != 'enabled')
+        parts.append(f"{constraint_type}({parameters})")
+    return ', '.join(parts) if parts else "none"
+
+
+class Scenario:
+    """
+    One solve of a scenario sweep.
+
+    Attributes:
+        solver: Name of the solver in SolverFactory
+        objective: 'minimize_cost' or 'maximize_output'
+        constraints: Configuration by constraint type, in the format of SolverManager;
+                     None or {'enabled': False} disables a type, and types that are
+                     missing are disabled
+        time_limit: Time limit in seconds
+        gap: Optimality gap
+        cores: Number of cores the solver uses, counted against the runner's core budget
+        solver_options: Additional arguments for the solver
+        name: Name of the scenario in the results
+    """
+
+    def __init__(self, solver: str, objective: str = 'minimize_cost',
+                 constraints: Optional[Mapping[str, Optional[Dict]]] = None, time_limit: int = 60,
+                 gap: float = 0.005, cores: int = 1, solver_options: Optional[Dict] = None,
+                 name: Optional[str] = None):
+        """
+        Initialize the scenario.
+
+        Args:
+            solver: Name of the solver in SolverFactory
+            objective: 'minimize_cost' or 'maximize_output'
+            constraints: Configuration by constraint type (default: demand, supply and
+                         allowed combinations with their default configurations)
+            time_limit: Time limit in seconds
+            gap: Optimality gap
+            cores: Number of cores the solver uses, e.g. the worker count of CP-SAT or
+                   the number of backends of a race
+            solver_options: Additional arguments for the solver
+            name: Name of the scenario in the results (default: solver, objective and constraints)
+
+        Raises:
+            ValueError: If the objective or the number of cores is invalid
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unsupported objective: {objective}")
+        if cores < 1:
+            raise ValueError(f"A scenario needs at least one core, got {cores}")
+        self.solver = solver
+        self.objective = objective
+        self.constraints = dict(constraints) if constraints is not None else {
+            'demand': {}, 'supply': {}, 'allowed_combinations': {}}
+        self.time_limit = time_limit
+        self.gap = gap
+        self.cores = cores
+        self.solver_options = dict(solver_options or {})
+        self.name = name or f"{solver} / {objective} / {constraint_label(self.constraints)}"
+
+    def __repr__(self) -> str:
+        return f"Scenario({self.name!r})"
+
+    def create_solver(self) -> Any:
+        """
+        Create the solver of the scenario with its constraints.
+
+        Returns:
+            SolverInterface: Solver instance
+
+        Raises:
+            ValueError: If a constraint type or configuration is invalid
+        """
+        solver_manager = SolverManager()
+        for constraint_type in solver_manager.get_available_constraints():
+            solver_manager.set_constraint_enabled(constraint_type, False)
+        for constraint_type, config in self.constraints.items():
+            enabled = config is not None and config.get('enabled', True)
+            solver_manager.set_constraint_enabled(constraint_type, enabled)
+            if enabled:
+                solver_manager.set_constraint_configuration(
+                    constraint_type, {key: value for key, value in config.items() if key != 'enabled'})
+        return solver_manager.create_solver(self.solver, with_constraints=True, time_limit=self.time_limit,
+                                            optimality_gap=self.gap, **self.solver_options)
+
+    def run(self, data: Mapping, warm_start: Optional[Mapping] = None) -> Dict[str, Any]:
+        """
+        Build and solve the scenario's model.
+
+        Errors are caught and reported in the row, so that one failing scenario
+        does not stop a sweep.
+
+        Args:
+            data: Optimization data
+            warm_start: Optional prior solution values by (waffle, pan, week) to start from
+
+        Returns:
+            Dict[str, Any]: Result row with the columns in RESULT_COLUMNS
+        """
+        return self.solve(data, warm_start)[0]
+
+    def solve(self, data: Mapping, warm_start: Optional[Mapping] = None) -> Tuple[Dict[str, Any], Dict]:
+        """
+        Build and solve the scenario's model, and keep its solution.
+
+        Args:
+            data: Optimization data
+            warm_start: Optional prior solution values by (waffle, pan, week) to start from
+
+        Returns:
+            Tuple[Dict[str, Any], Dict]: Result row, and the solution values by
+                                         (waffle, pan, week) (empty without a solution)
+        """
+        row = {
+            'name': self.name,
+            'solver': self.solver,
+            'objective': self.objective,
+            'constraints': constraint_label(self.constraints),
+            'time_limit': self.time_limit,
+            'gap': self.gap,
+            'cores': self.cores,
+            'warm_start': warm_start is not None,
+            'status': 'ERROR',
+            'objective_value': None,
+            'total_waffles': None,
+            'total_cost': None,
+            'build_time': None,
+            'solve_time': None,
+            'total_time': None,
+            'error': None,
+        }
+        values = {}
+        start_time = time.perf_counter()
+        try:
+            solver = self.create_solver()
+            solver.set_warm_start(warm_start)
+            if self.objective == 'minimize_cost':
+                solver.build_minimize_cost_model(data)
+            else:
+                solver.build_maximize_output_model(data)
+            build_end = time.perf_counter()
+            result = solver.solve_model()
+            solve_end = time.perf_counter()
+            solution = solver.get_solution() or {}
+            values = solution.get('values') or {}
+            row.update(status=result.get('status', 'UNKNOWN'), objective_value=result.get('objective_value'),
+                       build_time=build_end - start_time, solve_time=solve_end - build_end)
+            if values:
+                row.update(total_waffles=production_objective(data, values, maximize=True),
+                           total_cost=production_objective(data, values, maximize=False))
+        except Exception as e:
+            logger.error(f"Scenario '{self.name}' failed: {str(e)}")
+            row['error'] = f"{type(e).__name__}: {e}"
+        row['total_time'] = time.perf_counter() - start_time
+        return row, values
+
+
+def _attach_worker(descriptor: Dict[str, Any]) -> None:
+    """Attach a pool worker to the shared optimization data."""
+    global _worker_data, _worker_shm
+    _worker_data, _worker_shm = attach_shared_data(descriptor)
+
+
+def _run_in_worker(scenario: Scenario, warm_start: Optional[Dict]) -> Tuple[Dict[str, Any], Dict]:
+    """Solve a scenario on the optimization data of the pool worker."""
+    return scenario.solve(_worker_data, warm_start)
+
+
+class ScenarioRunner:
+    """
+    Runner that solves one dataset under many scenarios on a process pool.
+    """
+
+    def __init__(self, data: Mapping, core_budget: Optional[int] = None, parallel: bool = True,
+                 start_method: Optional[str] = None, warm_start: bool = False):
+        """
+        Initialize the runner.
+
+        Args:
+            data: Optimization data shared by all scenarios
+            core_budget: Number of cores the running scenarios may use together (default:
+                         number of cores); a scenario needing more runs alone
+            parallel: If False, run the scenarios one after the other in this process
+            start_method: multiprocessing start method of the pool, e.g. 'spawn' where
+                          forking the parent process is unsafe (default: the platform default)
+            warm_start: If True, each scenario starts from the solution of the last
+                        scenario of the same objective that finished before it started
+
+        Raises:
+            ValueError: If the core budget is invalid
+        """
+        if core_budget is not None and core_budget < 1:
+            raise ValueError(f"The core budget must be at least 1, got {core_budget}")
+        self.data = data
+        self.core_budget = core_budget or os.cpu_count() or 1
+        self.parallel = parallel
+        self.start_method = start_method
+        self.warm_start = warm_start
+        # Last solution of each objective, the starting point of the next scenario
+        self._last_values = {}
+
+    def run(self, scenarios: Iterable[Scenario], store: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Run scenarios and yield their result rows as they finish.
+
+        Scenarios start in the given order while the cores of the running ones and
+        the next one fit in the core budget. Closing the iterator early cancels the
+        scenarios that have not started and waits for the running ones.
+
+        Args:
+            scenarios: Scenarios to run
+            store: Optional CSV file that each row is appended to as it arrives; the
+                   header is written if the file is new or empty
+
+        Yields:
+            Dict[str, Any]: Result row of each scenario, with the columns in RESULT_COLUMNS
+        """
+        pending = deque(scenarios)
+        self._last_values = {}
+        logger.info(f"Running {len(pending)} scenarios with a budget of {self.core_budget} cores")
+        rows = self._run_serial(pending) if not self.parallel else self._run_parallel(pending)
+        if store is None:
+            yield from rows
+            return
+
+        new_file = not os.path.exists(store) or os.path.getsize(store) == 0
+        with open(store, 'a', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=RESULT_COLUMNS)
+            if new_file:
+                writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                file.flush()
+                yield row
+
+    def run_all(self, scenarios: Iterable[Scenario], store: Optional[str] = None) -> pd.DataFrame:
+        """
+        Run scenarios and collect their results.
+
+        Args:
+            scenarios: Scenarios to run
+            store: Optional CSV file that each row is appended to as it arrives
+
+        Returns:
+            pd.DataFrame: One row per scenario in order of completion, with the columns
+                          in RESULT_COLUMNS
+        """
+        return pd.DataFrame(list(self.run(scenarios, store)), columns=RESULT_COLUMNS)
+
+    def _scenario_warm_start(self, scenario: Scenario) -> Optional[Dict]:
+        """Get the starting point of a scenario, if warm starts are enabled."""
+        return self._last_values.get(scenario.objective) if self.warm_start else None
+
+    def _finish(self, scenario: Scenario, row: Dict[str, Any], values: Dict) -> Dict[str, Any]:
+        """Keep the solution of a finished scenario as the next starting point."""
+        if values:
+            self._last_values[scenario.objective] = values
+        return row
+
+    def _run_serial(self, pending: deque) -> Iterator[Dict[str, Any]]:
+        """Run the scenarios one after the other in this process."""
+        while pending:
+            scenario = pending.popleft()
+            row, values = scenario.solve(self.data, self._scenario_warm_start(scenario))
+            yield self._finish(scenario, row, values)
+
+    def _run_parallel(self, pending: deque) -> Iterator[Dict[str, Any]]:
+        """Run the scenarios on a process pool within the core budget."""
+        if not pending:
+            return
+        max_workers = min(self.core_budget, len(pending))
+        context = multiprocessing.get_context(self.start_method)
+        with SharedOptimizationData(self.data) as shared:
+            executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                                           initializer=_attach_worker, initargs=(shared.descriptor,))
+            running = {}
+            used_cores = 0
+            try:
+                while pending or running:
+                    # Start scenarios in order while they fit in the core budget; one runs in any case
+                    while pending and (not running or used_cores + pending[0].cores <= self.core_budget):
+                        scenario = pending.popleft()
+                        future = executor.submit(_run_in_worker, scenario, self._scenario_warm_start(scenario))
+                        running[future] = scenario
+                        used_cores += scenario.cores
+                        logger.debug(f"Started scenario '{scenario.name}' ({used_cores} cores in use)")
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        scenario = running.pop(future)
+                        used_cores -= scenario.cores
+                        try:
+                            row = self._finish(scenario, *future.result())
+                        except Exception as e:
+                            # The worker process died, e.g. in native solver code
+                            logger.error(f"Scenario '{scenario.name}' failed: {str(e)}")
+                            row = self._failed_row(scenario, e)
+                        logger.info(f"Scenario '{scenario.name}' finished with status {row['status']}")
+                        yield row
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _failed_row(scenario: Scenario, error: Exception) -> Dict[str, Any]:
+        """Get the result row of a scenario whose worker failed."""
+        row = {column: None for column in RESULT_COLUMNS}
+        row.update(name=scenario.name, solver=scenario.solver, objective=scenario.objective,
+                   constraints=constraint_label(scenario.constraints), time_limit=scenario.time_limit,
+                   gap=scenario.gap, cores=scenario.cores, status='ERROR', error=f"{type(error).__name__}: {error}")
+        return row
@@ -40,7 +40,7 @@ class SolverManager:
         # Default constraint configurations
         self._default_configs = {
             'demand': {'equality': True},
-            'supply': {'cumulative': True},
+            'supply': {'cumulative': True, 'formulation': 'prefix_sum'},
             'allowed_combinations': {},
             'production_rate': {'max_rate_change': 0.2},
             'minimum_batch': {'min_batch_size': 10},
@@ -192,7 +192,7 @@ class SolverManager:
         Create a solver with the currently enabled constraints.
         
         Args:
-            solver_name: Name of the solver
+            solver_name: Name of the solver, or 'auto' to pick one with select_solver
             with_constraints: Whether to add constraints to the solver
             **kwargs: Additional arguments for the solver
             
@@ -202,6 +202,8 @@ class SolverManager:
         Raises:
             ValueError: If a constraint configuration is invalid
         """
+        if solver_name.lower() == 'auto':
+            solver_name = self.select_solver() if with_constraints else 'ortools'
         logger.debug(f"Creating solver '{solver_name}' with constraints: {with_constraints}")
         
         # Create the solver
@@ -236,6 +238,26 @@ class SolverManager:
         
         return solver
     
+    def select_solver(self) -> str:
+        """
+        Pick the solver for the currently enabled constraints.
+        
+        The network flow solver is exact and much faster than a MIP solver when
+        only demand, supply and allowed combinations constraints are enabled.
+        
+        Returns:
+            str: 'flow' if the enabled constraints are flow-representable, otherwise 'ortools'
+        """
+        from src.solvers.flow_solver import is_flow_representable
+        
+        constraints = {
+            constraint_type: self.create_constraint(constraint_type, **self.get_constraint_configuration(constraint_type))
+            for constraint_type, enabled in self._enabled_constraints.items() if enabled
+        }
+        solver_name = 'flow' if is_flow_representable(constraints) else 'ortools'
+        logger.info(f"Selected solver '{solver_name}' for constraints: {', '.join(constraints)}")
+        return solver_name
+    
     def get_all_enabled_constraints(self) -> Dict[str, Dict]:
         """
         Get all enabled constraints with their configurations.
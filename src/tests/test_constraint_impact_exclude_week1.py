@@ -66,15 +66,8 @@ class TestConstraintImpactExcludeWeek1(unittest.TestCase):
         weeks = sorted(cls.optimization_data['weeks'])
         if 1 in weeks:
             weeks.remove(1)
-            cls.optimization_data['weeks'] = weeks
-            
-            # Remove week 1 from demand
-            demand = cls.optimization_data['demand']
-            cls.optimization_data['demand'] = {k: v for k, v in demand.items() if k[1] != 1}
-            
-            # Remove week 1 from supply
-            supply = cls.optimization_data['supply']
-            cls.optimization_data['supply'] = {k: v for k, v in supply.items() if k[1] != 1}
+            # Demand and supply entries of week 1 are dropped with the week
+            cls.optimization_data = cls.optimization_data.replace(weeks=weeks)
         
         # Log final weeks
         logger.info(f"Final weeks in data: {sorted(cls.optimization_data['weeks'])}")
@@ -1,11 +1,10 @@
 import os
-import time
 import pandas as pd
 import numpy as np
 import logging
 from tabulate import tabulate
 from src.data.processor import DataProcessor
-from src.solvers.solver_manager import SolverManager
+from src.solvers.scenario_runner import Scenario, ScenarioRunner
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -36,8 +35,8 @@ def load_default_data(shortage_penalty=10000):
         combinations_file=combinations_file
     )
     
-    # Get optimization data
-    data = data_processor.get_optimization_data()
+    # Get optimization data as a plain dictionary, so that the shortage penalty can be added
+    data = data_processor.get_optimization_data().to_dict()
     
     # Add shortage penalty
     data['shortage_penalty'] = shortage_penalty
@@ -86,58 +85,27 @@ def load_default_data(shortage_penalty=10000):
     
     return data
 
-def analyze_solution(solver_name, config_name, objective_type, solution, optimization_data):
+def analyze_solution(result, optimization_data):
     """
-    Analyze the optimization solution in detail.
+    Analyze the result of an optimization run in detail.
     
     Args:
-        solver_name: Name of the solver
-        config_name: Configuration name for display
-        objective_type: Type of objective function ('minimize_cost' or 'maximize_output')
-        solution: Solution dictionary
+        result: Result dictionary of a run
         optimization_data: Original optimization data
     """
-    # Basic solution info
-    print(f"\nDetailed Analysis for {solver_name} ({config_name}, {objective_type}):")
+    obj_desc = "minimize cost" if result['objective'] == 'minimize_cost' else "maximize output"
+    print(f"\nDetailed Analysis for {result['solver']} ({result['config']}, {obj_desc}):")
     
-    # Check if solution exists
-    if not solution:
-        print("  No solution data available.")
+    if not result['is_feasible']:
+        print(f"  No solution available. Status: {result['status']}")
         return
     
     # Analyze objective value
-    objective = solution.get('objective_value', 0)
+    objective = result['total_cost']
     print(f"  Objective Value: {objective:,.2f}")
     
-    # Production values could be in either 'production' or 'values' field
-    # The 'values' field is the primary location for ortools and pulp solvers
-    production = solution.get('production', {})
-    if not production and 'values' in solution:
-        production = solution.get('values', {})
-    
-    if not production:
-        print("  No production data available in solution.")
-        
-        # Additional diagnostics
-        print("  Solution keys:", ", ".join(solution.keys()))
-        for key in solution:
-            if isinstance(solution[key], dict) and len(solution[key]) < 10:
-                print(f"  Contents of {key}: {solution[key]}")
-        return
-    
-    # Analyze production
-    total_production = sum(production.values())
-    print(f"  Total Production: {total_production:,}")
-    
-    # Count non-zero production entries
-    non_zero_production = sum(1 for v in production.values() if v > 0)
-    print(f"  Non-zero Production Entries: {non_zero_production}")
-    
     # Calculate total waffles produced
-    total_waffles = 0
-    for (waffle, pan, week), amount in production.items():
-        wpp = optimization_data['wpp'].get(waffle, 0)
-        total_waffles += amount * wpp
+    total_waffles = result['waffles_total']
     print(f"  Total Waffles Produced: {total_waffles:,}")
     
     # Calculate demand satisfaction
@@ -147,133 +115,50 @@ def analyze_solution(solver_name, config_name, objective_type, solution, optimiz
     
     # Calculate average cost per waffle
     if total_waffles > 0:
-        avg_cost = objective / total_waffles if objective_type == 'minimize_cost' else objective
+        avg_cost = objective / total_waffles if result['objective'] == 'minimize_cost' else objective
         print(f"  Average Cost Per Waffle: {avg_cost:.4f}")
-    
-    # Show some sample production if any
-    if non_zero_production > 0:
-        print("  Sample Production (waffle, pan, week) = amount:")
-        count = 0
-        for key, value in production.items():
-            if value > 0 and count < 5:
-                print(f"    * {key} = {value}")
-                count += 1
 
-def test_solver_with_config(solver_name, config_name, constraint_config, optimization_data, objective_type='minimize_cost', limit_to_demand=False, time_limit=60, gap=0.01):
+def run_configurations(solver_name, configs, optimization_data, time_limit=60, gap=0.01):
     """
-    Test a solver with a specific constraint configuration and objective function.
+    Solve every configuration with both objective functions on a process pool.
     
     Args:
         solver_name: Name of the solver to test
-        config_name: Display name of the configuration
-        constraint_config: Dictionary of constraint configurations
+        configs: Constraint configurations with their display names
         optimization_data: Dictionary containing optimization data
-        objective_type: Type of objective function ('minimize_cost' or 'maximize_output')
-        limit_to_demand: Whether to limit production to demand (for maximize_output only)
         time_limit: Time limit in seconds
         gap: Optimality gap
         
     Returns:
-        dict: Results of the optimization
+        list: Results of the optimizations, in order of completion
     """
-    obj_desc = "minimize cost" if objective_type == 'minimize_cost' else "maximize output"
-    logger.info(f"Testing solver '{solver_name}' with configuration '{config_name}' and objective: {obj_desc}")
-    
-    # Create solver manager
-    solver_manager = SolverManager()
-    
-    # Enable and configure constraints
-    for constraint_type, config in constraint_config.items():
-        if config is None:
-            # If config is None, disable the constraint
-            solver_manager.set_constraint_enabled(constraint_type, False)
-        else:
-            # Enable and configure the constraint
-            solver_manager.set_constraint_enabled(constraint_type, True)
-            solver_manager.set_constraint_configuration(constraint_type, config)
-    
-    # Print the enabled constraints
-    constraints = solver_manager._enabled_constraints
-    print(f"\nEnabled Constraints for {solver_name} ({config_name}, {obj_desc}):")
-    for constraint_type, enabled in constraints.items():
-        if enabled:
-            config = solver_manager.get_constraint_configuration(constraint_type)
-            print(f"  - {constraint_type}: {config}")
-    
-    # Create solver with constraints
-    solver = solver_manager.create_solver(
-        solver_name=solver_name,
-        with_constraints=True,
-        time_limit=time_limit,
-        optimality_gap=gap
-    )
-    
-    # Build and solve the model
-    start_time = time.time()
-    if objective_type == 'minimize_cost':
-        solver.build_minimize_cost_model(optimization_data)
-    else:  # maximize_output
-        solver.build_maximize_output_model(optimization_data, limit_to_demand=limit_to_demand)
-    
-    solution_info = solver.solve_model()
-    end_time = time.time()
-    
-    # Get the solution and extract metrics
-    solution = solver.get_solution() or {}
-    
-    # Check solution status
-    is_feasible = False
-    status = "Unknown"
-    total_cost = float('inf')
-    production_total = 0
-    waffles_total = 0
-    
-    if solution_info is not None:
-        # Different solvers might use different keys for feasibility
-        is_feasible = solution_info.get('is_feasible', False)
-        if not is_feasible and solution_info.get('status', '').lower() in ['optimal', 'feasible']:
-            is_feasible = True
-            
-        status = solution_info.get('status', 'Unknown')
-    
-    # If we have a solution with an objective value, it must be feasible
-    if solution and 'objective_value' in solution:
-        is_feasible = True
-        total_cost = solution.get('objective_value')
-        
-        # Calculate total production - check both 'production' and 'values' fields
-        production = solution.get('production', {})
-        if not production and 'values' in solution:
-            production = solution.get('values', {})
-            
-        production_total = sum(production.values())
-        
-        # Calculate total waffles produced
-        for (waffle, pan, week), amount in production.items():
-            wpp = optimization_data['wpp'].get(waffle, 0)
-            waffles_total += amount * wpp
-        
-        # Analyze the solution
-        analyze_solution(solver_name, config_name, objective_type, solution, optimization_data)
-    elif solution_info and solution_info.get('status', '').lower() != 'infeasible':
-        # If the solution exists but has no objective_value, try to analyze it anyway
-        print(f"\nSolution info without objective value for {solver_name} ({config_name}, {obj_desc}):")
-        print(f"  Status: {status}")
-        print(f"  Solution keys: {list(solution.keys())}")
-        print(f"  Solution info keys: {list(solution_info.keys())}")
-    
-    # Return results
-    return {
-        'solver': solver_name,
-        'config': config_name,
-        'objective': objective_type,
-        'is_feasible': is_feasible,
-        'status': status,
-        'total_cost': total_cost,
-        'solve_time': end_time - start_time,
-        'production_total': production_total,
-        'waffles_total': waffles_total
-    }
+    scenarios = []
+    short_names = {}
+    for config in configs:
+        short_names[config['desc']] = config['name']
+        for objective_type in ['minimize_cost', 'maximize_output']:
+            scenarios.append(Scenario(solver_name, objective_type, config['constraints'],
+                                      time_limit=time_limit, gap=gap, name=config['desc']))
+    
+    results = []
+    for row in ScenarioRunner(optimization_data).run(scenarios):
+        is_feasible = row['status'] in ('OPTIMAL', 'FEASIBLE') and row['objective_value'] is not None
+        if row['error'] is not None:
+            logger.error(f"Error testing '{row['name']}' with {row['objective']}: {row['error']}")
+        result = {
+            'solver': solver_name,
+            'config': row['name'],
+            'objective': row['objective'],
+            'short_name': short_names[row['name']],  # Add short name for plotting
+            'is_feasible': is_feasible,
+            'status': f"Error: {row['error']}" if row['error'] is not None else row['status'],
+            'total_cost': row['objective_value'] if is_feasible else float('inf'),
+            'solve_time': row['total_time'],
+            'waffles_total': int(round(row['total_waffles'] or 0))
+        }
+        analyze_solution(result, optimization_data)
+        results.append(result)
+    return results
 
 def main():
     """Main function to test solvers with different constraint configurations, penalty levels and objective functions."""
@@ -335,70 +220,10 @@ def main():
             }
         ]
         
-        # Results for current penalty level
-        results = []
-        
         # Test each configuration with both objective functions
-        for config in configs:
-            # Test with minimize cost objective
-            try:
-                result = test_solver_with_config(
-                    solver_name=solver_name,
-                    config_name=config['desc'],
-                    constraint_config=config['constraints'],
-                    optimization_data=optimization_data,
-                    objective_type='minimize_cost'
-                )
-                result['short_name'] = config['name']  # Add short name for plotting
-                results.append(result)
-                all_results.append(result)
-            except Exception as e:
-                logger.error(f"Error testing '{config['desc']}' with minimize_cost: {str(e)}")
-                result = {
-                    'solver': solver_name,
-                    'config': config['desc'],
-                    'objective': 'minimize_cost',
-                    'short_name': config['name'],
-                    'is_feasible': False,
-                    'status': f"Error: {str(e)}",
-                    'total_cost': float('inf'),
-                    'solve_time': 0,
-                    'production_total': 0,
-                    'waffles_total': 0
-                }
-                results.append(result)
-                all_results.append(result)
-                
-            # Test with maximize output objective (only one configuration needed)
-            try:
-                result = test_solver_with_config(
-                    solver_name=solver_name,
-                    config_name=config['desc'],
-                    constraint_config=config['constraints'],
-                    optimization_data=optimization_data,
-                    objective_type='maximize_output',
-                    limit_to_demand=False
-                )
-                result['short_name'] = config['name']  # Add short name for plotting
-                results.append(result)
-                all_results.append(result)
-            except Exception as e:
-                logger.error(f"Error testing '{config['desc']}' with maximize_output: {str(e)}")
-                result = {
-                    'solver': solver_name,
-                    'config': config['desc'],
-                    'objective': 'maximize_output',
-                    'short_name': config['name'],
-                    'is_feasible': False,
-                    'status': f"Error: {str(e)}",
-                    'total_cost': float('inf'),
-                    'solve_time': 0,
-                    'production_total': 0,
-                    'waffles_total': 0
-                }
-                results.append(result)
-                all_results.append(result)
+        all_results.extend(run_configurations(solver_name, configs, optimization_data))
     
+
     # Format and display all results
     table_data = []
     headers = ["Configuration", "Objective", "Feasible", "Status", "Cost/Objective", "Waffles", "Time (s)"]
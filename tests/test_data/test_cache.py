@@ -0,0 +1,122 @@
+"""
+Tests for the ParseCache class and cached loading in DataProcessor.
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.data.cache import ParseCache, ARRAY_FIELDS
+from src.data.optimization_data import OptimizationData
+from src.data.processor import DataProcessor
+
+DATA_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../data/input'))
+INPUT_FILES = {
+    'demand_file': 'WaffleDemand.xlsx',
+    'supply_file': 'PanSupply.xlsx',
+    'cost_file': 'WaffleCostPerPan.xlsx',
+    'wpp_file': 'WafflesPerPan.xlsx',
+    'combinations_file': 'WafflePanCombinations.xlsx',
+}
+
+
+class TestParseCache(unittest.TestCase):
+    """
+    Test cases for the ParseCache class.
+    """
+    
+    def setUp(self):
+        """Copy the input files into a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+        self.files = {}
+        for role, name in INPUT_FILES.items():
+            path = os.path.join(self.temp_dir, name)
+            shutil.copy(os.path.join(DATA_FOLDER, name), path)
+            self.files[role] = path
+    
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_warm_load_matches_cold_load(self):
+        """Test that a cache hit returns exactly what a cold parse returns."""
+        cold = DataProcessor(cache_dir=self.cache_dir)
+        cold.load_data(**self.files)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        
+        warm = DataProcessor(cache_dir=self.cache_dir)
+        warm.load_data(**self.files)
+        self.assertIsNone(warm.waffle_demand)
+        self.assertTrue(warm.check_data_loaded())
+        
+        cold_data = cold.get_optimization_data()
+        warm_data = warm.get_optimization_data()
+        self.assertEqual(warm_data.waffle_types, cold_data.waffle_types)
+        self.assertEqual(warm_data.pan_types, cold_data.pan_types)
+        self.assertEqual(warm_data.weeks, cold_data.weeks)
+        for field in ARRAY_FIELDS:
+            np.testing.assert_array_equal(getattr(warm_data, field), getattr(cold_data, field), field)
+        self.assertEqual(warm.demand_dict, cold.demand_dict)
+    
+    def test_changed_file_misses(self):
+        """Test that modifying an input file changes the cache key."""
+        cache = ParseCache(self.cache_dir)
+        key = cache.fingerprint(self.files)
+        with open(self.files['wpp_file'], 'ab') as f:
+            f.write(b'\0')
+        self.assertNotEqual(cache.fingerprint(self.files), key)
+    
+    def test_invalidate(self):
+        """Test explicit invalidation by input file."""
+        processor = DataProcessor(cache_dir=self.cache_dir)
+        processor.load_data(**self.files)
+        self.assertEqual(processor.invalidate_cache(os.path.join(self.temp_dir, 'unrelated.xlsx')), 0)
+        self.assertEqual(processor.invalidate_cache(self.files['cost_file']), 1)
+        self.assertIsNone(processor.cache.get(self.files))
+
+    def test_invalidate_input_tables(self):
+        """Test that invalidation also removes the cached table of the input file."""
+        processor = DataProcessor(cache_dir=self.cache_dir, keep_raw_frames=True)
+        processor.load_data(**self.files)
+        self.assertIsNotNone(processor.cache.get_frame('cost_file', self.files['cost_file'],
+                                                       processor._frame_options(None)))
+        # The processed data entry and the cost table
+        self.assertEqual(processor.invalidate_cache(self.files['cost_file']), 2)
+        self.assertIsNone(processor.cache.get_frame('cost_file', self.files['cost_file'],
+                                                    processor._frame_options(None)))
+        self.assertIsNotNone(processor.cache.get_frame('demand_file', self.files['demand_file'],
+                                                       processor._frame_options(None)))
+
+    def test_eviction(self):
+        """Test that the cache is kept within its size bound."""
+        processor = DataProcessor(cache_dir=self.cache_dir)
+        processor.load_data(**self.files)
+        cache = ParseCache(self.cache_dir, max_size_bytes=0)
+        cache.put(self.files, processor.get_optimization_data())
+        self.assertEqual(cache.size_bytes(), 0)
+    
+    def test_numpy_labels(self):
+        """Test that data with NumPy scalar labels is cached and restored with equal labels."""
+        processor = DataProcessor()
+        processor.load_data(**self.files)
+        data = processor.get_optimization_data()
+        weeks = [np.int64(week) for week in range(1, len(data.weeks) + 1)]
+        numpy_data = OptimizationData(
+            data.waffle_types, data.pan_types, weeks, data.demand_array, data.supply_array,
+            data.cost_array, data.wpp_array, data.allowed_array, demand_mask=data.demand_mask,
+            supply_mask=data.supply_mask, cost_mask=data.cost_mask, wpp_mask=data.wpp_mask,
+            allowed_mask=data.allowed_mask
+        )
+        cache = ParseCache(self.cache_dir)
+        self.assertTrue(cache.put(self.files, numpy_data))
+        self.assertEqual(cache.get(self.files).weeks, list(range(1, len(data.weeks) + 1)))
+
+if __name__ == '__main__':
+    unittest.main()
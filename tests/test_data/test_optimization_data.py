@@ -0,0 +1,101 @@
+"""
+Tests for the OptimizationData class.
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.data.optimization_data import OptimizationData, as_optimization_data
+
+
+def create_test_data():
+    """Create a simple tuple-keyed test dataset."""
+    return {
+        'waffle_types': ['Chocolate', 'Plain'],
+        'pan_types': ['Premium', 'Standard'],
+        'weeks': [1, 2],
+        'demand': {('Plain', 1): 10, ('Chocolate', 2): 5},
+        'supply': {('Standard', 1): 20, ('Premium', 2): 10},
+        'cost': {('Plain', 'Standard'): 0.5, ('Chocolate', 'Premium'): 0.8},
+        'wpp': {'Plain': 100, 'Chocolate': 80},
+        'allowed': {('Plain', 'Standard'): True, ('Plain', 'Premium'): False,
+                    ('Chocolate', 'Premium'): True},
+    }
+
+
+class TestOptimizationData(unittest.TestCase):
+    """
+    Test cases for the OptimizationData class.
+    """
+    
+    def test_round_trip(self):
+        """Test that converting to arrays and back preserves the dictionaries."""
+        data = create_test_data()
+        arrays = OptimizationData.from_dict(data)
+        self.assertEqual(arrays.to_dict(), data)
+        for key in ['demand', 'supply', 'cost', 'wpp', 'allowed']:
+            self.assertEqual(arrays[key], data[key], key)
+    
+    def test_mapping_views(self):
+        """Test dictionary-style access through the mapping views."""
+        arrays = OptimizationData.from_dict(create_test_data())
+        self.assertEqual(arrays['demand'][('Plain', 1)], 10)
+        self.assertIsInstance(arrays['demand'][('Plain', 1)], int)
+        self.assertEqual(arrays['demand'].get(('Plain', 2), 0), 0)
+        self.assertNotIn(('Plain', 2), arrays['demand'])
+        self.assertNotIn(('Unknown', 1), arrays['demand'])
+        self.assertIs(arrays['allowed'][('Plain', 'Premium')], False)
+        self.assertNotIn(('Chocolate', 'Standard'), arrays['allowed'])
+        self.assertEqual(arrays.get('wpp')['Chocolate'], 80)
+        self.assertEqual(sum(arrays['demand'].values()), 15)
+        with self.assertRaises(TypeError):
+            arrays['demand'][('Plain', 1)] = 3
+    
+    def test_arrays(self):
+        """Test the interned integer layout of the arrays."""
+        arrays = OptimizationData.from_dict(create_test_data())
+        self.assertEqual(arrays.waffle_index, {'Chocolate': 0, 'Plain': 1})
+        np.testing.assert_array_equal(arrays.demand_matrix(), [[0, 5], [10, 0]])
+        np.testing.assert_array_equal(arrays.allowed_matrix(), [[True, False], [False, True]])
+        np.testing.assert_array_equal(arrays.cost_matrix(), [[0.8, 0.0], [0.0, 0.5]])
+    
+    def test_as_optimization_data(self):
+        """Test that array-backed data is passed through unchanged."""
+        arrays = as_optimization_data(create_test_data())
+        self.assertIs(as_optimization_data(arrays), arrays)
+
+    def test_with_changes(self):
+        """Test that changes replace and add entries without modifying the original."""
+        arrays = OptimizationData.from_dict(create_test_data())
+        changed = arrays.with_changes({'demand': {('Plain', 1): 12, ('Plain', 2): 3},
+                                       'cost': {('Plain', 'Standard'): 0.75}})
+        self.assertEqual(changed['demand'], {('Plain', 1): 12, ('Plain', 2): 3, ('Chocolate', 2): 5})
+        self.assertEqual(changed['cost'][('Plain', 'Standard')], 0.75)
+        self.assertEqual(arrays['demand'][('Plain', 1)], 10)
+        self.assertNotIn(('Plain', 2), arrays['demand'])
+        self.assertIs(changed.supply_array, arrays.supply_array)
+        with self.assertRaises(ValueError):
+            arrays.with_changes({'allowed': {('Plain', 'Premium'): True}})
+        with self.assertRaises(ValueError):
+            arrays.with_changes({'wpp': {'Unknown': 10}})
+
+    def test_replace(self):
+        """Test that replacing fields can change dimensions without modifying the original."""
+        arrays = OptimizationData.from_dict(create_test_data())
+        replaced = arrays.replace(weeks=[2])
+        self.assertEqual(replaced['weeks'], [2])
+        self.assertEqual(replaced['demand'], {('Chocolate', 2): 5})
+        self.assertEqual(replaced['supply'], {('Premium', 2): 10})
+        self.assertEqual(replaced['cost'], arrays['cost'])
+        self.assertEqual(arrays['weeks'], [1, 2])
+        self.assertEqual(arrays.replace(demand={('Plain', 2): 7})['demand'], {('Plain', 2): 7})
+        with self.assertRaises(ValueError):
+            arrays.replace(shortage_penalty=10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+"""
+Tests for the DataProcessor class.
+"""
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+import pandas as pd
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.data import processor as processor_module
+from src.data.processor import DataProcessor
+
+DICT_ATTRIBUTES = ['demand_dict', 'supply_dict', 'cost_dict', 'wpp_dict', 'allowed_dict']
+
+
+def create_processor(vectorized: bool) -> DataProcessor:
+    """Create a processor with small in-memory raw data already in long format."""
+    processor = DataProcessor(vectorized=vectorized)
+    processor.waffle_demand = pd.DataFrame({
+        'WaffleType': ['Plain', 'Chocolate', 'Plain'],
+        'Week 1': [10, 0, 3],
+        'Week 2': [15.7, None, -1],
+    })
+    processor.pan_supply = pd.DataFrame({
+        'PanType': ['Standard', 'Premium'],
+        'Week 1': [20, None],
+        'Week 3': [5, 7],
+    })
+    processor.waffle_cost = pd.DataFrame({
+        'WaffleType': ['Plain', 'Plain', 'Chocolate', 'Chocolate'],
+        'PanType': ['Standard', 'Premium', 'Standard', 'Premium'],
+        'Cost': [0.5, None, 0.6, 0.8],
+    })
+    processor.waffles_per_pan = pd.DataFrame({
+        'WaffleType': ['Plain', 'Chocolate'],
+        'WPP': [100.0, None],
+    })
+    processor.allowed_combinations = pd.DataFrame({
+        'WaffleType': ['Plain', 'Plain', 'Chocolate', 'Chocolate', 'Plain'],
+        'PanType': ['Standard', 'Premium', 'Standard', 'Premium', 'Other'],
+        'Allowed': pd.Series([True, 'Yes', 0, 'no', None], dtype=object),
+    })
+    processor._extract_dimensions()
+    processor._validate_data()
+    processor._process_data()
+    return processor
+
+
+def write_excel_inputs(folder: str) -> dict:
+    """Write a small dataset in the wide Excel layout of the input files."""
+    frames = {
+        'demand_file': pd.DataFrame({'Week 1': [10, 5], 'Week 2': [0, 8]}, index=['Plain', 'Chocolate']),
+        'supply_file': pd.DataFrame({'Week 1': [20], 'Week 2': [10]}, index=['Standard']),
+        'cost_file': pd.DataFrame({'Standard': [0.5, 0.6]}, index=['Plain', 'Chocolate']),
+        'wpp_file': pd.DataFrame({'WPP': [100, 80]}, index=['Plain', 'Chocolate']),
+        'combinations_file': pd.DataFrame({'Standard': [1, 1]}, index=['Plain', 'Chocolate']),
+    }
+    files = {}
+    for role, frame in frames.items():
+        files[role] = os.path.join(folder, f"{role}.xlsx")
+        frame.to_excel(files[role])
+    return files
+
+
+class TestDataProcessor(unittest.TestCase):
+    """
+    Test cases for the DataProcessor class.
+    """
+    
+    def test_vectorized_matches_rowwise(self):
+        """Test that both processing paths build identical dictionaries."""
+        rowwise = create_processor(vectorized=False)
+        vectorized = create_processor(vectorized=True)
+        for attribute in DICT_ATTRIBUTES:
+            self.assertEqual(getattr(rowwise, attribute), getattr(vectorized, attribute), attribute)
+    
+    def test_vectorized_values(self):
+        """Test the values produced by the vectorized processing path."""
+        processor = create_processor(vectorized=True)
+        self.assertEqual(processor.demand_dict, {('Plain', 'Week 1'): 3, ('Plain', 'Week 2'): 15})
+        self.assertEqual(processor.supply_dict, {('Standard', 'Week 1'): 20, ('Standard', 'Week 3'): 5,
+                                                 ('Premium', 'Week 3'): 7})
+        self.assertEqual(processor.wpp_dict, {'Plain': 100})
+        self.assertNotIn(('Plain', 'Premium'), processor.cost_dict)
+        self.assertEqual(processor.allowed_dict, {
+            ('Plain', 'Standard'): True,
+            ('Plain', 'Premium'): True,
+            ('Chocolate', 'Standard'): False,
+            ('Chocolate', 'Premium'): False,
+        })
+    
+    def test_parallel_load_matches_sequential(self):
+        """Test that reading the input files concurrently gives the same data."""
+        with tempfile.TemporaryDirectory() as folder:
+            files = write_excel_inputs(folder)
+            sequential = DataProcessor()
+            sequential.load_data(**files)
+            for mode in ['thread', 'process']:
+                parallel = DataProcessor(parallel_load=mode)
+                parallel.load_data(**files)
+                self.assertEqual(parallel.get_optimization_data().to_dict(),
+                                 sequential.get_optimization_data().to_dict(), mode)
+    
+    def test_parallel_load_reports_failing_file(self):
+        """Test that an unreadable input file is named in the error."""
+        with tempfile.TemporaryDirectory() as folder:
+            files = write_excel_inputs(folder)
+            with open(files['cost_file'], 'w') as f:
+                f.write('not a workbook')
+            for mode in [None, 'thread', 'process']:
+                with self.assertRaises(ValueError) as context:
+                    DataProcessor(parallel_load=mode).load_data(**files)
+                self.assertIn(files['cost_file'], str(context.exception))
+    
+    def test_reload_does_not_accumulate_dimensions(self):
+        """Test that loading a second dataset into the same processor replaces the first."""
+        with tempfile.TemporaryDirectory() as folder:
+            files = write_excel_inputs(folder)
+            processor = DataProcessor()
+            processor.load_data(**files)
+            
+            pd.DataFrame({'Week 1': [7]}, index=['Plain']).to_excel(files['demand_file'])
+            pd.DataFrame({'WPP': [100]}, index=['Plain']).to_excel(files['wpp_file'])
+            pd.DataFrame({'Standard': [0.5]}, index=['Plain']).to_excel(files['cost_file'])
+            pd.DataFrame({'Standard': [1]}, index=['Plain']).to_excel(files['combinations_file'])
+            processor.load_data(**files)
+            
+            self.assertEqual(processor.waffle_types, ['Plain'])
+            self.assertEqual(processor.get_optimization_data().to_dict(), self._fresh_load(files))
+    
+    def test_incremental_reload_reads_only_changed_file(self):
+        """Test that only the changed input is read again when raw tables are kept."""
+        with tempfile.TemporaryDirectory() as folder:
+            files = write_excel_inputs(folder)
+            processor = DataProcessor(keep_raw_frames=True)
+            processor.load_data(**files)
+            supply_array = processor.get_optimization_data().supply_array
+            
+            pd.DataFrame({'Standard': [0.9, 0.7]}, index=['Plain', 'Chocolate']).to_excel(files['cost_file'])
+            stat = os.stat(files['cost_file'])
+            os.utime(files['cost_file'], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            
+            with mock.patch.object(processor_module, 'read_input_file',
+                                   wraps=processor_module.read_input_file) as reader:
+                processor.load_data(**files)
+            self.assertEqual([call.args[0] for call in reader.call_args_list], ['cost_file'])
+            
+            data = processor.get_optimization_data()
+            self.assertEqual(data['cost'][('Plain', 'Standard')], 0.9)
+            self.assertIs(data.supply_array, supply_array)
+            self.assertEqual(data.to_dict(), self._fresh_load(files))
+            
+            # Unchanged files are not read at all
+            with mock.patch.object(processor_module, 'read_input_file') as reader:
+                processor.load_data(**files)
+            reader.assert_not_called()
+
+    def test_warm_start_reload_reads_only_changed_file(self):
+        """Test that a reload after a parse cache hit only reads the changed input."""
+        with tempfile.TemporaryDirectory() as folder:
+            files = write_excel_inputs(folder)
+            cache_dir = os.path.join(folder, 'cache')
+            DataProcessor(cache_dir=cache_dir, keep_raw_frames=True).load_data(**files)
+
+            processor = DataProcessor(cache_dir=cache_dir, keep_raw_frames=True)
+            with mock.patch.object(processor_module, 'read_input_file') as reader:
+                processor.load_data(**files)
+            reader.assert_not_called()
+
+            pd.DataFrame({'Standard': [0.9, 0.7]}, index=['Plain', 'Chocolate']).to_excel(files['cost_file'])
+            stat = os.stat(files['cost_file'])
+            os.utime(files['cost_file'], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+            with mock.patch.object(processor_module, 'read_input_file',
+                                   wraps=processor_module.read_input_file) as reader:
+                processor.load_data(**files)
+            self.assertEqual([call.args[0] for call in reader.call_args_list], ['cost_file'])
+            self.assertEqual(processor.get_optimization_data()['cost'][('Plain', 'Standard')], 0.9)
+            self.assertEqual(processor.get_optimization_data().to_dict(), self._fresh_load(files))
+
+    @staticmethod
+    def _fresh_load(files: dict) -> dict:
+        """Load a dataset with a new processor."""
+        processor = DataProcessor()
+        processor.load_data(**files)
+        return processor.get_optimization_data().to_dict()
+    
+    def test_invalid_parallel_load_mode(self):
+        """Test that unknown parallel load modes are rejected."""
+        with self.assertRaises(ValueError):
+            DataProcessor(parallel_load='cluster')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Tests for the input readers.
+"""
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+import pandas as pd
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.data.processor import DataProcessor
+from src.data import readers
+from src.data.readers import WideTable, detect_format, read_input_file, stream_input_file, stream_workbook
+
+DEMAND = pd.DataFrame({'Week 1': [10, 5], 'Week 2': [0, 8], 'Week 3': [4, 4]},
+                      index=['Plain', 'Chocolate'])
+SUPPLY = pd.DataFrame({'Week 1': [20], 'Week 2': [10], 'Week 3': [6]}, index=['Standard'])
+COST = pd.DataFrame({'Standard': [0.5, 0.6]}, index=['Plain', 'Chocolate'])
+WPP = pd.DataFrame({'WPP': [100, 80]}, index=['Plain', 'Chocolate'])
+COMBINATIONS = pd.DataFrame({'Standard': [1, 1]}, index=['Plain', 'Chocolate'])
+
+
+def to_long(frame: pd.DataFrame, id_column: str, value_column: str) -> pd.DataFrame:
+    """Convert a wide week table to the long (id, week, value) layout."""
+    long = frame.rename_axis(id_column).reset_index().melt(
+        id_vars=[id_column], var_name='Week', value_name=value_column)
+    return long
+
+
+def write_inputs(folder: str, extension: str, long: bool = False) -> dict:
+    """Write the test dataset in the given format and layout."""
+    frames = {
+        'demand_file': to_long(DEMAND, 'WaffleType', 'Demand') if long else DEMAND,
+        'supply_file': to_long(SUPPLY, 'PanType', 'Supply') if long else SUPPLY,
+        'cost_file': COST,
+        'wpp_file': WPP,
+        'combinations_file': COMBINATIONS,
+    }
+    files = {}
+    for role, frame in frames.items():
+        path = os.path.join(folder, f"{role}{extension}")
+        # Wide tables keep the identifiers in the unnamed first column like the workbooks
+        index = not long or role not in ['demand_file', 'supply_file']
+        if extension == '.xlsx':
+            frame.to_excel(path, index=index)
+        elif extension == '.csv':
+            frame.to_csv(path, index=index)
+        elif extension == '.parquet':
+            frame.to_parquet(path, index=index)
+        else:
+            frame.reset_index(drop=not index).to_feather(path)
+        files[role] = path
+    return files
+
+
+def load(files: dict, streaming: bool = False, **kwargs) -> dict:
+    """Load a dataset and return its optimization dictionaries."""
+    processor = DataProcessor(streaming=streaming)
+    processor.load_data(**files, **kwargs)
+    return processor.get_optimization_data().to_dict()
+
+
+class TestReaders(unittest.TestCase):
+    """
+    Test cases for the format-agnostic input readers.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = self.tmp.name
+        self.expected = load(write_inputs(self.folder, '.xlsx'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_formats_and_layouts_match_excel(self):
+        """Test that every format and layout gives the same data as the workbooks."""
+        for extension in ['.csv', '.parquet', '.feather']:
+            for long in [False, True]:
+                folder = os.path.join(self.folder, f"{extension[1:]}_{long}")
+                os.makedirs(folder)
+                files = write_inputs(folder, extension, long)
+                self.assertEqual(load(files), self.expected, (extension, long))
+
+    def test_detect_format_by_magic_bytes(self):
+        """Test that files without a known extension are detected by content."""
+        files = write_inputs(self.folder, '.parquet')
+        renamed = os.path.join(self.folder, 'demand.dat')
+        os.rename(files['demand_file'], renamed)
+        self.assertEqual(detect_format(renamed), 'parquet')
+        self.assertEqual(detect_format(os.path.join(self.folder, 'cost_file.xlsx')), 'excel')
+
+    def test_week_selection(self):
+        """Test that only the requested weeks are loaded from wide and long files."""
+        for long in [False, True]:
+            folder = os.path.join(self.folder, f"weeks_{long}")
+            os.makedirs(folder)
+            files = write_inputs(folder, '.parquet', long)
+            data = load(files, weeks=['Week 1', 'Week 3'])
+            self.assertEqual(data['weeks'], ['Week 1', 'Week 3'])
+            self.assertEqual(data['demand'][('Plain', 'Week 3')], 4)
+            self.assertNotIn(('Standard', 'Week 2'), data['supply'])
+
+            demand = read_input_file('demand_file', files['demand_file'], weeks=['Week 2'])
+            self.assertEqual(list(demand.columns), ['WaffleType', 'Week 2'])
+
+    def test_long_layout_with_duplicates_is_rejected(self):
+        """Test that duplicate rows in long demand data are reported."""
+        path = os.path.join(self.folder, 'demand.csv')
+        long = to_long(DEMAND, 'WaffleType', 'Demand')
+        pd.concat([long, long.head(1)]).to_csv(path, index=False)
+        with self.assertRaises(ValueError) as context:
+            read_input_file('demand_file', path)
+        self.assertIn(path, str(context.exception))
+
+    def test_streaming_matches_pandas(self):
+        """Test that streamed workbooks give the same data as pandas in both layouts."""
+        self.assertEqual(load(write_inputs(self.folder, '.xlsx'), streaming=True), self.expected)
+
+        folder = os.path.join(self.folder, 'long')
+        os.makedirs(folder)
+        files = write_inputs(folder, '.xlsx', long=True)
+        self.assertEqual(load(files, streaming=True), self.expected)
+        self.assertEqual(load(files, streaming=True, weeks=['Week 2'])['weeks'], ['Week 2'])
+
+    def test_stream_workbook(self):
+        """Test the compact table built by the streaming reader."""
+        files = write_inputs(self.folder, '.xlsx')
+        table = stream_workbook('demand_file', files['demand_file'], weeks=['Week 1', 'Week 3'])
+        self.assertIsInstance(table, WideTable)
+        self.assertEqual(table.ids, ['Plain', 'Chocolate'])
+        self.assertEqual(table.week_columns, ['Week 1', 'Week 3'])
+        self.assertEqual(table.values.tolist(), [[10.0, 4.0], [5.0, 4.0]])
+        self.assertEqual(list(table.to_frame().columns), ['WaffleType', 'Week 1', 'Week 3'])
+
+    def test_raw_frames_are_dropped(self):
+        """Test that raw tables are only kept after processing if requested."""
+        files = write_inputs(self.folder, '.xlsx')
+        processor = DataProcessor(streaming=True)
+        processor.load_data(**files)
+        self.assertIsNone(processor.waffle_demand)
+        self.assertTrue(processor.check_data_loaded())
+
+        processor = DataProcessor(streaming=True, keep_raw_frames=True)
+        processor.load_data(**files)
+        self.assertIsInstance(processor.waffle_demand, WideTable)
+        self.assertIsInstance(processor.waffle_cost, pd.DataFrame)
+
+    def test_legacy_workbook_is_not_streamed(self):
+        """Test that legacy .xls workbooks are read with pandas instead of openpyxl."""
+        path = os.path.join(self.folder, 'demand_file.xls')
+        with open(path, 'wb') as f:
+            f.write(readers.LEGACY_EXCEL_MAGIC + bytes(504))
+        with mock.patch.object(readers, 'read_input_file') as reader, \
+                mock.patch.object(readers, 'stream_workbook') as streamer:
+            stream_input_file('demand_file', path)
+        reader.assert_called_once_with('demand_file', path, None)
+        streamer.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Tests for sharing optimization data between processes.
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.data.optimization_data import OptimizationData
+from src.data.shared_data import SharedOptimizationData, attach_shared_data
+from tests.test_data.test_optimization_data import create_test_data
+
+
+class TestSharedData(unittest.TestCase):
+    """
+    Test cases for SharedOptimizationData and attach_shared_data.
+    """
+
+    def test_round_trip(self):
+        """Test that attached data equals the shared data and reads the shared buffer."""
+        data = create_test_data()
+        with SharedOptimizationData(data) as shared:
+            attached, shm = attach_shared_data(shared.descriptor)
+            try:
+                self.assertEqual(attached.to_dict(), data)
+                expected = OptimizationData.from_dict(data)
+                np.testing.assert_array_equal(attached.cost_array, expected.cost_array)
+                self.assertFalse(attached.demand_array.flags.owndata)
+            finally:
+                del attached
+                shm.close()
+
+    def test_read_only(self):
+        """Test that attached arrays cannot be modified."""
+        with SharedOptimizationData(create_test_data()) as shared:
+            attached, shm = attach_shared_data(shared.descriptor)
+            try:
+                with self.assertRaises(ValueError):
+                    attached.supply_array[0, 0] = 1
+            finally:
+                del attached
+                shm.close()
+
+    def test_close(self):
+        """Test that closing releases the block."""
+        shared = SharedOptimizationData(create_test_data())
+        descriptor = shared.descriptor
+        shared.close()
+        shared.close()
+        with self.assertRaises(FileNotFoundError):
+            attach_shared_data(descriptor)
+
+
+if __name__ == '__main__':
+    unittest.main()
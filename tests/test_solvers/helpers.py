@@ -0,0 +1,153 @@
+"""
+Shared constraint sets, planning data and model helpers for the solver tests.
+"""
+import unittest
+from typing import Optional
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import (DemandConstraint, SupplyConstraint, AllowedCombinationsConstraint,
+                                     MinimumBatchConstraint, ProductionRateConstraint)
+from src.solvers.presolve import presolve
+from src.data.optimization_data import as_optimization_data
+from benchmarks.synthetic_data import generate_planning_data
+
+# Options of make_constraints for the named sets of constraint_sets
+CONSTRAINT_SETS = {
+    'default': {'equality': True, 'allowed_combinations': True},
+    'weekly_supply': {'cumulative': False},
+    'inventory': {'formulation': 'inventory'},
+    'minimum_batch': {'min_batch_size': 15},
+    'production_rate': {'max_rate_change': 0.5},
+    'supply_only': {'demand': False},
+    'exact_demand': {'equality': True},
+    # Exact demand with minimum batches, which the network flow solver does not support
+    'small_batch': {'equality': True, 'min_batch_size': 3},
+    # Constraints with ranged rows and auxiliary columns in several blocks
+    'auxiliary_columns': {'formulation': 'inventory', 'min_batch_size': 2, 'max_rate_change': 0.5},
+}
+
+
+def make_constraints(demand: bool = True, equality: bool = False, cumulative: bool = True,
+                     formulation: str = 'prefix_sum', allowed_combinations: bool = False,
+                     min_batch_size: Optional[int] = None, max_rate_change: Optional[float] = None) -> dict:
+    """
+    Create a fresh set of constraints.
+
+    Args:
+        demand: If True, include the demand constraint
+        equality: If True, demand has to be met exactly, otherwise at least
+        cumulative: If True, unused pans carry over to later weeks
+        formulation: Formulation of the supply constraint
+        allowed_combinations: If True, include the allowed combinations constraint
+        min_batch_size: If given, include a minimum batch constraint of this size
+        max_rate_change: If given, include a production rate constraint with this limit
+
+    Returns:
+        dict: Constraints by name
+    """
+    constraints = {}
+    if demand:
+        constraints['demand'] = DemandConstraint(equality=equality)
+    constraints['supply'] = SupplyConstraint(cumulative=cumulative, formulation=formulation)
+    if allowed_combinations:
+        constraints['allowed_combinations'] = AllowedCombinationsConstraint()
+    if min_batch_size is not None:
+        constraints['minimum_batch'] = MinimumBatchConstraint(min_batch_size=min_batch_size)
+    if max_rate_change is not None:
+        constraints['production_rate'] = ProductionRateConstraint(max_rate_change=max_rate_change)
+    return constraints
+
+
+def constraint_set(name: str, sets: Optional[dict] = None) -> dict:
+    """
+    Create a fresh named constraint set.
+
+    Args:
+        name: Name of the set
+        sets: Options of make_constraints by set name (default: CONSTRAINT_SETS)
+
+    Returns:
+        dict: Constraints by name
+    """
+    return make_constraints(**(sets if sets is not None else CONSTRAINT_SETS)[name])
+
+
+def constraint_sets(*names: str) -> dict:
+    """
+    Create fresh named constraint sets.
+
+    Args:
+        names: Names of sets in CONSTRAINT_SETS (default: all sets)
+
+    Returns:
+        dict: Constraints by name for each set
+    """
+    return {name: constraint_set(name) for name in (names or CONSTRAINT_SETS)}
+
+
+def build(solver_name: str, constraints: dict, data, maximize: bool = False, use_presolve: bool = False,
+          warm_start: Optional[dict] = None, **options):
+    """
+    Create a solver and build a model.
+
+    The solver gets a time limit of 30 seconds and an optimality gap of 0 unless
+    options set them.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        constraints: Constraints by name
+        data: Optimization data
+        maximize: If True, build the output model, otherwise the cost model
+        use_presolve: If True, build with the bounds of a presolve run
+        warm_start: Prior solution values to start from
+        options: Other solver options
+
+    Returns:
+        SolverInterface: Solver with the built model
+    """
+    options = {'time_limit': 30, 'optimality_gap': 0, **options}
+    solver = SolverFactory.create_solver(solver_name, constraints=constraints, **options)
+    if use_presolve:
+        solver.set_presolve(presolve(data, solver.get_all_constraints(), maximize))
+    if warm_start is not None:
+        solver.set_warm_start(warm_start)
+    if maximize:
+        solver.build_maximize_output_model(data)
+    else:
+        solver.build_minimize_cost_model(data)
+    return solver
+
+
+def build_and_solve(solver_name: str, constraints: dict, data, maximize: bool = False, **options):
+    """
+    Build and solve a model.
+
+    Args:
+        solver_name: Name of the solver in SolverFactory
+        constraints: Constraints by name
+        data: Optimization data
+        maximize: If True, solve the output model, otherwise the cost model
+        options: Options of build
+
+    Returns:
+        tuple: Solver and the result of solve_model
+    """
+    solver = build(solver_name, constraints, data, maximize, **options)
+    return solver, solver.solve_model()
+
+
+class PlanningDataTestCase(unittest.TestCase):
+    """
+    Test case with synthetic planning data in self.data.
+    """
+
+    # Arguments of generate_planning_data
+    data_shape = (12, 4, 6)
+    data_options = {}
+    # If True, self.data is OptimizationData instead of a dictionary
+    optimization_data = False
+
+    def setUp(self):
+        self.data = generate_planning_data(*self.data_shape, **self.data_options)
+        if self.optimization_data:
+            self.data = as_optimization_data(self.data)
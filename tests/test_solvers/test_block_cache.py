@@ -0,0 +1,101 @@
+"""
+Tests for compiled constraint blocks and the block cache.
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.block_cache import BlockCache, compile_blocks, constraint_key
+from src.solvers.constraints import MinimumBatchConstraint
+from src.solvers.matrix_model import MatrixModel
+from tests.test_solvers.helpers import PlanningDataTestCase, build_and_solve, constraint_set
+
+
+def matrix_arrays(matrix: MatrixModel) -> list:
+    """Get the column, row and coefficient arrays of a matrix model."""
+    return list(matrix.column_arrays()) + list(matrix.row_arrays()) + list(matrix.to_csr())
+
+
+class TestBlockCache(PlanningDataTestCase):
+    """
+    Test cases for compile_blocks and BlockCache.
+    """
+
+    optimization_data = True
+
+    def assemble(self, cache=None, threads=1, data=None) -> MatrixModel:
+        """Assemble a matrix model from compiled blocks."""
+        data = data if data is not None else self.data
+        matrix = MatrixModel(data)
+        for name, block in compile_blocks(matrix, constraint_set('auxiliary_columns'), data, cache, threads):
+            matrix.add_compiled_block(name, block)
+        return matrix
+
+    def test_compiled_blocks_match_apply(self):
+        """Test that appending compiled blocks equals applying the constraints one after another."""
+        expected = MatrixModel(self.data)
+        for name, constraint in constraint_set('auxiliary_columns').items():
+            constraint.apply_to_matrix(expected, self.data)
+        matrix = self.assemble()
+        self.assertEqual(list(matrix.blocks), list(constraint_set('auxiliary_columns')))
+        for array, expected_array in zip(matrix_arrays(matrix), matrix_arrays(expected)):
+            np.testing.assert_array_equal(array, expected_array)
+
+    def test_threads_match_sequential(self):
+        """Test that blocks compiled in threads equal blocks compiled in sequence."""
+        for array, expected in zip(matrix_arrays(self.assemble(threads=4)), matrix_arrays(self.assemble())):
+            np.testing.assert_array_equal(array, expected)
+
+    def test_cache(self):
+        """Test that blocks are reused for the same data and configuration only."""
+        cache = BlockCache()
+        expected = matrix_arrays(self.assemble(cache))
+        self.assertEqual(cache.get_statistics(), {'blocks': 4, 'hits': 0, 'misses': 4})
+        for array, expected_array in zip(matrix_arrays(self.assemble(cache)), expected):
+            np.testing.assert_array_equal(array, expected_array)
+        self.assertEqual(cache.get_statistics()['hits'], 4)
+
+        waffle, week = next(iter(self.data['demand']))
+        self.assemble(cache, data=self.data.with_changes({'demand': {(waffle, week): 1}}))
+        self.assertEqual(cache.get_statistics()['misses'], 8)
+        self.assertNotEqual(constraint_key(MinimumBatchConstraint(min_batch_size=2)),
+                            constraint_key(MinimumBatchConstraint(min_batch_size=3)))
+
+        small = BlockCache(max_entries=2)
+        self.assemble(small)
+        self.assertEqual(small.get_statistics()['blocks'], 2)
+
+    def test_solver_rebuild_uses_cache(self):
+        """Test that rebuilding a model reuses the blocks compiled by the first build."""
+        solver, result = build_and_solve('highs', constraint_set('auxiliary_columns'), self.data)
+        expected = result['objective_value']
+        solver.build_minimize_cost_model(self.data)
+        self.assertEqual(solver.constraint_registry.block_cache.get_statistics()['hits'], 4)
+        self.assertAlmostEqual(solver.solve_model()['objective_value'], expected, places=6)
+        with self.assertRaises(ValueError):
+            solver.set_block_compilation(threads=0)
+
+    def test_pulp_bulk_build(self):
+        """Test that the PuLP model built from compiled blocks has the optimum of the classic build."""
+        for maximize in [False, True]:
+            for with_presolve in [False, True]:
+                with self.subTest(maximize=maximize, presolve=with_presolve):
+                    results = []
+                    for bulk_build in [False, True]:
+                        solver, result = build_and_solve('cbc', constraint_set('auxiliary_columns'), self.data,
+                                                         maximize, use_presolve=with_presolve,
+                                                         bulk_build=bulk_build, direct_mps=False)
+                        results.append((result, solver.get_solution()))
+                    (classic, _), (bulk, solution) = results
+                    self.assertEqual(bulk['status'], classic['status'])
+                    self.assertAlmostEqual(bulk['objective_value'], classic['objective_value'], places=4)
+                    self.assertTrue(all(len(key) == 3 for key in solution['values']))
+
+
+if __name__ == '__main__':
+    unittest.main()
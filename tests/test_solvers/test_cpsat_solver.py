@@ -0,0 +1,94 @@
+"""
+Tests for the CP-SAT solver.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.base import SolverFactory
+from src.solvers.cpsat_solver import CpSatSolver, decimal_ratio
+from tests.test_solvers.helpers import PlanningDataTestCase, build_and_solve, constraint_set, make_constraints
+
+
+# Constraint sets on which CP-SAT is compared with OR-Tools
+CPSAT_SETS = ('default', 'weekly_supply', 'inventory', 'minimum_batch', 'production_rate')
+
+
+class TestCpSatSolver(PlanningDataTestCase):
+    """
+    Test cases for the CP-SAT solver.
+    """
+
+    data_shape = (6, 4, 6)
+
+    def test_factory(self):
+        """Test that the factory creates the CP-SAT solver with its options."""
+        solver = SolverFactory.create_solver('cpsat', num_workers=8, objective_scale=100)
+        self.assertIsInstance(solver, CpSatSolver)
+        self.assertEqual(solver.num_workers, 8)
+        with self.assertRaises(ValueError):
+            CpSatSolver(objective_scale=0)
+
+    def test_same_optimum_as_ortools(self):
+        """Test that CP-SAT and OR-Tools agree for every constraint."""
+        for name in CPSAT_SETS:
+            for maximize in [False, True]:
+                _, expected = build_and_solve('ortools', constraint_set(name), self.data, maximize)
+                _, result = build_and_solve('cpsat', constraint_set(name), self.data, maximize, num_workers=1)
+                self.assertEqual(result['status'], expected['status'], (name, maximize))
+                if expected['objective_value'] is None:
+                    continue
+                # Costs are rounded to 1/1000 in the CP-SAT objective
+                self.assertAlmostEqual(result['objective_value'], expected['objective_value'],
+                                       delta=1e-3 * max(1.0, abs(expected['objective_value'])),
+                                       msg=(name, maximize))
+
+    def test_native_constraints(self):
+        """Test that minimum batch sizes are enforced through OnlyEnforceIf."""
+        solver, result = build_and_solve('cpsat', constraint_set('minimum_batch'), self.data, num_workers=1)
+        self.assertEqual(result['status'], 'OPTIMAL')
+        values = solver.get_solution()['values']
+        self.assertTrue(values)
+        for value in values.values():
+            self.assertGreaterEqual(value, 15)
+
+    def test_rate_scaling(self):
+        """Test that rate limits are scaled exactly, like the matrix rows."""
+        self.assertEqual(decimal_ratio(0.2), (2, 10))
+        self.assertEqual(decimal_ratio(0.1234), (1234, 10000))
+        self.assertEqual(decimal_ratio(3), (3, 1))
+        with self.assertRaises(ValueError):
+            decimal_ratio(1 / 3)
+
+        constraints = make_constraints(max_rate_change=0.1234)
+        _, expected = build_and_solve('ortools', constraints, self.data, maximize=True)
+        _, result = build_and_solve('cpsat', constraints, self.data, maximize=True, num_workers=1)
+        self.assertAlmostEqual(result['objective_value'], expected['objective_value'], places=6)
+
+    def test_solution_values(self):
+        """Test that solution values are read back by (waffle, pan, week) and meet demand."""
+        solver, result = build_and_solve('cpsat', constraint_set('default'), self.data, num_workers=1)
+        solution = solver.get_solution()
+        self.assertEqual(solution['objective_value'], result['objective_value'])
+        self.assertIn(next(iter(solution['values'])), solver.variables)
+
+        produced = {}
+        for (w, p, t), value in solution['values'].items():
+            self.assertTrue(self.data['allowed'].get((w, p), False))
+            produced[(w, t)] = produced.get((w, t), 0) + value
+        for key, demand in self.data['demand'].items():
+            self.assertAlmostEqual(produced.get(key, 0), demand)
+
+    def test_infeasible(self):
+        """Test that infeasible models are reported without a solution."""
+        data = dict(self.data, supply={})
+        solver, result = build_and_solve('cpsat', constraint_set('default'), data, num_workers=1)
+        self.assertEqual(result['status'], 'INFEASIBLE')
+        self.assertEqual(solver.get_solution()['values'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests for decomposing models into independent blocks.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.constraints import DemandConstraint
+from src.solvers.decomposition import DecomposedSolver, find_blocks, splits_weeks
+from benchmarks.synthetic_data import generate_planning_data
+from tests.test_solvers.helpers import CONSTRAINT_SETS, PlanningDataTestCase, build_and_solve, constraint_set
+
+
+class CustomDemandConstraint(DemandConstraint):
+    """Subclass of a built-in constraint, which may link any variables."""
+
+
+# Options of make_constraints for the constraint sets that separate into blocks
+DECOMPOSITION_SETS = {
+    'default': CONSTRAINT_SETS['default'],
+    'weekly_supply': {'demand': False, 'cumulative': False, 'min_batch_size': 3},
+    'production_rate': {'demand': False, 'cumulative': False, 'max_rate_change': 0.5},
+}
+
+
+class TestDecomposition(PlanningDataTestCase):
+    """
+    Test cases for decomposition.
+    """
+
+    data_shape = (24, 8, 6)
+    data_options = {'allowed_share': 1.0, 'n_families': 4}
+
+    def test_find_blocks(self):
+        """Test that blocks are the pan families, and their weeks with weekly supply."""
+        blocks = find_blocks(self.data, constraint_set('default'))
+        self.assertEqual(len(blocks), 4)
+        self.assertEqual(sorted(w for block in blocks for w in block['waffle_types']),
+                         sorted(self.data['waffle_types']))
+        for block in blocks:
+            self.assertEqual(len(block['pan_types']), 2)
+            for w, p in block['allowed']:
+                self.assertIn(w, block['waffle_types'])
+                self.assertIn(p, block['pan_types'])
+
+        self.assertTrue(splits_weeks(constraint_set('weekly_supply', DECOMPOSITION_SETS)))
+        self.assertEqual(len(find_blocks(self.data, constraint_set('weekly_supply', DECOMPOSITION_SETS))), 24)
+        self.assertFalse(splits_weeks(constraint_set('production_rate', DECOMPOSITION_SETS)))
+        self.assertEqual(len(find_blocks(self.data, constraint_set('production_rate', DECOMPOSITION_SETS))), 4)
+
+        # Unknown constraints may link any variables
+        self.assertEqual(find_blocks(self.data, {'demand': CustomDemandConstraint()}), [self.data])
+        self.assertEqual(len(find_blocks(generate_planning_data(12, 5, 4), constraint_set('default'))), 1)
+
+    def test_same_solution(self):
+        """Test that the merged solution has the objective of the undecomposed model."""
+        for name in DECOMPOSITION_SETS:
+            for maximize in [False, True]:
+                constraints = constraint_set(name, DECOMPOSITION_SETS)
+                _, expected = build_and_solve('highs', constraints, self.data, maximize)
+                solver, result = build_and_solve('highs', constraint_set(name, DECOMPOSITION_SETS), self.data,
+                                                 maximize, decompose=True, parallel=None)
+                self.assertIsInstance(solver, DecomposedSolver)
+                self.assertGreater(result['num_blocks'], 1)
+                self.assertEqual(result['status'], expected['status'], (name, maximize))
+                self.assertAlmostEqual(result['objective_value'], expected['objective_value'],
+                                       delta=1e-6 * max(1.0, abs(expected['objective_value'])),
+                                       msg=(name, maximize))
+
+                solution = solver.get_solution()
+                self.assertEqual(solution['objective_value'], result['objective_value'])
+                wpp = self.data['wpp']
+                cost = self.data['cost']
+                total = sum(value * (wpp[w] if maximize else cost[(w, p)] * wpp[w])
+                            for (w, p, t), value in solution['values'].items())
+                self.assertAlmostEqual(total, result['objective_value'], delta=1e-6 * max(1.0, abs(total)))
+
+    def test_process_pool(self):
+        """Test that blocks solved on a process pool give the same result."""
+        _, expected = build_and_solve('highs', constraint_set('default'), self.data, decompose=True, parallel=None)
+        _, result = build_and_solve('highs', constraint_set('default'), self.data, decompose=True,
+                                    parallel='process', max_workers=2)
+        self.assertEqual(result['status'], expected['status'])
+        self.assertAlmostEqual(result['objective_value'], expected['objective_value'], places=6)
+
+    def test_infeasible_block(self):
+        """Test that one infeasible block makes the whole model infeasible."""
+        data = dict(self.data, demand=dict(self.data['demand']))
+        data['demand'][(self.data['waffle_types'][0], self.data['weeks'][0])] = 10 ** 7
+        _, result = build_and_solve('highs', constraint_set('default'), data, decompose=True, parallel='thread')
+        self.assertEqual(result['status'], 'INFEASIBLE')
+        self.assertIsNone(result['objective_value'])
+
+    def test_invalid_parallel_mode(self):
+        """Test that an unknown pool type is rejected."""
+        with self.assertRaises(ValueError):
+            DecomposedSolver(parallel='cluster')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests for the min-cost flow solver.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.base import SolverFactory
+from src.solvers.solver_manager import SolverManager
+from src.solvers.constraints import DemandConstraint, SupplyConstraint, MinimumBatchConstraint
+from src.solvers.flow_solver import NetworkFlowSolver, is_flow_representable
+from tests.test_solvers.helpers import PlanningDataTestCase, build_and_solve, constraint_set, constraint_sets
+
+
+# Flow-representable constraint sets
+FLOW_SETS = ('default', 'weekly_supply', 'inventory', 'supply_only')
+
+
+class TestNetworkFlowSolver(PlanningDataTestCase):
+    """
+    Test cases for the network flow solver.
+    """
+
+    data_shape = (12, 5, 8)
+
+    def test_is_flow_representable(self):
+        """Test detection of flow-representable constraint sets."""
+        for constraints in constraint_sets(*FLOW_SETS).values():
+            self.assertTrue(is_flow_representable(constraints))
+        self.assertFalse(is_flow_representable({'demand': DemandConstraint()}))
+        self.assertFalse(is_flow_representable({'supply': SupplyConstraint(),
+                                                'minimum_batch': MinimumBatchConstraint()}))
+
+    def test_same_solution_as_ortools(self):
+        """Test that the flow solver finds the MIP optimum for every constraint set."""
+        for name in FLOW_SETS:
+            for maximize in [False, True]:
+                _, expected = build_and_solve('ortools', constraint_set(name), self.data, maximize)
+                _, result = build_and_solve('flow', constraint_set(name), self.data, maximize)
+                self.assertEqual(result['status'], expected['status'], (name, maximize))
+                if expected['objective_value'] is not None:
+                    self.assertAlmostEqual(result['objective_value'], expected['objective_value'],
+                                           delta=1e-6 * max(1.0, abs(expected['objective_value'])),
+                                           msg=(name, maximize))
+
+    def test_solution_values(self):
+        """Test that the solution dict meets demand and cumulative supply."""
+        solver, result = build_and_solve('flow', constraint_set('default'), self.data)
+        solution = solver.get_solution()
+        self.assertEqual(solution['status'], 'OPTIMAL')
+        self.assertEqual(solution['objective_value'], result['objective_value'])
+        self.assertEqual(solution['model_type'], 'minimize_cost')
+
+        produced, used = {}, {}
+        for (w, p, t), value in solution['values'].items():
+            self.assertTrue(self.data['allowed'].get((w, p), False))
+            self.assertEqual(value, int(value))
+            produced[(w, t)] = produced.get((w, t), 0) + value
+            used[(p, t)] = used.get((p, t), 0) + value
+        for key, demand in self.data['demand'].items():
+            self.assertAlmostEqual(produced.get(key, 0), demand)
+        for p in self.data['pan_types']:
+            usage = supply = 0
+            for t in sorted(self.data['weeks']):
+                usage += used.get((p, t), 0)
+                supply += self.data['supply'].get((p, t), 0)
+                self.assertLessEqual(usage, supply + 1e-9)
+
+    def test_fractional_data(self):
+        """Test that fractional supply is floored and fractional equality demand is infeasible."""
+        data = dict(self.data, supply={key: value + 0.5 for key, value in self.data['supply'].items()})
+        _, expected = build_and_solve('ortools', constraint_set('default'), data)
+        _, result = build_and_solve('flow', constraint_set('default'), data)
+        self.assertAlmostEqual(result['objective_value'], expected['objective_value'], places=4)
+
+        key = next(iter(self.data['demand']))
+        demand = dict(self.data['demand'])
+        demand[key] += 0.5
+        data = dict(self.data, demand=demand)
+        solver, result = build_and_solve('flow', constraint_set('default'), data)
+        self.assertEqual(result['status'], 'INFEASIBLE')
+        self.assertEqual(solver.get_solution()['values'], {})
+
+    def test_unsupported_constraints(self):
+        """Test that constraints outside the network are rejected."""
+        solver = SolverFactory.create_solver('flow', constraints={
+            'supply': SupplyConstraint(), 'minimum_batch': MinimumBatchConstraint()})
+        with self.assertRaises(ValueError):
+            solver.build_minimize_cost_model(self.data)
+
+    def test_automatic_selection(self):
+        """Test that the solver manager picks the flow solver for the default constraints."""
+        manager = SolverManager()
+        self.assertIsInstance(manager.create_solver('auto'), NetworkFlowSolver)
+        manager.set_constraint_enabled('minimum_batch', True)
+        self.assertEqual(manager.select_solver(), 'ortools')
+        self.assertNotIsInstance(manager.create_solver('auto'), NetworkFlowSolver)
+
+
+if __name__ == '__main__':
+    unittest.main()
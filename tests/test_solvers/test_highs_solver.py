@@ -0,0 +1,74 @@
+"""
+Tests for the in-process HiGHS solver.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.base import SolverFactory
+from src.solvers.highs_solver import HighsSolver
+from tests.test_solvers.helpers import PlanningDataTestCase, build_and_solve, constraint_set
+
+try:
+    import highspy  # noqa: F401
+    HIGHSPY_AVAILABLE = True
+except ImportError:
+    HIGHSPY_AVAILABLE = False
+
+
+# Constraint sets on which HiGHS is compared with OR-Tools
+HIGHS_SETS = ('default', 'inventory', 'minimum_batch', 'production_rate')
+
+
+@unittest.skipUnless(HIGHSPY_AVAILABLE, "highspy is not installed")
+class TestHighsSolver(PlanningDataTestCase):
+    """
+    Test cases for the HiGHS solver.
+    """
+
+    data_shape = (8, 4, 8)
+
+    def test_factory(self):
+        """Test that the factory creates the HiGHS solver with threading options."""
+        solver = SolverFactory.create_solver('highs', threads=2, parallel='off')
+        self.assertIsInstance(solver, HighsSolver)
+        self.assertEqual(solver.threads, 2)
+        with self.assertRaises(ValueError):
+            HighsSolver(parallel='sometimes')
+
+    def test_same_optimum_as_ortools(self):
+        """Test that HiGHS and OR-Tools agree for every constraint."""
+        for name in HIGHS_SETS:
+            for maximize in [False, True]:
+                _, expected = build_and_solve('ortools', constraint_set(name), self.data, maximize)
+                _, result = build_and_solve('highs', constraint_set(name), self.data, maximize)
+                self.assertEqual(result['status'], 'OPTIMAL', (name, maximize))
+                self.assertAlmostEqual(result['objective_value'], expected['objective_value'],
+                                       places=4, msg=(name, maximize))
+
+    def test_solution_values(self):
+        """Test that solution values are read back by (waffle, pan, week) and meet demand."""
+        solver, result = build_and_solve('highs', constraint_set('default'), self.data)
+        solution = solver.get_solution()
+        self.assertEqual(solution['objective_value'], result['objective_value'])
+
+        produced = {}
+        for (w, p, t), value in solution['values'].items():
+            self.assertTrue(self.data['allowed'].get((w, p), False))
+            produced[(w, t)] = produced.get((w, t), 0) + value
+        for key, demand in self.data['demand'].items():
+            self.assertAlmostEqual(produced.get(key, 0), demand)
+
+    def test_infeasible(self):
+        """Test that infeasible models are reported without a solution."""
+        data = dict(self.data, supply={})
+        solver, result = build_and_solve('highs', constraint_set('default'), data)
+        self.assertIn(result['status'], ['INFEASIBLE', 'UNBOUNDED_OR_INFEASIBLE'])
+        self.assertEqual(solver.get_solution()['values'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Tests for the bulk matrix-based model build of the OR-Tools solver.
+"""
+import unittest
+import sys
+import os
+
+from ortools.linear_solver import linear_solver_pb2
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.constraints import (Constraint, DemandConstraint, SupplyConstraint,
+                                     AllowedCombinationsConstraint, ProductionRateConstraint,
+                                     MinimumBatchConstraint)
+from tests.test_solvers.helpers import PlanningDataTestCase, build, make_constraints
+
+
+def canonical_model(solver) -> tuple:
+    """Get the columns and rows of a built model keyed by variable name, independent of order."""
+    proto = linear_solver_pb2.MPModelProto()
+    solver.solver.ExportModelToProto(proto)
+    names = [variable.name for variable in proto.variable]
+    columns = sorted((v.name, v.lower_bound, v.upper_bound, v.is_integer, round(v.objective_coefficient, 9))
+                     for v in proto.variable)
+    rows = sorted((c.lower_bound, c.upper_bound,
+                   tuple(sorted((names[i], round(x, 9)) for i, x in zip(c.var_index, c.coefficient))))
+                  for c in proto.constraint)
+    return proto.maximize, columns, rows
+
+
+class MaxTotalConstraint(Constraint):
+    """Constraint without matrix support: limits the total number of pans used."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+
+    def apply_to_ortools(self, solver, variables, data):
+        solver.Add(solver.Sum(list(variables.values())) <= self.limit)
+
+    def apply_to_pulp(self, problem, variables, data):
+        pass
+
+    def validate_data(self, data):
+        return True
+
+
+class TestMatrixBuild(PlanningDataTestCase):
+    """
+    Test cases checking that the bulk build gives the same model as the classic build.
+    """
+
+    data_shape = (6, 4, 7)
+
+    def test_same_model_for_each_constraint(self):
+        """Test that every constraint emits the same rows and columns in both builds."""
+        constraints = [
+            DemandConstraint(equality=True),
+            DemandConstraint(equality=False),
+            SupplyConstraint(cumulative=False),
+            SupplyConstraint(cumulative=True, formulation='prefix_sum'),
+            SupplyConstraint(cumulative=True, formulation='inventory'),
+            AllowedCombinationsConstraint(),
+            ProductionRateConstraint(max_rate_change=0.3),
+            MinimumBatchConstraint(min_batch_size={'default': 5}),
+        ]
+        for constraint in constraints:
+            for maximize in [False, True]:
+                classic = build('ortools', {'c': constraint}, self.data, maximize, bulk_build=False)
+                bulk = build('ortools', {'c': constraint}, self.data, maximize, bulk_build=True, variable_names=True)
+                self.assertEqual(canonical_model(bulk), canonical_model(classic),
+                                 (type(constraint).__name__, maximize))
+
+    def test_same_solution(self):
+        """Test that both builds find the same optimum and solution values."""
+        results = []
+        for bulk_build in [False, True]:
+            solver = build('ortools', make_constraints(min_batch_size=20), self.data, bulk_build=bulk_build)
+            result = solver.solve_model()
+            self.assertEqual(result['status'], 'OPTIMAL')
+            results.append(solver.get_solution())
+        self.assertAlmostEqual(results[0]['objective_value'], results[1]['objective_value'])
+        self.assertEqual(results[0]['values'], results[1]['values'])
+
+    def test_variables_mapping(self):
+        """Test that the bulk build exposes the variables by (waffle, pan, week)."""
+        classic = build('ortools', {}, self.data, bulk_build=False)
+        bulk = build('ortools', {}, self.data, bulk_build=True)
+        self.assertEqual(list(bulk.variables), list(classic.variables))
+        key = next(iter(classic.variables))
+        self.assertIn(key, bulk.variables)
+        self.assertNotIn(('Unknown', 'Pan 000', 'Week 001'), bulk.variables)
+        self.assertEqual(bulk.variables[key].index(), 0)
+
+    def test_constraint_without_matrix_support(self):
+        """Test that constraints without matrix support are applied after the bulk load."""
+        constraint = MaxTotalConstraint(limit=50)
+        self.assertFalse(constraint.matrix_support)
+        self.assertTrue(DemandConstraint().matrix_support)
+
+        solver = build('ortools', {'supply': SupplyConstraint(cumulative=True), 'total': constraint},
+                       self.data, maximize=True, bulk_build=True)
+        self.assertEqual(solver.solve_model()['status'], 'OPTIMAL')
+        self.assertAlmostEqual(sum(solver.get_solution()['values'].values()), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
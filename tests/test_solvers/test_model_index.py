@@ -0,0 +1,88 @@
+"""
+Tests for the shared variable index of the constraint system.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import Constraint, DemandConstraint
+from src.solvers.model_index import ModelIndex
+
+
+class RecordingConstraint(Constraint):
+    """Constraint that records the variables argument it is applied with."""
+
+    def __init__(self):
+        self.received = []
+
+    def apply_to_ortools(self, solver, variables, data):
+        self.received.append(variables)
+
+    def apply_to_pulp(self, problem, variables, data):
+        self.received.append(variables)
+
+    def validate_data(self, data):
+        return True
+
+
+class TestModelIndex(unittest.TestCase):
+    """
+    Test cases for ModelIndex.
+    """
+
+    def setUp(self):
+        self.data = {
+            'waffle_types': ['W1', 'W2', 'W3'],
+            'pan_types': ['P1', 'P2'],
+            'weeks': ['2024-02', '2024-01'],
+        }
+        self.variables = {}
+        for w, p in [('W1', 'P1'), ('W1', 'P2'), ('W2', 'P2')]:
+            for t in sorted(self.data['weeks']):
+                self.variables[(w, p, t)] = f"x_{w}_{p}_{t}"
+
+    def test_groups(self):
+        """Test that variables are grouped along every dimension in creation order."""
+        index = ModelIndex(self.variables, self.data)
+        self.assertEqual(index.weeks, ['2024-01', '2024-02'])
+        self.assertEqual(index.waffles, ['W1', 'W2'])
+        self.assertEqual(index.pans, ['P1', 'P2'])
+        self.assertEqual(index.by_waffle_week[('W1', '2024-01')], ['x_W1_P1_2024-01', 'x_W1_P2_2024-01'])
+        self.assertEqual(index.by_pan_week[('P2', '2024-02')], ['x_W1_P2_2024-02', 'x_W2_P2_2024-02'])
+        self.assertEqual(index.by_pair[('W2', 'P2')], [('2024-01', 'x_W2_P2_2024-01'),
+                                                      ('2024-02', 'x_W2_P2_2024-02')])
+        self.assertEqual(len(index.by_week['2024-01']), 3)
+        self.assertNotIn(('W3', '2024-01'), index.by_waffle_week)
+
+    def test_mapping(self):
+        """Test that the index behaves like the variables dictionary."""
+        index = ModelIndex(self.variables, self.data)
+        self.assertEqual(len(index), len(self.variables))
+        self.assertEqual(list(index), list(self.variables))
+        self.assertEqual(dict(index.items()), self.variables)
+        self.assertIn(('W1', 'P1', '2024-01'), index)
+        self.assertNotIn(('W3', 'P1', '2024-01'), index)
+        self.assertIs(ModelIndex.of(index, self.data), index)
+        self.assertIsNot(ModelIndex.of(self.variables, self.data), index)
+
+    def test_registry_passes_one_index(self):
+        """Test that every constraint receives the index the solver built with the variables."""
+        data = dict(self.data, allowed={('W1', 'P1'): True, ('W2', 'P2'): True},
+                    cost={}, wpp={}, demand={}, supply={})
+        first, second = RecordingConstraint(), RecordingConstraint()
+        solver = SolverFactory.create_solver('ortools', bulk_build=False,
+                                             constraints={'demand': DemandConstraint(), 'first': first,
+                                                          'second': second})
+        solver.build_minimize_cost_model(data)
+        self.assertIsInstance(first.received[0], ModelIndex)
+        self.assertIs(first.received[0], solver.model_index)
+        self.assertIs(second.received[0], first.received[0])
+        self.assertEqual(len(solver.model_index), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
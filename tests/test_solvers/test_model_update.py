@@ -0,0 +1,191 @@
+"""
+Tests for updating built models for new data in place.
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+from ortools.linear_solver import linear_solver_pb2
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import MinimumBatchConstraint
+from src.solvers.matrix_model import MatrixModel
+from tests.test_solvers.helpers import PlanningDataTestCase, build, constraint_set
+
+
+def exported_model(solver) -> tuple:
+    """Get the columns and rows of a loaded OR-Tools model."""
+    proto = linear_solver_pb2.MPModelProto()
+    solver.solver.ExportModelToProto(proto)
+    columns = [(v.lower_bound, v.upper_bound, v.is_integer, round(v.objective_coefficient, 9))
+               for v in proto.variable]
+    rows = [(c.lower_bound, c.upper_bound, tuple(c.var_index), tuple(round(x, 9) for x in c.coefficient))
+            for c in proto.constraint]
+    return columns, rows
+
+
+class TestModelUpdate(PlanningDataTestCase):
+    """
+    Test cases for SolverInterface.update_model.
+    """
+
+    optimization_data = True
+
+    def setUp(self):
+        super().setUp()
+        waffle, week = next(iter(self.data['demand']))
+        pan = self.data.pan_types[0]
+        supply_key = next(key for key in self.data['supply'] if key[0] == pan)
+        self.edits = [
+            {'demand': {(waffle, week): self.data['demand'][(waffle, week)] - 2}},
+            {'supply': {supply_key: self.data['supply'][supply_key] + 5}},
+            {'cost': {key: value * 1.3 for key, value in self.data['cost'].items() if key[1] == pan}},
+            {'wpp': {waffle: self.data['wpp'][waffle] + 10}},
+        ]
+
+    def test_same_optimum(self):
+        """Test that patched models reach the optimum of models built from the new data."""
+        for solver_name, kwargs, name, in_place in [
+                ('highs', {}, 'exact_demand', True), ('highs', {}, 'small_batch', True),
+                ('ortools', {}, 'exact_demand', True), ('ortools', {}, 'small_batch', True),
+                ('ortools', {'fast': True}, 'exact_demand', True),
+                ('cpsat', {}, 'exact_demand', True), ('cpsat', {}, 'small_batch', False),
+                ('ortools', {'bulk_build': False}, 'exact_demand', False), ('cbc', {}, 'exact_demand', False)]:
+            for maximize in [False, True]:
+                with self.subTest(solver=solver_name, constraints=name, maximize=maximize, **kwargs):
+                    solver = build(solver_name, constraint_set(name), self.data, maximize, **kwargs)
+                    solver.solve_model()
+                    data = self.data
+                    for changes in self.edits:
+                        data = data.with_changes(changes)
+                        self.assertEqual(solver.update_model(data), in_place)
+                        result = solver.solve_model()
+                        expected = build(solver_name, constraint_set(name), data, maximize, **kwargs).solve_model()
+                        self.assertEqual(result['status'], expected['status'])
+                        self.assertAlmostEqual(result['objective_value'], expected['objective_value'],
+                                               delta=1e-6 * abs(expected['objective_value']))
+                    self.assertIs(solver.data, data)
+
+    def test_patched_model_matches_build(self):
+        """Test that a patched OR-Tools model equals the model built from the new data."""
+        solver = build('ortools', constraint_set('small_batch'), self.data)
+        data = self.data
+        for changes in self.edits:
+            data = data.with_changes(changes)
+            self.assertTrue(solver.update_model(data))
+        expected = build('ortools', constraint_set('small_batch'), data)
+        self.assertEqual(exported_model(solver), exported_model(expected))
+
+    def test_structure_change(self):
+        """Test that data changing the rows of a constraint replaces its block or rebuilds the model."""
+        missing = next((w, t) for w in self.data.waffle_types for t in self.data.weeks
+                       if (w, t) not in self.data['demand'])
+        data = self.data.with_changes({'demand': {missing: 1}})
+        for solver_name, in_place in [('highs', True), ('ortools', True), ('cpsat', False)]:
+            with self.subTest(solver=solver_name):
+                solver = build(solver_name, constraint_set('exact_demand'), self.data)
+                solver.solve_model()
+                self.assertEqual(solver.update_model(data), in_place)
+                self.assertEqual(list(solver.matrix.blocks), ['supply', 'demand'] if in_place else ['demand', 'supply'])
+                expected = build(solver_name, constraint_set('exact_demand'), data)
+                self.assertAlmostEqual(solver.solve_model()['objective_value'],
+                                       expected.solve_model()['objective_value'], places=6)
+
+    def test_toggle_constraints(self):
+        """Test that constraints added and removed after the build reach the optimum of a new build."""
+        steps = [{'minimum_batch'}, set(), {'minimum_batch'}, {'minimum_batch', 'no_supply'}, set()]
+        for solver_name, kwargs, in_place in [('highs', {}, True), ('ortools', {}, True), ('cpsat', {}, False),
+                                              ('ortools', {'bulk_build': False}, False)]:
+            with self.subTest(solver=solver_name, **kwargs):
+                solver = build(solver_name, constraint_set('exact_demand'), self.data, **kwargs)
+                solver.solve_model()
+                for step in steps:
+                    constraints = constraint_set('small_batch' if 'minimum_batch' in step else 'exact_demand')
+                    if 'no_supply' in step:
+                        del constraints['supply']
+                    solver.set_constraints(constraints)
+                    self.assertEqual(solver.update_model(self.data), in_place)
+                    self.assertEqual(set(solver.get_all_constraints()), set(constraints))
+                    expected = build(solver_name, constraints, self.data, **kwargs)
+                    self.assertAlmostEqual(solver.solve_model()['objective_value'],
+                                           expected.solve_model()['objective_value'], places=6)
+
+    def test_toggled_model_matches_build(self):
+        """Test that a toggled OR-Tools model equals the model built with its constraints in block order."""
+        solver = build('ortools', constraint_set('small_batch'), self.data)
+        solver.remove_constraint('demand')
+        self.assertTrue(solver.update_model(self.data))
+        self.assertEqual(list(solver.matrix.blocks), ['supply', 'minimum_batch'])
+        solver.set_constraints(constraint_set('small_batch'))
+        self.assertTrue(solver.update_model(self.data))
+        constraints = constraint_set('small_batch')
+        expected = SolverFactory.create_solver('ortools', constraints={name: constraints[name]
+                                                                       for name in solver.matrix.blocks})
+        expected.build_minimize_cost_model(self.data)
+        self.assertEqual(list(solver.matrix.blocks), ['supply', 'minimum_batch', 'demand'])
+        self.assertEqual(exported_model(solver), exported_model(expected))
+
+    def test_update_before_build(self):
+        """Test that updating requires a built model."""
+        solver = SolverFactory.create_solver('highs', constraints=constraint_set('exact_demand'))
+        with self.assertRaises(ValueError):
+            solver.update_model(self.data)
+
+    def test_changes_from(self):
+        """Test the changes between matrix models of the same structure."""
+        def matrix_of(data):
+            matrix = MatrixModel(data)
+            matrix.set_production_objective(False)
+            MinimumBatchConstraint(min_batch_size=2).apply_to_matrix(matrix, data)
+            return matrix
+
+        previous = matrix_of(self.data)
+        self.assertIsNone(previous.changes_from(MatrixModel(self.data)))
+        changes = matrix_of(self.data.with_changes(self.edits[1])).changes_from(previous)
+        self.assertEqual(len(changes['objective']), 0)
+        self.assertEqual(len(changes['rows']), 0)
+        self.assertGreater(len(changes['coefficients']), 0)
+        np.testing.assert_array_less(changes['coefficients'], 0)
+        changes = matrix_of(self.data.with_changes(self.edits[2])).changes_from(previous)
+        self.assertGreater(len(changes['objective']), 0)
+        self.assertEqual(len(changes['coefficients']), 0)
+        self.assertFalse(changes['blocks_changed'])
+
+    def test_changes_from_blocks(self):
+        """Test the changes between matrix models of different constraints."""
+        def matrix_of(names):
+            matrix = MatrixModel(self.data)
+            matrix.set_production_objective(False)
+            constraints = constraint_set('small_batch')
+            for name in names:
+                matrix.add_block(name, constraints[name], self.data)
+            return matrix
+
+        previous = matrix_of(['demand', 'minimum_batch', 'supply'])
+        current = matrix_of(['demand', 'supply'])
+        self.assertEqual(current.changed_blocks(previous), [])
+        self.assertEqual(previous.block_order(['supply', 'demand']), ['demand', 'supply'])
+        changes = current.changes_from(previous)
+        batch = previous.blocks['minimum_batch']
+        np.testing.assert_array_equal(changes['deleted_rows'], np.arange(batch[0], batch[1]))
+        np.testing.assert_array_equal(changes['deleted_columns'], np.arange(batch[2], batch[3]))
+        self.assertEqual(changes['first_new_row'], current.num_rows)
+        self.assertEqual(changes['first_new_column'], current.num_columns)
+        self.assertTrue(changes['blocks_changed'])
+        self.assertEqual(len(changes['coefficients']) + len(changes['rows']), 0)
+
+        # Blocks out of the previous order are deleted and appended again
+        current = matrix_of(['supply', 'demand'])
+        changes = current.changes_from(previous)
+        supply = previous.blocks['supply']
+        self.assertEqual(changes['first_new_row'], supply[1] - supply[0])
+        self.assertEqual(len(changes['deleted_rows']), supply[0])
+        self.assertEqual(current.block_order(['demand', 'supply']), ['supply', 'demand'])
+
+
+if __name__ == '__main__':
+    unittest.main()
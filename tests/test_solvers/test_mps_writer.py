@@ -0,0 +1,111 @@
+"""
+Tests for the direct MPS path of the PuLP solvers.
+"""
+import unittest
+import tempfile
+import sys
+import os
+
+import numpy as np
+import pulp
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.constraints import DemandConstraint
+from src.solvers.matrix_model import MatrixModel
+from src.solvers.mps_writer import column_values, write_mps
+from src.solvers.presolve import presolve
+from src.solvers.pulp_solver import PulpSolver
+from tests.test_solvers.helpers import PlanningDataTestCase, build, build_and_solve, constraint_set
+
+try:
+    import highspy
+    HIGHSPY_AVAILABLE = True
+except ImportError:
+    HIGHSPY_AVAILABLE = False
+
+CBC_AVAILABLE = pulp.PULP_CBC_CMD(msg=False).available()
+
+
+class TestMpsWriter(PlanningDataTestCase):
+    """
+    Test cases for write_mps and the direct MPS path of PulpSolver.
+    """
+
+    optimization_data = True
+
+    @unittest.skipUnless(HIGHSPY_AVAILABLE, "highspy is not installed")
+    def test_written_model_matches_build(self):
+        """Test that a written model read by HiGHS has the optimum of the HiGHS build."""
+        for maximize in [False, True]:
+            for with_presolve in [False, True]:
+                with self.subTest(maximize=maximize, presolve=with_presolve):
+                    constraints = constraint_set('auxiliary_columns')
+                    bounds = presolve(self.data, constraints, maximize) if with_presolve else None
+                    matrix = MatrixModel(self.data, upper_bounds=bounds.upper_bounds if bounds else None)
+                    matrix.set_production_objective(maximize)
+                    for name, constraint in constraints.items():
+                        matrix.add_block(name, constraint, self.data)
+                    with tempfile.TemporaryDirectory() as directory:
+                        path = os.path.join(directory, 'model.mps')
+                        write_mps(matrix, path)
+                        highs = highspy.Highs()
+                        highs.setOptionValue('output_flag', False)
+                        highs.readModel(path)
+                    highs.run()
+                    self.assertEqual(highs.getNumCol(), matrix.num_columns)
+
+                    _, expected = build_and_solve('highs', constraint_set('auxiliary_columns'), self.data, maximize,
+                                                  use_presolve=with_presolve)
+                    objective = highs.getInfo().objective_function_value
+                    self.assertAlmostEqual(-objective if maximize else objective,
+                                           expected['objective_value'], places=4)
+
+    def test_column_values(self):
+        """Test that solution values map back to columns by index."""
+        np.testing.assert_array_equal(column_values({'C2': '3', 'R0': 5.0, 'C0': 1.5, 'OBJ': 2}, 4),
+                                      [1.5, 0, 3, 0])
+
+    @unittest.skipUnless(CBC_AVAILABLE, "CBC is not available")
+    def test_direct_matches_pulp_model(self):
+        """Test that the direct MPS path reaches the optimum of the PuLP model."""
+        for maximize in [False, True]:
+            for fast in [False, True]:
+                with self.subTest(maximize=maximize, fast=fast):
+                    results = []
+                    for direct_mps in [False, True]:
+                        solver = build('cbc', constraint_set('auxiliary_columns'), self.data, maximize, fast=fast,
+                                       direct_mps=direct_mps)
+                        self.assertEqual(solver.matrix is not None, direct_mps)
+                        results.append((solver.solve_model(), solver.get_solution()))
+                    (expected, expected_solution), (result, solution) = results
+                    self.assertEqual(result['status'], expected['status'])
+                    self.assertAlmostEqual(result['objective_value'], expected['objective_value'], places=4)
+                    self.assertAlmostEqual(sum(solution['values'].values()),
+                                           sum(expected_solution['values'].values()), places=6)
+
+    @unittest.skipUnless(CBC_AVAILABLE, "CBC is not available")
+    def test_direct_infeasible_and_warm_start(self):
+        """Test infeasible models and MIP starts on the direct MPS path."""
+        infeasible = self.data.with_changes({'supply': {key: 0 for key in self.data['supply']}})
+        solver, result = build_and_solve('cbc', constraint_set('exact_demand'), infeasible)
+        self.assertEqual(result['status'], 'INFEASIBLE')
+        self.assertEqual(solver.get_solution()['values'], {})
+
+        solver, result = build_and_solve('cbc', constraint_set('auxiliary_columns'), self.data)
+        expected = result['objective_value']
+        solver.set_warm_start(solver.get_solution()['values'])
+        self.assertAlmostEqual(solver.solve_model()['objective_value'], expected, places=4)
+
+    def test_fallback(self):
+        """Test that solvers without the direct path build a PuLP model."""
+        solver = PulpSolver(solver_name='CHOCO_CMD')
+        solver.add_constraint('demand', DemandConstraint())
+        solver.build_minimize_cost_model(self.data)
+        self.assertIsNone(solver.matrix)
+        self.assertIsNotNone(solver.model)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Tests for the presolve pass.
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.presolve import presolve
+from tests.test_solvers.helpers import (CONSTRAINT_SETS, PlanningDataTestCase, build_and_solve, constraint_set,
+                                        make_constraints)
+
+
+# Options of make_constraints for the constraint sets solved with and without presolve
+PRESOLVE_SETS = {
+    'default': CONSTRAINT_SETS['default'],
+    'minimum_batch': {'equality': True, 'cumulative': False, 'min_batch_size': 3},
+    'production_rate': {'formulation': 'inventory', 'max_rate_change': 0.5},
+}
+
+
+class TestPresolve(PlanningDataTestCase):
+    """
+    Test cases for presolve.
+    """
+
+    data_shape = (12, 5, 8)
+    data_options = {'demand_share': 0.25}
+
+    def setUp(self):
+        super().setUp()
+        self.small_data = {
+            'waffle_types': ['W1', 'W2'],
+            'pan_types': ['P1'],
+            'weeks': ['2024-01', '2024-02', '2024-03'],
+            'demand': {('W1', '2024-02'): 4, ('W2', '2024-03'): 2},
+            'supply': {('P1', '2024-02'): 5, ('P1', '2024-03'): 1},
+            'cost': {('W1', 'P1'): 1.0, ('W2', 'P1'): 1.0},
+            'wpp': {'W1': 1, 'W2': 1},
+            'allowed': {('W1', 'P1'): True, ('W2', 'P1'): True},
+        }
+
+    def test_bounds(self):
+        """Test the bounds derived from supply, demand and dominance."""
+        result = presolve(self.small_data, constraint_set('default'))
+        self.assertEqual(result.variable_bounds(), {('W1', 'P1', '2024-02'): 4.0, ('W2', 'P1', '2024-03'): 2.0})
+        statistics = result.get_statistics()
+        self.assertEqual(statistics['variables'], 6)
+        self.assertEqual(statistics['removed_variables'], 4)
+        self.assertEqual(statistics['bounded_variables'], 2)
+
+        # Without dominance, only the weeks without cumulative supply are removed
+        result = presolve(self.small_data, constraint_set('default'), maximize=True)
+        self.assertEqual(result.variable_bounds(), {
+            ('W1', 'P1', '2024-02'): 4.0, ('W1', 'P1', '2024-03'): 6.0,
+            ('W2', 'P1', '2024-02'): 5.0, ('W2', 'P1', '2024-03'): 2.0})
+
+        # A minimum batch above the bound removes the variable
+        constraints = make_constraints(**CONSTRAINT_SETS['default'], min_batch_size=3)
+        result = presolve(self.small_data, constraints)
+        self.assertEqual(list(result.variable_bounds()), [('W1', 'P1', '2024-02')])
+        self.assertEqual(result.get_statistics()['removed_rows'], 10)
+
+    def test_shrinks_model(self):
+        """Test that presolve removes most variables and rows on sparse demand."""
+        solvers = {}
+        for use_presolve in [False, True]:
+            constraints = constraint_set('minimum_batch', PRESOLVE_SETS)
+            solvers[use_presolve], _ = build_and_solve('highs', constraints, self.data, use_presolve=use_presolve)
+        full = solvers[False].matrix.get_statistics()
+        reduced = solvers[True].matrix.get_statistics()
+        statistics = presolve(self.data, constraint_set('minimum_batch', PRESOLVE_SETS)).get_statistics()
+        self.assertGreater(statistics['removed_variables'], statistics['variables'] // 2)
+        self.assertEqual(full['rows'] - reduced['rows'], statistics['removed_rows'])
+        self.assertEqual(full['columns'] - reduced['columns'], statistics['removed_columns'])
+        self.assertLess(reduced['nonzeros'], full['nonzeros'] // 2)
+
+    def test_same_optimum(self):
+        """Test that every solver finds the same optimum with and without presolve."""
+        for solver_name, kwargs in [('ortools', {}), ('ortools', {'bulk_build': False}), ('highs', {}),
+                                    ('cpsat', {'num_workers': 1})]:
+            for name in PRESOLVE_SETS:
+                for maximize in [False, True]:
+                    constraints = constraint_set(name, PRESOLVE_SETS)
+                    _, expected = build_and_solve(solver_name, constraints, self.data, maximize, **kwargs)
+                    _, result = build_and_solve(solver_name, constraint_set(name, PRESOLVE_SETS), self.data,
+                                                maximize, use_presolve=True, **kwargs)
+                    label = (solver_name, kwargs, name, maximize)
+                    self.assertEqual(result['status'], expected['status'], label)
+                    if expected['objective_value'] is not None:
+                        self.assertAlmostEqual(result['objective_value'], expected['objective_value'],
+                                               delta=1e-6 * max(1.0, abs(expected['objective_value'])),
+                                               msg=label)
+
+    def test_removed_week_limits_production_rate(self):
+        """Test that a week whose variables were removed still limits the next week's production."""
+        data = dict(self.small_data, supply={('P1', '2024-01'): 0, ('P1', '2024-02'): 10})
+        constraints = make_constraints(demand=False, cumulative=False, max_rate_change=0.5)
+        for solver_name, kwargs in [('ortools', {}), ('ortools', {'bulk_build': False}), ('cpsat', {})]:
+            result = presolve(data, constraints, maximize=True)
+            self.assertEqual(result.get_statistics()['removed_variables'], 4)
+            _, expected = build_and_solve(solver_name, constraints, data, maximize=True, **kwargs)
+            _, presolved = build_and_solve(solver_name, constraints, data, maximize=True, use_presolve=True,
+                                           **kwargs)
+            self.assertEqual(presolved['objective_value'], expected['objective_value'], (solver_name, kwargs))
+
+    def test_bounds_in_column_order(self):
+        """Test that the bounds can be passed to a matrix model of the same data."""
+        from src.solvers.matrix_model import MatrixModel
+
+        result = presolve(self.data, constraint_set('default'))
+        matrix = MatrixModel(self.data, upper_bounds=result.upper_bounds)
+        self.assertEqual(matrix.variable_keys(), result.matrix.variable_keys())
+        self.assertTrue(np.array_equal(matrix.column_arrays()[1][:matrix.num_variables], result.upper_bounds))
+        with self.assertRaises(ValueError):
+            MatrixModel(self.data, upper_bounds=result.upper_bounds[:-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for racing solver backends.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.race import RacingSolver, backend_label
+from benchmarks.synthetic_data import generate_planning_data
+from tests.test_solvers.helpers import PlanningDataTestCase, build_and_solve, constraint_set
+
+
+class TestRace(PlanningDataTestCase):
+    """
+    Test cases for racing solver backends.
+    """
+
+    data_shape = (20, 5, 8)
+
+    def test_first_optimal_wins(self):
+        """Test that the race returns an optimal result and names its backend."""
+        for maximize in [False, True]:
+            _, expected = build_and_solve('highs', constraint_set('small_batch'), self.data, maximize)
+            solver, result = build_and_solve('race', constraint_set('small_batch'), self.data, maximize,
+                                             solvers=['highs', 'cbc', 'ortools'])
+            self.assertEqual(result['status'], 'OPTIMAL', maximize)
+            self.assertAlmostEqual(result['objective_value'], expected['objective_value'], places=4)
+            self.assertIn(result['winner'], ['highs', 'cbc', 'ortools'])
+            self.assertEqual(result['backends'][result['winner']], 'OPTIMAL')
+            solution = solver.get_solution()
+            self.assertEqual(solution['winner'], result['winner'])
+            self.assertTrue(solution['values'])
+
+    def test_infeasible(self):
+        """Test that a proof of infeasibility ends the race."""
+        data = dict(self.data, supply={key: 0 for key in self.data['supply']})
+        _, result = build_and_solve('race', constraint_set('small_batch'), data, solvers=['highs', 'cbc'])
+        self.assertEqual(result['status'], 'INFEASIBLE')
+        self.assertIsNotNone(result['winner'])
+
+    def test_failed_backend(self):
+        """Test that a backend that fails loses the race."""
+        _, result = build_and_solve('race', constraint_set('small_batch'), self.data,
+                                    solvers=['flow', 'highs'])
+        self.assertEqual(result['status'], 'OPTIMAL')
+        self.assertEqual(result['winner'], 'highs')
+        self.assertEqual(result['backends']['flow'], 'ERROR')
+
+    def test_best_incumbent(self):
+        """Test that without a conclusive result the best solution wins."""
+        data = generate_planning_data(12, 5, 10, demand_share=1.0)
+        _, result = build_and_solve('race', constraint_set('production_rate'), data,
+                                    solvers=[('ortools', {'fast': True}), ('cbc', {'fast': True})])
+        self.assertEqual(result['status'], 'FEASIBLE')
+        self.assertEqual(set(result['backends'].values()), {'FEASIBLE'})
+        self.assertIn(result['winner'], ['ortools(fast=True)', 'cbc(fast=True)'])
+
+    def test_backends(self):
+        """Test backend options and labels."""
+        solver = RacingSolver(solvers=['highs', ('ortools', {'bulk_build': False})], time_limit=5)
+        self.assertEqual(solver.labels, ['highs', 'ortools(bulk_build=False)'])
+        self.assertEqual(solver.backends[1], ('ortools', {'time_limit': 5, 'optimality_gap': 0.005, 'bulk_build': False}))
+        self.assertEqual(backend_label('cbc', {}), 'cbc')
+        with self.assertRaises(ValueError):
+            RacingSolver(solvers=['highs', 'highs'])
+
+    def test_fast_only_for_fast_backends(self):
+        """Test that a shared fast option only goes to backends that have a fast mode."""
+        solver = RacingSolver(solvers=['highs', 'cpsat', 'ortools'], time_limit=5, fast=True)
+        self.assertEqual([('fast' in options) for _, options in solver.backends], [False, False, True])
+        _, result = build_and_solve('race', constraint_set('default'), self.data,
+                                    solvers=['highs', 'ortools'], fast=True)
+        self.assertNotIn('ERROR', result['backends'].values())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Tests for the solve cache.
+"""
+import tempfile
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.data.optimization_data import OptimizationData
+from src.solvers.result_cache import SolveCache, data_fingerprint
+from tests.test_solvers.helpers import PlanningDataTestCase, build_and_solve, constraint_set
+
+
+class TestSolveCache(PlanningDataTestCase):
+    """
+    Test cases for SolveCache.
+    """
+
+    data_shape = (10, 4, 5)
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_dir = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def key(self, data=None, **changes) -> str:
+        """Compute a cache key, with some parameters changed."""
+        parameters = dict(configuration={'enabled_constraints': {'demand': True}}, objective='minimize_cost',
+                          solver_name='highs', time_limit=30, gap=0.005, options=None)
+        parameters.update(changes)
+        return SolveCache.key(self.data if data is None else data, **parameters)
+
+    def test_disk_round_trip(self):
+        """Test that a new cache instance returns the stored result and solution."""
+        solver, result = build_and_solve('highs', constraint_set('exact_demand'), self.data)
+        solution = solver.get_solution()
+        self.assertTrue(SolveCache(self.cache_dir).put(self.key(), result, solution))
+        cached = SolveCache(self.cache_dir).get(self.key())
+        self.assertIsNotNone(cached)
+        self.assertEqual(cached, (result, solution))
+        self.assertIn(next(iter(cached[1]['values'])), solution['values'])
+
+    def test_key(self):
+        """Test which inputs change the cache key."""
+        self.assertEqual(self.key(), self.key(data=OptimizationData.from_dict(self.data)))
+        self.assertEqual(data_fingerprint(self.data), data_fingerprint(dict(self.data)))
+        changed_demand = dict(self.data, demand={key: value + 1 for key, value in self.data['demand'].items()})
+        keys = [self.key(), self.key(data=changed_demand), self.key(configuration={}),
+                self.key(objective='maximize_output'), self.key(solver_name='cbc'), self.key(time_limit=60),
+                self.key(gap=0.01), self.key(options={'fast': True})]
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_incumbents(self):
+        """Test that results that are not final are only reused when asked."""
+        cache = SolveCache(self.cache_dir)
+        cache.put(self.key(), {'status': 'FEASIBLE', 'objective_value': 1.0}, {'values': {}})
+        self.assertIsNone(cache.get(self.key()))
+        result, _ = cache.get(self.key(), reuse_incumbent=True)
+        self.assertEqual(result['status'], 'FEASIBLE')
+
+    def test_eviction(self):
+        """Test that both tiers evict their least recently used entries."""
+        cache = SolveCache(None, max_entries=2)
+        for time_limit in [1, 2, 3]:
+            self.assertFalse(cache.put(self.key(time_limit=time_limit), {'status': 'OPTIMAL'}, {}))
+        self.assertIsNone(cache.get(self.key(time_limit=1)))
+        self.assertIsNotNone(cache.get(self.key(time_limit=3)))
+
+        cache = SolveCache(self.cache_dir, max_size_bytes=1)
+        cache.put(self.key(), {'status': 'OPTIMAL'}, {})
+        self.assertEqual(os.listdir(self.cache_dir), [])
+        self.assertEqual(SolveCache(self.cache_dir).clear(), 0)
+
+    def test_copies(self):
+        """Test that changing a returned solution does not change the cache."""
+        cache = SolveCache(None)
+        cache.put(self.key(), {'status': 'OPTIMAL'}, {'status': 'optimal'})
+        _, solution = cache.get(self.key())
+        solution['status'] = 'OPTIMAL'
+        self.assertEqual(cache.get(self.key())[1]['status'], 'optimal')
+
+
+if __name__ == '__main__':
+    unittest.main()
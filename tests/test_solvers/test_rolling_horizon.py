@@ -0,0 +1,130 @@
+"""
+Tests for rolling horizon solves.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import SupplyConstraint, ProductionRateConstraint
+from src.solvers.rolling_horizon import RollingHorizonSolver
+from tests.test_solvers.helpers import PlanningDataTestCase, build_and_solve, constraint_set, make_constraints
+
+
+class TestRollingHorizon(PlanningDataTestCase):
+    """
+    Test cases for rolling horizon solves.
+    """
+
+    data_shape = (8, 4, 20)
+    data_options = {'demand_share': 1.0}
+
+    def setUp(self):
+        super().setUp()
+        self.weeks = sorted(self.data['weeks'])
+
+    def assert_feasible(self, values: dict, max_rate_change: float = 0.5):
+        """Check the cumulative supply, demand and production rate of a solution of the full horizon."""
+        data = self.data
+        for p in data['pan_types']:
+            supply = usage = 0
+            for t in self.weeks:
+                supply += data['supply'].get((p, t), 0)
+                usage += sum(value for (_, pan, week), value in values.items() if pan == p and week == t)
+                self.assertLessEqual(usage, supply + 1e-6, (p, t))
+        for w in data['waffle_types']:
+            production = [sum(value for (waffle, _, week), value in values.items() if waffle == w and week == t)
+                          for t in self.weeks]
+            for t, produced in zip(self.weeks, production):
+                self.assertGreaterEqual(produced, data['demand'].get((w, t), 0) - 1e-6, (w, t))
+            for previous, current in zip(production, production[1:]):
+                if previous > 0:
+                    self.assertGreaterEqual(current, previous * (1 - max_rate_change) - 1e-6, w)
+
+    def test_windows(self):
+        """Test the window and fixed weeks of each solve."""
+        solver = RollingHorizonSolver(window=8, step=4)
+        solver.data = self.data
+        windows = solver.windows()
+        self.assertEqual([len(weeks) for weeks, _ in windows], [8, 8, 8, 8])
+        self.assertEqual([fixed for _, fixed in windows],
+                         [self.weeks[0:4], self.weeks[4:8], self.weeks[8:12], self.weeks[12:20]])
+        with self.assertRaises(ValueError):
+            RollingHorizonSolver(window=4, step=5)
+
+    def test_full_window_is_monolithic(self):
+        """Test that a window covering all weeks gives the single model's optimum."""
+        _, expected = build_and_solve('highs', constraint_set('production_rate'), self.data)
+        _, result = build_and_solve('highs', constraint_set('production_rate'), self.data,
+                                    rolling_horizon=(20, 20))
+        self.assertEqual(result['status'], 'OPTIMAL')
+        self.assertAlmostEqual(result['objective_value'], expected['objective_value'], places=4)
+
+    def test_feasible_plan(self):
+        """Test that rolling horizon plans satisfy the constraints of the full horizon."""
+        for solver_name in ['highs', 'ortools', 'cpsat']:
+            for maximize in [False, True]:
+                _, expected = build_and_solve(solver_name, constraint_set('production_rate'), self.data, maximize)
+                solver, result = build_and_solve(solver_name, constraint_set('production_rate'), self.data,
+                                                 maximize, rolling_horizon=(8, 4))
+                label = (solver_name, maximize)
+                self.assertEqual(result['status'], 'FEASIBLE', label)
+                self.assertEqual(result['num_windows'], 4, label)
+                solution = solver.get_solution()
+                self.assertEqual({t for _, _, t in solution['values']} - set(self.weeks), set(), label)
+                self.assert_feasible(solution['values'])
+                if not maximize:
+                    self.assertGreaterEqual(result['objective_value'], expected['objective_value'] - 1e-6, label)
+
+    def test_infeasible_window_restarts(self):
+        """Test that a window made infeasible by earlier windows restarts with longer windows."""
+        data = {
+            'waffle_types': ['W1'],
+            'pan_types': ['P1'],
+            'weeks': ['2024-01', '2024-02', '2024-03', '2024-04'],
+            'demand': {('W1', '2024-02'): 5},
+            'supply': {('P1', '2024-01'): 10},
+            'cost': {('W1', 'P1'): 1.0},
+            'wpp': {'W1': 1},
+            'allowed': {('W1', 'P1'): True},
+        }
+        # The first one-week window uses all supply, which the demand of the second week needs
+        solver, result = build_and_solve('highs', make_constraints(), data, maximize=True, rolling_horizon=(1, 1))
+        self.assertEqual(result['status'], 'FEASIBLE')
+        self.assertEqual((result['window'], result['step'], result['num_windows']), (2, 2, 2))
+        self.assertAlmostEqual(result['objective_value'], 10.0, places=6)
+        self.assertGreaterEqual(solver.get_solution()['values'][('W1', 'P1', '2024-02')], 5 - 1e-6)
+
+        # An infeasible first window means an infeasible model
+        data['demand'] = {('W1', '2024-01'): 20}
+        _, result = build_and_solve('highs', make_constraints(), data, maximize=True, rolling_horizon=(1, 1))
+        self.assertEqual((result['status'], result['window']), ('INFEASIBLE', 1))
+
+    def test_initial_production(self):
+        """Test that the production before the first week limits the decrease in the first week."""
+        data = {
+            'waffle_types': ['W1'],
+            'pan_types': ['P1'],
+            'weeks': ['2024-01', '2024-02'],
+            'demand': {},
+            'supply': {('P1', '2024-01'): 10, ('P1', '2024-02'): 10},
+            'cost': {('W1', 'P1'): 1.0},
+            'wpp': {'W1': 1},
+            'allowed': {('W1', 'P1'): True},
+        }
+        constraints = {'supply': SupplyConstraint(cumulative=False),
+                       'production_rate': ProductionRateConstraint(max_rate_change=0.5,
+                                                                   initial_production={'W1': 8})}
+        for solver_name, kwargs in [('ortools', {}), ('ortools', {'bulk_build': False}), ('highs', {}),
+                                    ('cpsat', {}), ('cbc', {})]:
+            solver = SolverFactory.create_solver(solver_name, constraints=constraints, **kwargs)
+            solver.build_minimize_cost_model(data)
+            result = solver.solve_model()
+            self.assertAlmostEqual(result['objective_value'], 6.0, places=6, msg=(solver_name, kwargs))
+
+
+if __name__ == '__main__':
+    unittest.main()
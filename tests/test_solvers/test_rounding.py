@@ -0,0 +1,130 @@
+"""
+Tests for the fast mode that rounds and repairs the LP relaxation.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import DemandConstraint
+from src.solvers.rounding import check_repairable, round_and_repair, rounding_gap
+from tests.test_solvers.helpers import PlanningDataTestCase, build_and_solve, constraint_set, make_constraints
+
+
+class TestRounding(PlanningDataTestCase):
+    """
+    Test cases for LP relaxation rounding.
+    """
+
+    data_shape = (12, 5, 10)
+    data_options = {'demand_share': 1.0}
+
+    def setUp(self):
+        super().setUp()
+        self.weeks = sorted(self.data['weeks'])
+
+    def assert_feasible(self, values: dict, equality: bool = False, min_batch: int = 1,
+                        max_rate_change: float = None):
+        """Check integrality, cumulative supply, demand, minimum batch and production rate of a plan."""
+        data = self.data
+        for (w, p, t), value in values.items():
+            self.assertEqual(value, round(value), (w, p, t))
+            self.assertGreaterEqual(value, min_batch, (w, p, t))
+            self.assertTrue(data['allowed'].get((w, p), False), (w, p))
+        for p in data['pan_types']:
+            supply = usage = 0
+            for t in self.weeks:
+                supply += data['supply'].get((p, t), 0)
+                usage += sum(value for (_, pan, week), value in values.items() if pan == p and week == t)
+                self.assertLessEqual(usage, supply + 1e-6, (p, t))
+        for w in data['waffle_types']:
+            production = [sum(value for (waffle, _, week), value in values.items() if waffle == w and week == t)
+                          for t in self.weeks]
+            for t, produced in zip(self.weeks, production):
+                demand = data['demand'].get((w, t), 0)
+                self.assertGreaterEqual(produced, demand - 1e-6, (w, t))
+                if equality and (w, t) in data['demand']:
+                    self.assertLessEqual(produced, demand + 1e-6, (w, t))
+            if max_rate_change is not None:
+                for previous, current in zip(production, production[1:]):
+                    if previous > 0:
+                        self.assertGreaterEqual(current, previous * (1 - max_rate_change) - 1e-6, w)
+
+    def test_repair(self):
+        """Test that the repair restores the demand of a rounded down plan within the supply."""
+        data = {
+            'waffle_types': ['W1', 'W2'],
+            'pan_types': ['P1', 'P2'],
+            'weeks': ['2024-01'],
+            'demand': {('W1', '2024-01'): 5, ('W2', '2024-01'): 3},
+            'supply': {('P1', '2024-01'): 5, ('P2', '2024-01'): 4},
+            'cost': {('W1', 'P1'): 1.0, ('W1', 'P2'): 2.0, ('W2', 'P1'): 1.0, ('W2', 'P2'): 3.0},
+            'wpp': {'W1': 1, 'W2': 1},
+            'allowed': {('W1', 'P1'): True, ('W1', 'P2'): True, ('W2', 'P1'): True, ('W2', 'P2'): True},
+        }
+        constraints = make_constraints(equality=True, cumulative=False)
+        lp_values = {('W1', 'P1', '2024-01'): 2.5, ('W1', 'P2', '2024-01'): 2.5,
+                     ('W2', 'P1', '2024-01'): 2.5, ('W2', 'P2', '2024-01'): 0.5}
+        values, repaired = round_and_repair(data, constraints, lp_values, maximize=False)
+        self.assertTrue(repaired)
+        self.assertEqual(sum(value for (w, _, _), value in values.items() if w == 'W1'), 5)
+        self.assertEqual(sum(value for (w, _, _), value in values.items() if w == 'W2'), 3)
+        self.assertLessEqual(sum(value for (_, p, _), value in values.items() if p == 'P1'), 5)
+        self.assertLessEqual(sum(value for (_, p, _), value in values.items() if p == 'P2'), 4)
+
+    def test_matches_flow_optimum(self):
+        """Test that fast mode finds the optimum of a model whose LP relaxation is integral."""
+        constraints = make_constraints(equality=True)
+        _, expected = build_and_solve('flow', constraints, self.data)
+        for solver_name, kwargs in [('ortools', {}), ('ortools', {'bulk_build': False}), ('cbc', {})]:
+            solver, result = build_and_solve(solver_name, constraints, self.data, fast=True, **kwargs)
+            label = (solver_name, kwargs)
+            self.assertEqual(result['status'], 'FEASIBLE', label)
+            self.assertAlmostEqual(result['objective_value'], expected['objective_value'], places=4, msg=label)
+            self.assertEqual(result['gap'], 0.0, label)
+            self.assert_feasible(solver.get_solution()['values'], equality=True)
+
+    def test_feasible_plan(self):
+        """Test that fast plans satisfy minimum batch and production rate constraints."""
+        cases = [
+            (constraint_set('small_batch'), {'equality': True, 'min_batch': 3}),
+            (constraint_set('production_rate'), {'max_rate_change': 0.5}),
+        ]
+        for constraints, checks in cases:
+            for maximize in [False, True]:
+                for solver_name in ['ortools', 'cbc']:
+                    solver, result = build_and_solve(solver_name, constraints, self.data, maximize, fast=True)
+                    label = (solver_name, maximize, sorted(constraints))
+                    self.assertEqual(result['status'], 'FEASIBLE', label)
+                    self.assertGreaterEqual(result['gap'], 0.0, label)
+                    if maximize:
+                        self.assertLessEqual(result['objective_value'], result['lp_bound'] + 1e-6, label)
+                    else:
+                        self.assertGreaterEqual(result['objective_value'], result['lp_bound'] - 1e-6, label)
+                    self.assert_feasible(solver.get_solution()['values'], **checks)
+
+    def test_unsupported_constraint(self):
+        """Test that fast mode refuses constraints the repair does not know."""
+        class CustomDemandConstraint(DemandConstraint):
+            pass
+
+        check_repairable({'demand': DemandConstraint()})
+        with self.assertRaises(ValueError):
+            check_repairable({'demand': CustomDemandConstraint()})
+        solver = SolverFactory.create_solver('ortools', constraints={'demand': CustomDemandConstraint()}, fast=True)
+        solver.build_minimize_cost_model(self.data)
+        with self.assertRaises(ValueError):
+            solver.solve_model()
+
+    def test_rounding_gap(self):
+        """Test the relative gap to the LP bound."""
+        self.assertEqual(rounding_gap(100.0, 100.0), 0.0)
+        self.assertAlmostEqual(rounding_gap(110.0, 100.0), 10.0 / 110.0)
+        self.assertAlmostEqual(rounding_gap(90.0, 100.0), 10.0 / 90.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for running scenario sweeps.
+"""
+import csv
+import tempfile
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.scenario_runner import RESULT_COLUMNS, Scenario, ScenarioRunner, constraint_label
+from benchmarks.synthetic_data import generate_planning_data
+
+
+def make_scenarios() -> list:
+    """Create scenarios of both objectives, with a failing and a multi-core scenario."""
+    scenarios = [Scenario(solver, objective) for solver in ['highs', 'cbc']
+                 for objective in ['minimize_cost', 'maximize_output']]
+    scenarios.append(Scenario('no_such_solver', name='broken'))
+    scenarios.append(Scenario('highs', constraints={'demand': {'equality': False}, 'supply': None,
+                                                    'minimum_batch': {'min_batch_size': 3, 'enabled': True}},
+                              cores=4, name='batch'))
+    return scenarios
+
+
+class TestScenarioRunner(unittest.TestCase):
+    """
+    Test cases for ScenarioRunner.
+    """
+
+    def setUp(self):
+        self.data = generate_planning_data(15, 4, 6)
+
+    def test_parallel_matches_serial(self):
+        """Test that the pool returns the results of a serial run, one row per scenario."""
+        parallel = ScenarioRunner(self.data, core_budget=2).run_all(make_scenarios())
+        serial = ScenarioRunner(self.data, parallel=False).run_all(make_scenarios())
+        self.assertEqual(list(parallel.columns), RESULT_COLUMNS)
+        self.assertEqual(sorted(parallel['name']), sorted(serial['name']))
+        parallel = parallel.set_index('name')
+        for _, row in serial.iterrows():
+            self.assertEqual(parallel.loc[row['name'], 'status'], row['status'])
+            if row['status'] == 'OPTIMAL':
+                self.assertAlmostEqual(parallel.loc[row['name'], 'objective_value'], row['objective_value'],
+                                       delta=1e-6 * abs(row['objective_value']) + 1e-6)
+
+    def test_errors(self):
+        """Test that a failing scenario is reported without stopping the sweep."""
+        rows = {row['name']: row for row in ScenarioRunner(self.data, core_budget=1).run(make_scenarios())}
+        self.assertEqual(rows['broken']['status'], 'ERROR')
+        self.assertIn('not supported', rows['broken']['error'])
+        # A scenario needing more cores than the budget runs alone
+        self.assertEqual(rows['batch']['status'], 'OPTIMAL')
+        self.assertIsNone(rows['batch']['error'])
+
+    def test_warm_start(self):
+        """Test that scenarios start from the last solution of their objective."""
+        scenarios = [Scenario('highs', name='first'), Scenario('cbc', name='second'),
+                     Scenario('highs', 'maximize_output', name='output')]
+        rows = ScenarioRunner(self.data, parallel=False, warm_start=True).run_all(scenarios).set_index('name')
+        self.assertEqual(rows['warm_start'].to_dict(), {'first': False, 'second': True, 'output': False})
+        self.assertAlmostEqual(rows.loc['second', 'objective_value'], rows.loc['first', 'objective_value'],
+                               delta=0.01 * rows.loc['first', 'objective_value'])
+
+    def test_store(self):
+        """Test that rows are appended to the CSV store."""
+        with tempfile.TemporaryDirectory() as directory:
+            store = os.path.join(directory, 'results.csv')
+            runner = ScenarioRunner(self.data, parallel=False)
+            runner.run_all([Scenario('highs')], store=store)
+            runner.run_all([Scenario('highs', 'maximize_output')], store=store)
+            with open(store, newline='') as file:
+                rows = list(csv.DictReader(file))
+        self.assertEqual([row['objective'] for row in rows], ['minimize_cost', 'maximize_output'])
+        self.assertEqual(rows[0]['status'], 'OPTIMAL')
+
+    def test_scenarios(self):
+        """Test scenario validation and labels."""
+        self.assertEqual(constraint_label({'demand': {'equality': True}, 'supply': None,
+                                           'minimum_batch': {'enabled': False}}), 'demand(equality=True)')
+        self.assertEqual(Scenario('highs', constraints={}).name, 'highs / minimize_cost / none')
+        with self.assertRaises(ValueError):
+            Scenario('highs', objective='minimize_waffles')
+        with self.assertRaises(ValueError):
+            Scenario('highs', cores=0)
+        with self.assertRaises(ValueError):
+            ScenarioRunner(self.data, core_budget=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
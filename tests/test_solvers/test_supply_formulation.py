@@ -0,0 +1,83 @@
+"""
+Tests for the formulations of the cumulative supply constraint.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.base import SolverFactory
+from src.solvers.constraints import DemandConstraint, SupplyConstraint, AllowedCombinationsConstraint
+
+
+def create_data(supply: dict) -> dict:
+    """Create a small dataset in which pans have to be carried over to later weeks."""
+    return {
+        'waffle_types': ['Plain', 'Chocolate'],
+        'pan_types': ['Standard', 'Premium'],
+        'weeks': ['Week 1', 'Week 2', 'Week 3'],
+        'demand': {('Plain', 'Week 1'): 4, ('Plain', 'Week 3'): 6,
+                   ('Chocolate', 'Week 2'): 5, ('Chocolate', 'Week 3'): 3},
+        'supply': supply,
+        'cost': {('Plain', 'Standard'): 1.0, ('Plain', 'Premium'): 3.0,
+                 ('Chocolate', 'Standard'): 1.5, ('Chocolate', 'Premium'): 2.0},
+        'wpp': {'Plain': 1, 'Chocolate': 1},
+        'allowed': {('Plain', 'Standard'): True, ('Plain', 'Premium'): True,
+                    ('Chocolate', 'Standard'): True, ('Chocolate', 'Premium'): True},
+    }
+
+
+def solve(solver_name: str, data: dict, formulation: str, maximize: bool = False) -> dict:
+    """Build and solve a model with the given supply formulation."""
+    solver = SolverFactory.create_solver(solver_name, time_limit=10)
+    solver.add_constraint('demand', DemandConstraint(equality=not maximize))
+    solver.add_constraint('supply', SupplyConstraint(cumulative=True, formulation=formulation))
+    solver.add_constraint('allowed_combinations', AllowedCombinationsConstraint())
+    if maximize:
+        solver.build_maximize_output_model(data)
+    else:
+        solver.build_minimize_cost_model(data)
+    return solver.solve_model()
+
+
+class TestSupplyFormulation(unittest.TestCase):
+    """
+    Test cases checking that both cumulative supply formulations are equivalent.
+    """
+
+    SUPPLY = {('Standard', 'Week 1'): 10, ('Premium', 'Week 1'): 4, ('Premium', 'Week 3'): 5}
+
+    def test_same_cost_optimum(self):
+        """Test that both formulations find the same minimum cost."""
+        data = create_data(self.SUPPLY)
+        for solver_name in ['ortools', 'cbc']:
+            prefix_sum = solve(solver_name, data, 'prefix_sum')
+            inventory = solve(solver_name, data, 'inventory')
+            self.assertEqual(prefix_sum['status'], 'OPTIMAL', solver_name)
+            self.assertEqual(inventory['status'], 'OPTIMAL', solver_name)
+            self.assertAlmostEqual(prefix_sum['objective_value'], inventory['objective_value'])
+
+    def test_same_output_optimum(self):
+        """Test that both formulations allow the same maximum output."""
+        data = create_data(self.SUPPLY)
+        prefix_sum = solve('ortools', data, 'prefix_sum', maximize=True)
+        inventory = solve('ortools', data, 'inventory', maximize=True)
+        self.assertAlmostEqual(prefix_sum['objective_value'], inventory['objective_value'])
+
+    def test_late_supply_is_infeasible(self):
+        """Test that supply arriving after the demand week is rejected by both formulations."""
+        data = create_data({('Standard', 'Week 3'): 30})
+        for formulation in ['prefix_sum', 'inventory']:
+            result = solve('ortools', data, formulation)
+            self.assertEqual(result['status'], 'INFEASIBLE', formulation)
+
+    def test_invalid_formulation(self):
+        """Test that unknown formulations are rejected."""
+        with self.assertRaises(ValueError):
+            SupplyConstraint(formulation='rolling')
+
+
+if __name__ == '__main__':
+    unittest.main()
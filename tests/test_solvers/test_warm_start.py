@@ -0,0 +1,75 @@
+"""
+Tests for warm-starting solvers from a prior solution.
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.solvers.base import SolverFactory
+from src.solvers.matrix_model import MatrixModel
+from tests.test_solvers.helpers import PlanningDataTestCase, build_and_solve, constraint_set
+
+
+class TestWarmStart(PlanningDataTestCase):
+    """
+    Test cases for warm starts.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # An edited model: more demand in one week
+        week = self.data['weeks'][2]
+        self.edited = dict(self.data, demand={key: value + 5 if key[1] == week else value
+                                              for key, value in self.data['demand'].items()})
+
+    def test_same_optimum(self):
+        """Test that each backend reaches the cold-start optimum from the prior solution."""
+        # The minimum batch columns are not covered by the warm start
+        solver, _ = build_and_solve('highs', constraint_set('small_batch'), self.data)
+        prior = solver.get_solution()
+        for solver_name, kwargs in [('highs', {}), ('ortools', {}), ('ortools', {'bulk_build': False}),
+                                    ('cpsat', {}), ('cbc', {}), ('decompose', {}), ('rolling', {})]:
+            with self.subTest(solver=solver_name, **kwargs):
+                if solver_name == 'decompose':
+                    solver_name, kwargs = 'highs', {'decompose': True, 'parallel': None}
+                elif solver_name == 'rolling':
+                    solver_name, kwargs = 'highs', {'rolling_horizon': (6, 6)}
+                _, cold = build_and_solve(solver_name, constraint_set('small_batch'), self.edited, **kwargs)
+                solver, warm = build_and_solve(solver_name, constraint_set('small_batch'), self.edited,
+                                               warm_start=prior, **kwargs)
+                solution = solver.get_solution()
+                self.assertEqual(warm['status'], 'OPTIMAL')
+                self.assertAlmostEqual(warm['objective_value'], cold['objective_value'],
+                                       delta=1e-6 * abs(cold['objective_value']))
+                self.assertTrue(solution['values'])
+
+    def test_hint_values(self):
+        """Test that a prior solution is mapped onto the decision variable columns."""
+        matrix = MatrixModel(self.data)
+        keys = matrix.variable_keys()
+        hints = matrix.hint_values({keys[1]: 2.6, keys[3]: -1, ('No such waffle', 'Pan', 'Week'): 5})
+        self.assertEqual(hints.shape, (matrix.num_variables,))
+        self.assertEqual(hints[1], 3)
+        self.assertEqual(hints[3], 0)
+        self.assertEqual(np.count_nonzero(hints), 1)
+
+    def test_set_warm_start(self):
+        """Test the accepted forms of a warm start."""
+        solver = SolverFactory.create_solver('highs')
+        key = ('Waffle 0000', 'Pan 000', 'Week 001')
+        solver.set_warm_start({'status': 'OPTIMAL', 'values': {key: 4.0}})
+        self.assertEqual(solver.warm_start, {key: 4.0})
+        self.assertEqual(solver.warm_start_values([key, ('Other', 'Pan 000', 'Week 001')]), [4.0, 0.0])
+        solver.set_warm_start({key: 1.0})
+        self.assertEqual(solver.warm_start, {key: 1.0})
+        solver.set_warm_start(None)
+        self.assertIsNone(solver.warm_start)
+
+
+if __name__ == '__main__':
+    unittest.main()